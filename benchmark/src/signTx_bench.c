@@ -0,0 +1,399 @@
+#include <cx.h>
+#include <os_io.h>
+#include <signTx.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <state.h>
+
+#include "benchUtils.h"
+#include "cx_hash_host.h"
+
+// Replays sign tx APDU streams through the real handlers and reports
+// the cost per APDU and the hashing throughput, grouped by tx section (P1).
+//
+// The streams come from files in the fuzzing corpus format
+// (repeated [ins, p1, p2, lc, data...], see fuzzing/src/signTx_harness.c)
+// passed on the command line, and from large synthetic transactions built below.
+
+uint8_t G_io_apdu_buffer[IO_APDU_BUFFER_SIZE];
+
+enum {
+    NUM_SECTIONS = 0x20,
+};
+
+static const char* SECTION_NAMES[NUM_SECTIONS] = {
+    [0x01] = "init",
+    [0x02] = "inputs",
+    [0x03] = "outputs",
+    [0x04] = "fee",
+    [0x05] = "ttl",
+    [0x06] = "certificates",
+    [0x07] = "withdrawals",
+    [0x08] = "aux data",
+    [0x09] = "validity interval start",
+    [0x0a] = "confirm",
+    [0x0b] = "mint",
+    [0x0c] = "script data hash",
+    [0x0d] = "collateral inputs",
+    [0x0e] = "required signers",
+    [0x0f] = "witnesses",
+    [0x10] = "total collateral",
+    [0x11] = "reference inputs",
+    [0x12] = "collateral output",
+    [0x13] = "voting procedures",
+    [0x15] = "treasury",
+    [0x16] = "donation",
+};
+
+typedef struct {
+    uint64_t apdus;
+    uint64_t failed;
+    uint64_t ns;
+    uint64_t cycles;
+    uint64_t hashUpdates;
+    uint64_t hashBytes;
+    uint64_t hashCycles;
+} section_stats_t;
+
+static section_stats_t stats[NUM_SECTIONS];
+
+static void stats_reset() {
+    memset(stats, 0, sizeof(stats));
+}
+
+// ------------------------ replay ------------------------
+
+static bool replayApdu(uint8_t p1, uint8_t p2, const uint8_t* data, uint8_t lc, bool isNewCall) {
+    volatile bool ok = true;
+    io_state = IO_EXPECT_NONE;
+    BEGIN_TRY {
+        TRY {
+            signTx_handleAPDU(p1, p2, data, lc, isNewCall);
+        }
+        CATCH_ALL {
+            ok = false;
+        }
+        FINALLY {
+        }
+    }
+    END_TRY;
+    return ok;
+}
+
+static void replay(const uint8_t* data, size_t size) {
+    bool isFirst = true;
+
+    // unlike the fuzzing harness, APDUs without data at the end of the stream are replayed too
+    while (size >= 4) {
+        const uint8_t p1 = data[1];
+        const uint8_t p2 = data[2];
+        const uint8_t lc = data[3];
+        data += 4;
+        size -= 4;
+        if (size < lc) {
+            return;
+        }
+
+        const host_hash_stats_t hashBefore = host_hash_stats;
+        const uint64_t startNs = bench_nowNs();
+        const uint64_t startCycles = bench_cycles();
+
+        const bool ok = replayApdu(p1, p2, data, lc, isFirst);
+
+        const uint64_t cycles = bench_cycles() - startCycles;
+        const uint64_t ns = bench_nowNs() - startNs;
+
+        section_stats_t* section = &stats[p1 % NUM_SECTIONS];
+        section->apdus++;
+        section->failed += ok ? 0 : 1;
+        section->ns += ns;
+        section->cycles += cycles;
+        section->hashUpdates += host_hash_stats.updates - hashBefore.updates;
+        section->hashBytes += host_hash_stats.bytes - hashBefore.bytes;
+        section->hashCycles += host_hash_stats.cycles - hashBefore.cycles;
+
+        isFirst = false;
+        data += lc;
+        size -= lc;
+    }
+}
+
+static void report(const char* name) {
+    uint64_t totalApdus = 0, totalNs = 0;
+    for (size_t p1 = 0; p1 < NUM_SECTIONS; p1++) {
+        totalApdus += stats[p1].apdus;
+        totalNs += stats[p1].ns;
+    }
+    printf("== %s: %llu apdus, %.2f ms in the handlers\n",
+           name,
+           (unsigned long long) totalApdus,
+           (double) totalNs / 1e6);
+    printf("%-24s %8s %7s %10s %12s %10s %10s %10s\n",
+           "section",
+           "apdus",
+           "failed",
+           "ns/apdu",
+           "cycles/apdu",
+           "upd/apdu",
+           "B/apdu",
+           "cycles/B");
+    for (size_t p1 = 0; p1 < NUM_SECTIONS; p1++) {
+        const section_stats_t* s = &stats[p1];
+        if (s->apdus == 0) {
+            continue;
+        }
+        char unknown[16];
+        const char* sectionName = SECTION_NAMES[p1];
+        if (sectionName == NULL) {
+            snprintf(unknown, sizeof(unknown), "P1 0x%02x", (unsigned) p1);
+            sectionName = unknown;
+        }
+        printf("%-24s %8llu %7llu %10.0f %12.0f %10.2f %10.1f %10.2f\n",
+               sectionName,
+               (unsigned long long) s->apdus,
+               (unsigned long long) s->failed,
+               (double) s->ns / (double) s->apdus,
+               (double) s->cycles / (double) s->apdus,
+               (double) s->hashUpdates / (double) s->apdus,
+               (double) s->hashBytes / (double) s->apdus,
+               s->hashBytes ? (double) s->hashCycles / (double) s->hashBytes : 0.0);
+    }
+    printf("\n");
+}
+
+// ------------------------ corpus files ------------------------
+
+static bool replayFile(const char* path) {
+    FILE* f = fopen(path, "rb");
+    if (f == NULL) {
+        fprintf(stderr, "cannot open %s\n", path);
+        return false;
+    }
+    fseek(f, 0, SEEK_END);
+    const long size = ftell(f);
+    fseek(f, 0, SEEK_SET);
+
+    uint8_t* data = malloc(size > 0 ? (size_t) size : 1);
+    const bool ok = data != NULL && fread(data, 1, (size_t) size, f) == (size_t) size;
+    fclose(f);
+    if (ok) {
+        replay(data, (size_t) size);
+    }
+    free(data);
+    return ok;
+}
+
+// ------------------------ synthetic transactions ------------------------
+
+typedef struct {
+    uint8_t* data;
+    size_t size;
+    size_t capacity;
+} apdu_stream_t;
+
+static void stream_add(apdu_stream_t* stream, uint8_t p1, uint8_t p2, const uint8_t* data, size_t lc) {
+    ASSERT(lc <= UINT8_MAX);
+    if (stream->size + 4 + lc > stream->capacity) {
+        stream->capacity = 2 * stream->capacity + 4 + lc;
+        stream->data = realloc(stream->data, stream->capacity);
+        ASSERT(stream->data != NULL);
+    }
+    uint8_t* out = stream->data + stream->size;
+    out[0] = INS_SIGN_TX;
+    out[1] = p1;
+    out[2] = p2;
+    out[3] = (uint8_t) lc;
+    memcpy(out + 4, data, lc);
+    stream->size += 4 + lc;
+}
+
+static uint8_t* put_u1(uint8_t* p, uint8_t value) {
+    *p = value;
+    return p + 1;
+}
+
+static uint8_t* put_u4(uint8_t* p, uint32_t value) {
+    for (int i = 3; i >= 0; i--) {
+        *p++ = (uint8_t) (value >> (8 * i));
+    }
+    return p;
+}
+
+static uint8_t* put_u8(uint8_t* p, uint64_t value) {
+    for (int i = 7; i >= 0; i--) {
+        *p++ = (uint8_t) (value >> (8 * i));
+    }
+    return p;
+}
+
+// mainnet base address, as used in the fuzzing corpus
+static const uint8_t ADDRESS[] = {
+    0x01, 0xeb, 0x0b, 0xaa, 0x5e, 0x57, 0x0c, 0xff, 0xbe, 0x29, 0x34, 0xdb, 0x29, 0xdf, 0x0b,
+    0x6a, 0x3d, 0x7c, 0x04, 0x30, 0xee, 0x65, 0xd4, 0xc3, 0xa7, 0xab, 0x2f, 0xef, 0xb9, 0x1b,
+    0xc4, 0x28, 0xe4, 0x72, 0x07, 0x02, 0xeb, 0xd5, 0xda, 0xb4, 0xfb, 0x17, 0x53, 0x24, 0xc1,
+    0x92, 0xdc, 0x9b, 0xb7, 0x6c, 0xc5, 0xda, 0x95, 0x6e, 0x3c, 0x8d, 0xff,
+};
+
+typedef struct {
+    const char* name;
+    uint32_t numInputs;
+    uint32_t numOutputs;
+    uint32_t datumSize;      // inline datum in every output, 0 for none
+    uint32_t inputsPerApdu;  // more than 1 uses P2_INPUTS_BATCH
+} synthetic_tx_t;
+
+static void addInit(apdu_stream_t* stream, const synthetic_tx_t* tx) {
+    uint8_t buffer[60];
+    uint8_t* p = buffer;
+    p = put_u8(p, 0);  // tx options
+    p = put_u1(p, MAINNET_NETWORK_ID);
+    p = put_u4(p, MAINNET_PROTOCOL_MAGIC);
+    for (int i = 0; i < 10; i++) {
+        // ttl, aux data, validity interval start, mint, script data hash,
+        // network id, collateral output, total collateral, treasury, donation
+        p = put_u1(p, ITEM_INCLUDED_NO);
+    }
+    p = put_u1(p, SIGN_TX_SIGNINGMODE_ORDINARY_TX);
+    p = put_u4(p, tx->numInputs);
+    p = put_u4(p, tx->numOutputs);
+    for (int i = 0; i < 6; i++) {
+        // certificates, withdrawals, collateral inputs, required signers,
+        // reference inputs, voting procedures
+        p = put_u4(p, 0);
+    }
+    p = put_u4(p, 1);  // witnesses
+    ASSERT(p == buffer + sizeof(buffer));
+    stream_add(stream, 0x01, 0x00, buffer, sizeof(buffer));
+}
+
+static void addInputs(apdu_stream_t* stream, uint32_t firstIndex, uint32_t count) {
+    enum { UTXO_SIZE = TX_HASH_LENGTH + 4 };
+    uint8_t buffer[SIGN_TX_INPUTS_BATCH_MAX * UTXO_SIZE];
+    ASSERT(count >= 1 && count <= SIGN_TX_INPUTS_BATCH_MAX);
+    for (uint32_t k = 0; k < count; k++) {
+        const uint32_t index = firstIndex + k;
+        uint8_t* utxo = buffer + k * UTXO_SIZE;
+        for (size_t i = 0; i < TX_HASH_LENGTH; i++) {
+            utxo[i] = (uint8_t) (index * 31 + i);
+        }
+        put_u4(utxo + TX_HASH_LENGTH, index);
+    }
+    const uint8_t p2 = count > 1 ? P2_INPUTS_BATCH : 0x00;
+    stream_add(stream, 0x02, p2, buffer, count * UTXO_SIZE);
+}
+
+static void addOutput(apdu_stream_t* stream, uint32_t index, uint32_t datumSize) {
+    uint8_t buffer[UINT8_MAX];
+    uint8_t* p = buffer;
+    p = put_u1(p, MAP_BABBAGE);
+    p = put_u1(p, DESTINATION_THIRD_PARTY);
+    p = put_u4(p, sizeof(ADDRESS));
+    memcpy(p, ADDRESS, sizeof(ADDRESS));
+    p += sizeof(ADDRESS);
+    p = put_u8(p, 1000000 + index);
+    p = put_u4(p, 0);  // asset groups
+    p = put_u1(p, datumSize > 0 ? ITEM_INCLUDED_YES : ITEM_INCLUDED_NO);
+    p = put_u1(p, ITEM_INCLUDED_NO);  // reference script
+    stream_add(stream, 0x03, 0x30, buffer, p - buffer);
+
+    if (datumSize > 0) {
+        uint8_t chunk[MAX_CHUNK_SIZE];
+        memset(chunk, 0x42, sizeof(chunk));
+
+        // the first chunk comes with the datum header, the others separately
+        uint32_t remaining = datumSize;
+        uint32_t chunkSize = remaining < MAX_CHUNK_SIZE ? remaining : MAX_CHUNK_SIZE;
+        p = buffer;
+        p = put_u1(p, DATUM_INLINE);
+        p = put_u4(p, datumSize);
+        p = put_u4(p, chunkSize);
+        memcpy(p, chunk, chunkSize);
+        p += chunkSize;
+        stream_add(stream, 0x03, 0x34, buffer, p - buffer);
+        remaining -= chunkSize;
+
+        while (remaining > 0) {
+            chunkSize = remaining < MAX_CHUNK_SIZE ? remaining : MAX_CHUNK_SIZE;
+            p = put_u4(buffer, chunkSize);
+            memcpy(p, chunk, chunkSize);
+            p += chunkSize;
+            stream_add(stream, 0x03, 0x35, buffer, p - buffer);
+            remaining -= chunkSize;
+        }
+    }
+
+    stream_add(stream, 0x03, 0x33, NULL, 0);
+}
+
+static void buildSyntheticTx(apdu_stream_t* stream, const synthetic_tx_t* tx) {
+    addInit(stream, tx);
+    for (uint32_t i = 0; i < tx->numInputs; i += tx->inputsPerApdu) {
+        const uint32_t remaining = tx->numInputs - i;
+        addInputs(stream, i, remaining < tx->inputsPerApdu ? remaining : tx->inputsPerApdu);
+    }
+    for (uint32_t i = 0; i < tx->numOutputs; i++) {
+        addOutput(stream, i, tx->datumSize);
+    }
+
+    uint8_t fee[8];
+    put_u8(fee, 170000);
+    stream_add(stream, 0x04, 0x00, fee, sizeof(fee));
+
+    stream_add(stream, 0x0a, 0x00, NULL, 0);
+
+    // 1852'/1815'/0'/0/0
+    uint8_t witness[1 + 5 * 4];
+    uint8_t* p = put_u1(witness, 5);
+    p = put_u4(p, HARDENED_BIP32 + 1852);
+    p = put_u4(p, HARDENED_BIP32 + 1815);
+    p = put_u4(p, HARDENED_BIP32 + 0);
+    p = put_u4(p, 0);
+    put_u4(p, 0);
+    stream_add(stream, 0x0f, 0x00, witness, sizeof(witness));
+}
+
+static const synthetic_tx_t SYNTHETIC_TXS[] = {
+    {"synthetic: 10000 inputs", 10000, 1, 0, 1},
+    {"synthetic: 10000 inputs, batched", 10000, 1, 0, SIGN_TX_INPUTS_BATCH_MAX},
+    {"synthetic: 5000 outputs", 1, 5000, 0, 1},
+    {"synthetic: 200 outputs, 16 kB datums", 1, 200, 16384, 1},
+};
+
+int main(int argc, char** argv) {
+    int result = 0;
+
+    if (argc > 1) {
+        stats_reset();
+        for (int i = 1; i < argc; i++) {
+            if (!replayFile(argv[i])) {
+                result = 1;
+            }
+        }
+        report("corpus");
+    }
+
+    for (size_t i = 0; i < ARRAY_LEN(SYNTHETIC_TXS); i++) {
+        apdu_stream_t stream = {0};
+        BEGIN_TRY {
+            TRY {
+                buildSyntheticTx(&stream, &SYNTHETIC_TXS[i]);
+            }
+            CATCH_ALL {
+                printf("building %s failed\n", SYNTHETIC_TXS[i].name);
+                result = 1;
+            }
+            FINALLY {
+            }
+        }
+        END_TRY;
+
+        stats_reset();
+        replay(stream.data, stream.size);
+        report(SYNTHETIC_TXS[i].name);
+        free(stream.data);
+    }
+
+    return result;
+}
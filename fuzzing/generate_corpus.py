@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""
+Generates fuzzing seeds from the ragger test vectors in tests/input_files.
+
+Every test vector is serialized offline (no device needed) with the tests CommandBuilder,
+sending the same APDU sequence as the corresponding test, into the harness input format:
+repeated [ins, p1, p2, lc, data...], i.e. the APDUs without CLA.
+
+Identical seeds are dropped. If the harnesses are built (see README.md), the seeds are
+additionally minimized by coverage with libFuzzer merge: only the seeds adding coverage are kept.
+
+Usage:
+    python3 generate_corpus.py [--out generated_corpus] [--build build]
+
+Needs the tests requirements (tests/requirements.txt).
+"""
+
+import argparse
+import hashlib
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable, Dict, List
+
+TESTS_PATH = Path(__file__).resolve().parent.parent / "tests"
+sys.path.insert(0, str(TESTS_PATH))
+
+# pylint: disable=wrong-import-position
+from application_client.command_builder import CommandBuilder, P1Type, P2Type
+
+from input_files.cvote import cvoteTestCases, CVoteTestCase
+from input_files.derive_address import byronTestCases as addressByronTestCases
+from input_files.derive_address import shelleyTestCasesNoConfirm, shelleyTestCasesWithConfirm
+from input_files.derive_address import rejectTestCases as addressRejectTestCases
+from input_files.derive_address import DeriveAddressTestCase
+from input_files.derive_native_script import ValidNativeScriptTestCases, InvalidScriptTestCases
+from input_files.derive_native_script import ValidNativeScriptTestCase, NativeScript, NativeScriptType
+from input_files.pubkey import byronTestCases as pubkeyByronTestCases
+from input_files.pubkey import testsShelleyUsual, testsShelleyUnusual, testsColdKeys, testsCVoteKeys
+from input_files.pubkey import rejectTestCases as pubkeyRejectTestCases
+from input_files.pubkey import PubKeyTestCase
+from input_files.signMsg import signMsgTestCases, SignMsgTestCase
+from input_files.signOpCert import opCertTestCases, OpCertTestCase
+from input_files import signTx as signTxInputs
+from input_files.signTx import MAX_SIGN_TX_CHUNK_SIZE, SignTxTestCase, TxOutput, TxOutputBabbage, Certificate
+from input_files.signTx import AssetGroup, CertificateType, DatumType, TxAuxiliaryDataType
+
+# the tests decide which paths need a witness, the seeds must follow them
+from test_signTx import _gatherWitnessPaths
+
+
+def _toHarness(apdus: List[bytes]) -> bytes:
+    """Serializes APDUs into the harness input format
+
+    Args:
+        apdus (List[bytes]): APDUs as built by CommandBuilder
+
+    Returns:
+        Harness input
+    """
+
+    return b"".join(bytes(apdu[1:]) for apdu in apdus)
+
+
+def _chunks(builder: CommandBuilder, p2: P2Type, dataHex: str) -> List[bytes]:
+    """Chunks following the first one sent in the datum / reference script APDU"""
+
+    apdus = []
+    payload = dataHex[MAX_SIGN_TX_CHUNK_SIZE * 2:]
+    while len(payload) > 0:
+        apdus.append(builder.sign_tx_outputs_chunk(p2, payload[:MAX_SIGN_TX_CHUNK_SIZE * 2]))
+        payload = payload[MAX_SIGN_TX_CHUNK_SIZE * 2:]
+    return apdus
+
+
+def _tokenBundle(builder: CommandBuilder, p1: P1Type, assetGroups: List[AssetGroup]) -> List[bytes]:
+    apdus = []
+    for assetGroup in assetGroups:
+        apdus.append(builder.sign_tx_asset_group(p1, assetGroup))
+        for token in assetGroup.tokens:
+            apdus.append(builder.sign_tx_token(p1, token))
+    return apdus
+
+
+def _signTxOutput(builder: CommandBuilder, txOutput: TxOutput) -> List[bytes]:
+    apdus = [builder.sign_tx_outputs_basic(txOutput)]
+    apdus += _tokenBundle(builder, P1Type.P1_OUTPUTS, txOutput.tokenBundle)
+    if txOutput.datum is not None:
+        apdus.append(builder.sign_tx_outputs_datum(txOutput.datum))
+        if txOutput.datum.type == DatumType.INLINE:
+            apdus += _chunks(builder, P2Type.P2_DATUM_CHUNK, txOutput.datum.datumHex)
+    if isinstance(txOutput, TxOutputBabbage) and txOutput.referenceScriptHex is not None:
+        apdus.append(builder.sign_tx_outputs_ref_script(txOutput.referenceScriptHex))
+        apdus += _chunks(builder, P2Type.P2_SCRIPT_CHUNK, txOutput.referenceScriptHex)
+    apdus.append(builder.sign_tx_outputs_confirm())
+    return apdus
+
+
+def _signTxCertificate(builder: CommandBuilder, certificate: Certificate) -> List[bytes]:
+    apdus = [builder.sign_tx_certificate(certificate)]
+    if certificate.type == CertificateType.STAKE_POOL_REGISTRATION:
+        pool = certificate.params
+        apdus.append(builder.sign_tx_cert_pool_reg_init(pool))
+        apdus.append(builder.sign_tx_cert_pool_reg_pool_key(pool.poolKey))
+        apdus.append(builder.sign_tx_cert_pool_reg_vrf(pool.vrfKeyHashHex))
+        apdus.append(builder.sign_tx_cert_pool_reg_financials(pool))
+        apdus.append(builder.sign_tx_cert_pool_reg_reward(pool.rewardAccount))
+        apdus += [builder.sign_tx_cert_pool_reg_owner(owner) for owner in pool.poolOwners]
+        apdus += [builder.sign_tx_cert_pool_reg_relay(relay) for relay in pool.relays]
+        apdus.append(builder.sign_tx_cert_pool_reg_metadata(pool.metadata))
+        apdus.append(builder.sign_tx_cert_pool_reg_confirm())
+    return apdus
+
+
+def signTxSeed(builder: CommandBuilder, testCase: SignTxTestCase) -> List[bytes]:
+    """APDU sequence of a transaction, in the order of tests/test_signTx.py
+
+    Args:
+        builder (CommandBuilder): The command builder
+        testCase (SignTxTestCase): The test case
+
+    Returns:
+        List of APDUs
+    """
+
+    tx = testCase.tx
+    witnessPaths = _gatherWitnessPaths(testCase)
+
+    apdus = [builder.sign_tx_init(testCase, len(witnessPaths))]
+
+    if tx.auxiliaryData is not None:
+        apdus.append(builder.sign_tx_aux_data_serialize(tx.auxiliaryData))
+        if tx.auxiliaryData.type == TxAuxiliaryDataType.CIP36_REGISTRATION:
+            params = tx.auxiliaryData.params
+            apdus.append(builder.sign_tx_aux_data_init(params))
+            if params.voteKey:
+                apdus.append(builder.sign_tx_aux_data_vote_key(params))
+            elif params.delegations:
+                apdus += [builder.sign_tx_aux_data_delegation(delegation) for delegation in params.delegations]
+            apdus.append(builder.sign_tx_aux_data_staking(params))
+            apdus.append(builder.sign_tx_aux_data_payment(params))
+            apdus.append(builder.sign_tx_aux_data_nonce(params))
+            apdus.append(builder.sign_tx_aux_data_voting_purpose(params))
+            apdus.append(builder.sign_tx_aux_data_confirm())
+
+    apdus += [builder.sign_tx_inputs(txInput) for txInput in tx.inputs]
+    for txOutput in tx.outputs:
+        apdus += _signTxOutput(builder, txOutput)
+
+    apdus.append(builder.sign_tx_fee(testCase))
+    if tx.ttl is not None:
+        apdus.append(builder.sign_tx_ttl(testCase))
+    for certificate in tx.certificates:
+        apdus += _signTxCertificate(builder, certificate)
+    apdus += [builder.sign_tx_withdrawal(withdrawal) for withdrawal in tx.withdrawals]
+    if tx.validityIntervalStart is not None:
+        apdus.append(builder.sign_tx_validity(tx.validityIntervalStart))
+    if len(tx.mint) > 0:
+        apdus.append(builder.sign_tx_mint_init(len(tx.mint)))
+        apdus += _tokenBundle(builder, P1Type.P1_MINT, tx.mint)
+        apdus.append(builder.sign_tx_mint_confirm())
+    if tx.scriptDataHash is not None:
+        apdus.append(builder.sign_tx_script_data_hash(tx.scriptDataHash))
+    apdus += [builder.sign_tx_collateral_inputs(txInput) for txInput in tx.collateralInputs]
+    apdus += [builder.sign_tx_required_signers(signer) for signer in tx.requiredSigners]
+    if tx.collateralOutput is not None:
+        apdus.append(builder.sign_tx_collateral_output_basic(tx.collateralOutput))
+        apdus += _tokenBundle(builder, P1Type.P1_COLLATERAL_OUTPUT, tx.collateralOutput.tokenBundle)
+        apdus.append(builder.sign_tx_collateral_output_confirm())
+    if tx.totalCollateral:
+        apdus.append(builder.sign_tx_total_collateral(tx.totalCollateral))
+    apdus += [builder.sign_tx_reference_inputs(txInput) for txInput in tx.referenceInputs]
+    apdus += [builder.sign_tx_voting_procedure(votingProcedure) for votingProcedure in tx.votingProcedures]
+    if tx.treasury is not None:
+        apdus.append(builder.sign_tx_treasury(tx.treasury))
+    if tx.donation is not None:
+        apdus.append(builder.sign_tx_donation(tx.donation))
+
+    apdus.append(builder.sign_tx_confirm())
+    apdus += [builder.sign_tx_witness(path) for path in witnessPaths]
+    return apdus
+
+
+def _nativeScript(builder: CommandBuilder, script: NativeScript) -> List[bytes]:
+    if script.type in (NativeScriptType.ALL, NativeScriptType.ANY, NativeScriptType.N_OF_K):
+        apdus = [builder.derive_script_add_complex(script)]
+        for subscript in script.params.scripts:
+            apdus += _nativeScript(builder, subscript)
+        return apdus
+    return [builder.derive_script_add_simple(script)]
+
+
+def nativeScriptSeed(builder: CommandBuilder, testCase: ValidNativeScriptTestCase) -> List[bytes]:
+    return _nativeScript(builder, testCase.script) + [builder.derive_script_finish(testCase.displayFormat)]
+
+
+def cvoteSeed(builder: CommandBuilder, testCase: CVoteTestCase) -> List[bytes]:
+    return [builder.sign_cip36_init(testCase)] + \
+           builder.sign_cip36_chunk(testCase) + \
+           [builder.sign_cip36_confirm(), builder.sign_cip36_witness(testCase)]
+
+
+def signMsgSeed(builder: CommandBuilder, testCase: SignMsgTestCase) -> List[bytes]:
+    return [builder.sign_msg_init(testCase)] + builder.sign_msg_chunk(testCase) + [builder.sign_msg_confirm()]
+
+
+def opCertSeed(builder: CommandBuilder, testCase: OpCertTestCase) -> List[bytes]:
+    return [builder.sign_opCert(testCase)]
+
+
+def pubkeySeed(builder: CommandBuilder, testCases: List[PubKeyTestCase]) -> List[bytes]:
+    """Several keys in one call, as in test_pubkey_several (a single key when given one test case)"""
+
+    apdus = [builder.get_pubkey(P1Type.P1_KEY_INIT, testCases[0].path, len(testCases) - 1)]
+    apdus += [builder.get_pubkey(P1Type.P1_KEY_NEXT, testCase.path) for testCase in testCases[1:]]
+    return apdus
+
+
+def deriveAddressSeeds(builder: CommandBuilder, testCase: DeriveAddressTestCase) -> List[List[bytes]]:
+    return [[builder.derive_address(p1, testCase)] for p1 in (P1Type.P1_RETURN, P1Type.P1_DISPLAY)]
+
+
+def _signTxTestCases() -> List[SignTxTestCase]:
+    """All transactions of the test vectors, including the rejected ones"""
+
+    testCases = []
+    for value in vars(signTxInputs).values():
+        if isinstance(value, list) and len(value) > 0 and all(isinstance(t, SignTxTestCase) for t in value):
+            testCases += value
+    return testCases
+
+
+def collectSeeds(builder: CommandBuilder) -> Dict[str, List[bytes]]:
+    """Builds the seeds of all test vectors
+
+    Args:
+        builder (CommandBuilder): The command builder
+
+    Returns:
+        Seeds (harness inputs) per harness name
+    """
+
+    pubkeyTestCases = pubkeyByronTestCases + testsShelleyUsual + testsShelleyUnusual + \
+                      testsColdKeys + testsCVoteKeys + pubkeyRejectTestCases
+    addressTestCases = addressByronTestCases + shelleyTestCasesNoConfirm + \
+                       shelleyTestCasesWithConfirm + addressRejectTestCases
+
+    generators: Dict[str, Callable[[], List[List[bytes]]]] = {
+        "signTx_harness": lambda: [signTxSeed(builder, t) for t in _signTxTestCases()],
+        "deriveNativeScriptHash_harness": lambda: [nativeScriptSeed(builder, t)
+                                                   for t in ValidNativeScriptTestCases + InvalidScriptTestCases],
+        "signCVote_harness": lambda: [cvoteSeed(builder, t) for t in cvoteTestCases],
+        "signMsg_harness": lambda: [signMsgSeed(builder, t) for t in signMsgTestCases],
+        "signOpCert_harness": lambda: [opCertSeed(builder, t) for t in opCertTestCases],
+        "getPublicKeys_harness": lambda: [pubkeySeed(builder, [t]) for t in pubkeyTestCases] + \
+                                         [pubkeySeed(builder, pubkeyTestCases)],
+        "deriveAddress_harness": lambda: [seed for t in addressTestCases for seed in deriveAddressSeeds(builder, t)],
+    }
+
+    seeds: Dict[str, List[bytes]] = {}
+    for harness, generate in generators.items():
+        seeds[harness] = []
+        for apdus in generate():
+            try:
+                seeds[harness].append(_toHarness(apdus))
+            except (AssertionError, ValueError) as e:
+                # some reject test vectors cannot even be serialized, skip them
+                print(f"{harness}: skipping a test vector ({e!r})")
+    # all_harness dispatches by instruction, it takes everything
+    seeds["all_harness"] = [seed for harnessSeeds in seeds.values() for seed in harnessSeeds]
+    return seeds
+
+
+def writeSeeds(directory: Path, seeds: List[bytes]) -> int:
+    """Writes the seeds, named by content hash (as libFuzzer does), dropping duplicates
+
+    Args:
+        directory (Path): Output directory
+        seeds (List[bytes]): Harness inputs
+
+    Returns:
+        Number of unique seeds
+    """
+
+    directory.mkdir(parents=True, exist_ok=True)
+    names = set()
+    for seed in seeds:
+        name = hashlib.sha1(seed).hexdigest()
+        if name not in names:
+            names.add(name)
+            (directory / name).write_bytes(seed)
+    return len(names)
+
+
+def minimize(harnessPath: Path, rawDir: Path, outDir: Path) -> None:
+    """Keeps only the seeds adding coverage, using libFuzzer merge
+
+    Args:
+        harnessPath (Path): The built harness
+        rawDir (Path): All seeds
+        outDir (Path): Minimized seeds (must be empty)
+    """
+
+    outDir.mkdir(parents=True, exist_ok=True)
+    subprocess.run([str(harnessPath), "-merge=1", str(outDir), str(rawDir)],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def main() -> None:
+    fuzzingPath = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Generates fuzzing seeds from the test vectors")
+    parser.add_argument("--out", type=Path, default=fuzzingPath / "generated_corpus",
+                        help="output directory, one subdirectory per harness (replaced)")
+    parser.add_argument("--build", type=Path, default=None,
+                        help="build directory with the harnesses, enables minimization by coverage")
+    args = parser.parse_args()
+
+    seeds = collectSeeds(CommandBuilder())
+
+    shutil.rmtree(args.out, ignore_errors=True)
+    with tempfile.TemporaryDirectory() as tmp:
+        for harness, harnessSeeds in seeds.items():
+            rawDir = Path(tmp) / harness
+            unique = writeSeeds(rawDir, harnessSeeds)
+            outDir = args.out / harness
+            harnessPath = args.build / harness if args.build is not None else None
+            if harnessPath is not None and harnessPath.exists():
+                minimize(harnessPath, rawDir, outDir)
+            else:
+                shutil.copytree(rawDir, outDir)
+            kept = len(list(outDir.iterdir()))
+            print(f"{harness}: {len(harnessSeeds)} test vectors, {unique} unique, {kept} kept")
+
+
+if __name__ == "__main__":
+    main()
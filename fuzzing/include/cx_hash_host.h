@@ -0,0 +1,35 @@
+#ifndef H_CARDANO_APP_CX_HASH_HOST
+#define H_CARDANO_APP_CX_HASH_HOST
+
+#include <stddef.h>
+#include <stdint.h>
+
+// Statistics of the host implementation of the firmware hashing api.
+typedef struct {
+    uint64_t updates;  // calls to cx_hash_no_throw with data
+    uint64_t bytes;    // bytes hashed
+    uint64_t cycles;   // cycles spent in cx_hash_no_throw
+} host_hash_stats_t;
+
+extern host_hash_stats_t host_hash_stats;
+
+// SHA-512 for the host Ed25519 implementation (cx_eddsa_host.c), not counted in the statistics
+typedef struct {
+    uint64_t h[8];
+    uint64_t length;  // bytes hashed
+    uint8_t buf[128];
+    size_t bufLen;
+} host_sha512_t;
+
+void host_sha512_init(host_sha512_t* s);
+void host_sha512_update(host_sha512_t* s, const uint8_t* in, size_t len);
+void host_sha512_final(host_sha512_t* s, uint8_t out[static 64]);
+
+// HMAC-SHA256, the OS derives the master chain code with it
+void host_hmac_sha256(const uint8_t* key,
+                      size_t keyLen,
+                      const uint8_t* in,
+                      size_t len,
+                      uint8_t mac[static 32]);
+
+#endif  // H_CARDANO_APP_CX_HASH_HOST
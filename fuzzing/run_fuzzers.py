@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Runs all the fuzzing harnesses in parallel.
+
+Each harness runs in libFuzzer fork mode (in-process fuzzing, several worker processes
+per harness) on its own persistent corpus, shared by its workers and kept between runs,
+seeded with ./corpus and the seeds from generate_corpus.py. The available cores are split
+between the harnesses and the memory of every worker is capped. At the end, the corpus of
+every harness is merged (minimized by coverage).
+
+Coverage, features, corpus size and exec/s are sampled from the libFuzzer output
+and written to <workdir>/report.csv, crashes go to <workdir>/artifacts/<harness>.
+
+Usage:
+    python3 run_fuzzers.py --sdk /path/to/sdk --time 3600
+    python3 run_fuzzers.py --build build --time 600 --harness signTx_harness
+"""
+
+import argparse
+import csv
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+FUZZING_PATH = Path(__file__).resolve().parent
+
+# libFuzzer status lines, e.g.
+#   #65536  pulse  cov: 1320 ft: 4187 corp: 233/14Kb lim: 4 exec/s: 21845 rss: 71Mb
+#   #1024: cov: 1320 ft: 4187 corp: 233 exec/s 2048 oom/timeout/crash: 0/0/0 time: 42s job: 7 dft_time: 0
+STATUS_RE = re.compile(r"^#(\d+):?\s.*?cov: (\d+) ft: (\d+) corp: (\d+)\S*.*?exec/s:? (\d+)")
+
+
+@dataclass
+class HarnessRun:
+    name: str
+    process: Optional[subprocess.Popen] = None
+    samples: List[Dict[str, int]] = field(default_factory=list)
+    crashes: int = 0
+
+
+def harnessNames() -> List[str]:
+    return sorted(path.stem for path in (FUZZING_PATH / "src").glob("*_harness.c"))
+
+
+def build(sdk: Path, buildDir: Path) -> None:
+    """Configures and builds all harnesses with clang
+
+    Args:
+        sdk (Path): Path to the SDK
+        buildDir (Path): Build directory
+    """
+
+    subprocess.run(["cmake", f"-DBOLOS_SDK={sdk}", "-DCMAKE_C_COMPILER=clang",
+                    f"-B{buildDir}", f"-H{FUZZING_PATH}"], check=True)
+    subprocess.run(["make", "-C", str(buildDir), f"-j{os.cpu_count()}"], check=True)
+
+
+def _watch(run: HarnessRun, startTime: float, log: Path) -> None:
+    """Collects the status lines of a running harness, keeps its full output in a log"""
+
+    assert run.process is not None and run.process.stderr is not None
+    with log.open("w") as logFile:
+        for line in run.process.stderr:
+            logFile.write(line)
+            if "ERROR: libFuzzer" in line or "ERROR: AddressSanitizer" in line:
+                run.crashes += 1
+            match = STATUS_RE.match(line)
+            if match:
+                execs, cov, ft, corp, execsPerSec = (int(g) for g in match.groups())
+                run.samples.append({
+                    "time": int(time.monotonic() - startTime),
+                    "execs": execs,
+                    "cov": cov,
+                    "ft": ft,
+                    "corpus": corp,
+                    "exec_s": execsPerSec,
+                })
+
+
+@contextmanager
+def start(binary: Path, run: HarnessRun, workDir: Path, seedDirs: List[Path],
+          workers: int, maxTime: int, rssLimitMb: int) -> Iterator[None]:
+    """Starts a harness in fork mode, terminated when leaving the context if still running
+
+    Args:
+        binary (Path): The harness
+        run (HarnessRun): Run data, filled in while running
+        workDir (Path): Working directory
+        seedDirs (List[Path]): Additional (read-only) seed directories
+        workers (int): Number of worker processes
+        maxTime (int): Fuzzing time in seconds
+        rssLimitMb (int): Memory limit of every worker
+    """
+
+    corpus = workDir / "corpus" / run.name
+    artifacts = workDir / "artifacts" / run.name
+    corpus.mkdir(parents=True, exist_ok=True)
+    artifacts.mkdir(parents=True, exist_ok=True)
+
+    # new inputs are saved to the first corpus directory only
+    cmd = [str(binary),
+           f"-fork={workers}",
+           "-ignore_crashes=1",
+           "-ignore_ooms=1",
+           "-ignore_timeouts=1",
+           f"-max_total_time={maxTime}",
+           f"-rss_limit_mb={rssLimitMb}",
+           f"-malloc_limit_mb={rssLimitMb}",
+           f"-artifact_prefix={artifacts}/",
+           "-print_final_stats=1",
+           str(corpus)] + [str(d) for d in seedDirs if d.is_dir()]
+    with subprocess.Popen(cmd, cwd=workDir, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True) as process:
+        run.process = process
+        thread = threading.Thread(target=_watch, args=(run, time.monotonic(), workDir / f"{run.name}.log"))
+        thread.start()
+        try:
+            yield
+        finally:
+            # no-op if already finished, the remaining output is collected before waiting for the process
+            process.terminate()
+            thread.join()
+
+
+def merge(binary: Path, corpus: Path, rssLimitMb: int) -> None:
+    """Minimizes a corpus by coverage (libFuzzer merge)
+
+    Args:
+        binary (Path): The harness
+        corpus (Path): Corpus directory, replaced by the merged one
+        rssLimitMb (int): Memory limit
+    """
+
+    merged = corpus.with_name(corpus.name + ".merged")
+    shutil.rmtree(merged, ignore_errors=True)
+    merged.mkdir()
+    subprocess.run([str(binary), "-merge=1", f"-rss_limit_mb={rssLimitMb}", str(merged), str(corpus)],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    shutil.rmtree(corpus)
+    merged.rename(corpus)
+
+
+def writeReport(runs: List[HarnessRun], path: Path) -> None:
+    with path.open("w", newline="") as reportFile:
+        writer = csv.writer(reportFile)
+        writer.writerow(["harness", "time", "execs", "cov", "ft", "corpus", "exec_s"])
+        for run in runs:
+            for sample in run.samples:
+                writer.writerow([run.name, sample["time"], sample["execs"], sample["cov"],
+                                 sample["ft"], sample["corpus"], sample["exec_s"]])
+
+
+def printSummary(runs: List[HarnessRun], workDir: Path) -> None:
+    print(f"{'harness':32} {'execs':>12} {'exec/s':>10} {'cov':>8} {'ft':>8} {'corpus':>8} {'crashes':>8}")
+    for run in runs:
+        last = run.samples[-1] if run.samples else {"execs": 0, "cov": 0, "ft": 0}
+        elapsed = max(1, last.get("time", 0))
+        corpusSize = len(list((workDir / "corpus" / run.name).iterdir()))
+        print(f"{run.name:32} {last['execs']:>12} {last['execs'] // elapsed:>10} {last['cov']:>8} "
+              f"{last['ft']:>8} {corpusSize:>8} {run.crashes:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Runs the fuzzing harnesses in parallel")
+    parser.add_argument("--sdk", type=Path, default=None, help="SDK path, (re)builds the harnesses first")
+    parser.add_argument("--build", type=Path, default=FUZZING_PATH / "build", help="build directory")
+    parser.add_argument("--workdir", type=Path, default=FUZZING_PATH / "out",
+                        help="corpora (kept between runs), artifacts, logs and report")
+    parser.add_argument("--harness", action="append", choices=harnessNames(),
+                        help="harness to run (repeatable), all by default")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="total number of workers")
+    parser.add_argument("--time", type=int, default=3600, help="fuzzing time in seconds")
+    parser.add_argument("--rss-limit-mb", type=int, default=2048, help="memory limit of every worker")
+    parser.add_argument("--no-merge", action="store_true", help="skip the final corpus merge")
+    args = parser.parse_args()
+
+    if args.sdk is not None:
+        build(args.sdk, args.build)
+
+    names = args.harness or harnessNames()
+    workers = max(1, args.jobs // len(names))
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    seedDirs = [FUZZING_PATH / "corpus"]
+
+    runs = [HarnessRun(name) for name in names]
+    # the harnesses still running are terminated when leaving, on an error or an interrupt
+    with ExitStack() as stack:
+        for run in runs:
+            binary = args.build / run.name
+            if not binary.exists():
+                raise FileNotFoundError(f"{binary} not built, use --sdk")
+            generated = FUZZING_PATH / "generated_corpus" / run.name
+            stack.enter_context(start(binary.resolve(), run, args.workdir.resolve(), seedDirs + [generated],
+                                      workers, args.time, args.rss_limit_mb))
+        print(f"fuzzing {len(runs)} harnesses with {workers} workers each for {args.time}s")
+
+        try:
+            for run in runs:
+                assert run.process is not None
+                run.process.wait()
+        except KeyboardInterrupt:
+            print("interrupted, stopping the harnesses")
+
+    if not args.no_merge:
+        for run in runs:
+            merge((args.build / run.name).resolve(), args.workdir / "corpus" / run.name, args.rss_limit_mb)
+
+    writeReport(runs, args.workdir / "report.csv")
+    printSummary(runs, args.workdir)
+
+
+if __name__ == "__main__":
+    main()
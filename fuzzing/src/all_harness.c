@@ -28,12 +28,13 @@ int LLVMFuzzerTestOneInput(const uint8_t *data, size_t size) {
             return 0;
         }
 
-        cmd.data = malloc(cmd.lc);
+        input = malloc(cmd.lc);
         if (input == NULL) {
             return 0;
         }
 
         memcpy(input, data, cmd.lc);
+        cmd.data = input;
 
         data += cmd.lc;
         size -= cmd.lc;
@@ -0,0 +1,458 @@
+#include <cx.h>
+#include <os.h>
+#include <stddef.h>
+#include <string.h>
+
+#include "cx_hash_host.h"
+
+// Ed25519 (RFC 8032) on extended private keys and the BIP32-Ed25519 derivation of the OS
+// standing in for the firmware in the host builds, so that keys, addresses and witnesses
+// match a device seeded with the 12-word mnemonic "abandon" x 11 + "about".
+// The field and group arithmetic follows TweetNaCl: constant time is not a goal here.
+
+typedef int64_t gf[16];  // 16 limbs of 16 bits, little endian
+
+static const gf GF_ONE = {1};
+
+// 2 * d
+static const gf ED25519_D2 = {
+    0xf159, 0x26b2, 0x9b94, 0xebd6, 0xb156, 0x8283, 0x149a, 0x00e0,
+    0xd130, 0xeef3, 0x80f2, 0x198e, 0xfce7, 0x56df, 0xd9dc, 0x2406,
+};
+
+// base point
+static const gf ED25519_BX = {
+    0xd51a, 0x8f25, 0x2d60, 0xc956, 0xa7b2, 0x9525, 0xc760, 0x692c,
+    0xdc5c, 0xfdd6, 0xe231, 0xc0a4, 0x53fe, 0xcd6e, 0x36d3, 0x2169,
+};
+static const gf ED25519_BY = {
+    0x6658, 0x6666, 0x6666, 0x6666, 0x6666, 0x6666, 0x6666, 0x6666,
+    0x6666, 0x6666, 0x6666, 0x6666, 0x6666, 0x6666, 0x6666, 0x6666,
+};
+
+// order of the base point, little endian
+static const int64_t ED25519_L[32] = {
+    0xed, 0xd3, 0xf5, 0x5c, 0x1a, 0x63, 0x12, 0x58,
+    0xd6, 0x9c, 0xf7, 0xa2, 0xde, 0xf9, 0xde, 0x14,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00,
+    0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x10,
+};
+
+// BIP39 seed of "abandon" x 11 + "about" without passphrase
+static const uint8_t HOST_SEED[64] = {
+    0x5e, 0xb0, 0x0b, 0xbd, 0xdc, 0xf0, 0x69, 0x08, 0x48, 0x89, 0xa8, 0xab, 0x91, 0x55, 0x56, 0x81,
+    0x65, 0xf5, 0xc4, 0x53, 0xcc, 0xb8, 0x5e, 0x70, 0x81, 0x1a, 0xae, 0xd6, 0xf6, 0xda, 0x5f, 0xc1,
+    0x9a, 0x5a, 0xc4, 0x0b, 0x38, 0x9c, 0xd3, 0x70, 0xd0, 0x86, 0x20, 0x6d, 0xec, 0x8a, 0xa6, 0xc4,
+    0x3d, 0xae, 0xa6, 0x69, 0x0f, 0x20, 0xad, 0x3d, 0x8d, 0x48, 0xb2, 0xd2, 0xce, 0x9e, 0x38, 0xe4,
+};
+
+static const uint8_t ED25519_SEED_KEY[] = "ed25519 seed";
+
+static void gf_carry(gf o) {
+    for (int i = 0; i < 16; i++) {
+        o[i] += (int64_t) 1 << 16;
+        const int64_t c = o[i] >> 16;
+        if (i < 15) {
+            o[i + 1] += c - 1;
+        } else {
+            o[0] += 38 * (c - 1);
+        }
+        o[i] -= c * 65536;
+    }
+}
+
+// swaps p and q if b is 1
+static void gf_swap(gf p, gf q, int b) {
+    const int64_t mask = ~(int64_t) (b - 1);
+    for (int i = 0; i < 16; i++) {
+        const int64_t t = mask & (p[i] ^ q[i]);
+        p[i] ^= t;
+        q[i] ^= t;
+    }
+}
+
+static void gf_pack(uint8_t out[static 32], const gf n) {
+    gf m, t;
+    memcpy(t, n, sizeof(t));
+    gf_carry(t);
+    gf_carry(t);
+    gf_carry(t);
+    for (int j = 0; j < 2; j++) {
+        // subtract p = 2^255 - 19, keep the result if it does not borrow
+        m[0] = t[0] - 0xffed;
+        for (int i = 1; i < 15; i++) {
+            m[i] = t[i] - 0xffff - ((m[i - 1] >> 16) & 1);
+            m[i - 1] &= 0xffff;
+        }
+        m[15] = t[15] - 0x7fff - ((m[14] >> 16) & 1);
+        const int borrow = (int) ((m[15] >> 16) & 1);
+        m[14] &= 0xffff;
+        gf_swap(t, m, 1 - borrow);
+    }
+    for (int i = 0; i < 16; i++) {
+        out[2 * i] = (uint8_t) (t[i] & 0xff);
+        out[2 * i + 1] = (uint8_t) (t[i] >> 8);
+    }
+}
+
+static void gf_add(gf o, const gf a, const gf b) {
+    for (int i = 0; i < 16; i++) {
+        o[i] = a[i] + b[i];
+    }
+}
+
+static void gf_sub(gf o, const gf a, const gf b) {
+    for (int i = 0; i < 16; i++) {
+        o[i] = a[i] - b[i];
+    }
+}
+
+static void gf_mul(gf o, const gf a, const gf b) {
+    int64_t t[31] = {0};
+    for (int i = 0; i < 16; i++) {
+        for (int j = 0; j < 16; j++) {
+            t[i + j] += a[i] * b[j];
+        }
+    }
+    // 2^256 = 38 mod p
+    for (int i = 0; i < 15; i++) {
+        t[i] += 38 * t[i + 16];
+    }
+    memcpy(o, t, sizeof(gf));
+    gf_carry(o);
+    gf_carry(o);
+}
+
+// a^(p - 2)
+static void gf_invert(gf o, const gf a) {
+    gf c;
+    memcpy(c, a, sizeof(c));
+    for (int i = 253; i >= 0; i--) {
+        gf_mul(c, c, c);
+        if (i != 2 && i != 4) {
+            gf_mul(c, c, a);
+        }
+    }
+    memcpy(o, c, sizeof(c));
+}
+
+// extended coordinates (X, Y, Z, T) with x = X / Z, y = Y / Z, x * y = T / Z
+typedef gf point_t[4];
+
+static void point_add(point_t p, const point_t q) {
+    gf a, b, c, d, t, e, f, g, h;
+
+    gf_sub(a, p[1], p[0]);
+    gf_sub(t, q[1], q[0]);
+    gf_mul(a, a, t);
+    gf_add(b, p[0], p[1]);
+    gf_add(t, q[0], q[1]);
+    gf_mul(b, b, t);
+    gf_mul(c, p[3], q[3]);
+    gf_mul(c, c, ED25519_D2);
+    gf_mul(d, p[2], q[2]);
+    gf_add(d, d, d);
+    gf_sub(e, b, a);
+    gf_sub(f, d, c);
+    gf_add(g, d, c);
+    gf_add(h, b, a);
+
+    gf_mul(p[0], e, f);
+    gf_mul(p[1], h, g);
+    gf_mul(p[2], g, f);
+    gf_mul(p[3], e, h);
+}
+
+// p = s * B for a 256-bit little endian scalar s
+static void point_scalarmult_base(point_t p, const uint8_t s[static 32]) {
+    point_t q;
+
+    memcpy(q[0], ED25519_BX, sizeof(gf));
+    memcpy(q[1], ED25519_BY, sizeof(gf));
+    memcpy(q[2], GF_ONE, sizeof(gf));
+    gf_mul(q[3], ED25519_BX, ED25519_BY);
+
+    memset(p, 0, sizeof(point_t));
+    memcpy(p[1], GF_ONE, sizeof(gf));
+    memcpy(p[2], GF_ONE, sizeof(gf));
+
+    for (int i = 255; i >= 0; i--) {
+        const int b = (s[i / 8] >> (i % 8)) & 1;
+        for (int k = 0; k < 4; k++) {
+            gf_swap(p[k], q[k], b);
+        }
+        point_add(q, p);
+        point_add(p, p);
+        for (int k = 0; k < 4; k++) {
+            gf_swap(p[k], q[k], b);
+        }
+    }
+}
+
+// affine coordinates, little endian
+static void point_affine(uint8_t x[static 32], uint8_t y[static 32], const point_t p) {
+    gf zi, t;
+
+    gf_invert(zi, p[2]);
+    gf_mul(t, p[0], zi);
+    gf_pack(x, t);
+    gf_mul(t, p[1], zi);
+    gf_pack(y, t);
+}
+
+// compressed point: y little endian, the top bit is the parity of x
+static void point_compress(uint8_t out[static 32], const point_t p) {
+    uint8_t x[32];
+
+    point_affine(x, out, p);
+    out[31] ^= (uint8_t) ((x[0] & 1) << 7);
+}
+
+// r = x mod L for a number given as 64 signed limbs of 8 bits
+static void scalar_mod_l(uint8_t r[static 32], int64_t x[64]) {
+    int64_t carry;
+    int j;
+
+    for (int i = 63; i >= 32; i--) {
+        carry = 0;
+        for (j = i - 32; j < i - 12; j++) {
+            x[j] += carry - 16 * x[i] * ED25519_L[j - (i - 32)];
+            carry = (x[j] + 128) >> 8;
+            x[j] -= carry * 256;
+        }
+        x[j] += carry;
+        x[i] = 0;
+    }
+    carry = 0;
+    for (j = 0; j < 32; j++) {
+        x[j] += carry - (x[31] >> 4) * ED25519_L[j];
+        carry = x[j] >> 8;
+        x[j] &= 255;
+    }
+    for (j = 0; j < 32; j++) {
+        x[j] -= carry * ED25519_L[j];
+    }
+    for (int i = 0; i < 32; i++) {
+        x[i + 1] += x[i] >> 8;
+        r[i] = (uint8_t) (x[i] & 255);
+    }
+}
+
+// 64-byte little endian number mod L
+static void scalar_reduce(uint8_t r[static 32], const uint8_t h[static 64]) {
+    int64_t x[64];
+    for (int i = 0; i < 64; i++) {
+        x[i] = h[i];
+    }
+    scalar_mod_l(r, x);
+}
+
+static bool is_extended_ed25519_key(const cx_ecfp_private_key_t* pvkey) {
+    // the app passes cx_ecfp_256_extended_private_key_t (kL || kR) cast to the 32-byte key type
+    return pvkey->curve == CX_CURVE_Ed25519 && pvkey->d_len == 64;
+}
+
+cx_err_t cx_eddsa_get_public_key_no_throw(const cx_ecfp_private_key_t* pv_key,
+                                          cx_md_t hashID,
+                                          cx_ecfp_public_key_t* pu_key,
+                                          uint8_t* a,
+                                          size_t a_len,
+                                          uint8_t* h,
+                                          size_t h_len) {
+    if (!is_extended_ed25519_key(pv_key) || hashID != CX_SHA512) {
+        return CX_INVALID_PARAMETER;
+    }
+    const uint8_t* kl = ((const cx_ecfp_256_extended_private_key_t*) pv_key)->d;
+    point_t p;
+    uint8_t x[32], y[32];
+
+    point_scalarmult_base(p, kl);
+    point_affine(x, y, p);
+
+    // uncompressed point 04 || x || y, big endian
+    pu_key->curve = CX_CURVE_Ed25519;
+    pu_key->W_len = 65;
+    pu_key->W[0] = 0x04;
+    for (size_t i = 0; i < 32; i++) {
+        pu_key->W[1 + i] = x[31 - i];
+        pu_key->W[33 + i] = y[31 - i];
+    }
+    return CX_OK;
+}
+
+cx_err_t cx_eddsa_sign_no_throw(const cx_ecfp_private_key_t* pvkey,
+                                cx_md_t hashID,
+                                const uint8_t* hash,
+                                size_t hash_len,
+                                uint8_t* sig,
+                                size_t sig_len) {
+    if (!is_extended_ed25519_key(pvkey) || hashID != CX_SHA512 || sig_len < 64) {
+        return CX_INVALID_PARAMETER;
+    }
+    const uint8_t* kl = ((const cx_ecfp_256_extended_private_key_t*) pvkey)->d;
+    const uint8_t* kr = kl + 32;
+    host_sha512_t sha;
+    uint8_t digest[64], r[32], k[32], pubkey[32];
+    point_t p;
+    int64_t x[64] = {0};
+
+    point_scalarmult_base(p, kl);
+    point_compress(pubkey, p);
+
+    // r = H(kR || M) mod L, R = r * B
+    host_sha512_init(&sha);
+    host_sha512_update(&sha, kr, 32);
+    host_sha512_update(&sha, hash, hash_len);
+    host_sha512_final(&sha, digest);
+    scalar_reduce(r, digest);
+    point_scalarmult_base(p, r);
+    point_compress(sig, p);
+
+    // k = H(R || A || M) mod L, S = r + k * kL mod L
+    host_sha512_init(&sha);
+    host_sha512_update(&sha, sig, 32);
+    host_sha512_update(&sha, pubkey, sizeof(pubkey));
+    host_sha512_update(&sha, hash, hash_len);
+    host_sha512_final(&sha, digest);
+    scalar_reduce(k, digest);
+
+    for (int i = 0; i < 32; i++) {
+        x[i] = r[i];
+    }
+    for (int i = 0; i < 32; i++) {
+        for (int j = 0; j < 32; j++) {
+            x[i + j] += (int64_t) k[i] * kl[j];
+        }
+    }
+    scalar_mod_l(sig + 32, x);
+
+    explicit_bzero(digest, sizeof(digest));
+    explicit_bzero(r, sizeof(r));
+    explicit_bzero(x, sizeof(x));
+    return CX_OK;
+}
+
+static void hmac_sha512(const uint8_t key[static 32],
+                        const uint8_t* in,
+                        size_t len,
+                        uint8_t mac[static 64]) {
+    cx_hmac_sha512_t hmac;
+
+    if (cx_hmac_sha512_init_no_throw(&hmac, key, 32) != CX_OK ||
+        cx_hmac_no_throw((cx_hmac_t*) &hmac, CX_LAST, in, len, mac, 64) != CX_OK) {
+        THROW(EXCEPTION);
+    }
+    explicit_bzero(&hmac, sizeof(hmac));
+}
+
+// Master key of the seed, retrying while the third highest bit of kL is set
+static void derive_master_node(uint8_t key[static 64], uint8_t chain_code[static 32]) {
+    cx_hmac_sha512_t hmac;
+    uint8_t data[1 + sizeof(HOST_SEED)];
+
+    if (cx_hmac_sha512_init_no_throw(&hmac,
+                                     ED25519_SEED_KEY,
+                                     sizeof(ED25519_SEED_KEY) - 1) != CX_OK ||
+        cx_hmac_no_throw((cx_hmac_t*) &hmac,
+                         CX_LAST,
+                         HOST_SEED,
+                         sizeof(HOST_SEED),
+                         key,
+                         64) != CX_OK) {
+        THROW(EXCEPTION);
+    }
+    while (key[31] & 0x20) {
+        if (cx_hmac_sha512_init_no_throw(&hmac,
+                                         ED25519_SEED_KEY,
+                                         sizeof(ED25519_SEED_KEY) - 1) != CX_OK ||
+            cx_hmac_no_throw((cx_hmac_t*) &hmac, CX_LAST, key, 64, key, 64) != CX_OK) {
+            THROW(EXCEPTION);
+        }
+    }
+    key[0] &= 0xf8;
+    key[31] = (key[31] & 0x7f) | 0x40;
+
+    data[0] = 0x01;
+    memcpy(data + 1, HOST_SEED, sizeof(HOST_SEED));
+    host_hmac_sha256(ED25519_SEED_KEY, sizeof(ED25519_SEED_KEY) - 1, data, sizeof(data), chain_code);
+
+    explicit_bzero(&hmac, sizeof(hmac));
+}
+
+// Child node (Khovratovich-Law): kL' = kL + 8 * ZL[0..28), kR' = kR + ZR mod 2^256
+static void derive_child_node(uint8_t key[static 64], uint8_t chain_code[static 32], uint32_t index) {
+    uint8_t data[1 + 64 + 4];
+    size_t dataLen;
+    uint8_t z[64], next_chain_code[64];
+
+    if (index & 0x80000000u) {
+        data[0] = 0x00;
+        memcpy(data + 1, key, 64);
+        dataLen = 1 + 64 + 4;
+    } else {
+        point_t p;
+        data[0] = 0x02;
+        point_scalarmult_base(p, key);
+        point_compress(data + 1, p);
+        dataLen = 1 + 32 + 4;
+    }
+    for (size_t i = 0; i < 4; i++) {
+        data[dataLen - 4 + i] = (uint8_t) (index >> (8 * i));
+    }
+
+    hmac_sha512(chain_code, data, dataLen, z);
+    data[0] |= 0x01;
+    hmac_sha512(chain_code, data, dataLen, next_chain_code);
+
+    unsigned int carry = 0;
+    for (size_t i = 0; i < 32; i++) {
+        unsigned int zl8 = 0;
+        if (i < 28) {
+            zl8 |= (unsigned int) z[i] << 3;
+        }
+        if (i > 0 && i <= 28) {
+            zl8 |= z[i - 1] >> 5;
+        }
+        carry += key[i] + (zl8 & 0xff);
+        key[i] = (uint8_t) carry;
+        carry >>= 8;
+    }
+    carry = 0;
+    for (size_t i = 0; i < 32; i++) {
+        carry += key[32 + i] + z[32 + i];
+        key[32 + i] = (uint8_t) carry;
+        carry >>= 8;
+    }
+    memcpy(chain_code, next_chain_code + 32, 32);
+
+    explicit_bzero(data, sizeof(data));
+    explicit_bzero(z, sizeof(z));
+    explicit_bzero(next_chain_code, sizeof(next_chain_code));
+}
+
+void os_perso_derive_node_with_seed_key(unsigned int mode,
+                                        cx_curve_t curve,
+                                        const unsigned int* path,
+                                        unsigned int pathLength,
+                                        unsigned char* privateKey,
+                                        unsigned char* chain,
+                                        unsigned char* seed_key,
+                                        unsigned int seed_key_length) {
+    // only the derivation used by the app, from the device seed
+    if (mode != HDW_NORMAL || curve != CX_CURVE_Ed25519 || seed_key != NULL) {
+        THROW(EXCEPTION);
+    }
+    uint8_t key[64], chain_code[32];
+
+    derive_master_node(key, chain_code);
+    for (unsigned int i = 0; i < pathLength; i++) {
+        derive_child_node(key, chain_code, path[i]);
+    }
+
+    memcpy(privateKey, key, sizeof(key));
+    if (chain != NULL) {
+        memcpy(chain, chain_code, sizeof(chain_code));
+    }
+    explicit_bzero(key, sizeof(key));
+    explicit_bzero(chain_code, sizeof(chain_code));
+}
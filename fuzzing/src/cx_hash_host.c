@@ -0,0 +1,624 @@
+#include <cx.h>
+#include <stddef.h>
+#include <string.h>
+
+#include "benchUtils.h"
+#include "cx_hash_host.h"
+
+// Compact BLAKE2b (RFC 7693), SHA3 (FIPS 202), SHA-2 and HMAC standing in for the firmware
+// hashing api in the host builds, so that hashes match the device and the benchmarks pay
+// a realistic price for every hashed byte.
+// The host state is kept inside the memory of the SDK context structures.
+
+host_hash_stats_t host_hash_stats;
+
+enum {
+    HOST_HASH_BLAKE2B = 0xb1a2e2b0,
+    HOST_HASH_SHA3 = 0x5a3a5a30,
+    HOST_HMAC_SHA512 = 0x4a5c5120,
+
+    BLAKE2B_BLOCK_SIZE = 128,
+    SHA3_STATE_SIZE = 200,
+    SHA512_BLOCK_SIZE = 128,
+    SHA256_BLOCK_SIZE = 64,
+};
+
+typedef struct {
+    cx_hash_t header;
+    uint32_t kind;
+} host_hash_t;
+
+typedef struct {
+    cx_hash_t header;
+    uint32_t kind;
+    uint64_t h[8];
+    uint64_t t;
+    uint8_t buf[BLAKE2B_BLOCK_SIZE];
+    size_t bufLen;
+    size_t outLen;
+} host_blake2b_t;
+
+typedef struct {
+    cx_hash_t header;
+    uint32_t kind;
+    uint64_t a[25];
+    size_t rate;  // bytes absorbed per permutation
+    size_t pos;   // next byte of the rate to absorb
+    size_t outLen;
+} host_sha3_t;
+
+typedef struct {
+    uint32_t kind;
+    host_sha512_t inner;
+    uint8_t outerKey[SHA512_BLOCK_SIZE];  // key ^ opad
+} host_hmac_sha512_t;
+
+_Static_assert(sizeof(host_blake2b_t) <= sizeof(cx_blake2b_t), "host blake2b state too large");
+_Static_assert(sizeof(host_sha3_t) <= sizeof(cx_sha3_t), "host sha3 state too large");
+_Static_assert(sizeof(host_hmac_sha512_t) <= sizeof(cx_hmac_sha512_t), "host hmac state too large");
+
+static const uint64_t BLAKE2B_IV[8] = {
+    0x6a09e667f3bcc908,
+    0xbb67ae8584caa73b,
+    0x3c6ef372fe94f82b,
+    0xa54ff53a5f1d36f1,
+    0x510e527fade682d1,
+    0x9b05688c2b3e6c1f,
+    0x1f83d9abfb41bd6b,
+    0x5be0cd19137e2179,
+};
+
+static const uint8_t BLAKE2B_SIGMA[12][16] = {
+    {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15},
+    {14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3},
+    {11, 8, 12, 0, 5, 2, 15, 13, 10, 14, 3, 6, 7, 1, 9, 4},
+    {7, 9, 3, 1, 13, 12, 11, 14, 2, 6, 5, 10, 4, 0, 15, 8},
+    {9, 0, 5, 7, 2, 4, 10, 15, 14, 1, 11, 12, 6, 8, 3, 13},
+    {2, 12, 6, 10, 0, 11, 8, 3, 4, 13, 7, 5, 15, 14, 1, 9},
+    {12, 5, 1, 15, 14, 13, 4, 10, 0, 7, 6, 3, 9, 2, 8, 11},
+    {13, 11, 7, 14, 12, 1, 3, 9, 5, 0, 15, 4, 8, 6, 2, 10},
+    {6, 15, 14, 9, 11, 3, 0, 8, 12, 2, 13, 7, 1, 4, 10, 5},
+    {10, 2, 8, 4, 7, 6, 1, 5, 15, 11, 9, 14, 3, 12, 13, 0},
+    {0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15},
+    {14, 10, 4, 8, 9, 15, 13, 6, 1, 12, 0, 2, 11, 7, 5, 3},
+};
+
+static inline uint64_t rotr64(uint64_t x, unsigned n) {
+    return (x >> n) | (x << (64 - n));
+}
+
+static inline uint64_t rotl64(uint64_t x, unsigned n) {
+    return (x << n) | (x >> (64 - n));
+}
+
+static inline uint32_t rotr32(uint32_t x, unsigned n) {
+    return (x >> n) | (x << (32 - n));
+}
+
+static inline uint64_t load64le(const uint8_t* p) {
+    uint64_t v = 0;
+    for (int i = 7; i >= 0; i--) {
+        v = (v << 8) | p[i];
+    }
+    return v;
+}
+
+static inline uint64_t load64be(const uint8_t* p) {
+    uint64_t v = 0;
+    for (int i = 0; i < 8; i++) {
+        v = (v << 8) | p[i];
+    }
+    return v;
+}
+
+static inline uint32_t load32be(const uint8_t* p) {
+    return ((uint32_t) p[0] << 24) | ((uint32_t) p[1] << 16) | ((uint32_t) p[2] << 8) | p[3];
+}
+
+#define G(a, b, c, d, x, y)               \
+    do {                                  \
+        v[a] = v[a] + v[b] + (x);         \
+        v[d] = rotr64(v[d] ^ v[a], 32);   \
+        v[c] = v[c] + v[d];               \
+        v[b] = rotr64(v[b] ^ v[c], 24);   \
+        v[a] = v[a] + v[b] + (y);         \
+        v[d] = rotr64(v[d] ^ v[a], 16);   \
+        v[c] = v[c] + v[d];               \
+        v[b] = rotr64(v[b] ^ v[c], 63);   \
+    } while (0)
+
+static void blake2b_compress(host_blake2b_t* s, bool last) {
+    uint64_t v[16], m[16];
+    for (int i = 0; i < 16; i++) {
+        m[i] = load64le(s->buf + 8 * i);
+    }
+    for (int i = 0; i < 8; i++) {
+        v[i] = s->h[i];
+        v[i + 8] = BLAKE2B_IV[i];
+    }
+    v[12] ^= s->t;
+    if (last) {
+        v[14] = ~v[14];
+    }
+    for (int r = 0; r < 12; r++) {
+        const uint8_t* sigma = BLAKE2B_SIGMA[r];
+        G(0, 4, 8, 12, m[sigma[0]], m[sigma[1]]);
+        G(1, 5, 9, 13, m[sigma[2]], m[sigma[3]]);
+        G(2, 6, 10, 14, m[sigma[4]], m[sigma[5]]);
+        G(3, 7, 11, 15, m[sigma[6]], m[sigma[7]]);
+        G(0, 5, 10, 15, m[sigma[8]], m[sigma[9]]);
+        G(1, 6, 11, 12, m[sigma[10]], m[sigma[11]]);
+        G(2, 7, 8, 13, m[sigma[12]], m[sigma[13]]);
+        G(3, 4, 9, 14, m[sigma[14]], m[sigma[15]]);
+    }
+    for (int i = 0; i < 8; i++) {
+        s->h[i] ^= v[i] ^ v[i + 8];
+    }
+}
+
+#undef G
+
+static void blake2b_update(host_blake2b_t* s, const uint8_t* in, size_t len) {
+    while (len > 0) {
+        if (s->bufLen == BLAKE2B_BLOCK_SIZE) {
+            // the last block must be kept for finalization
+            s->t += BLAKE2B_BLOCK_SIZE;
+            blake2b_compress(s, false);
+            s->bufLen = 0;
+        }
+        size_t chunk = BLAKE2B_BLOCK_SIZE - s->bufLen;
+        if (chunk > len) {
+            chunk = len;
+        }
+        memcpy(s->buf + s->bufLen, in, chunk);
+        s->bufLen += chunk;
+        in += chunk;
+        len -= chunk;
+    }
+}
+
+static void blake2b_final(host_blake2b_t* s, uint8_t* out) {
+    s->t += s->bufLen;
+    memset(s->buf + s->bufLen, 0, BLAKE2B_BLOCK_SIZE - s->bufLen);
+    blake2b_compress(s, true);
+    for (size_t i = 0; i < s->outLen; i++) {
+        out[i] = (uint8_t) (s->h[i / 8] >> (8 * (i % 8)));
+    }
+}
+
+// SHA3 (FIPS 202), the Byron address root hashes a SHA3-256 digest
+static const uint64_t KECCAK_RC[24] = {
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808a, 0x8000000080008000,
+    0x000000000000808b, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008a, 0x0000000000000088, 0x0000000080008009, 0x000000008000000a,
+    0x000000008000808b, 0x800000000000008b, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800a, 0x800000008000000a,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+};
+
+// rotation offsets and lane permutation of the rho and pi steps, in the order of the walk
+static const uint8_t KECCAK_RHO[24] = {
+    1, 3, 6, 10, 15, 21, 28, 36, 45, 55, 2, 14, 27, 41, 56, 8, 25, 43, 62, 18, 39, 61, 20, 44,
+};
+
+static const uint8_t KECCAK_PI[24] = {
+    10, 7, 11, 17, 18, 3, 5, 16, 8, 21, 24, 4, 15, 23, 19, 13, 12, 2, 20, 14, 22, 9, 6, 1,
+};
+
+static void keccak_f1600(uint64_t a[25]) {
+    for (int r = 0; r < 24; r++) {
+        uint64_t c[5];
+        for (int x = 0; x < 5; x++) {
+            c[x] = a[x] ^ a[x + 5] ^ a[x + 10] ^ a[x + 15] ^ a[x + 20];
+        }
+        for (int x = 0; x < 5; x++) {
+            const uint64_t d = c[(x + 4) % 5] ^ rotl64(c[(x + 1) % 5], 1);
+            for (int y = 0; y < 25; y += 5) {
+                a[y + x] ^= d;
+            }
+        }
+        uint64_t lane = a[1];
+        for (int i = 0; i < 24; i++) {
+            const uint64_t next = a[KECCAK_PI[i]];
+            a[KECCAK_PI[i]] = rotl64(lane, KECCAK_RHO[i]);
+            lane = next;
+        }
+        for (int y = 0; y < 25; y += 5) {
+            for (int x = 0; x < 5; x++) {
+                c[x] = a[y + x];
+            }
+            for (int x = 0; x < 5; x++) {
+                a[y + x] = c[x] ^ (~c[(x + 1) % 5] & c[(x + 2) % 5]);
+            }
+        }
+        a[0] ^= KECCAK_RC[r];
+    }
+}
+
+static void sha3_absorb_byte(host_sha3_t* s, uint8_t byte) {
+    s->a[s->pos / 8] ^= (uint64_t) byte << (8 * (s->pos % 8));
+    if (++s->pos == s->rate) {
+        keccak_f1600(s->a);
+        s->pos = 0;
+    }
+}
+
+static void sha3_update(host_sha3_t* s, const uint8_t* in, size_t len) {
+    for (size_t i = 0; i < len; i++) {
+        sha3_absorb_byte(s, in[i]);
+    }
+}
+
+static void sha3_final(host_sha3_t* s, uint8_t* out) {
+    // domain separation bits 01 followed by the pad10*1 padding
+    s->a[s->pos / 8] ^= (uint64_t) 0x06 << (8 * (s->pos % 8));
+    s->a[(s->rate - 1) / 8] ^= (uint64_t) 0x80 << (8 * ((s->rate - 1) % 8));
+    keccak_f1600(s->a);
+    for (size_t i = 0; i < s->outLen; i++) {
+        out[i] = (uint8_t) (s->a[i / 8] >> (8 * (i % 8)));
+    }
+}
+
+// SHA-512 (FIPS 180-4), used by HMAC-SHA512 and Ed25519
+static const uint64_t SHA512_K[80] = {
+    0x428a2f98d728ae22, 0x7137449123ef65cd, 0xb5c0fbcfec4d3b2f, 0xe9b5dba58189dbbc,
+    0x3956c25bf348b538, 0x59f111f1b605d019, 0x923f82a4af194f9b, 0xab1c5ed5da6d8118,
+    0xd807aa98a3030242, 0x12835b0145706fbe, 0x243185be4ee4b28c, 0x550c7dc3d5ffb4e2,
+    0x72be5d74f27b896f, 0x80deb1fe3b1696b1, 0x9bdc06a725c71235, 0xc19bf174cf692694,
+    0xe49b69c19ef14ad2, 0xefbe4786384f25e3, 0x0fc19dc68b8cd5b5, 0x240ca1cc77ac9c65,
+    0x2de92c6f592b0275, 0x4a7484aa6ea6e483, 0x5cb0a9dcbd41fbd4, 0x76f988da831153b5,
+    0x983e5152ee66dfab, 0xa831c66d2db43210, 0xb00327c898fb213f, 0xbf597fc7beef0ee4,
+    0xc6e00bf33da88fc2, 0xd5a79147930aa725, 0x06ca6351e003826f, 0x142929670a0e6e70,
+    0x27b70a8546d22ffc, 0x2e1b21385c26c926, 0x4d2c6dfc5ac42aed, 0x53380d139d95b3df,
+    0x650a73548baf63de, 0x766a0abb3c77b2a8, 0x81c2c92e47edaee6, 0x92722c851482353b,
+    0xa2bfe8a14cf10364, 0xa81a664bbc423001, 0xc24b8b70d0f89791, 0xc76c51a30654be30,
+    0xd192e819d6ef5218, 0xd69906245565a910, 0xf40e35855771202a, 0x106aa07032bbd1b8,
+    0x19a4c116b8d2d0c8, 0x1e376c085141ab53, 0x2748774cdf8eeb99, 0x34b0bcb5e19b48a8,
+    0x391c0cb3c5c95a63, 0x4ed8aa4ae3418acb, 0x5b9cca4f7763e373, 0x682e6ff3d6b2b8a3,
+    0x748f82ee5defb2fc, 0x78a5636f43172f60, 0x84c87814a1f0ab72, 0x8cc702081a6439ec,
+    0x90befffa23631e28, 0xa4506cebde82bde9, 0xbef9a3f7b2c67915, 0xc67178f2e372532b,
+    0xca273eceea26619c, 0xd186b8c721c0c207, 0xeada7dd6cde0eb1e, 0xf57d4f7fee6ed178,
+    0x06f067aa72176fba, 0x0a637dc5a2c898a6, 0x113f9804bef90dae, 0x1b710b35131c471b,
+    0x28db77f523047d84, 0x32caab7b40c72493, 0x3c9ebe0a15c9bebc, 0x431d67c49c100d4c,
+    0x4cc5d4becb3e42b6, 0x597f299cfc657e2a, 0x5fcb6fab3ad6faec, 0x6c44198c4a475817,
+};
+
+static void sha512_compress(host_sha512_t* s, const uint8_t* block) {
+    uint64_t w[80], v[8];
+    for (int i = 0; i < 16; i++) {
+        w[i] = load64be(block + 8 * i);
+    }
+    for (int i = 16; i < 80; i++) {
+        const uint64_t s0 = rotr64(w[i - 15], 1) ^ rotr64(w[i - 15], 8) ^ (w[i - 15] >> 7);
+        const uint64_t s1 = rotr64(w[i - 2], 19) ^ rotr64(w[i - 2], 61) ^ (w[i - 2] >> 6);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+    memcpy(v, s->h, sizeof(v));
+    for (int i = 0; i < 80; i++) {
+        const uint64_t s1 = rotr64(v[4], 14) ^ rotr64(v[4], 18) ^ rotr64(v[4], 41);
+        const uint64_t ch = (v[4] & v[5]) ^ (~v[4] & v[6]);
+        const uint64_t t1 = v[7] + s1 + ch + SHA512_K[i] + w[i];
+        const uint64_t s0 = rotr64(v[0], 28) ^ rotr64(v[0], 34) ^ rotr64(v[0], 39);
+        const uint64_t maj = (v[0] & v[1]) ^ (v[0] & v[2]) ^ (v[1] & v[2]);
+        memmove(v + 1, v, 7 * sizeof(v[0]));
+        v[4] += t1;
+        v[0] = t1 + s0 + maj;
+    }
+    for (int i = 0; i < 8; i++) {
+        s->h[i] += v[i];
+    }
+}
+
+void host_sha512_init(host_sha512_t* s) {
+    static const uint64_t SHA512_IV[8] = {
+        0x6a09e667f3bcc908,
+        0xbb67ae8584caa73b,
+        0x3c6ef372fe94f82b,
+        0xa54ff53a5f1d36f1,
+        0x510e527fade682d1,
+        0x9b05688c2b3e6c1f,
+        0x1f83d9abfb41bd6b,
+        0x5be0cd19137e2179,
+    };
+    memset(s, 0, sizeof(*s));
+    memcpy(s->h, SHA512_IV, sizeof(s->h));
+}
+
+void host_sha512_update(host_sha512_t* s, const uint8_t* in, size_t len) {
+    s->length += len;
+    while (len > 0) {
+        size_t chunk = SHA512_BLOCK_SIZE - s->bufLen;
+        if (chunk > len) {
+            chunk = len;
+        }
+        memcpy(s->buf + s->bufLen, in, chunk);
+        s->bufLen += chunk;
+        in += chunk;
+        len -= chunk;
+        if (s->bufLen == SHA512_BLOCK_SIZE) {
+            sha512_compress(s, s->buf);
+            s->bufLen = 0;
+        }
+    }
+}
+
+void host_sha512_final(host_sha512_t* s, uint8_t out[static 64]) {
+    const uint64_t bits = s->length * 8;
+    s->buf[s->bufLen++] = 0x80;
+    if (s->bufLen > SHA512_BLOCK_SIZE - 16) {
+        memset(s->buf + s->bufLen, 0, SHA512_BLOCK_SIZE - s->bufLen);
+        sha512_compress(s, s->buf);
+        s->bufLen = 0;
+    }
+    // 128-bit big endian length, the upper half is always zero here
+    memset(s->buf + s->bufLen, 0, SHA512_BLOCK_SIZE - s->bufLen);
+    for (int i = 0; i < 8; i++) {
+        s->buf[SHA512_BLOCK_SIZE - 1 - i] = (uint8_t) (bits >> (8 * i));
+    }
+    sha512_compress(s, s->buf);
+    for (int i = 0; i < 64; i++) {
+        out[i] = (uint8_t) (s->h[i / 8] >> (8 * (7 - i % 8)));
+    }
+}
+
+// SHA-256 (FIPS 180-4), only used by the HMAC-SHA256 of the OS derivation
+static const uint32_t SHA256_K[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+};
+
+typedef struct {
+    uint32_t h[8];
+    uint64_t length;  // bytes hashed
+    uint8_t buf[SHA256_BLOCK_SIZE];
+    size_t bufLen;
+} host_sha256_t;
+
+static void sha256_compress(host_sha256_t* s, const uint8_t* block) {
+    uint32_t w[64], v[8];
+    for (int i = 0; i < 16; i++) {
+        w[i] = load32be(block + 4 * i);
+    }
+    for (int i = 16; i < 64; i++) {
+        const uint32_t s0 = rotr32(w[i - 15], 7) ^ rotr32(w[i - 15], 18) ^ (w[i - 15] >> 3);
+        const uint32_t s1 = rotr32(w[i - 2], 17) ^ rotr32(w[i - 2], 19) ^ (w[i - 2] >> 10);
+        w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+    }
+    memcpy(v, s->h, sizeof(v));
+    for (int i = 0; i < 64; i++) {
+        const uint32_t s1 = rotr32(v[4], 6) ^ rotr32(v[4], 11) ^ rotr32(v[4], 25);
+        const uint32_t ch = (v[4] & v[5]) ^ (~v[4] & v[6]);
+        const uint32_t t1 = v[7] + s1 + ch + SHA256_K[i] + w[i];
+        const uint32_t s0 = rotr32(v[0], 2) ^ rotr32(v[0], 13) ^ rotr32(v[0], 22);
+        const uint32_t maj = (v[0] & v[1]) ^ (v[0] & v[2]) ^ (v[1] & v[2]);
+        memmove(v + 1, v, 7 * sizeof(v[0]));
+        v[4] += t1;
+        v[0] = t1 + s0 + maj;
+    }
+    for (int i = 0; i < 8; i++) {
+        s->h[i] += v[i];
+    }
+}
+
+static void sha256_init(host_sha256_t* s) {
+    static const uint32_t SHA256_IV[8] = {
+        0x6a09e667,
+        0xbb67ae85,
+        0x3c6ef372,
+        0xa54ff53a,
+        0x510e527f,
+        0x9b05688c,
+        0x1f83d9ab,
+        0x5be0cd19,
+    };
+    memset(s, 0, sizeof(*s));
+    memcpy(s->h, SHA256_IV, sizeof(s->h));
+}
+
+static void sha256_update(host_sha256_t* s, const uint8_t* in, size_t len) {
+    s->length += len;
+    while (len > 0) {
+        size_t chunk = SHA256_BLOCK_SIZE - s->bufLen;
+        if (chunk > len) {
+            chunk = len;
+        }
+        memcpy(s->buf + s->bufLen, in, chunk);
+        s->bufLen += chunk;
+        in += chunk;
+        len -= chunk;
+        if (s->bufLen == SHA256_BLOCK_SIZE) {
+            sha256_compress(s, s->buf);
+            s->bufLen = 0;
+        }
+    }
+}
+
+static void sha256_final(host_sha256_t* s, uint8_t out[static 32]) {
+    const uint64_t bits = s->length * 8;
+    s->buf[s->bufLen++] = 0x80;
+    if (s->bufLen > SHA256_BLOCK_SIZE - 8) {
+        memset(s->buf + s->bufLen, 0, SHA256_BLOCK_SIZE - s->bufLen);
+        sha256_compress(s, s->buf);
+        s->bufLen = 0;
+    }
+    memset(s->buf + s->bufLen, 0, SHA256_BLOCK_SIZE - s->bufLen);
+    for (int i = 0; i < 8; i++) {
+        s->buf[SHA256_BLOCK_SIZE - 1 - i] = (uint8_t) (bits >> (8 * i));
+    }
+    sha256_compress(s, s->buf);
+    for (int i = 0; i < 32; i++) {
+        out[i] = (uint8_t) (s->h[i / 4] >> (8 * (3 - i % 4)));
+    }
+}
+
+void host_hmac_sha256(const uint8_t* key,
+                      size_t keyLen,
+                      const uint8_t* in,
+                      size_t len,
+                      uint8_t mac[static 32]) {
+    uint8_t pad[SHA256_BLOCK_SIZE] = {0};
+    uint8_t innerHash[32];
+    host_sha256_t s;
+
+    // the OS only uses short keys, no need to hash long ones
+    if (keyLen > sizeof(pad)) {
+        keyLen = sizeof(pad);
+    }
+    memcpy(pad, key, keyLen);
+
+    for (size_t i = 0; i < sizeof(pad); i++) {
+        pad[i] ^= 0x36;
+    }
+    sha256_init(&s);
+    sha256_update(&s, pad, sizeof(pad));
+    sha256_update(&s, in, len);
+    sha256_final(&s, innerHash);
+
+    for (size_t i = 0; i < sizeof(pad); i++) {
+        pad[i] ^= 0x36 ^ 0x5c;
+    }
+    sha256_init(&s);
+    sha256_update(&s, pad, sizeof(pad));
+    sha256_update(&s, innerHash, sizeof(innerHash));
+    sha256_final(&s, mac);
+
+    explicit_bzero(pad, sizeof(pad));
+    explicit_bzero(&s, sizeof(s));
+}
+
+cx_err_t cx_blake2b_init_no_throw(cx_blake2b_t* hash, size_t size) {
+    // size is in bits
+    if (size % 8 != 0 || size == 0 || size > 512) {
+        return CX_INVALID_PARAMETER;
+    }
+    host_blake2b_t* s = (host_blake2b_t*) hash;
+    memset(s, 0, sizeof(*s));
+    s->kind = HOST_HASH_BLAKE2B;
+    s->outLen = size / 8;
+    memcpy(s->h, BLAKE2B_IV, sizeof(s->h));
+    s->h[0] ^= 0x01010000 ^ s->outLen;
+    return CX_OK;
+}
+
+cx_err_t cx_sha3_init_no_throw(cx_sha3_t* hash, size_t size) {
+    // size is in bits
+    if (size != 224 && size != 256 && size != 384 && size != 512) {
+        return CX_INVALID_PARAMETER;
+    }
+    host_sha3_t* s = (host_sha3_t*) hash;
+    memset(s, 0, sizeof(*s));
+    s->kind = HOST_HASH_SHA3;
+    s->outLen = size / 8;
+    s->rate = SHA3_STATE_SIZE - 2 * s->outLen;
+    return CX_OK;
+}
+
+cx_err_t cx_hash_no_throw(cx_hash_t* hash,
+                          uint32_t mode,
+                          const uint8_t* in,
+                          size_t len,
+                          uint8_t* out,
+                          size_t out_len) {
+    const uint64_t start = bench_cycles();
+    host_hash_t* tag = (host_hash_t*) hash;
+
+    if (len > 0) {
+        host_hash_stats.updates++;
+        host_hash_stats.bytes += len;
+    }
+
+    if (tag->kind == HOST_HASH_BLAKE2B) {
+        host_blake2b_t* s = (host_blake2b_t*) hash;
+        blake2b_update(s, in, len);
+        if (mode & CX_LAST) {
+            if (out_len < s->outLen) {
+                return CX_INVALID_PARAMETER;
+            }
+            blake2b_final(s, out);
+        }
+    } else if (tag->kind == HOST_HASH_SHA3) {
+        host_sha3_t* s = (host_sha3_t*) hash;
+        sha3_update(s, in, len);
+        if (mode & CX_LAST) {
+            if (out_len < s->outLen) {
+                return CX_INVALID_PARAMETER;
+            }
+            sha3_final(s, out);
+        }
+    } else {
+        return CX_INVALID_PARAMETER;
+    }
+
+    host_hash_stats.cycles += bench_cycles() - start;
+    return CX_OK;
+}
+
+size_t cx_hash_get_size(const cx_hash_t* ctx) {
+    const host_hash_t* tag = (const host_hash_t*) ctx;
+    if (tag->kind == HOST_HASH_BLAKE2B) {
+        return ((const host_blake2b_t*) ctx)->outLen;
+    }
+    return ((const host_sha3_t*) ctx)->outLen;
+}
+
+cx_err_t cx_hmac_sha512_init_no_throw(cx_hmac_sha512_t* hmac, const uint8_t* key, size_t key_len) {
+    host_hmac_sha512_t* s = (host_hmac_sha512_t*) hmac;
+    uint8_t pad[SHA512_BLOCK_SIZE] = {0};
+
+    // the app only uses 32-byte chain codes as keys, no need to hash long ones
+    if (key_len > sizeof(pad)) {
+        return CX_INVALID_PARAMETER;
+    }
+    memcpy(pad, key, key_len);
+
+    memset(s, 0, sizeof(*s));
+    s->kind = HOST_HMAC_SHA512;
+    for (size_t i = 0; i < sizeof(pad); i++) {
+        s->outerKey[i] = pad[i] ^ 0x5c;
+        pad[i] ^= 0x36;
+    }
+    host_sha512_init(&s->inner);
+    host_sha512_update(&s->inner, pad, sizeof(pad));
+
+    explicit_bzero(pad, sizeof(pad));
+    return CX_OK;
+}
+
+cx_err_t cx_hmac_no_throw(cx_hmac_t* hmac,
+                          uint32_t mode,
+                          const uint8_t* in,
+                          size_t len,
+                          uint8_t* mac,
+                          size_t mac_len) {
+    host_hmac_sha512_t* s = (host_hmac_sha512_t*) hmac;
+    if (s->kind != HOST_HMAC_SHA512) {
+        return CX_INVALID_PARAMETER;
+    }
+
+    host_sha512_update(&s->inner, in, len);
+    if (mode & CX_LAST) {
+        uint8_t innerHash[64];
+        uint8_t outerHash[64];
+        host_sha512_t outer;
+
+        if (mac_len > sizeof(outerHash)) {
+            return CX_INVALID_PARAMETER;
+        }
+        host_sha512_final(&s->inner, innerHash);
+        host_sha512_init(&outer);
+        host_sha512_update(&outer, s->outerKey, sizeof(s->outerKey));
+        host_sha512_update(&outer, innerHash, sizeof(innerHash));
+        host_sha512_final(&outer, outerHash);
+        memcpy(mac, outerHash, mac_len);
+
+        explicit_bzero(innerHash, sizeof(innerHash));
+        explicit_bzero(outerHash, sizeof(outerHash));
+    }
+    return CX_OK;
+}
@@ -0,0 +1,73 @@
+#include <cx.h>
+#include <os.h>
+#include <stddef.h>
+#include <string.h>
+
+// Hashing, signing and key derivation are not needed for fuzzing,
+// the harnesses only exercise parsing and validation.
+// The other host builds link a real implementation instead (see cx_hash_host.c and cx_eddsa_host.c).
+
+cx_err_t cx_blake2b_init_no_throw(cx_blake2b_t *hash, size_t size) {
+    return CX_OK;
+};
+cx_err_t cx_sha3_init_no_throw(cx_sha3_t *hash, size_t size) {
+    return CX_OK;
+};
+cx_err_t cx_hash_no_throw(cx_hash_t *hash,
+                          uint32_t mode,
+                          const uint8_t *in,
+                          size_t len,
+                          uint8_t *out,
+                          size_t out_len) {
+    return CX_OK;
+};
+size_t cx_hash_get_size(const cx_hash_t *ctx) {
+    return 32;
+};
+
+cx_err_t cx_eddsa_get_public_key_no_throw(const cx_ecfp_private_key_t *pv_key,
+                                          cx_md_t hashID,
+                                          cx_ecfp_public_key_t *pu_key,
+                                          uint8_t *a,
+                                          size_t a_len,
+                                          uint8_t *h,
+                                          size_t h_len) {
+    pu_key->W_len = 65;
+    memset(pu_key, 'A', pu_key->W_len);
+    return CX_OK;
+}
+
+cx_err_t cx_eddsa_sign_no_throw(const cx_ecfp_private_key_t *pvkey,
+                                cx_md_t hashID,
+                                const uint8_t *hash,
+                                size_t hash_len,
+                                uint8_t *sig,
+                                size_t sig_len) {
+    return CX_OK;
+}
+
+cx_err_t cx_hmac_sha512_init_no_throw(cx_hmac_sha512_t *hmac, const uint8_t *key, size_t key_len) {
+    return CX_OK;
+}
+
+cx_err_t cx_hmac_no_throw(cx_hmac_t *hmac,
+                          uint32_t mode,
+                          const uint8_t *in,
+                          size_t len,
+                          uint8_t *mac,
+                          size_t mac_len) {
+    if (mode & CX_LAST) {
+        memset(mac, 'A', mac_len);
+    }
+    return CX_OK;
+}
+
+void os_perso_derive_node_with_seed_key(unsigned int mode,
+                                        cx_curve_t curve,
+                                        const unsigned int *path,
+                                        unsigned int pathLength,
+                                        unsigned char *privateKey,
+                                        unsigned char *chain,
+                                        unsigned char *seed_key,
+                                        unsigned int seed_key_length) {
+}
@@ -0,0 +1,221 @@
+#include <string.h>
+
+#include "addressUtilsByron.h"
+#include "addressUtilsShelley.h"
+#include "bech32.h"
+#include "cbor.h"
+#include "nativeScriptHashBuilder.h"
+#include "os_io.h"
+#include "txHashBuilder.h"
+#include "cardano_host.h"
+
+// Host build of the app's encoding modules, loaded as a shared library (see hostlib/README.md).
+// Every call runs the app code inside a try context, the exceptions thrown by VALIDATE
+// and ASSERT (the FUZZING build throws ERR_ASSERT instead of resetting) become error codes.
+
+uint8_t G_io_apdu_buffer[IO_APDU_BUFFER_SIZE];
+
+#define HOST_CALL(...)                   \
+    {                                    \
+        volatile uint16_t error = 0;     \
+        BEGIN_TRY {                      \
+            TRY {                        \
+                __VA_ARGS__;             \
+            }                            \
+            CATCH_OTHER(e) {             \
+                error = (uint16_t) e;    \
+            }                            \
+            FINALLY {                    \
+            }                            \
+        }                                \
+        END_TRY;                         \
+        return error;                    \
+    }
+
+uint16_t cardano_host_cbor_writeToken(uint8_t type,
+                                      uint64_t value,
+                                      uint8_t* buffer,
+                                      size_t bufferSize,
+                                      size_t* written) {
+    HOST_CALL(*written = cbor_writeToken(type, value, buffer, bufferSize));
+}
+
+uint16_t cardano_host_bech32_encode(const char* hrp,
+                                    const uint8_t* bytes,
+                                    size_t bytesSize,
+                                    char* output,
+                                    size_t maxOutputSize) {
+    HOST_CALL(bech32_encode(hrp, bytes, bytesSize, output, maxOutputSize));
+}
+
+uint16_t cardano_host_humanReadableAddress(const uint8_t* address,
+                                           size_t addressSize,
+                                           char* output,
+                                           size_t maxOutputSize) {
+    HOST_CALL(humanReadableAddress(address, addressSize, output, maxOutputSize));
+}
+
+static void humanReadableAddresses(const uint8_t* addresses,
+                                   const size_t* addressSizes,
+                                   size_t count,
+                                   char* output,
+                                   size_t outputStride,
+                                   size_t* converted) {
+    for (*converted = 0; *converted < count; (*converted)++) {
+        humanReadableAddress(addresses, addressSizes[*converted], output, outputStride);
+        addresses += addressSizes[*converted];
+        output += outputStride;
+    }
+}
+
+uint16_t cardano_host_humanReadableAddresses(const uint8_t* addresses,
+                                             const size_t* addressSizes,
+                                             size_t count,
+                                             char* output,
+                                             size_t outputStride,
+                                             size_t* converted) {
+    HOST_CALL(
+        humanReadableAddresses(addresses, addressSizes, count, output, outputStride, converted));
+}
+
+uint16_t cardano_host_extractProtocolMagic(const uint8_t* address,
+                                           size_t addressSize,
+                                           uint32_t* protocolMagic) {
+    HOST_CALL(*protocolMagic = extractProtocolMagic(address, addressSize));
+}
+
+static void nativeScriptHash(const host_native_script_t* scripts,
+                             size_t numScripts,
+                             uint8_t* outBuffer,
+                             size_t outSize) {
+    native_script_hash_builder_t builder;
+    nativeScriptHashBuilder_init(&builder);
+
+    for (size_t i = 0; i < numScripts; i++) {
+        const host_native_script_t* script = &scripts[i];
+        switch (script->type) {
+            case NATIVE_SCRIPT_PUBKEY:
+                nativeScriptHashBuilder_addScript_pubkey(&builder,
+                                                         script->keyHash,
+                                                         SIZEOF(script->keyHash));
+                break;
+            case NATIVE_SCRIPT_ALL:
+                VALIDATE(builder.level + 1 < MAX_SCRIPT_DEPTH, ERR_INVALID_DATA);
+                nativeScriptHashBuilder_startComplexScript_all(&builder, script->numScripts);
+                break;
+            case NATIVE_SCRIPT_ANY:
+                VALIDATE(builder.level + 1 < MAX_SCRIPT_DEPTH, ERR_INVALID_DATA);
+                nativeScriptHashBuilder_startComplexScript_any(&builder, script->numScripts);
+                break;
+            case NATIVE_SCRIPT_N_OF_K:
+                VALIDATE(builder.level + 1 < MAX_SCRIPT_DEPTH, ERR_INVALID_DATA);
+                VALIDATE(script->requiredScripts <= script->numScripts, ERR_INVALID_DATA);
+                // same argument order as in deriveNativeScriptHash.c
+                nativeScriptHashBuilder_startComplexScript_n_of_k(&builder,
+                                                                  script->requiredScripts,
+                                                                  script->numScripts);
+                break;
+            case NATIVE_SCRIPT_INVALID_BEFORE:
+                nativeScriptHashBuilder_addScript_invalidBefore(&builder, script->timelock);
+                break;
+            case NATIVE_SCRIPT_INVALID_HEREAFTER:
+                nativeScriptHashBuilder_addScript_invalidHereafter(&builder, script->timelock);
+                break;
+            default:
+                THROW(ERR_INVALID_DATA);
+        }
+    }
+
+    nativeScriptHashBuilder_finalize(&builder, outBuffer, outSize);
+}
+
+uint16_t cardano_host_nativeScriptHash(const host_native_script_t* scripts,
+                                       size_t numScripts,
+                                       uint8_t* outBuffer,
+                                       size_t outSize) {
+    HOST_CALL(nativeScriptHash(scripts, numScripts, outBuffer, outSize));
+}
+
+static void txHash(const host_tx_body_t* tx, uint8_t* outBuffer, size_t outSize) {
+    tx_hash_builder_t builder;
+    // txHashBuilder_init does not reset the output state, the app keeps the builder zeroed
+    explicit_bzero(&builder, SIZEOF(builder));
+    txHashBuilder_init(&builder,
+                       tx->tagCborSets,
+                       tx->numInputs,
+                       tx->numOutputs,
+                       tx->includeTtl,
+                       0,  // certificates
+                       tx->numWithdrawals,
+                       tx->auxDataHash != NULL,
+                       tx->includeValidityIntervalStart,
+                       false,  // mint
+                       false,  // script data hash
+                       0,      // collateral inputs
+                       0,      // required signers
+                       false,  // network id
+                       false,  // collateral output
+                       false,  // total collateral
+                       0,      // reference inputs
+                       0,      // voting procedures
+                       false,  // treasury
+                       false   // donation
+    );
+
+    txHashBuilder_enterInputs(&builder);
+    for (uint16_t i = 0; i < tx->numInputs; i++) {
+        txHashBuilder_addInput(&builder, &tx->inputs[i]);
+    }
+
+    txHashBuilder_enterOutputs(&builder);
+    for (uint16_t i = 0; i < tx->numOutputs; i++) {
+        const host_tx_output_t* hostOutput = &tx->outputs[i];
+        VALIDATE(hostOutput->addressSize <= MAX_ADDRESS_SIZE, ERR_INVALID_DATA);
+
+        tx_output_description_t output;
+        explicit_bzero(&output, SIZEOF(output));
+        output.format = hostOutput->format;
+        output.destination.type = DESTINATION_THIRD_PARTY;
+        output.destination.address.buffer = (uint8_t*) hostOutput->address;
+        output.destination.address.size = hostOutput->addressSize;
+        output.amount = hostOutput->amount;
+        txHashBuilder_addOutput_topLevelData(&builder, &output);
+    }
+
+    txHashBuilder_addFee(&builder, tx->fee);
+    if (tx->includeTtl) {
+        txHashBuilder_addTtl(&builder, tx->ttl);
+    }
+    if (tx->numWithdrawals > 0) {
+        txHashBuilder_enterWithdrawals(&builder);
+        for (uint16_t i = 0; i < tx->numWithdrawals; i++) {
+            txHashBuilder_addWithdrawal(&builder,
+                                        tx->withdrawals[i].rewardAccount,
+                                        REWARD_ACCOUNT_SIZE,
+                                        tx->withdrawals[i].amount);
+        }
+    }
+    if (tx->auxDataHash != NULL) {
+        txHashBuilder_addAuxData(&builder, tx->auxDataHash, AUX_DATA_HASH_LENGTH);
+    }
+    if (tx->includeValidityIntervalStart) {
+        txHashBuilder_addValidityIntervalStart(&builder, tx->validityIntervalStart);
+    }
+
+    txHashBuilder_finalize(&builder, outBuffer, outSize);
+}
+
+static void txHashes(const host_tx_body_t* txs, size_t count, uint8_t* outBuffer, size_t outSize) {
+    VALIDATE(outSize / TX_HASH_LENGTH >= count, ERR_INVALID_DATA);
+
+    for (size_t i = 0; i < count; i++) {
+        txHash(&txs[i], outBuffer + i * TX_HASH_LENGTH, TX_HASH_LENGTH);
+    }
+}
+
+uint16_t cardano_host_txHashes(const host_tx_body_t* txs,
+                               size_t count,
+                               uint8_t* outBuffer,
+                               size_t outSize) {
+    HOST_CALL(txHashes(txs, count, outBuffer, outSize));
+}
@@ -0,0 +1,99 @@
+#ifndef H_CARDANO_APP_CARDANO_HOST
+#define H_CARDANO_APP_CARDANO_HOST
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+
+#include "cardano.h"
+
+// Flat api of the host build of the app's encoding modules (see hostlib/README.md),
+// meant to be loaded with ctypes or cffi.
+//
+// Unless said otherwise, the functions return 0 on success and the error code
+// thrown by the app code otherwise (e.g. ERR_INVALID_DATA, ERR_ASSERT).
+// The app code keeps its exception context in a global variable,
+// so the functions must not be called from several threads at once.
+
+typedef struct {
+    const uint8_t* address;
+    size_t addressSize;
+    uint64_t amount;
+    uint8_t format;  // tx_output_serialization_format_t
+} host_tx_output_t;
+
+typedef struct {
+    const uint8_t* rewardAccount;  // REWARD_ACCOUNT_SIZE bytes
+    uint64_t amount;
+} host_tx_withdrawal_t;
+
+// Transaction body made of inputs, outputs without tokens, datum or script reference,
+// fee, ttl, withdrawals, aux data hash and validity interval start
+typedef struct {
+    bool tagCborSets;
+    const tx_input_t* inputs;
+    uint16_t numInputs;
+    const host_tx_output_t* outputs;
+    uint16_t numOutputs;
+    uint64_t fee;
+    bool includeTtl;
+    uint64_t ttl;
+    const host_tx_withdrawal_t* withdrawals;
+    uint16_t numWithdrawals;
+    const uint8_t* auxDataHash;  // AUX_DATA_HASH_LENGTH bytes, NULL if none
+    bool includeValidityIntervalStart;
+    uint64_t validityIntervalStart;
+} host_tx_body_t;
+
+// Node of a native script, the scripts being listed in pre-order
+typedef struct {
+    uint8_t type;                // native_script_type
+    uint32_t numScripts;         // ALL, ANY, N_OF_K: number of direct subscripts
+    uint32_t requiredScripts;    // N_OF_K
+    uint64_t timelock;           // INVALID_BEFORE, INVALID_HEREAFTER
+    uint8_t keyHash[ADDRESS_KEY_HASH_LENGTH];  // PUBKEY
+} host_native_script_t;
+
+uint16_t cardano_host_cbor_writeToken(uint8_t type,
+                                      uint64_t value,
+                                      uint8_t* buffer,
+                                      size_t bufferSize,
+                                      size_t* written);
+
+uint16_t cardano_host_bech32_encode(const char* hrp,
+                                    const uint8_t* bytes,
+                                    size_t bytesSize,
+                                    char* output,
+                                    size_t maxOutputSize);
+
+uint16_t cardano_host_humanReadableAddress(const uint8_t* address,
+                                           size_t addressSize,
+                                           char* output,
+                                           size_t maxOutputSize);
+
+// The addresses are concatenated in addresses, the i-th one being written
+// NUL-terminated at output + i * outputStride. Stops at the first failure,
+// the number of converted addresses is returned in converted.
+uint16_t cardano_host_humanReadableAddresses(const uint8_t* addresses,
+                                             const size_t* addressSizes,
+                                             size_t count,
+                                             char* output,
+                                             size_t outputStride,
+                                             size_t* converted);
+
+uint16_t cardano_host_extractProtocolMagic(const uint8_t* address,
+                                           size_t addressSize,
+                                           uint32_t* protocolMagic);
+
+uint16_t cardano_host_nativeScriptHash(const host_native_script_t* scripts,
+                                       size_t numScripts,
+                                       uint8_t* outBuffer,
+                                       size_t outSize);
+
+// Hashes count transaction bodies, the i-th hash being written at outBuffer + i * TX_HASH_LENGTH
+uint16_t cardano_host_txHashes(const host_tx_body_t* txs,
+                               size_t count,
+                               uint8_t* outBuffer,
+                               size_t outSize);
+
+#endif  // H_CARDANO_APP_CARDANO_HOST
@@ -49,6 +49,13 @@ The following macros and functions have dual purpose:
                                            false);                                           \
     }
 
+// appends the whole batch (all tokens of a single item) in one hash update
+#define APPEND_BATCH(hashContexts, batch)                          \
+    do {                                                           \
+        APPEND_DATA(hashContexts, (batch)->buffer, (batch)->size); \
+        cbor_batch_init(batch);                                    \
+    } while (0)
+
 __noinline_due_to_stack__ static void blake2b_256_append_cbor_aux_data(
     blake2b_256_context_t* hashCtx,
     uint8_t type,
@@ -178,17 +185,16 @@ void auxDataHashBuilder_cVoteRegistration_addDelegation(aux_data_hash_builder_t*
     builder->cVoteRegistrationData.remainingDelegations--;
 
     {
-        APPEND_CBOR(HC_AUX_DATA | HC_CVOTE_REGISTRATION_PAYLOAD, CBOR_TYPE_ARRAY, 2);
+        cbor_batch_t batch;
+        cbor_batch_init(&batch);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_ARRAY, 2);
         {
             ASSERT(votePubKeySize == PUBLIC_KEY_SIZE);
-            APPEND_CBOR(HC_AUX_DATA | HC_CVOTE_REGISTRATION_PAYLOAD,
-                        CBOR_TYPE_BYTES,
-                        votePubKeySize);
-            APPEND_DATA(HC_AUX_DATA | HC_CVOTE_REGISTRATION_PAYLOAD,
-                        votePubKeyBuffer,
-                        votePubKeySize);
+            cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, votePubKeySize);
+            cbor_batch_appendData(&batch, votePubKeyBuffer, votePubKeySize);
         }
-        APPEND_CBOR(HC_AUX_DATA | HC_CVOTE_REGISTRATION_PAYLOAD, CBOR_TYPE_UNSIGNED, weight);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, weight);
+        APPEND_BATCH(HC_AUX_DATA | HC_CVOTE_REGISTRATION_PAYLOAD, &batch);
     }
 }
 
@@ -24,31 +24,48 @@
 #include "bech32.h"
 #include "utils.h"
 
-uint32_t bech32_polymod_step(uint32_t pre) {
-    const uint8_t b = pre >> 25;
-    return ((pre & 0x1FFFFFF) << 5) ^ (-((b >> 0) & 1) & 0x3b6a57b2UL) ^
-           (-((b >> 1) & 1) & 0x26508e6dUL) ^ (-((b >> 2) & 1) & 0x1ea119faUL) ^
-           (-((b >> 3) & 1) & 0x3d4233ddUL) ^ (-((b >> 4) & 1) & 0x2a1462b3UL);
+// Contribution of the generator to the checksum for each value of the 5 bits
+// shifted out in a polymod step (xor of the generator coefficients for the set bits)
+static const uint32_t POLYMOD_GENERATOR_TABLE[32] = {
+    0x00000000, 0x3b6a57b2, 0x26508e6d, 0x1d3ad9df, 0x1ea119fa, 0x25cb4e48, 0x38f19797, 0x039bc025,
+    0x3d4233dd, 0x0628646f, 0x1b12bdb0, 0x2078ea02, 0x23e32a27, 0x18897d95, 0x05b3a44a, 0x3ed9f3f8,
+    0x2a1462b3, 0x117e3501, 0x0c44ecde, 0x372ebb6c, 0x34b57b49, 0x0fdf2cfb, 0x12e5f524, 0x298fa296,
+    0x1756516e, 0x2c3c06dc, 0x3106df03, 0x0a6c88b1, 0x09f74894, 0x329d1f26, 0x2fa7c6f9, 0x14cd914b,
+};
+
+static inline uint32_t bech32_polymod_step(uint32_t pre) {
+    return ((pre & 0x1FFFFFF) << 5) ^ POLYMOD_GENERATOR_TABLE[pre >> 25];
 }
 
 /* cspell:disable-next-line */
 static const char* charset = "qpzry9x8gf2tvdw0s3jn54khce6mua7l";
 
-/** Encode a Bech32 string
- *
- *  Out: output:  Pointer to a buffer of size >= strlen(hrp) + data_len + 8 that
- *                will be updated to contain the null-terminated Bech32 string.
- *  In: hrp :     Pointer to the null-terminated human readable part.
- *      data :    Pointer to an array of 5-bit values.
- *      data_len: Length of the data array.
+// we are not supposed to use more for Cardano Shelley
+#define MAX_BYTES 65
+
+/*
+ * The bytes are converted to 5-bit symbols on the fly, without an intermediate buffer:
+ * whole groups of 5 bytes give exactly 8 symbols, the remaining bytes are padded with zero bits.
+ * Each symbol is appended to the output and added to the checksum right away.
  */
-void bech32_encode_5bit(const char* hrp,
-                        const uint8_t* data,
-                        size_t data_len,
-                        char* output,
-                        size_t maxOutputSize) {
+size_t bech32_encode(const char* hrp,
+                     const uint8_t* bytes,
+                     size_t bytesSize,
+                     char* output,
+                     size_t maxOutputSize) {
+    ASSERT(bytesSize <= MAX_BYTES);
+    ASSERT(strlen(hrp) >= 1);  // not allowed for bech32
+
+    const size_t SEPARATOR_LEN = 1;
+    const size_t CHECKSUM_LEN = 6;
+    size_t ceiling =
+        (8 * bytesSize + 4) / 5;  // ceiling of 8/5 * bytesLen (base32 encoding with padding)
+    size_t supposedOutputLength = strlen(hrp) + SEPARATOR_LEN + ceiling + CHECKSUM_LEN;
+    ASSERT(maxOutputSize >= supposedOutputLength + 1);
     ASSERT(maxOutputSize < BUFFER_SIZE_PARANOIA);
-    ASSERT(maxOutputSize >= strlen(hrp) + data_len + 8);
+    ASSERT(bytesSize < BUFFER_SIZE_PARANOIA);
+
+    const char* outputStart = output;
     const char* outputLimit = output + maxOutputSize;
 
 #define APPEND_OUT(value)             \
@@ -57,6 +74,13 @@ void bech32_encode_5bit(const char* hrp,
         *(output++) = (value);        \
     }
 
+#define APPEND_SYMBOL(value)                      \
+    {                                             \
+        const uint8_t symbol = (uint8_t) (value); \
+        chk = bech32_polymod_step(chk) ^ symbol;  \
+        APPEND_OUT(charset[symbol]);              \
+    }
+
     uint32_t chk = 1;
     {
         size_t i = 0;
@@ -75,69 +99,46 @@ void bech32_encode_5bit(const char* hrp,
 
     APPEND_OUT('1');
 
-    for (size_t i = 0; i < data_len; ++i) {
-        ASSERT((*data >> 5) == 0);
-        chk = bech32_polymod_step(chk) ^ (*data);
-        APPEND_OUT(charset[*(data++)]);
-    }
-    for (size_t i = 0; i < 6; ++i) {
-        chk = bech32_polymod_step(chk);
-    }
-    chk ^= 1;
-    for (size_t i = 0; i < 6; ++i) {
-        APPEND_OUT(charset[(chk >> ((5 - i) * 5)) & 0x1f]);
+    while (bytesSize >= 5) {
+        const uint64_t group = ((uint64_t) bytes[0] << 32) | ((uint64_t) bytes[1] << 24) |
+                               ((uint64_t) bytes[2] << 16) | ((uint64_t) bytes[3] << 8) |
+                               (uint64_t) bytes[4];
+        for (int shift = 35; shift >= 0; shift -= 5) {
+            APPEND_SYMBOL((group >> shift) & 0x1f);
+        }
+        bytes += 5;
+        bytesSize -= 5;
     }
-    APPEND_OUT(0);
-}
-
-// we are not supposed to use more for Cardano Shelley
-// WARNING: increasing this would take more stack space, see data5bit definition below
-#define MAX_BYTES 65
-
-size_t bech32_encode(const char* hrp,
-                     const uint8_t* bytes,
-                     size_t bytesSize,
-                     char* output,
-                     size_t maxOutputSize) {
-    ASSERT(bytesSize <= MAX_BYTES);
-    ASSERT(strlen(hrp) >= 1);  // not allowed for bech32
-
-    const size_t SEPARATOR_LEN = 1;
-    const size_t CHECKSUM_LEN = 6;
-    size_t ceiling =
-        (8 * bytesSize + 4) / 5;  // ceiling of 8/5 * bytesLen (base32 encoding with padding)
-    size_t supposedOutputLength = strlen(hrp) + SEPARATOR_LEN + ceiling + CHECKSUM_LEN;
-    ASSERT(maxOutputSize >= supposedOutputLength + 1);
-    ASSERT(maxOutputSize < BUFFER_SIZE_PARANOIA);
-    ASSERT(bytesSize < BUFFER_SIZE_PARANOIA);
-
-    uint8_t data5bit[(8 * MAX_BYTES + 4) / 5] = {0};  // ceiling of (8/5 * MAX_BYTES_LEN) = 104
-    size_t data5bitLength = 0;
     {
-        const int OUTBITS = 5;
-        const int INBITS = 8;
-
-        // originally convert_bits()
+        // at most 4 bytes remain, they fit into val
         uint32_t val = 0;
         int bits = 0;
-        uint32_t maxv = (((uint32_t) 1) << OUTBITS) - 1;
         while (bytesSize--) {
-            val = (val << INBITS) | *(bytes++);
-            bits += INBITS;
-            while (bits >= OUTBITS) {
-                bits -= OUTBITS;
-                ASSERT(data5bitLength < SIZEOF(data5bit));
-                data5bit[data5bitLength++] = (val >> bits) & maxv;
+            val = (val << 8) | *(bytes++);
+            bits += 8;
+            while (bits >= 5) {
+                bits -= 5;
+                APPEND_SYMBOL((val >> bits) & 0x1f);
             }
         }
         if (bits) {
-            ASSERT(data5bitLength < SIZEOF(data5bit));
-            data5bit[data5bitLength++] = (val << (OUTBITS - bits)) & maxv;
+            APPEND_SYMBOL((val << (5 - bits)) & 0x1f);
         }
     }
 
-    bech32_encode_5bit(hrp, data5bit, data5bitLength, output, maxOutputSize);
-    ASSERT(strlen(output) == supposedOutputLength);
+    for (size_t i = 0; i < 6; ++i) {
+        chk = bech32_polymod_step(chk);
+    }
+    chk ^= 1;
+    for (size_t i = 0; i < 6; ++i) {
+        APPEND_OUT(charset[(chk >> ((5 - i) * 5)) & 0x1f]);
+    }
+    APPEND_OUT(0);
+
+#undef APPEND_SYMBOL
+#undef APPEND_OUT
+
+    ASSERT(strlen(outputStart) == supposedOutputLength);
 
     return supposedOutputLength;
 }
@@ -45,6 +45,7 @@ size_t bip44_parseFromWire(bip44_path_t* pathSpec, const uint8_t* dataBuffer, si
         pathSpec->path[i] = u4be_read(dataBuffer + offset);
         offset += 4;
     }
+    bip44_classify(pathSpec);
     return offset;
 }
 
@@ -62,77 +63,6 @@ uint32_t unharden(uint32_t value) {
     return value & (~HARDENED_BIP32);
 }
 
-// Byron: /44'/1815'
-bool bip44_hasByronPrefix(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length > BIP44_I_COIN_TYPE);
-    CHECK(pathSpec->path[BIP44_I_PURPOSE] == harden(PURPOSE_BYRON));
-    CHECK(pathSpec->path[BIP44_I_COIN_TYPE] == harden(ADA_COIN_TYPE));
-    return true;
-#undef CHECK
-}
-
-// Shelley: /1852'/1815'
-bool bip44_hasShelleyPrefix(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length > BIP44_I_COIN_TYPE);
-    CHECK(pathSpec->path[BIP44_I_PURPOSE] == harden(PURPOSE_SHELLEY));
-    CHECK(pathSpec->path[BIP44_I_COIN_TYPE] == harden(ADA_COIN_TYPE));
-    return true;
-#undef CHECK
-}
-
-// /44'/1815' or /1852'/1815'
-bool bip44_hasOrdinaryWalletKeyPrefix(const bip44_path_t* pathSpec) {
-    return bip44_hasByronPrefix(pathSpec) || bip44_hasShelleyPrefix(pathSpec);
-}
-
-// /1854'/1815'
-bool bip44_hasMultisigWalletKeyPrefix(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length > BIP44_I_COIN_TYPE);
-    CHECK(pathSpec->path[BIP44_I_PURPOSE] == harden(PURPOSE_MULTISIG));
-    CHECK(pathSpec->path[BIP44_I_COIN_TYPE] == harden(ADA_COIN_TYPE));
-    return true;
-#undef CHECK
-}
-
-// /1855'/1815'
-bool bip44_hasMintKeyPrefix(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length > BIP44_I_COIN_TYPE);
-    CHECK(pathSpec->path[BIP44_I_PURPOSE] == harden(PURPOSE_MINT));
-    CHECK(pathSpec->path[BIP44_I_COIN_TYPE] == harden(ADA_COIN_TYPE));
-    return true;
-#undef CHECK
-}
-
-// /1853'/1815'
-bool bip44_hasPoolColdKeyPrefix(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length > BIP44_I_COIN_TYPE);
-    CHECK(pathSpec->path[BIP44_I_PURPOSE] == harden(PURPOSE_POOL_COLD_KEY));
-    CHECK(pathSpec->path[BIP44_I_COIN_TYPE] == harden(ADA_COIN_TYPE));
-    return true;
-#undef CHECK
-}
-
-// /1694'/1815'
-bool bip44_hasCVoteKeyPrefix(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length > BIP44_I_COIN_TYPE);
-    CHECK(pathSpec->path[BIP44_I_PURPOSE] == harden(PURPOSE_CVOTE_KEY));
-    CHECK(pathSpec->path[BIP44_I_COIN_TYPE] == harden(ADA_COIN_TYPE));
-    return true;
-#undef CHECK
-}
-
 // Account
 
 bool bip44_containsAccount(const bip44_path_t* pathSpec) {
@@ -161,16 +91,16 @@ static bool bip44_hasReasonableAccount(const bip44_path_t* pathSpec) {
     return unharden(account) <= MAX_REASONABLE_ACCOUNT;
 }
 
+// only for mint key paths
 static bool bip44_hasReasonableMintPolicy(const bip44_path_t* pathSpec) {
-    if (!bip44_isMintKeyPath(pathSpec)) return false;
     uint32_t mintPolicyIndex = bip44_getMintPolicy(pathSpec);
 
     if (!isHardened(mintPolicyIndex)) return false;
     return unharden(mintPolicyIndex) <= MAX_REASONABLE_MINT_POLICY_INDEX;
 }
 
+// only for pool cold key paths
 static bool bip44_hasReasonablePoolColdKeyIndex(const bip44_path_t* pathSpec) {
-    if (!bip44_isPoolColdKeyPath(pathSpec)) return false;
     uint32_t coldKeyIndex = bip44_getColdKeyIndex(pathSpec);
 
     if (!isHardened(coldKeyIndex)) return false;
@@ -205,180 +135,53 @@ static bool bip44_hasReasonableAddress(const bip44_path_t* pathSpec) {
     return (address <= MAX_REASONABLE_ADDRESS);
 }
 
-static bool bip44_isConwayPathRecommended(const bip44_path_t* pathSpec) {
-    switch (bip44_classifyPath(pathSpec)) {
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
-            // strongly recommended in CIP-0105 to only use 0 as address
-            return (bip44_getAddressValue(pathSpec) == 0);
-        default:
-            ASSERT(false);
-            return false;
-    }
-}
-
-static bool bip44_containsMoreThanAddress(const bip44_path_t* pathSpec) {
-    return (pathSpec->length > BIP44_I_ADDRESS + 1);
-}
-
-// stake keys
-bool bip44_isOrdinaryStakingKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(bip44_containsAddress(pathSpec));
-    CHECK(!bip44_containsMoreThanAddress(pathSpec));
-    CHECK(bip44_hasShelleyPrefix(pathSpec));
-    CHECK(isHardened(bip44_getAccount(pathSpec)));
-    CHECK(bip44_getChainTypeValue(pathSpec) == CARDANO_CHAIN_STAKING_KEY);
-    CHECK(!isHardened(bip44_getAddressValue(pathSpec)));
-    return true;
-#undef CHECK
-}
-
-// multisig stake keys
-bool bip44_isMultisigStakingKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(bip44_containsAddress(pathSpec));
-    CHECK(!bip44_containsMoreThanAddress(pathSpec));
-    CHECK(bip44_hasMultisigWalletKeyPrefix(pathSpec));
-    CHECK(isHardened(bip44_getAccount(pathSpec)));
-    CHECK(bip44_getChainTypeValue(pathSpec) == CARDANO_CHAIN_STAKING_KEY);
-    CHECK(!isHardened(bip44_getAddressValue(pathSpec)));
-    return true;
-#undef CHECK
-}
-
-bool bip44_isMultidelegationStakingKeyPath(const bip44_path_t* pathSpec) {
-    return (bip44_isOrdinaryStakingKeyPath(pathSpec) || bip44_isMultisigStakingKeyPath(pathSpec)) &&
-           (bip44_getAddressValue(pathSpec) > 0);
-}
-
-bool bip44_isDRepKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(bip44_containsAddress(pathSpec));
-    CHECK(!bip44_containsMoreThanAddress(pathSpec));
-    CHECK(bip44_hasShelleyPrefix(pathSpec));
-    CHECK(isHardened(bip44_getAccount(pathSpec)));
-    CHECK(bip44_getChainTypeValue(pathSpec) == CARDANO_CHAIN_DREP_KEY);
-    // is it strongly recommended (but not forbidden) to only use 0 as address
-    CHECK(!isHardened(bip44_getAddressValue(pathSpec)));
-    return true;
-#undef CHECK
-}
-
-bool bip44_isCommitteeColdKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(bip44_containsAddress(pathSpec));
-    CHECK(!bip44_containsMoreThanAddress(pathSpec));
-    CHECK(bip44_hasShelleyPrefix(pathSpec));
-    CHECK(isHardened(bip44_getAccount(pathSpec)));
-    CHECK(bip44_getChainTypeValue(pathSpec) == CARDANO_CHAIN_COMMITTEE_COLD_KEY);
-    // is it strongly recommended (but not forbidden) to only use 0 as address
-    CHECK(!isHardened(bip44_getAddressValue(pathSpec)));
-    return true;
-#undef CHECK
-}
+// Classification
+// The functions below inspect the path elements,
+// they are only used to fill the classification kept in the path.
 
-bool bip44_isCommitteeHotKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(bip44_containsAddress(pathSpec));
-    CHECK(!bip44_containsMoreThanAddress(pathSpec));
-    CHECK(bip44_hasShelleyPrefix(pathSpec));
-    CHECK(isHardened(bip44_getAccount(pathSpec)));
-    CHECK(bip44_getChainTypeValue(pathSpec) == CARDANO_CHAIN_COMMITTEE_HOT_KEY);
-    // is it strongly recommended (but not forbidden) to only use 0 as address
-    CHECK(!isHardened(bip44_getAddressValue(pathSpec)));
-    return true;
-#undef CHECK
-}
+static bip44_prefix_t bip44_computePrefix(const bip44_path_t* pathSpec) {
+    if (pathSpec->length <= BIP44_I_COIN_TYPE) return BIP44_PREFIX_NONE;
+    if (pathSpec->path[BIP44_I_COIN_TYPE] != harden(ADA_COIN_TYPE)) return BIP44_PREFIX_NONE;
 
-bool bip44_isMintKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length == BIP44_I_MINT_POLICY + 1);
-    CHECK(bip44_hasMintKeyPrefix(pathSpec));
-    CHECK(isHardened(pathSpec->path[BIP44_I_MINT_POLICY]));
-    return true;
-#undef CHECK
-}
-
-bool bip44_isPoolColdKeyPath(const bip44_path_t* pathSpec) {
-#define CHECK(cond) \
-    if (!(cond)) return false
-    CHECK(pathSpec->length == BIP44_I_POOL_COLD_KEY + 1);
-    CHECK(bip44_hasPoolColdKeyPrefix(pathSpec));
-    CHECK(pathSpec->path[BIP44_I_POOL_COLD_KEY_USECASE] == harden(0));
-    CHECK(isHardened(pathSpec->path[BIP44_I_POOL_COLD_KEY]));
-    return true;
-#undef CHECK
+    const uint32_t purpose = pathSpec->path[BIP44_I_PURPOSE];
+    if (purpose == harden(PURPOSE_BYRON)) return BIP44_PREFIX_BYRON;
+    if (purpose == harden(PURPOSE_SHELLEY)) return BIP44_PREFIX_SHELLEY;
+    if (purpose == harden(PURPOSE_MULTISIG)) return BIP44_PREFIX_MULTISIG;
+    if (purpose == harden(PURPOSE_MINT)) return BIP44_PREFIX_MINT;
+    if (purpose == harden(PURPOSE_POOL_COLD_KEY)) return BIP44_PREFIX_POOL_COLD_KEY;
+    if (purpose == harden(PURPOSE_CVOTE_KEY)) return BIP44_PREFIX_CVOTE_KEY;
+    return BIP44_PREFIX_NONE;
 }
 
-bool bip44_isCVoteKeyPath(const bip44_path_t* pathSpec) {
+// purpose' / coin_type' / account' / chainType / address
+// with the prefix already checked by the caller
+static bool bip44_isChainKeyPath(const bip44_path_t* pathSpec, uint32_t chainType) {
 #define CHECK(cond) \
     if (!(cond)) return false
     CHECK(pathSpec->length == BIP44_I_ADDRESS + 1);
-    CHECK(bip44_hasCVoteKeyPrefix(pathSpec));
-    CHECK(bip44_getAccount(pathSpec) >= HARDENED_BIP32);
-    CHECK(pathSpec->path[BIP44_I_CHAIN] == 0);  // in the future, more might be allowed
+    CHECK(isHardened(bip44_getAccount(pathSpec)));
+    CHECK(bip44_getChainTypeValue(pathSpec) == chainType);
+    // for DRep and committee keys, it is strongly recommended (but not forbidden)
+    // to only use 0 as address
     CHECK(!isHardened(bip44_getAddressValue(pathSpec)));
     return true;
 #undef CHECK
 }
 
-// returns the length of the resulting string
-size_t bip44_printToStr(const bip44_path_t* pathSpec, char* out, size_t outSize) {
-    ASSERT(outSize < BUFFER_SIZE_PARANOIA);
-    // we need space for the terminating \0
-    // and one more byte to check whether
-    // everything was printed
-    ASSERT(outSize >= BIP44_PATH_STRING_SIZE_MAX + 1);
-    char* ptr = out;
-    char* end = (out + outSize);
-
-#define WRITE(fmt, ...)                                                               \
-    {                                                                                 \
-        ASSERT(ptr <= end);                                                           \
-        STATIC_ASSERT(sizeof(end - ptr) == sizeof(size_t), "bad size_t size");        \
-        size_t availableSize = (size_t)(end - ptr);                                   \
-        /* Note(ppershing): We do not bother checking return */                       \
-        /* value of snprintf as it always returns 0. */                               \
-        /* Go figure ... */                                                           \
-        snprintf(ptr, availableSize, fmt, ##__VA_ARGS__);                             \
-        size_t res = strlen(ptr);                                                     \
-        /* if snprintf filled all the remaining space, there is no space for '\0', */ \
-        /* or the information is not displayed in full, */                            \
-        /* and that's a serious security risk */                                      \
-        ASSERT(res + 1 < availableSize);                                              \
-        ptr += res;                                                                   \
-    }
-
-    WRITE("m");
-
-    ASSERT(pathSpec->length <= ARRAY_LEN(pathSpec->path));
-
-    for (size_t i = 0; i < pathSpec->length; i++) {
-        const uint32_t value = pathSpec->path[i];
-
-        if (isHardened(value)) {
-            WRITE("/%u'", unharden(value));
-        } else {
-            WRITE("/%u", value);
-        }
+// stake, DRep and committee keys are only defined for Shelley
+static bip44_path_type_t bip44_classifyShelleyKeyPath(const bip44_path_t* pathSpec,
+                                                      bip44_prefix_t prefix,
+                                                      uint32_t chainType,
+                                                      bip44_path_type_t pathType) {
+    if (prefix != BIP44_PREFIX_SHELLEY) {
+        return PATH_INVALID;
     }
-#undef WRITE
-    ASSERT(ptr >= out);
-    ASSERT(ptr + 1 < end);
-
-    return ptr - out;
+    return bip44_isChainKeyPath(pathSpec, chainType) ? pathType : PATH_INVALID;
 }
 
-static bip44_path_type_t bip44_classifyOrdinaryWalletPath(const bip44_path_t* pathSpec) {
-    ASSERT(bip44_hasOrdinaryWalletKeyPrefix(pathSpec));
+static bip44_path_type_t bip44_classifyOrdinaryWalletPath(const bip44_path_t* pathSpec,
+                                                          bip44_prefix_t prefix) {
+    ASSERT(prefix == BIP44_PREFIX_BYRON || prefix == BIP44_PREFIX_SHELLEY);
 
     // account must be hardened
     if (!bip44_containsAccount(pathSpec)) {
@@ -405,19 +208,28 @@ static bip44_path_type_t bip44_classifyOrdinaryWalletPath(const bip44_path_t* pa
                     return PATH_ORDINARY_PAYMENT_KEY;
 
                 case CARDANO_CHAIN_STAKING_KEY:
-                    return bip44_isOrdinaryStakingKeyPath(pathSpec) ? PATH_ORDINARY_STAKING_KEY
-                                                                    : PATH_INVALID;
+                    return bip44_classifyShelleyKeyPath(pathSpec,
+                                                        prefix,
+                                                        CARDANO_CHAIN_STAKING_KEY,
+                                                        PATH_ORDINARY_STAKING_KEY);
 
                 case CARDANO_CHAIN_DREP_KEY:
-                    return bip44_isDRepKeyPath(pathSpec) ? PATH_DREP_KEY : PATH_INVALID;
+                    return bip44_classifyShelleyKeyPath(pathSpec,
+                                                        prefix,
+                                                        CARDANO_CHAIN_DREP_KEY,
+                                                        PATH_DREP_KEY);
 
                 case CARDANO_CHAIN_COMMITTEE_COLD_KEY:
-                    return bip44_isCommitteeColdKeyPath(pathSpec) ? PATH_COMMITTEE_COLD_KEY
-                                                                  : PATH_INVALID;
+                    return bip44_classifyShelleyKeyPath(pathSpec,
+                                                        prefix,
+                                                        CARDANO_CHAIN_COMMITTEE_COLD_KEY,
+                                                        PATH_COMMITTEE_COLD_KEY);
 
                 case CARDANO_CHAIN_COMMITTEE_HOT_KEY:
-                    return bip44_isCommitteeHotKeyPath(pathSpec) ? PATH_COMMITTEE_HOT_KEY
-                                                                 : PATH_INVALID;
+                    return bip44_classifyShelleyKeyPath(pathSpec,
+                                                        prefix,
+                                                        CARDANO_CHAIN_COMMITTEE_HOT_KEY,
+                                                        PATH_COMMITTEE_HOT_KEY);
 
                 default:
                     return PATH_INVALID;
@@ -429,8 +241,6 @@ static bip44_path_type_t bip44_classifyOrdinaryWalletPath(const bip44_path_t* pa
 }
 
 static bip44_path_type_t bip44_classifyMultisigWalletPath(const bip44_path_t* pathSpec) {
-    ASSERT(bip44_hasMultisigWalletKeyPrefix(pathSpec));
-
     // account must be hardened
     if (!bip44_containsAccount(pathSpec)) {
         return PATH_INVALID;
@@ -454,8 +264,9 @@ static bip44_path_type_t bip44_classifyMultisigWalletPath(const bip44_path_t* pa
                     return PATH_MULTISIG_PAYMENT_KEY;
 
                 case CARDANO_CHAIN_STAKING_KEY:
-                    return bip44_isMultisigStakingKeyPath(pathSpec) ? PATH_MULTISIG_STAKING_KEY
-                                                                    : PATH_INVALID;
+                    return bip44_isChainKeyPath(pathSpec, CARDANO_CHAIN_STAKING_KEY)
+                               ? PATH_MULTISIG_STAKING_KEY
+                               : PATH_INVALID;
 
                 default:
                     return PATH_INVALID;
@@ -466,9 +277,26 @@ static bip44_path_type_t bip44_classifyMultisigWalletPath(const bip44_path_t* pa
     }
 }
 
-static bip44_path_type_t bip44_classifyCVotePath(const bip44_path_t* pathSpec) {
-    ASSERT(bip44_hasCVoteKeyPrefix(pathSpec));
+static bip44_path_type_t bip44_classifyMintPath(const bip44_path_t* pathSpec) {
+#define CHECK(cond) \
+    if (!(cond)) return PATH_INVALID
+    CHECK(pathSpec->length == BIP44_I_MINT_POLICY + 1);
+    CHECK(isHardened(pathSpec->path[BIP44_I_MINT_POLICY]));
+    return PATH_MINT_KEY;
+#undef CHECK
+}
+
+static bip44_path_type_t bip44_classifyPoolColdKeyPath(const bip44_path_t* pathSpec) {
+#define CHECK(cond) \
+    if (!(cond)) return PATH_INVALID
+    CHECK(pathSpec->length == BIP44_I_POOL_COLD_KEY + 1);
+    CHECK(pathSpec->path[BIP44_I_POOL_COLD_KEY_USECASE] == harden(0));
+    CHECK(isHardened(pathSpec->path[BIP44_I_POOL_COLD_KEY]));
+    return PATH_POOL_COLD_KEY;
+#undef CHECK
+}
 
+static bip44_path_type_t bip44_classifyCVotePath(const bip44_path_t* pathSpec) {
     // account must be hardened
     if (!bip44_containsAccount(pathSpec)) {
         return PATH_INVALID;
@@ -482,47 +310,39 @@ static bip44_path_type_t bip44_classifyCVotePath(const bip44_path_t* pathSpec) {
             return PATH_CVOTE_ACCOUNT;
         }
         case 5: {
-            return bip44_isCVoteKeyPath(pathSpec) ? PATH_CVOTE_KEY : PATH_INVALID;
+            // in the future, more chain types might be allowed
+            return bip44_isChainKeyPath(pathSpec, 0) ? PATH_CVOTE_KEY : PATH_INVALID;
         }
         default:
             return PATH_INVALID;
     }
 }
 
-bip44_path_type_t bip44_classifyPath(const bip44_path_t* pathSpec) {
-    if (bip44_hasOrdinaryWalletKeyPrefix(pathSpec)) {
-        return bip44_classifyOrdinaryWalletPath(pathSpec);
-    }
+static bip44_path_type_t bip44_computeType(const bip44_path_t* pathSpec, bip44_prefix_t prefix) {
+    switch (prefix) {
+        case BIP44_PREFIX_BYRON:
+        case BIP44_PREFIX_SHELLEY:
+            return bip44_classifyOrdinaryWalletPath(pathSpec, prefix);
 
-    if (bip44_hasMultisigWalletKeyPrefix(pathSpec)) {
-        return bip44_classifyMultisigWalletPath(pathSpec);
-    }
+        case BIP44_PREFIX_MULTISIG:
+            return bip44_classifyMultisigWalletPath(pathSpec);
 
-    if (bip44_hasMintKeyPrefix(pathSpec)) {
-        if (bip44_isMintKeyPath(pathSpec)) {
-            return PATH_MINT_KEY;
-        } else {
-            return PATH_INVALID;
-        }
-    }
+        case BIP44_PREFIX_MINT:
+            return bip44_classifyMintPath(pathSpec);
 
-    if (bip44_hasPoolColdKeyPrefix(pathSpec)) {
-        if (bip44_isPoolColdKeyPath(pathSpec)) {
-            return PATH_POOL_COLD_KEY;
-        } else {
-            return PATH_INVALID;
-        }
-    }
+        case BIP44_PREFIX_POOL_COLD_KEY:
+            return bip44_classifyPoolColdKeyPath(pathSpec);
 
-    if (bip44_hasCVoteKeyPrefix(pathSpec)) {
-        return bip44_classifyCVotePath(pathSpec);
-    }
+        case BIP44_PREFIX_CVOTE_KEY:
+            return bip44_classifyCVotePath(pathSpec);
 
-    return PATH_INVALID;
+        default:
+            return PATH_INVALID;
+    }
 }
 
-bool bip44_isPathReasonable(const bip44_path_t* pathSpec) {
-    switch (bip44_classifyPath(pathSpec)) {
+static bool bip44_computeIsReasonable(const bip44_path_t* pathSpec, bip44_path_type_t pathType) {
+    switch (pathType) {
         case PATH_ORDINARY_ACCOUNT:
         case PATH_MULTISIG_ACCOUNT:
             return bip44_hasReasonableAccount(pathSpec);
@@ -538,8 +358,9 @@ bool bip44_isPathReasonable(const bip44_path_t* pathSpec) {
         case PATH_DREP_KEY:
         case PATH_COMMITTEE_COLD_KEY:
         case PATH_COMMITTEE_HOT_KEY:
+            // strongly recommended in CIP-0105 to only use 0 as address
             return bip44_hasReasonableAccount(pathSpec) && bip44_hasReasonableAddress(pathSpec) &&
-                   bip44_isConwayPathRecommended(pathSpec);
+                   (bip44_getAddressValue(pathSpec) == 0);
 
         case PATH_MINT_KEY:
             return bip44_hasReasonableMintPolicy(pathSpec);
@@ -554,10 +375,181 @@ bool bip44_isPathReasonable(const bip44_path_t* pathSpec) {
             return bip44_hasReasonableAccount(pathSpec) && bip44_hasReasonableAddress(pathSpec);
 
         default:
-            // we are not supposed to call this for invalid paths
-            ASSERT(false);
+            // invalid paths are never reasonable
+            return false;
     }
-    return false;
+}
+
+static void bip44_computeClassification(const bip44_path_t* pathSpec,
+                                        bip44_path_classification_t* classification) {
+    ASSERT(pathSpec->length <= ARRAY_LEN(pathSpec->path));
+
+    const bip44_prefix_t prefix = bip44_computePrefix(pathSpec);
+    const bip44_path_type_t pathType = bip44_computeType(pathSpec, prefix);
+
+    classification->tag = BIP44_CLASSIFICATION_TAG;
+    classification->prefix = (uint8_t) prefix;
+    classification->type = (uint8_t) pathType;
+    classification->isReasonable = bip44_computeIsReasonable(pathSpec, pathType);
+}
+
+void bip44_classify(bip44_path_t* pathSpec) {
+    bip44_computeClassification(pathSpec, &pathSpec->classification);
+}
+
+static bip44_path_classification_t bip44_getClassification(const bip44_path_t* pathSpec) {
+    if (pathSpec->classification.tag == BIP44_CLASSIFICATION_TAG) {
+#ifdef DEVEL
+        {
+            // catches the paths whose elements were changed without calling bip44_classify
+            bip44_path_classification_t fresh;
+            bip44_computeClassification(pathSpec, &fresh);
+            ASSERT(fresh.prefix == pathSpec->classification.prefix);
+            ASSERT(fresh.type == pathSpec->classification.type);
+            ASSERT(fresh.isReasonable == pathSpec->classification.isReasonable);
+        }
+#endif  // DEVEL
+        return pathSpec->classification;
+    }
+    // the path was not classified (e.g. it is zero-initialized and never parsed),
+    // so we classify it without keeping the result
+    bip44_path_classification_t classification;
+    bip44_computeClassification(pathSpec, &classification);
+    return classification;
+}
+
+// Byron: /44'/1815'
+bool bip44_hasByronPrefix(const bip44_path_t* pathSpec) {
+    return bip44_getClassification(pathSpec).prefix == BIP44_PREFIX_BYRON;
+}
+
+// Shelley: /1852'/1815'
+bool bip44_hasShelleyPrefix(const bip44_path_t* pathSpec) {
+    return bip44_getClassification(pathSpec).prefix == BIP44_PREFIX_SHELLEY;
+}
+
+// /44'/1815' or /1852'/1815'
+bool bip44_hasOrdinaryWalletKeyPrefix(const bip44_path_t* pathSpec) {
+    const bip44_prefix_t prefix = bip44_getClassification(pathSpec).prefix;
+    return (prefix == BIP44_PREFIX_BYRON) || (prefix == BIP44_PREFIX_SHELLEY);
+}
+
+// /1854'/1815'
+bool bip44_hasMultisigWalletKeyPrefix(const bip44_path_t* pathSpec) {
+    return bip44_getClassification(pathSpec).prefix == BIP44_PREFIX_MULTISIG;
+}
+
+// /1855'/1815'
+bool bip44_hasMintKeyPrefix(const bip44_path_t* pathSpec) {
+    return bip44_getClassification(pathSpec).prefix == BIP44_PREFIX_MINT;
+}
+
+// /1853'/1815'
+bool bip44_hasPoolColdKeyPrefix(const bip44_path_t* pathSpec) {
+    return bip44_getClassification(pathSpec).prefix == BIP44_PREFIX_POOL_COLD_KEY;
+}
+
+// /1694'/1815'
+bool bip44_hasCVoteKeyPrefix(const bip44_path_t* pathSpec) {
+    return bip44_getClassification(pathSpec).prefix == BIP44_PREFIX_CVOTE_KEY;
+}
+
+// stake keys
+bool bip44_isOrdinaryStakingKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_ORDINARY_STAKING_KEY;
+}
+
+// multisig stake keys
+bool bip44_isMultisigStakingKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_MULTISIG_STAKING_KEY;
+}
+
+bool bip44_isMultidelegationStakingKeyPath(const bip44_path_t* pathSpec) {
+    const bip44_path_type_t pathType = bip44_classifyPath(pathSpec);
+    return (pathType == PATH_ORDINARY_STAKING_KEY || pathType == PATH_MULTISIG_STAKING_KEY) &&
+           (bip44_getAddressValue(pathSpec) > 0);
+}
+
+bool bip44_isDRepKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_DREP_KEY;
+}
+
+bool bip44_isCommitteeColdKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_COMMITTEE_COLD_KEY;
+}
+
+bool bip44_isCommitteeHotKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_COMMITTEE_HOT_KEY;
+}
+
+bool bip44_isMintKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_MINT_KEY;
+}
+
+bool bip44_isPoolColdKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_POOL_COLD_KEY;
+}
+
+bool bip44_isCVoteKeyPath(const bip44_path_t* pathSpec) {
+    return bip44_classifyPath(pathSpec) == PATH_CVOTE_KEY;
+}
+
+// returns the length of the resulting string
+size_t bip44_printToStr(const bip44_path_t* pathSpec, char* out, size_t outSize) {
+    ASSERT(outSize < BUFFER_SIZE_PARANOIA);
+    // we need space for the terminating \0
+    // and one more byte to check whether
+    // everything was printed
+    ASSERT(outSize >= BIP44_PATH_STRING_SIZE_MAX + 1);
+    char* ptr = out;
+    char* end = (out + outSize);
+
+#define WRITE(fmt, ...)                                                               \
+    {                                                                                 \
+        ASSERT(ptr <= end);                                                           \
+        STATIC_ASSERT(sizeof(end - ptr) == sizeof(size_t), "bad size_t size");        \
+        size_t availableSize = (size_t)(end - ptr);                                   \
+        /* Note(ppershing): We do not bother checking return */                       \
+        /* value of snprintf as it always returns 0. */                               \
+        /* Go figure ... */                                                           \
+        snprintf(ptr, availableSize, fmt, ##__VA_ARGS__);                             \
+        size_t res = strlen(ptr);                                                     \
+        /* if snprintf filled all the remaining space, there is no space for '\0', */ \
+        /* or the information is not displayed in full, */                            \
+        /* and that's a serious security risk */                                      \
+        ASSERT(res + 1 < availableSize);                                              \
+        ptr += res;                                                                   \
+    }
+
+    WRITE("m");
+
+    ASSERT(pathSpec->length <= ARRAY_LEN(pathSpec->path));
+
+    for (size_t i = 0; i < pathSpec->length; i++) {
+        const uint32_t value = pathSpec->path[i];
+
+        if (isHardened(value)) {
+            WRITE("/%u'", unharden(value));
+        } else {
+            WRITE("/%u", value);
+        }
+    }
+#undef WRITE
+    ASSERT(ptr >= out);
+    ASSERT(ptr + 1 < end);
+
+    return ptr - out;
+}
+
+bip44_path_type_t bip44_classifyPath(const bip44_path_t* pathSpec) {
+    return (bip44_path_type_t) bip44_getClassification(pathSpec).type;
+}
+
+bool bip44_isPathReasonable(const bip44_path_t* pathSpec) {
+    const bip44_path_classification_t classification = bip44_getClassification(pathSpec);
+    // we are not supposed to call this for invalid paths
+    ASSERT(classification.type != PATH_INVALID);
+    return classification.isReasonable;
 }
 
 void bip44_pathToKeyHash(const bip44_path_t* pathSpec, uint8_t* hash, size_t hashSize) {
@@ -8,9 +8,71 @@
 // plus ' for hardened plus / as a separator, plus the initial m and '\0'
 #define BIP44_PATH_STRING_SIZE_MAX (1 + 12 * BIP44_MAX_PATH_ELEMENTS + 1)
 
+typedef enum {
+    // hd wallet account
+    PATH_ORDINARY_ACCOUNT,
+    PATH_MULTISIG_ACCOUNT,
+
+    // hd wallet address (payment part in shelley)
+    PATH_ORDINARY_PAYMENT_KEY,
+    PATH_MULTISIG_PAYMENT_KEY,
+
+    // hd wallet reward address, withdrawal witness, pool owner
+    PATH_ORDINARY_STAKING_KEY,
+    PATH_MULTISIG_STAKING_KEY,
+
+    // DRep key
+    // m / 1852' / 1815' / account' / 3 / address_index
+    PATH_DREP_KEY,
+
+    // constitutional committee hot key
+    // m / 1852' / 1815' / account' / 4 / address_index
+    PATH_COMMITTEE_COLD_KEY,
+    // constitutional committee cold key
+    // m / 1852' / 1815' / account' / 5 / address_index
+    PATH_COMMITTEE_HOT_KEY,
+
+    // native token minting/burning
+    PATH_MINT_KEY,
+
+    // pool cold key in pool registrations and retirements
+    PATH_POOL_COLD_KEY,
+
+    // cip36 voting, incl. Catalyst
+    PATH_CVOTE_ACCOUNT,
+    PATH_CVOTE_KEY,
+
+    // none of the above
+    PATH_INVALID,
+} bip44_path_type_t;
+
+typedef enum {
+    BIP44_PREFIX_NONE,
+    BIP44_PREFIX_BYRON,          // /44'/1815'
+    BIP44_PREFIX_SHELLEY,        // /1852'/1815'
+    BIP44_PREFIX_MULTISIG,       // /1854'/1815'
+    BIP44_PREFIX_MINT,           // /1855'/1815'
+    BIP44_PREFIX_POOL_COLD_KEY,  // /1853'/1815'
+    BIP44_PREFIX_CVOTE_KEY,      // /1694'/1815'
+} bip44_prefix_t;
+
+// marks a classification computed from the current path elements
+#define BIP44_CLASSIFICATION_TAG 0xA5
+
+// Computed once by bip44_classify so that the bip44_has*Prefix and bip44_is*
+// predicates do not re-inspect the path elements;
+// the account, chain and address are read directly from the path
+typedef struct {
+    uint8_t tag;
+    uint8_t prefix;        // bip44_prefix_t
+    uint8_t type;          // bip44_path_type_t
+    uint8_t isReasonable;  // only meaningful for valid paths
+} bip44_path_classification_t;
+
 typedef struct {
     uint32_t path[BIP44_MAX_PATH_ELEMENTS];
     uint32_t length;
+    bip44_path_classification_t classification;
 } bip44_path_t;
 
 static const uint32_t PURPOSE_BYRON = 44;
@@ -34,6 +96,10 @@ uint32_t unharden(uint32_t value);
 bool bip44_check_path(bip44_path_t* pathSpec, const uint8_t* dataBuffer, size_t dataSize);
 size_t bip44_parseFromWire(bip44_path_t* pathSpec, const uint8_t* dataBuffer, size_t dataSize);
 
+// must be called whenever the path elements are set other than by bip44_parseFromWire;
+// in DEVEL builds, reading a stale classification fails an ASSERT
+void bip44_classify(bip44_path_t* pathSpec);
+
 // Indexes into pathSpec
 enum {
     // wallet keys:
@@ -87,44 +153,6 @@ bool bip44_isCVoteKeyPath(const bip44_path_t* pathSpec);
 
 size_t bip44_printToStr(const bip44_path_t*, char* out, size_t outSize);
 
-typedef enum {
-    // hd wallet account
-    PATH_ORDINARY_ACCOUNT,
-    PATH_MULTISIG_ACCOUNT,
-
-    // hd wallet address (payment part in shelley)
-    PATH_ORDINARY_PAYMENT_KEY,
-    PATH_MULTISIG_PAYMENT_KEY,
-
-    // hd wallet reward address, withdrawal witness, pool owner
-    PATH_ORDINARY_STAKING_KEY,
-    PATH_MULTISIG_STAKING_KEY,
-
-    // DRep key
-    // m / 1852' / 1815' / account' / 3 / address_index
-    PATH_DREP_KEY,
-
-    // constitutional committee hot key
-    // m / 1852' / 1815' / account' / 4 / address_index
-    PATH_COMMITTEE_COLD_KEY,
-    // constitutional committee cold key
-    // m / 1852' / 1815' / account' / 5 / address_index
-    PATH_COMMITTEE_HOT_KEY,
-
-    // native token minting/burning
-    PATH_MINT_KEY,
-
-    // pool cold key in pool registrations and retirements
-    PATH_POOL_COLD_KEY,
-
-    // cip36 voting, incl. Catalyst
-    PATH_CVOTE_ACCOUNT,
-    PATH_CVOTE_KEY,
-
-    // none of the above
-    PATH_INVALID,
-} bip44_path_type_t;
-
 bip44_path_type_t bip44_classifyPath(const bip44_path_t* pathSpec);
 
 bool bip44_isPathReasonable(const bip44_path_t* pathSpec);
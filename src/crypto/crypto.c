@@ -21,6 +21,8 @@
 #include "cx.h"
 #include "os.h"
 
+#include "crypto.h"
+
 static cx_err_t crypto_init_privkey(const uint32_t* path,
                                     size_t path_len,
                                     cx_ecfp_256_extended_private_key_t* privkey,
@@ -50,6 +52,20 @@ end:
     return error;
 }
 
+// Public key of an extended private key, in the 65-byte (uncompressed) form
+static cx_err_t crypto_privkey_to_pubkey(const cx_ecfp_256_extended_private_key_t* privkey,
+                                         cx_ecfp_256_public_key_t* pubkey) {
+    // Do not use cx_ecfp_generate_pair2_no_throw as it doesn't
+    // support 64 bytes for CX_CURVE_Ed25519 curve
+    return cx_eddsa_get_public_key_no_throw((const struct cx_ecfp_256_private_key_s*) privkey,
+                                            CX_SHA512,
+                                            pubkey,
+                                            NULL,
+                                            0,
+                                            NULL,
+                                            0);
+}
+
 WARN_UNUSED_RESULT cx_err_t crypto_get_pubkey(const uint32_t* path,
                                               size_t path_len,
                                               uint8_t raw_pubkey[static 65],
@@ -63,15 +79,7 @@ WARN_UNUSED_RESULT cx_err_t crypto_get_pubkey(const uint32_t* path,
     CX_CHECK(crypto_init_privkey(path, path_len, &privkey, chain_code));
 
     // Generate associated pubkey
-    // Do not use cx_ecfp_generate_pair2_no_throw as it doesn't
-    // support 64 bytes for CX_CURVE_Ed25519 curve
-    CX_CHECK(cx_eddsa_get_public_key_no_throw((const struct cx_ecfp_256_private_key_s*) &privkey,
-                                              CX_SHA512,
-                                              &pubkey,
-                                              NULL,
-                                              0,
-                                              NULL,
-                                              0));
+    CX_CHECK(crypto_privkey_to_pubkey(&privkey, &pubkey));
 
     // Check pubkey length then copy it to raw_pubkey
     if (pubkey.W_len != 65) {
@@ -131,3 +139,166 @@ end:
     }
     return error;
 }
+
+static cx_err_t crypto_hmac_sha512(const uint8_t* key,
+                                   size_t key_len,
+                                   const uint8_t* data,
+                                   size_t data_len,
+                                   uint8_t mac[static CX_SHA512_SIZE]) {
+    cx_err_t error = CX_OK;
+    cx_hmac_sha512_t hmac;
+
+    CX_CHECK(cx_hmac_sha512_init_no_throw(&hmac, key, key_len));
+    CX_CHECK(cx_hmac_no_throw((cx_hmac_t*) &hmac, CX_LAST, data, data_len, mac, CX_SHA512_SIZE));
+
+end:
+    explicit_bzero(&hmac, sizeof(hmac));
+    return error;
+}
+
+// Non-hardened child of an Ed25519 BIP32 (Khovratovich-Law) extended private key,
+// i.e. the derivation os_derive_bip32_no_throw does for a non-hardened path element:
+//   Z = HMAC-SHA512(c, 0x02 || A || index), c' = right half of HMAC-SHA512(c, 0x03 || A || index)
+//   kL' = kL + 8 * ZL[0..28), kR' = kR + ZR mod 2^256
+// with A the compressed public key, index and the integers little endian.
+static cx_err_t crypto_derive_soft_child(cx_ecfp_256_extended_private_key_t* privkey,
+                                         uint8_t chain_code[static 32],
+                                         uint32_t index) {
+    cx_err_t error = CX_OK;
+    cx_ecfp_256_public_key_t pubkey;
+    uint8_t data[1 + 32 + 4];
+    uint8_t z[64];
+    uint8_t next_chain_code[64];
+
+    if (index >= 0x80000000u) {
+        error = CX_INVALID_PARAMETER_VALUE;
+        goto end;
+    }
+
+    CX_CHECK(crypto_privkey_to_pubkey(privkey, &pubkey));
+    if (pubkey.W_len != 65) {
+        error = CX_EC_INVALID_CURVE;
+        goto end;
+    }
+    // compressed point: y little endian, the top bit is the parity of x
+    for (size_t i = 0; i < 32; i++) {
+        data[1 + i] = pubkey.W[64 - i];
+    }
+    if ((pubkey.W[32] & 1) != 0) {
+        data[32] |= 0x80;
+    }
+    for (size_t i = 0; i < 4; i++) {
+        data[33 + i] = (uint8_t) (index >> (8 * i));
+    }
+
+    data[0] = 0x02;
+    CX_CHECK(crypto_hmac_sha512(chain_code, 32, data, sizeof(data), z));
+    data[0] = 0x03;
+    CX_CHECK(crypto_hmac_sha512(chain_code, 32, data, sizeof(data), next_chain_code));
+
+    {
+        uint8_t* kl = privkey->d;
+        uint8_t* kr = privkey->d + 32;
+        unsigned int carry = 0;
+        // 8 * ZL[0..28) has 29 bytes, the carry out of kL is discarded (it cannot happen
+        // for keys derived from a seed, kL stays below 2^255)
+        for (size_t i = 0; i < 32; i++) {
+            unsigned int zl8 = 0;
+            if (i < 28) {
+                zl8 |= (unsigned int) z[i] << 3;
+            }
+            if (i > 0 && i <= 28) {
+                zl8 |= z[i - 1] >> 5;
+            }
+            carry += kl[i] + (zl8 & 0xff);
+            kl[i] = (uint8_t) carry;
+            carry >>= 8;
+        }
+        carry = 0;
+        for (size_t i = 0; i < 32; i++) {
+            carry += kr[i] + z[32 + i];
+            kr[i] = (uint8_t) carry;
+            carry >>= 8;
+        }
+    }
+    memmove(chain_code, next_chain_code + 32, 32);
+
+end:
+    explicit_bzero(z, sizeof(z));
+    explicit_bzero(next_chain_code, sizeof(next_chain_code));
+
+    if (error != CX_OK) {
+        explicit_bzero(privkey, sizeof(cx_ecfp_256_extended_private_key_t));
+        explicit_bzero(chain_code, 32);
+    }
+    return error;
+}
+
+// 3 hardened levels followed by 2 non-hardened ones, e.g. 1852'/1815'/account'/role/index
+static bool crypto_is_account_child_path(const uint32_t* path, size_t path_len) {
+    if (path_len != CRYPTO_ACCOUNT_PATH_LENGTH + 2) {
+        return false;
+    }
+    for (size_t i = 0; i < path_len; i++) {
+        const bool hardened = (path[i] & 0x80000000u) != 0;
+        if (hardened != (i < CRYPTO_ACCOUNT_PATH_LENGTH)) {
+            return false;
+        }
+    }
+    return true;
+}
+
+WARN_UNUSED_RESULT cx_err_t crypto_eddsa_sign_with_account_key(crypto_account_key_t* account_key,
+                                                               const uint32_t* path,
+                                                               size_t path_len,
+                                                               const uint8_t* hash,
+                                                               size_t hash_len,
+                                                               uint8_t* sig,
+                                                               size_t* sig_len) {
+    if (!crypto_is_account_child_path(path, path_len)) {
+        return crypto_eddsa_sign(path, path_len, hash, hash_len, sig, sig_len);
+    }
+
+    cx_err_t error = CX_OK;
+    cx_ecfp_256_extended_private_key_t privkey;
+    uint8_t chain_code[32];
+    size_t size;
+    size_t buf_len = *sig_len;
+
+    if (!account_key->is_valid ||
+        memcmp(account_key->path, path, sizeof(account_key->path)) != 0) {
+        crypto_account_key_wipe(account_key);
+        CX_CHECK(crypto_init_privkey(path,
+                                     CRYPTO_ACCOUNT_PATH_LENGTH,
+                                     &account_key->privkey,
+                                     account_key->chain_code));
+        memmove(account_key->path, path, sizeof(account_key->path));
+        account_key->is_valid = true;
+    }
+
+    memmove(&privkey, &account_key->privkey, sizeof(privkey));
+    memmove(chain_code, account_key->chain_code, sizeof(chain_code));
+    for (size_t i = CRYPTO_ACCOUNT_PATH_LENGTH; i < path_len; i++) {
+        CX_CHECK(crypto_derive_soft_child(&privkey, chain_code, path[i]));
+    }
+
+    CX_CHECK(cx_eddsa_sign_no_throw((const struct cx_ecfp_256_private_key_s*) &privkey,
+                                    CX_SHA512,
+                                    hash,
+                                    hash_len,
+                                    sig,
+                                    *sig_len));
+
+    CX_CHECK(cx_ecdomain_parameters_length(CX_CURVE_Ed25519, &size));
+    *sig_len = size * 2;
+
+end:
+    explicit_bzero(&privkey, sizeof(privkey));
+    explicit_bzero(chain_code, sizeof(chain_code));
+
+    if (error != CX_OK) {
+        crypto_account_key_wipe(account_key);
+        explicit_bzero(sig, buf_len);
+    }
+    return error;
+}
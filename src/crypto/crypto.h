@@ -1,6 +1,8 @@
 #pragma once
 
-#include <stdint.h>  // uint*_t
+#include <stdint.h>   // uint*_t
+#include <stdbool.h>  // bool
+#include <string.h>   // explicit_bzero
 
 #include "os.h"
 #include "cx.h"
@@ -16,3 +18,30 @@ WARN_UNUSED_RESULT cx_err_t crypto_eddsa_sign(const uint32_t* path,
                                               size_t hash_len,
                                               uint8_t* sig,
                                               size_t* sig_len);
+
+// hardened levels of an account, e.g. 1852'/1815'/account'
+#define CRYPTO_ACCOUNT_PATH_LENGTH 3
+
+// Extended private key of an account, kept while several keys of the account are needed
+// (must be wiped with crypto_account_key_wipe as soon as it is not)
+typedef struct {
+    bool is_valid;
+    uint32_t path[CRYPTO_ACCOUNT_PATH_LENGTH];
+    cx_ecfp_256_extended_private_key_t privkey;
+    uint8_t chain_code[32];
+} crypto_account_key_t;
+
+static inline void crypto_account_key_wipe(crypto_account_key_t* account_key) {
+    explicit_bzero(account_key, sizeof(*account_key));
+}
+
+// Same as crypto_eddsa_sign; for paths made of 3 hardened and 2 non-hardened levels,
+// the account key is derived once (and stored in account_key) and only the last two
+// levels are derived for each signature
+WARN_UNUSED_RESULT cx_err_t crypto_eddsa_sign_with_account_key(crypto_account_key_t* account_key,
+                                                               const uint32_t* path,
+                                                               size_t path_len,
+                                                               const uint8_t* hash,
+                                                               size_t hash_len,
+                                                               uint8_t* sig,
+                                                               size_t* sig_len);
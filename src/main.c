@@ -161,6 +161,9 @@ void app_main(void) {
                     if (e >= _ERR_AUTORESPOND_START && e < _ERR_AUTORESPOND_END) {
                         io_send_buf(e, NULL, 0);
                         flags = IO_ASYNCH_REPLY;
+                        // the instruction is aborted, its data (e.g. cached keys) must not
+                        // stay in memory until the next instruction
+                        explicit_bzero(&instructionState, SIZEOF(instructionState));
 #ifdef HAVE_NBGL
                         if (e != ERR_REJECTED_BY_USER) {
                             ui_idle();
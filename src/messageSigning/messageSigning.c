@@ -57,6 +57,48 @@ void getWitness(bip44_path_t* pathSpec,
 #endif
 }
 
+// same as getWitness, the account key is cached in accountKey
+// and reused for the following witnesses of the same account
+void getWitnessWithAccountKey(bip44_path_t* pathSpec,
+                              crypto_account_key_t* accountKey,
+                              const uint8_t* hashBuffer,
+                              size_t hashSize,
+                              uint8_t* outBuffer,
+                              size_t outSize) {
+    size_t sigLen = outSize;
+
+    ASSERT(hashSize < BUFFER_SIZE_PARANOIA);
+    ASSERT(sigLen == ED25519_SIGNATURE_LENGTH);
+
+    // Sanity check
+    ASSERT(pathSpec->length <= ARRAY_LEN(pathSpec->path));
+
+    // if the path is invalid, it's a bug in previous validation
+    ASSERT(policyForDerivePrivateKey(pathSpec) != POLICY_DENY);
+
+#ifndef FUZZING
+    {
+        TRACE("signing with path:");
+        BIP44_PRINTF(pathSpec);
+        PRINTF("\n");
+
+        cx_err_t error = crypto_eddsa_sign_with_account_key(accountKey,
+                                                            pathSpec->path,
+                                                            pathSpec->length,
+                                                            hashBuffer,
+                                                            hashSize,
+                                                            outBuffer,
+                                                            &sigLen);
+        if (error != CX_OK) {
+            PRINTF("error: %d", error);
+            ASSERT(false);
+        }
+    }
+#endif
+
+    ASSERT(sigLen == ED25519_SIGNATURE_LENGTH);
+}
+
 void getCVoteRegistrationSignature(bip44_path_t* pathSpec,
                                    const uint8_t* payloadHashBuffer,
                                    size_t payloadHashSize,
@@ -2,6 +2,7 @@
 #define H_CARDANO_APP_MESSAGE_SIGNING
 
 #include "bip44.h"
+#include "crypto.h"
 
 void signRawMessageWithPath(bip44_path_t* pathSpec,
                             const uint8_t* messageBuffer,
@@ -15,6 +16,13 @@ void getWitness(bip44_path_t* pathSpec,
                 uint8_t* outBuffer,
                 size_t outSize);
 
+void getWitnessWithAccountKey(bip44_path_t* pathSpec,
+                              crypto_account_key_t* accountKey,
+                              const uint8_t* hashBuffer,
+                              size_t hashSize,
+                              uint8_t* outBuffer,
+                              size_t outSize);
+
 void getCVoteRegistrationSignature(bip44_path_t* pathSpec,
                                    const uint8_t* payloadHashBuffer,
                                    size_t payloadHashSize,
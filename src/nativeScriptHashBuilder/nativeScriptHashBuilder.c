@@ -13,11 +13,17 @@
 #define _TRACE_BUFFER(...)
 #endif  // TRACE_NATIVE_SCRIPT_HASH_BUILDER
 
-#define APPEND_CBOR(type, value) \
-    blake2b_224_append_cbor_data(&builder->nativeScriptHash, type, value)
 #define APPEND_BUFFER(buffer, size) \
     blake2b_224_append_buffer_data(&builder->nativeScriptHash, buffer, size)
 
+// all tokens of a script are collected in a local batch and hashed in one update
+#define BATCH_INIT()    \
+    cbor_batch_t batch; \
+    cbor_batch_init(&batch)
+#define BATCH_CBOR(type, value)    cbor_batch_appendToken(&batch, type, value)
+#define BATCH_BUFFER(buffer, size) cbor_batch_appendData(&batch, buffer, size)
+#define APPEND_BATCH()             blake2b_224_append_batch_data(&builder->nativeScriptHash, &batch)
+
 static void blake2b_224_append_buffer_data(blake2b_224_context_t* hashCtx,
                                            const uint8_t* buffer,
                                            size_t size) {
@@ -25,13 +31,10 @@ static void blake2b_224_append_buffer_data(blake2b_224_context_t* hashCtx,
     blake2b_224_append(hashCtx, buffer, size);
 }
 
-__noinline_due_to_stack__ static void blake2b_224_append_cbor_data(blake2b_224_context_t* hashCtx,
-                                                                   uint8_t type,
-                                                                   uint64_t value) {
-    uint8_t buffer[10] = {0};
-    size_t size = cbor_writeToken(type, value, buffer, SIZEOF(buffer));
-    _TRACE_BUFFER(buffer, size);
-    blake2b_224_append(hashCtx, buffer, size);
+static void blake2b_224_append_batch_data(blake2b_224_context_t* hashCtx, cbor_batch_t* batch) {
+    _TRACE_BUFFER(batch->buffer, batch->size);
+    blake2b_224_append(hashCtx, batch->buffer, batch->size);
+    cbor_batch_init(batch);
 }
 
 static inline void advanceState(native_script_hash_builder_t* builder) {
@@ -101,9 +104,11 @@ void nativeScriptHashBuilder_init(native_script_hash_builder_t* builder) {
         /*       // entries added later */                                                        \
         /*    ], */                                                                               \
         /* ] */                                                                                   \
-        APPEND_CBOR(CBOR_TYPE_ARRAY, 2);                                                          \
-        APPEND_CBOR(CBOR_TYPE_UNSIGNED, type);                                                    \
-        APPEND_CBOR(CBOR_TYPE_ARRAY, remainingScripts);                                           \
+        BATCH_INIT();                                                                             \
+        BATCH_CBOR(CBOR_TYPE_ARRAY, 2);                                                           \
+        BATCH_CBOR(CBOR_TYPE_UNSIGNED, type);                                                     \
+        BATCH_CBOR(CBOR_TYPE_ARRAY, remainingScripts);                                            \
+        APPEND_BATCH();                                                                           \
                                                                                                   \
         builder->level++;                                                                         \
         builder->remainingScripts[builder->level] = remainingScripts;                             \
@@ -133,10 +138,12 @@ void nativeScriptHashBuilder_startComplexScript_n_of_k(native_script_hash_builde
     //       // entries added later
     //    ],
     // ]
-    APPEND_CBOR(CBOR_TYPE_ARRAY, 3);
-    APPEND_CBOR(CBOR_TYPE_UNSIGNED, NATIVE_SCRIPT_N_OF_K);
-    APPEND_CBOR(CBOR_TYPE_UNSIGNED, requiredScripts);
-    APPEND_CBOR(CBOR_TYPE_ARRAY, remainingScripts);
+    BATCH_INIT();
+    BATCH_CBOR(CBOR_TYPE_ARRAY, 3);
+    BATCH_CBOR(CBOR_TYPE_UNSIGNED, NATIVE_SCRIPT_N_OF_K);
+    BATCH_CBOR(CBOR_TYPE_UNSIGNED, requiredScripts);
+    BATCH_CBOR(CBOR_TYPE_ARRAY, remainingScripts);
+    APPEND_BATCH();
 
     builder->level++;
     builder->remainingScripts[builder->level] = remainingScripts;
@@ -159,10 +166,12 @@ void nativeScriptHashBuilder_addScript_pubkey(native_script_hash_builder_t* buil
     //    Unsigned[native script type = 0],
     //    Bytes[pubKeyHash],
     // ]
-    APPEND_CBOR(CBOR_TYPE_ARRAY, 2);
-    APPEND_CBOR(CBOR_TYPE_UNSIGNED, NATIVE_SCRIPT_PUBKEY);
-    APPEND_CBOR(CBOR_TYPE_BYTES, pubKeyHashSize);
-    APPEND_BUFFER(pubKeyHashBuffer, pubKeyHashSize);
+    BATCH_INIT();
+    BATCH_CBOR(CBOR_TYPE_ARRAY, 2);
+    BATCH_CBOR(CBOR_TYPE_UNSIGNED, NATIVE_SCRIPT_PUBKEY);
+    BATCH_CBOR(CBOR_TYPE_BYTES, pubKeyHashSize);
+    BATCH_BUFFER(pubKeyHashBuffer, pubKeyHashSize);
+    APPEND_BATCH();
 
     simpleScriptFinished(builder);
     advanceState(builder);
@@ -179,9 +188,11 @@ void nativeScriptHashBuilder_addScript_pubkey(native_script_hash_builder_t* buil
         /*    Unsigned[native script type], */                                           \
         /*    Unsigned[timelock], */                                                     \
         /* ] */                                                                          \
-        APPEND_CBOR(CBOR_TYPE_ARRAY, 2);                                                 \
-        APPEND_CBOR(CBOR_TYPE_UNSIGNED, type);                                           \
-        APPEND_CBOR(CBOR_TYPE_UNSIGNED, timelock);                                       \
+        BATCH_INIT();                                                                    \
+        BATCH_CBOR(CBOR_TYPE_ARRAY, 2);                                                  \
+        BATCH_CBOR(CBOR_TYPE_UNSIGNED, type);                                            \
+        BATCH_CBOR(CBOR_TYPE_UNSIGNED, timelock);                                        \
+        APPEND_BATCH();                                                                  \
                                                                                          \
         simpleScriptFinished(builder);                                                   \
         advanceState(builder);                                                           \
@@ -204,8 +215,11 @@ void nativeScriptHashBuilder_finalize(native_script_hash_builder_t* builder,
     blake2b_224_finalize(&builder->nativeScriptHash, outBuffer, outSize);
 }
 
+#undef APPEND_BATCH
+#undef BATCH_BUFFER
+#undef BATCH_CBOR
+#undef BATCH_INIT
 #undef APPEND_BUFFER
-#undef APPEND_CBOR
 #undef _TRACE_BUFFER
 #undef _TRACE
 
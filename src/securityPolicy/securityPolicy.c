@@ -78,143 +78,200 @@ static address_type_t getDestinationAddressType(const tx_output_destination_t* d
 #define SHOW_UNLESS(expr) \
     if (!(expr)) return POLICY_SHOW_BEFORE_RESPONSE;
 
-security_policy_t policyForDerivePrivateKey(const bip44_path_t* path) {
-    switch (bip44_classifyPath(path)) {
-        case PATH_ORDINARY_ACCOUNT:
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_ORDINARY_STAKING_KEY:
-
-        case PATH_MULTISIG_ACCOUNT:
-        case PATH_MULTISIG_PAYMENT_KEY:
-        case PATH_MULTISIG_STAKING_KEY:
+// decision tables
+
+// A rule gives the policy of an item from its kind (the type of its path, or the signing mode):
+// the checks below are applied in the order DENY > WARN > PROMPT/SHOW > ALLOW
+// and the result of the rule is returned if none of them applies.
+// Kinds without a rule (zero) are denied.
+typedef uint16_t policy_rule_t;
+
+enum {
+    // result
+    RULE_DENY = 0,
+    RULE_ALLOW = 1,
+    RULE_SHOW = 2,
+    RULE_PROMPT = 3,
+    RULE_SHOW_IF_EXPERT = 4,    // shown in expert mode, allowed otherwise
+    RULE_PROMPT_IF_EXPERT = 5,  // prompted in expert mode, allowed otherwise
+    RULE_RESULT_MASK = 0x07,
+
+    // checks of a path
+    RULE_DENY_UNLESS_MINT = 1 << 3,
+    RULE_DENY_UNLESS_POOL_OWNER = 1 << 4,
+    RULE_DENY_UNLESS_SHELLEY = 1 << 5,
+    RULE_DENY_OTHER_ACCOUNT = 1 << 6,
+    RULE_WARN_UNLESS_REASONABLE = 1 << 7,
+    RULE_PROMPT_UNLESS_SHELLEY = 1 << 8,
+};
+
+// rules indexed by bip44_path_type_t
+typedef policy_rule_t path_rules_t[PATH_INVALID + 1];
+
+// rules indexed by sign_tx_signingmode_t, starting from SIGN_TX_SIGNINGMODE_ORDINARY_TX
+#define SIGNING_MODE_RULE(mode) [(mode) - SIGN_TX_SIGNINGMODE_ORDINARY_TX]
+typedef policy_rule_t signing_mode_rules_t[SIGN_TX_SIGNINGMODE_PLUTUS_TX -
+                                           SIGN_TX_SIGNINGMODE_ORDINARY_TX + 1];
+
+static security_policy_t _policyForRuleResult(policy_rule_t rule) {
+    switch (rule & RULE_RESULT_MASK) {
+        case RULE_DENY:
+            DENY();
+            break;
 
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
+        case RULE_ALLOW:
+            ALLOW();
+            break;
 
-        case PATH_MINT_KEY:
+        case RULE_SHOW:
+            SHOW();
+            break;
 
-        case PATH_POOL_COLD_KEY:
+        case RULE_PROMPT:
+            PROMPT();
+            break;
 
-        case PATH_CVOTE_ACCOUNT:
-        case PATH_CVOTE_KEY:
+        case RULE_SHOW_IF_EXPERT:
+            SHOW_IF(app_mode_expert());
+            ALLOW();
+            break;
 
+        case RULE_PROMPT_IF_EXPERT:
+            PROMPT_IF(app_mode_expert());
             ALLOW();
             break;
 
         default:
-            DENY();
-            break;
+            ASSERT(false);
     }
 
     DENY();  // should not be reached
 }
 
-// Initiate getting extended public key or extended public key bulk
-security_policy_t policyForGetPublicKeysInit(uint32_t numPaths) {
-    // in a bulk key export, some keys are hidden, the user must be notified
-    PROMPT_IF(numPaths > 1);
+// the path is classified once, the other checks are done only if the rule requires them
+static security_policy_t _policyForPath(const path_rules_t rules,
+                                        const bip44_path_t* path,
+                                        bool mintPresent,
+                                        const bip44_path_t* poolOwnerPath) {
+    const bip44_path_type_t pathType = bip44_classifyPath(path);
+    ASSERT(pathType <= PATH_INVALID);
+    const policy_rule_t rule = rules[pathType];
 
-    // for a single key, the policy for displaying it is determined later
-    ALLOW();
+    DENY_IF((rule & RULE_RESULT_MASK) == RULE_DENY);
+    DENY_IF((rule & RULE_DENY_UNLESS_MINT) && !mintPresent);
+    if (rule & RULE_DENY_UNLESS_POOL_OWNER) {
+        // without an owner given by path, the witness might witness owners given by key hash
+        DENY_IF(poolOwnerPath == NULL);
+        DENY_UNLESS(bip44_pathsEqual(path, poolOwnerPath));
+    }
+    DENY_IF((rule & RULE_DENY_UNLESS_SHELLEY) && !bip44_hasShelleyPrefix(path));
+    DENY_IF((rule & RULE_DENY_OTHER_ACCOUNT) && violatesSingleAccountOrStoreIt(path));
+
+    WARN_IF((rule & RULE_WARN_UNLESS_REASONABLE) && !bip44_isPathReasonable(path));
+
+    PROMPT_IF((rule & RULE_PROMPT_UNLESS_SHELLEY) && !bip44_hasShelleyPrefix(path));
+
+    return _policyForRuleResult(rule);
 }
 
-// Get extended public key and return it to the host
-security_policy_t policyForGetExtendedPublicKey(const bip44_path_t* pathSpec) {
-    switch (bip44_classifyPath(pathSpec)) {
-        case PATH_ORDINARY_ACCOUNT:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // show Byron paths
-            PROMPT_UNLESS(bip44_hasShelleyPrefix(pathSpec));
+static security_policy_t _policyForSigningMode(const signing_mode_rules_t rules,
+                                               sign_tx_signingmode_t txSigningMode) {
+    ASSERT(txSigningMode >= SIGN_TX_SIGNINGMODE_ORDINARY_TX);
+    ASSERT(txSigningMode <= SIGN_TX_SIGNINGMODE_PLUTUS_TX);
 
-            // in expert mode, do not export keys without permission
-            PROMPT_IF(app_mode_expert());
-            // do not bother the user with confirmation --- required by LedgerLive to improve UX
-            ALLOW();
-            break;
+    return _policyForRuleResult(rules[txSigningMode - SIGN_TX_SIGNINGMODE_ORDINARY_TX]);
+}
 
-        case PATH_MULTISIG_ACCOUNT:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // ask for confirmation, multisig users need high awareness of what keys are being used
-            PROMPT();
-            break;
+static const path_rules_t DERIVE_PRIVATE_KEY_RULES = {
+    [PATH_ORDINARY_ACCOUNT] = RULE_ALLOW,
+    [PATH_ORDINARY_PAYMENT_KEY] = RULE_ALLOW,
+    [PATH_ORDINARY_STAKING_KEY] = RULE_ALLOW,
 
-        case PATH_MINT_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // used rarely, so making the user aware of the export does not hamper him
-            // but could be relaxed to expert mode if needed
-            PROMPT();
-            break;
+    [PATH_MULTISIG_ACCOUNT] = RULE_ALLOW,
+    [PATH_MULTISIG_PAYMENT_KEY] = RULE_ALLOW,
+    [PATH_MULTISIG_STAKING_KEY] = RULE_ALLOW,
 
-        case PATH_POOL_COLD_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // used rarely, so making the user aware of the export does not hamper him
-            // but could be relaxed to expert mode if needed
-            PROMPT();
-            break;
+    [PATH_DREP_KEY] = RULE_ALLOW,
+    [PATH_COMMITTEE_COLD_KEY] = RULE_ALLOW,
+    [PATH_COMMITTEE_HOT_KEY] = RULE_ALLOW,
 
-        case PATH_CVOTE_ACCOUNT:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
+    [PATH_MINT_KEY] = RULE_ALLOW,
 
-            // in expert mode, do not export keys without permission
-            PROMPT_IF(app_mode_expert());
-            // do not bother the user with confirmation, similar to ordinary account
-            ALLOW();
-            break;
+    [PATH_POOL_COLD_KEY] = RULE_ALLOW,
 
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_ORDINARY_STAKING_KEY:
-        case PATH_MULTISIG_PAYMENT_KEY:
-        case PATH_MULTISIG_STAKING_KEY:
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
-        case PATH_CVOTE_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // ask for permission (it is unusual if client asks this instead of the account key)
-            PROMPT();
-            break;
+    [PATH_CVOTE_ACCOUNT] = RULE_ALLOW,
+    [PATH_CVOTE_KEY] = RULE_ALLOW,
+};
 
-        default:
-            DENY();
-            break;
-    }
+security_policy_t policyForDerivePrivateKey(const bip44_path_t* path) {
+    return _policyForPath(DERIVE_PRIVATE_KEY_RULES, path, false, NULL);
+}
 
-    DENY();  // should not be reached
+// Initiate getting extended public key or extended public key bulk
+security_policy_t policyForGetPublicKeysInit(uint32_t numPaths) {
+    // in a bulk key export, some keys are hidden, the user must be notified
+    PROMPT_IF(numPaths > 1);
+
+    // for a single key, the policy for displaying it is determined later
+    ALLOW();
 }
 
-// Get extended public key and return it to the host within bulk key export
-security_policy_t policyForGetExtendedPublicKeyBulkExport(const bip44_path_t* pathSpec) {
-    switch (bip44_classifyPath(pathSpec)) {
-        case PATH_ORDINARY_ACCOUNT:
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_ORDINARY_STAKING_KEY:
-        case PATH_MULTISIG_ACCOUNT:
-        case PATH_MULTISIG_PAYMENT_KEY:
-        case PATH_MULTISIG_STAKING_KEY:
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
-        case PATH_MINT_KEY:
-        case PATH_CVOTE_ACCOUNT:
-        case PATH_CVOTE_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // we do not show these paths since there may be many of them
-            ALLOW();
-            break;
+static const path_rules_t GET_EXTENDED_PUBLIC_KEY_RULES = {
+    // show Byron paths
+    // in expert mode, do not export keys without permission
+    // otherwise do not bother the user with confirmation --- required by LedgerLive to improve UX
+    [PATH_ORDINARY_ACCOUNT] =
+        RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT_UNLESS_SHELLEY | RULE_PROMPT_IF_EXPERT,
 
-        case PATH_POOL_COLD_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(pathSpec));
-            // but ask for permission
-            PROMPT();
-            break;
+    // ask for confirmation, multisig users need high awareness of what keys are being used
+    [PATH_MULTISIG_ACCOUNT] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
 
-        default:
-            DENY();
-            break;
-    }
+    // used rarely, so making the user aware of the export does not hamper him
+    // but could be relaxed to expert mode if needed
+    [PATH_MINT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_POOL_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
 
-    DENY();  // should not be reached
+    // similar to ordinary account
+    [PATH_CVOTE_ACCOUNT] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT_IF_EXPERT,
+
+    // ask for permission (it is unusual if client asks this instead of the account key)
+    [PATH_ORDINARY_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_ORDINARY_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_MULTISIG_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_MULTISIG_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_DREP_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_COMMITTEE_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_COMMITTEE_HOT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+    [PATH_CVOTE_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+};
+
+// Get extended public key and return it to the host
+security_policy_t policyForGetExtendedPublicKey(const bip44_path_t* pathSpec) {
+    return _policyForPath(GET_EXTENDED_PUBLIC_KEY_RULES, pathSpec, false, NULL);
+}
+
+// we do not show these paths since there may be many of them
+static const path_rules_t GET_EXTENDED_PUBLIC_KEY_BULK_EXPORT_RULES = {
+    [PATH_ORDINARY_ACCOUNT] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_ORDINARY_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_ORDINARY_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_MULTISIG_ACCOUNT] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_MULTISIG_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_MULTISIG_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_DREP_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_COMMITTEE_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_COMMITTEE_HOT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_MINT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_CVOTE_ACCOUNT] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+    [PATH_CVOTE_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_ALLOW,
+
+    // but ask for permission
+    [PATH_POOL_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+};
+
+// Get extended public key and return it to the host within bulk key export
+security_policy_t policyForGetExtendedPublicKeyBulkExport(const bip44_path_t* pathSpec) {
+    return _policyForPath(GET_EXTENDED_PUBLIC_KEY_BULK_EXPORT_RULES, pathSpec, false, NULL);
 }
 
 // common policy for DENY and WARN cases in returnDeriveAddress and showDeriveAddress
@@ -438,28 +495,20 @@ security_policy_t policyForSignTxInit(sign_tx_signingmode_t txSigningMode,
     PROMPT();
 }
 
-// For each transaction UTxO input
-security_policy_t policyForSignTxInput(sign_tx_signingmode_t txSigningMode) {
-    switch (txSigningMode) {
-        case SIGN_TX_SIGNINGMODE_PLUTUS_TX:
-            // user should check inputs because they are not interchangeable for Plutus scripts
-            SHOW_IF(app_mode_expert());
-            ALLOW();
-            break;
-
-        case SIGN_TX_SIGNINGMODE_ORDINARY_TX:
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER:
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR:
-        case SIGN_TX_SIGNINGMODE_MULTISIG_TX:
-            // inputs are not interesting for the user (transferred funds are shown in the outputs)
-            ALLOW();
-            break;
+static const signing_mode_rules_t INPUT_RULES = {
+    // user should check inputs because they are not interchangeable for Plutus scripts
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_PLUTUS_TX) = RULE_SHOW_IF_EXPERT,
 
-        default:
-            ASSERT(false);
-    }
+    // inputs are not interesting for the user (transferred funds are shown in the outputs)
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_ORDINARY_TX) = RULE_ALLOW,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER) = RULE_ALLOW,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR) = RULE_ALLOW,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_MULTISIG_TX) = RULE_ALLOW,
+};
 
-    DENY();  // should not be reached
+// For each transaction UTxO input
+security_policy_t policyForSignTxInput(sign_tx_signingmode_t txSigningMode) {
+    return _policyForSigningMode(INPUT_RULES, txSigningMode);
 }
 
 static bool is_addressBytes_suitable_for_tx_output(const uint8_t* addressBuffer,
@@ -913,28 +962,21 @@ security_policy_t policyForSignTxCollateralOutputConfirm(security_policy_t outpu
     DENY();  // should not be reached
 }
 
+static const signing_mode_rules_t FEE_RULES = {
+    // always show the fee if it is paid by the signer
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR) = RULE_SHOW,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_ORDINARY_TX) = RULE_SHOW,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_MULTISIG_TX) = RULE_SHOW,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_PLUTUS_TX) = RULE_SHOW,
+
+    // fees are paid by the operator and are thus irrelevant for owners
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER) = RULE_ALLOW,
+};
+
 // For transaction fee
 security_policy_t policyForSignTxFee(sign_tx_signingmode_t txSigningMode,
                                      uint64_t fee MARK_UNUSED) {
-    switch (txSigningMode) {
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR:
-        case SIGN_TX_SIGNINGMODE_ORDINARY_TX:
-        case SIGN_TX_SIGNINGMODE_MULTISIG_TX:
-        case SIGN_TX_SIGNINGMODE_PLUTUS_TX:
-            // always show the fee if it is paid by the signer
-            SHOW();
-            break;
-
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER:
-            // fees are paid by the operator and are thus irrelevant for owners
-            ALLOW();
-            break;
-
-        default:
-            ASSERT(false);
-    }
-
-    DENY();  // should not be reached
+    return _policyForSigningMode(FEE_RULES, txSigningMode);
 }
 
 // For transaction TTL
@@ -1434,152 +1476,82 @@ security_policy_t policyForSignTxWithdrawal(sign_tx_signingmode_t txSigningMode,
 }
 
 // TODO move witness policies in the proper place, at the end of tx
-static inline security_policy_t _ordinaryWitnessPolicy(const bip44_path_t* path, bool mintPresent) {
-    switch (bip44_classifyPath(path)) {
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_ORDINARY_STAKING_KEY:
-            // ordinary key paths can be hidden if they are not unusual
-            // (the user saw all outputs not belonging to him, withdrawals and certificates,
-            // those belong to him in an ORDINARY txs thanks to
-            // keys being displayed by paths instead of hashes)
-            DENY_IF(violatesSingleAccountOrStoreIt(path));
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            SHOW_IF(app_mode_expert());
-            ALLOW();
-            break;
-
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
-            // used to sign certificates and voting procedures
-            // these won't occur often, so little benefit from hiding them
-            // better to show them at least while they are new
-            // in the future, we might want to hide some of them in non-expert mode
-            DENY_IF(violatesSingleAccountOrStoreIt(path));
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            SHOW();
-            break;
-
-        case PATH_POOL_COLD_KEY:
-            // could be hidden perhaps, but it's safer to let the user to know
-            // the SW wallet wants to sign with the stake pool key
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            SHOW();
-            break;
-
-        case PATH_MINT_KEY:
-            DENY_UNLESS(mintPresent);
-            // maybe not necessary, but let the user know which mint key is he using (eg. in case
-            // the minting policy contains multiple of his keys but with different rules)
-            SHOW();
-            break;
-
-        default:
-            // multisig keys forbidden
-            DENY();
-            break;
-    }
-}
-
-static inline security_policy_t _multisigWitnessPolicy(const bip44_path_t* path, bool mintPresent) {
-    switch (bip44_classifyPath(path)) {
-        case PATH_MULTISIG_PAYMENT_KEY:
-        case PATH_MULTISIG_STAKING_KEY:
-            // multisig key paths are allowed, but hiding them would make impossible for the user to
-            // distinguish what funds are being spent (multisig UTXOs sharing a signer are not
-            // necessarily interchangeable, because they may be governed by a different script)
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            SHOW();
-            break;
-
-        case PATH_MINT_KEY:
-            DENY_UNLESS(mintPresent);
-            // maybe not necessary, but let the user know which mint key is he using (eg. in case
-            // the minting policy contains multiple of his keys but with different rules)
-            SHOW();
-            break;
-
-        default:
-            // ordinary and pool cold keys forbidden
-            // DRep and committee keys forbidden
-            DENY();
-            break;
-    }
-}
-
-static inline security_policy_t _plutusWitnessPolicy(const bip44_path_t* path, bool mintPresent) {
-    switch (bip44_classifyPath(path)) {
-        // in PLUTUS_TX, we allow signing with any path, but it must be shown
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_ORDINARY_STAKING_KEY:
-        case PATH_MULTISIG_PAYMENT_KEY:
-        case PATH_MULTISIG_STAKING_KEY:
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            SHOW();
-            break;
-
-        case PATH_MINT_KEY:
-            // mint witness without mint in the tx: somewhat suspicious,
-            // no known usecase, but a mint path could be e.g. in required signers
-            SHOW_UNLESS(mintPresent);
-            // maybe not necessary, but let the user know which mint key is he using (e.g. in case
-            // the minting policy contains multiple of his keys but with different rules)
-            SHOW();
-            break;
-
-        case PATH_POOL_COLD_KEY:
-        default:
-            DENY();
-            break;
-    }
-}
+static const path_rules_t ORDINARY_WITNESS_RULES = {
+    // ordinary key paths can be hidden if they are not unusual
+    // (the user saw all outputs not belonging to him, withdrawals and certificates,
+    // those belong to him in an ORDINARY txs thanks to
+    // keys being displayed by paths instead of hashes)
+    [PATH_ORDINARY_PAYMENT_KEY] =
+        RULE_DENY_OTHER_ACCOUNT | RULE_WARN_UNLESS_REASONABLE | RULE_SHOW_IF_EXPERT,
+    [PATH_ORDINARY_STAKING_KEY] =
+        RULE_DENY_OTHER_ACCOUNT | RULE_WARN_UNLESS_REASONABLE | RULE_SHOW_IF_EXPERT,
+
+    // used to sign certificates and voting procedures
+    // these won't occur often, so little benefit from hiding them
+    // better to show them at least while they are new
+    // in the future, we might want to hide some of them in non-expert mode
+    [PATH_DREP_KEY] = RULE_DENY_OTHER_ACCOUNT | RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_COMMITTEE_COLD_KEY] = RULE_DENY_OTHER_ACCOUNT | RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_COMMITTEE_HOT_KEY] = RULE_DENY_OTHER_ACCOUNT | RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+
+    // could be hidden perhaps, but it's safer to let the user to know
+    // the SW wallet wants to sign with the stake pool key
+    [PATH_POOL_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+
+    // maybe not necessary, but let the user know which mint key is he using (eg. in case
+    // the minting policy contains multiple of his keys but with different rules)
+    [PATH_MINT_KEY] = RULE_DENY_UNLESS_MINT | RULE_SHOW,
+
+    // multisig keys forbidden
+};
+
+static const path_rules_t MULTISIG_WITNESS_RULES = {
+    // multisig key paths are allowed, but hiding them would make impossible for the user to
+    // distinguish what funds are being spent (multisig UTXOs sharing a signer are not
+    // necessarily interchangeable, because they may be governed by a different script)
+    [PATH_MULTISIG_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_MULTISIG_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+
+    // maybe not necessary, but let the user know which mint key is he using (eg. in case
+    // the minting policy contains multiple of his keys but with different rules)
+    [PATH_MINT_KEY] = RULE_DENY_UNLESS_MINT | RULE_SHOW,
+
+    // ordinary and pool cold keys forbidden
+    // DRep and committee keys forbidden
+};
+
+static const path_rules_t PLUTUS_WITNESS_RULES = {
+    // in PLUTUS_TX, we allow signing with any path, but it must be shown
+    [PATH_ORDINARY_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_ORDINARY_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_MULTISIG_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_MULTISIG_STAKING_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_DREP_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_COMMITTEE_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_COMMITTEE_HOT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+
+    // shown even without mint in the tx: somewhat suspicious, no known usecase,
+    // but a mint path could be e.g. in required signers
+    [PATH_MINT_KEY] = RULE_SHOW,
+
+    // pool cold keys forbidden
+};
 
 #ifdef APP_FEATURE_POOL_REGISTRATION
 
-static inline security_policy_t _poolRegistrationOwnerWitnessPolicy(
-    const bip44_path_t* witnessPath,
-    const bip44_path_t* poolOwnerPath) {
-    switch (bip44_classifyPath(witnessPath)) {
-        case PATH_ORDINARY_STAKING_KEY:
-            if (poolOwnerPath != NULL) {
-                // an owner was given by path
-                // the witness path must be identical
-                DENY_UNLESS(bip44_pathsEqual(witnessPath, poolOwnerPath));
-            } else {
-                // no owner was given by path
-                // we must not allow witnesses because they might witness owners given by key hash
-                DENY();
-            }
-            WARN_UNLESS(bip44_isPathReasonable(witnessPath));
-            SHOW();
-            break;
-
-        default:
-            DENY();
-            break;
-    }
-}
+static const path_rules_t POOL_REGISTRATION_OWNER_WITNESS_RULES = {
+    // the witness path must be identical to the owner given by path
+    [PATH_ORDINARY_STAKING_KEY] =
+        RULE_DENY_UNLESS_POOL_OWNER | RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+};
 
-static inline security_policy_t _poolRegistrationOperatorWitnessPolicy(const bip44_path_t* path) {
-    switch (bip44_classifyPath(path)) {
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_POOL_COLD_KEY:
-            // only ordinary payment key paths (because of inputs) and pool cold key path are
-            // allowed
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            // it might be safe to hide the witnesses, but txs related to stake pools
-            // are rare, so it would not help much and might introduce some unknown risk
-            SHOW();
-            break;
-
-        default:
-            DENY();
-            break;
-    }
-}
+static const path_rules_t POOL_REGISTRATION_OPERATOR_WITNESS_RULES = {
+    // only ordinary payment key paths (because of inputs) and pool cold key path are allowed
+    // it might be safe to hide the witnesses, but txs related to stake pools
+    // are rare, so it would not help much and might introduce some unknown risk
+    [PATH_ORDINARY_PAYMENT_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+    [PATH_POOL_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+};
 
 #endif  // APP_FEATURE_POOL_REGISTRATION
 
@@ -1593,21 +1565,27 @@ security_policy_t policyForSignTxWitness(sign_tx_signingmode_t txSigningMode,
                                          __attribute__((unused))) {
     switch (txSigningMode) {
         case SIGN_TX_SIGNINGMODE_ORDINARY_TX:
-            return _ordinaryWitnessPolicy(witnessPath, mintPresent);
+            return _policyForPath(ORDINARY_WITNESS_RULES, witnessPath, mintPresent, NULL);
 
         case SIGN_TX_SIGNINGMODE_MULTISIG_TX:
-            return _multisigWitnessPolicy(witnessPath, mintPresent);
+            return _policyForPath(MULTISIG_WITNESS_RULES, witnessPath, mintPresent, NULL);
 
         case SIGN_TX_SIGNINGMODE_PLUTUS_TX:
-            return _plutusWitnessPolicy(witnessPath, mintPresent);
+            return _policyForPath(PLUTUS_WITNESS_RULES, witnessPath, mintPresent, NULL);
 
 #ifdef APP_FEATURE_POOL_REGISTRATION
 
         case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER:
-            return _poolRegistrationOwnerWitnessPolicy(witnessPath, poolOwnerPath);
+            return _policyForPath(POOL_REGISTRATION_OWNER_WITNESS_RULES,
+                                  witnessPath,
+                                  mintPresent,
+                                  poolOwnerPath);
 
         case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR:
-            return _poolRegistrationOperatorWitnessPolicy(witnessPath);
+            return _policyForPath(POOL_REGISTRATION_OPERATOR_WITNESS_RULES,
+                                  witnessPath,
+                                  mintPresent,
+                                  NULL);
 
 #endif  // APP_FEATURE_POOL_REGISTRATION
 
@@ -1682,26 +1660,18 @@ security_policy_t policyForSignTxMintConfirm(security_policy_t mintInitPolicy) {
     DENY();  // should not be reached
 }
 
-// For transaction script data hash
-security_policy_t policyForSignTxScriptDataHash(const sign_tx_signingmode_t txSigningMode) {
-    switch (txSigningMode) {
-        case SIGN_TX_SIGNINGMODE_ORDINARY_TX:
-        case SIGN_TX_SIGNINGMODE_MULTISIG_TX:
-        case SIGN_TX_SIGNINGMODE_PLUTUS_TX:
-            SHOW_IF(app_mode_expert());
-            ALLOW();
-            break;
+static const signing_mode_rules_t SCRIPT_DATA_HASH_RULES = {
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_ORDINARY_TX) = RULE_SHOW_IF_EXPERT,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_MULTISIG_TX) = RULE_SHOW_IF_EXPERT,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_PLUTUS_TX) = RULE_SHOW_IF_EXPERT,
 
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER:
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR:
-            DENY();
-            break;
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER) = RULE_DENY,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR) = RULE_DENY,
+};
 
-        default:
-            ASSERT(false);
-    }
-
-    DENY();  // should not be reached
+// For transaction script data hash
+security_policy_t policyForSignTxScriptDataHash(const sign_tx_signingmode_t txSigningMode) {
+    return _policyForSigningMode(SCRIPT_DATA_HASH_RULES, txSigningMode);
 }
 
 // For each transaction collateral input
@@ -1749,31 +1719,22 @@ static bool required_signers_allowed(const sign_tx_signingmode_t txSigningMode)
     }
 }
 
-static bool is_required_signer_allowed(bip44_path_t* path) {
-    switch (bip44_classifyPath(path)) {
-        case PATH_ORDINARY_ACCOUNT:
-        case PATH_ORDINARY_PAYMENT_KEY:
-        case PATH_ORDINARY_STAKING_KEY:
-            return bip44_hasShelleyPrefix(path);
+static const path_rules_t REQUIRED_SIGNER_RULES = {
+    [PATH_ORDINARY_ACCOUNT] = RULE_DENY_UNLESS_SHELLEY | RULE_SHOW_IF_EXPERT,
+    [PATH_ORDINARY_PAYMENT_KEY] = RULE_DENY_UNLESS_SHELLEY | RULE_SHOW_IF_EXPERT,
+    [PATH_ORDINARY_STAKING_KEY] = RULE_DENY_UNLESS_SHELLEY | RULE_SHOW_IF_EXPERT,
 
-        case PATH_MULTISIG_ACCOUNT:
-        case PATH_MULTISIG_PAYMENT_KEY:
-        case PATH_MULTISIG_STAKING_KEY:
-            return true;
+    [PATH_MULTISIG_ACCOUNT] = RULE_SHOW_IF_EXPERT,
+    [PATH_MULTISIG_PAYMENT_KEY] = RULE_SHOW_IF_EXPERT,
+    [PATH_MULTISIG_STAKING_KEY] = RULE_SHOW_IF_EXPERT,
 
-        case PATH_DREP_KEY:
-        case PATH_COMMITTEE_COLD_KEY:
-        case PATH_COMMITTEE_HOT_KEY:
-            // no known use case, but also no reason to deny
-            return true;
+    // no known use case, but also no reason to deny
+    [PATH_DREP_KEY] = RULE_SHOW_IF_EXPERT,
+    [PATH_COMMITTEE_COLD_KEY] = RULE_SHOW_IF_EXPERT,
+    [PATH_COMMITTEE_HOT_KEY] = RULE_SHOW_IF_EXPERT,
 
-        case PATH_MINT_KEY:
-            return true;
-
-        default:
-            return false;
-    }
-}
+    [PATH_MINT_KEY] = RULE_SHOW_IF_EXPERT,
+};
 
 security_policy_t policyForSignTxRequiredSigner(const sign_tx_signingmode_t txSigningMode,
                                                 sign_tx_required_signer_t* requiredSigner) {
@@ -1786,10 +1747,7 @@ security_policy_t policyForSignTxRequiredSigner(const sign_tx_signingmode_t txSi
             break;
 
         case REQUIRED_SIGNER_WITH_PATH:
-            DENY_UNLESS(is_required_signer_allowed(&requiredSigner->keyPath));
-            SHOW_IF(app_mode_expert());
-            ALLOW();
-            break;
+            return _policyForPath(REQUIRED_SIGNER_RULES, &requiredSigner->keyPath, false, NULL);
 
         default:
             ASSERT(false);
@@ -1807,25 +1765,18 @@ security_policy_t policyForSignTxTotalCollateral() {
     SHOW();
 }
 
-security_policy_t policyForSignTxReferenceInput(const sign_tx_signingmode_t txSigningMode) {
-    switch (txSigningMode) {
-        case SIGN_TX_SIGNINGMODE_PLUTUS_TX:
-            // should be shown because the user loses all collateral if Plutus execution fails
-            SHOW_IF(app_mode_expert());
-            ALLOW();
-            break;
+static const signing_mode_rules_t REFERENCE_INPUT_RULES = {
+    // should be shown because the user loses all collateral if Plutus execution fails
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_PLUTUS_TX) = RULE_SHOW_IF_EXPERT,
 
-        case SIGN_TX_SIGNINGMODE_ORDINARY_TX:
-        case SIGN_TX_SIGNINGMODE_MULTISIG_TX:
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER:
-        case SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR:
-            DENY();
-            break;
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_ORDINARY_TX) = RULE_DENY,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_MULTISIG_TX) = RULE_DENY,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OWNER) = RULE_DENY,
+    SIGNING_MODE_RULE(SIGN_TX_SIGNINGMODE_POOL_REGISTRATION_OPERATOR) = RULE_DENY,
+};
 
-        default:
-            ASSERT(false);
-    }
-    DENY();
+security_policy_t policyForSignTxReferenceInput(const sign_tx_signingmode_t txSigningMode) {
+    return _policyForSigningMode(REFERENCE_INPUT_RULES, txSigningMode);
 }
 
 // For voting procedures
@@ -1991,22 +1942,12 @@ security_policy_t policyForCVoteRegistrationConfirm() {
 }
 
 #ifdef APP_FEATURE_OPCERT
-security_policy_t policyForSignOpCert(const bip44_path_t* poolColdKeyPathSpec) {
-    switch (bip44_classifyPath(poolColdKeyPathSpec)) {
-        case PATH_POOL_COLD_KEY:
-            if (bip44_isPathReasonable(poolColdKeyPathSpec)) {
-                PROMPT();
-            } else {
-                WARN();
-            }
-            break;
+static const path_rules_t SIGN_OP_CERT_RULES = {
+    [PATH_POOL_COLD_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_PROMPT,
+};
 
-        default:
-            DENY();
-            break;
-    }
-
-    DENY();  // should not be reached
+security_policy_t policyForSignOpCert(const bip44_path_t* poolColdKeyPathSpec) {
+    return _policyForPath(SIGN_OP_CERT_RULES, poolColdKeyPathSpec, false, NULL);
 }
 #endif  // APP_FEATURE_OPCERT
 
@@ -2018,17 +1959,12 @@ security_policy_t policyForSignCVoteConfirm() {
     PROMPT();
 }
 
-security_policy_t policyForSignCVoteWitness(bip44_path_t* path) {
-    switch (bip44_classifyPath(path)) {
-        case PATH_CVOTE_KEY:
-            WARN_UNLESS(bip44_isPathReasonable(path));
-            SHOW();
-            break;
+static const path_rules_t SIGN_CVOTE_WITNESS_RULES = {
+    [PATH_CVOTE_KEY] = RULE_WARN_UNLESS_REASONABLE | RULE_SHOW,
+};
 
-        default:
-            DENY();
-            break;
-    }
+security_policy_t policyForSignCVoteWitness(bip44_path_t* path) {
+    return _policyForPath(SIGN_CVOTE_WITNESS_RULES, path, false, NULL);
 }
 
 security_policy_t policyForSignMsg(const bip44_path_t* witnessPath,
@@ -328,6 +328,8 @@ void tx_advanceStage() {
 
             __attribute__((fallthrough));
         case SIGN_STAGE_WITNESSES:
+            // the account key is not needed anymore
+            crypto_account_key_wipe(&WITNESS_CTX->accountKey);
             ctx->stage = SIGN_STAGE_NONE;
             ui_idle();  // we are done with this tx
             endTxStatus();
@@ -814,13 +816,15 @@ static void ui_advanceState_input() {
     }
 }
 
+typedef struct {
+    uint8_t txHash[TX_HASH_LENGTH];
+    uint8_t index[4];
+} wire_utxo_t;
+
 static void parseInput(const uint8_t* wireDataBuffer, size_t wireDataSize) {
     sign_tx_transaction_input_t* input = &BODY_CTX->stageData.input;
 
-    struct {
-        uint8_t txHash[TX_HASH_LENGTH];
-        uint8_t index[4];
-    }* wireUtxo = (void*) wireDataBuffer;
+    wire_utxo_t* wireUtxo = (void*) wireDataBuffer;
 
     VALIDATE(wireDataSize == SIZEOF(*wireUtxo), ERR_INVALID_DATA);
 
@@ -855,6 +859,39 @@ static void ui_selectInputStep(security_policy_t policy) {
     }
 }
 
+typedef void add_input_fn_t(tx_hash_builder_t* builder, const tx_input_t* input);
+
+// Adds all inputs of a P2_INPUTS_BATCH APDU to the tx hash and responds once.
+// Used for inputs, collateral inputs and reference inputs.
+static void handleInputBatch(security_policy_t policy,
+                             add_input_fn_t* addInput,
+                             uint16_t* currentInput,
+                             uint16_t numInputs,
+                             const uint8_t* wireDataBuffer,
+                             size_t wireDataSize) {
+    // the inputs are shown one by one, each confirmation needs its own APDU
+    VALIDATE(policy == POLICY_ALLOW_WITHOUT_PROMPT, ERR_REJECTED_BY_POLICY);
+
+    const size_t utxoSize = SIZEOF(wire_utxo_t);
+    VALIDATE(wireDataSize > 0 && wireDataSize % utxoSize == 0, ERR_INVALID_DATA);
+    const size_t batchSize = wireDataSize / utxoSize;
+    VALIDATE(batchSize <= SIGN_TX_INPUTS_BATCH_MAX, ERR_INVALID_DATA);
+    ASSERT(*currentInput < numInputs);
+    VALIDATE(batchSize <= (size_t) (numInputs - *currentInput), ERR_INVALID_DATA);
+
+    for (size_t i = 0; i < batchSize; i++) {
+        parseInput(wireDataBuffer + i * utxoSize, utxoSize);
+        addInput(&BODY_CTX->txHashBuilder, &BODY_CTX->stageData.input.input_data);
+    }
+
+    respondSuccessEmptyMsg();
+
+    *currentInput += batchSize;
+    if (*currentInput == numInputs) {
+        tx_advanceStage();
+    }
+}
+
 __noinline_due_to_stack__ static void signTx_handleInputAPDU(uint8_t p2,
                                                              const uint8_t* wireDataBuffer,
                                                              size_t wireDataSize) {
@@ -864,11 +901,9 @@ __noinline_due_to_stack__ static void signTx_handleInputAPDU(uint8_t p2,
         CHECK_STAGE(SIGN_STAGE_BODY_INPUTS);
         ASSERT(BODY_CTX->currentInput < ctx->numInputs);
 
-        VALIDATE(p2 == P2_UNUSED, ERR_INVALID_REQUEST_PARAMETERS);
+        VALIDATE(p2 == P2_UNUSED || p2 == P2_INPUTS_BATCH, ERR_INVALID_REQUEST_PARAMETERS);
     }
 
-    parseInput(wireDataBuffer, wireDataSize);
-
     security_policy_t policy = POLICY_DENY;
 #ifdef HAVE_SWAP
     if (G_called_from_swap) {
@@ -881,6 +916,18 @@ __noinline_due_to_stack__ static void signTx_handleInputAPDU(uint8_t p2,
         ENSURE_NOT_DENIED(policy);
     }
 
+    if (p2 == P2_INPUTS_BATCH) {
+        handleInputBatch(policy,
+                         txHashBuilder_addInput,
+                         &BODY_CTX->currentInput,
+                         ctx->numInputs,
+                         wireDataBuffer,
+                         wireDataSize);
+        return;
+    }
+
+    parseInput(wireDataBuffer, wireDataSize);
+
     {
         // add to tx
         TRACE("Adding input to tx hash");
@@ -2011,11 +2058,9 @@ signTx_handleCollateralInputAPDU(uint8_t p2, const uint8_t* wireDataBuffer, size
         CHECK_STAGE(SIGN_STAGE_BODY_COLLATERAL_INPUTS);
         ASSERT(BODY_CTX->currentCollateral < ctx->numCollateralInputs);
 
-        VALIDATE(p2 == P2_UNUSED, ERR_INVALID_REQUEST_PARAMETERS);
+        VALIDATE(p2 == P2_UNUSED || p2 == P2_INPUTS_BATCH, ERR_INVALID_REQUEST_PARAMETERS);
     }
 
-    parseInput(wireDataBuffer, wireDataSize);
-
     security_policy_t policy = POLICY_DENY;
 #ifdef HAVE_SWAP
     if (G_called_from_swap) {
@@ -2029,6 +2074,18 @@ signTx_handleCollateralInputAPDU(uint8_t p2, const uint8_t* wireDataBuffer, size
         ENSURE_NOT_DENIED(policy);
     }
 
+    if (p2 == P2_INPUTS_BATCH) {
+        handleInputBatch(policy,
+                         txHashBuilder_addCollateralInput,
+                         &BODY_CTX->currentCollateral,
+                         ctx->numCollateralInputs,
+                         wireDataBuffer,
+                         wireDataSize);
+        return;
+    }
+
+    parseInput(wireDataBuffer, wireDataSize);
+
     {
         // add to tx
         TRACE("Adding collateral input to tx hash");
@@ -2231,10 +2288,8 @@ __noinline_due_to_stack__ static void signTx_handleReferenceInputAPDU(uint8_t p2
         CHECK_STAGE(SIGN_STAGE_BODY_REFERENCE_INPUTS);
         ASSERT(BODY_CTX->currentReferenceInput < ctx->numReferenceInputs);
 
-        VALIDATE(p2 == P2_UNUSED, ERR_INVALID_REQUEST_PARAMETERS);
+        VALIDATE(p2 == P2_UNUSED || p2 == P2_INPUTS_BATCH, ERR_INVALID_REQUEST_PARAMETERS);
     }
-    // Parsed in same way as the inputs
-    parseInput(wireDataBuffer, wireDataSize);
 
     security_policy_t policy = POLICY_DENY;
 #ifdef HAVE_SWAP
@@ -2248,6 +2303,19 @@ __noinline_due_to_stack__ static void signTx_handleReferenceInputAPDU(uint8_t p2
         ENSURE_NOT_DENIED(policy);
     }
 
+    if (p2 == P2_INPUTS_BATCH) {
+        handleInputBatch(policy,
+                         txHashBuilder_addReferenceInput,
+                         &BODY_CTX->currentReferenceInput,
+                         ctx->numReferenceInputs,
+                         wireDataBuffer,
+                         wireDataSize);
+        return;
+    }
+
+    // Parsed in same way as the inputs
+    parseInput(wireDataBuffer, wireDataSize);
+
     {
         // add to tx
         TRACE("Adding reference input to tx hash");
@@ -2641,68 +2709,88 @@ __noinline_due_to_stack__ static void signTx_handleWitnessAPDU(uint8_t p2,
         TRACE("Witness no. %d out of %d", WITNESS_CTX->currentWitness + 1, ctx->numWitnesses);
         ASSERT(WITNESS_CTX->currentWitness < ctx->numWitnesses);
 
-        VALIDATE(p2 == P2_UNUSED, ERR_INVALID_REQUEST_PARAMETERS);
+        VALIDATE(p2 == P2_UNUSED || p2 == P2_WITNESSES_BATCH, ERR_INVALID_REQUEST_PARAMETERS);
     }
 
-    explicit_bzero(&WITNESS_CTX->stageData.witness, SIZEOF(WITNESS_CTX->stageData.witness));
+    sign_tx_witness_data_t* witness = &WITNESS_CTX->stageData.witness;
+    explicit_bzero(witness, SIZEOF(*witness));
 
     {
         // parse
         TRACE_BUFFER(wireDataBuffer, wireDataSize);
 
-        size_t parsedSize =
-            bip44_parseFromWire(&WITNESS_CTX->stageData.witness.path, wireDataBuffer, wireDataSize);
-        VALIDATE(parsedSize == wireDataSize, ERR_INVALID_DATA);
+        read_view_t view = make_read_view(wireDataBuffer, wireDataBuffer + wireDataSize);
 
-        TRACE();
-        BIP44_PRINTF(&WITNESS_CTX->stageData.witness.path);
-        PRINTF("\n");
+        witness->numWitnesses = 1;
+        if (p2 == P2_WITNESSES_BATCH) {
+            witness->numWitnesses = parse_u1be(&view);
+            VALIDATE(witness->numWitnesses > 0, ERR_INVALID_DATA);
+            VALIDATE(witness->numWitnesses <= SIGN_TX_WITNESSES_BATCH_MAX, ERR_INVALID_DATA);
+            VALIDATE(witness->numWitnesses <= ctx->numWitnesses - WITNESS_CTX->currentWitness,
+                     ERR_INVALID_DATA);
+        }
+        for (size_t i = 0; i < witness->numWitnesses; i++) {
+            _parsePathSpec(&view, &witness->paths[i]);
+        }
+        VALIDATE(view_remainingSize(&view) == 0, ERR_INVALID_DATA);
     }
 
-    security_policy_t policy = POLICY_DENY;
+    for (size_t i = 0; i < witness->numWitnesses; i++) {
+        security_policy_t policy = POLICY_DENY;
 #ifdef HAVE_SWAP
-    if (G_called_from_swap) {
-        policy = POLICY_ALLOW_WITHOUT_PROMPT;
-    } else
+        if (G_called_from_swap) {
+            policy = POLICY_ALLOW_WITHOUT_PROMPT;
+        } else
 #endif
-    {
-        policy = policyForSignTxWitness(ctx->commonTxData.txSigningMode,
-                                        &WITNESS_CTX->stageData.witness.path,
-                                        ctx->includeMint,
-                                        ctx->poolOwnerByPath ? &ctx->poolOwnerPath : NULL);
-        TRACE("Policy: %d", (int) policy);
-        ENSURE_NOT_DENIED(policy);
+        {
+            policy = policyForSignTxWitness(ctx->commonTxData.txSigningMode,
+                                            &witness->paths[i],
+                                            ctx->includeMint,
+                                            ctx->poolOwnerByPath ? &ctx->poolOwnerPath : NULL);
+            TRACE("Policy: %d", (int) policy);
+            ENSURE_NOT_DENIED(policy);
+        }
+        {
+            // choose UI steps, every witness of a batch goes through its own steps
+            STATIC_ASSERT(HANDLE_WITNESS_STEP_INVALID - HANDLE_WITNESS_STEP_WARNING <= UINT8_MAX,
+                          "witness UI steps do not fit uint8_t");
+            switch (policy) {
+#define CASE(POLICY, UI_STEP)                                         \
+    case POLICY: {                                                    \
+        witness->ui_steps[i] = UI_STEP - HANDLE_WITNESS_STEP_WARNING; \
+        break;                                                        \
+    }
+                CASE(POLICY_PROMPT_WARN_UNUSUAL, HANDLE_WITNESS_STEP_WARNING);
+                CASE(POLICY_SHOW_BEFORE_RESPONSE, HANDLE_WITNESS_STEP_DISPLAY);
+                CASE(POLICY_ALLOW_WITHOUT_PROMPT, HANDLE_WITNESS_STEP_RESPOND);
+#undef CASE
+                default:
+                    THROW(ERR_NOT_IMPLEMENTED);
+            }
+        }
     }
-    {
+
+    // signatures are computed only after all paths of a batch are allowed;
+    // those of witnesses not confirmed yet are wiped on every abort path:
+    // user reject (_wipeWitnessSignature), errors (the whole instruction state)
+    // and the next witness APDU (the witness data above)
+    for (size_t i = 0; i < witness->numWitnesses; i++) {
         // compute witness
         TRACE("getWitness");
         TRACE("TX HASH");
         TRACE_BUFFER(ctx->txHash, SIZEOF(ctx->txHash));
         TRACE("END TX HASH");
 
-        getWitness(&WITNESS_CTX->stageData.witness.path,
-                   ctx->txHash,
-                   SIZEOF(ctx->txHash),
-                   WITNESS_CTX->stageData.witness.signature,
-                   SIZEOF(WITNESS_CTX->stageData.witness.signature));
+        getWitnessWithAccountKey(&witness->paths[i],
+                                 &WITNESS_CTX->accountKey,
+                                 ctx->txHash,
+                                 SIZEOF(ctx->txHash),
+                                 witness->signatures[i],
+                                 SIZEOF(witness->signatures[i]));
     }
 
-    {
-        // choose UI steps
-        switch (policy) {
-#define CASE(POLICY, UI_STEP)   \
-    case POLICY: {              \
-        ctx->ui_step = UI_STEP; \
-        break;                  \
-    }
-            CASE(POLICY_PROMPT_WARN_UNUSUAL, HANDLE_WITNESS_STEP_WARNING);
-            CASE(POLICY_SHOW_BEFORE_RESPONSE, HANDLE_WITNESS_STEP_DISPLAY);
-            CASE(POLICY_ALLOW_WITHOUT_PROMPT, HANDLE_WITNESS_STEP_RESPOND);
-#undef CASE
-            default:
-                THROW(ERR_NOT_IMPLEMENTED);
-        }
-    }
+    witness->shownWitness = 0;
+    ctx->ui_step = HANDLE_WITNESS_STEP_WARNING + witness->ui_steps[0];
     signTx_handleWitness_ui_runStep();
 #ifdef HAVE_SWAP
     if (G_called_from_swap) {
@@ -7,6 +7,7 @@
 #include "handlers.h"
 #include "txHashBuilder.h"
 #include "bip44.h"
+#include "crypto.h"
 #include "addressUtilsShelley.h"
 #include "signTxMint.h"
 #include "signTxOutput.h"
@@ -66,6 +67,20 @@ enum {
     SIGN_MAX_VOTING_PROCEDURES = 1,  // we only support a single vote per tx
 };
 
+// P2 for inputs, collateral inputs and reference inputs:
+// several inputs (up to SIGN_TX_INPUTS_BATCH_MAX) serialized one after another in a single APDU
+enum { P2_INPUTS_BATCH = 0x01 };
+
+// 6 * (32 B hash + 4 B index) = 216 B, fits into an APDU
+#define SIGN_TX_INPUTS_BATCH_MAX 6
+
+// P2 for witnesses: the number of paths followed by the paths,
+// the signatures are returned one after another in a single response
+enum { P2_WITNESSES_BATCH = 0x01 };
+
+// 3 * 64 B of signatures fit into a response
+#define SIGN_TX_WITNESSES_BATCH_MAX 3
+
 #define UI_INPUT_LABEL_SIZE 20
 
 typedef struct {
@@ -154,8 +169,13 @@ typedef struct {
 } sign_tx_transaction_input_t;
 
 typedef struct {
-    bip44_path_t path;
-    uint8_t signature[ED25519_SIGNATURE_LENGTH];
+    // witnesses requested by a single APDU, more than one only with P2_WITNESSES_BATCH
+    bip44_path_t paths[SIGN_TX_WITNESSES_BATCH_MAX];
+    uint8_t signatures[SIGN_TX_WITNESSES_BATCH_MAX][ED25519_SIGNATURE_LENGTH];
+    // the first UI step of each witness, relative to HANDLE_WITNESS_STEP_WARNING
+    uint8_t ui_steps[SIGN_TX_WITNESSES_BATCH_MAX];
+    uint8_t numWitnesses;
+    uint8_t shownWitness;  // the witness going through its UI steps
 } sign_tx_witness_data_t;
 
 typedef struct {
@@ -262,6 +282,8 @@ typedef struct {
 
 typedef struct {
     uint16_t currentWitness;
+    // key of the account of the last witness, kept for the whole witness stage
+    crypto_account_key_t accountKey;
     struct {
         sign_tx_witness_data_t witness;
     } stageData;
@@ -1551,9 +1551,10 @@ void signTx_handleConfirm_ui_runStep() {
 // ============================== WITNESS ==============================
 
 static void _wipeWitnessSignature() {
-    // safer not to keep the signature in memory
-    explicit_bzero(WITNESS_CTX->stageData.witness.signature,
-                   SIZEOF(WITNESS_CTX->stageData.witness.signature));
+    // safer not to keep the signatures in memory
+    explicit_bzero(WITNESS_CTX->stageData.witness.signatures,
+                   SIZEOF(WITNESS_CTX->stageData.witness.signatures));
+    crypto_account_key_wipe(&WITNESS_CTX->accountKey);
     respond_with_user_reject();
 }
 
@@ -1561,6 +1562,8 @@ void signTx_handleWitness_ui_runStep() {
     TRACE("UI step %d", ctx->ui_step);
     TRACE_STACK_USAGE();
     ui_callback_fn_t* this_fn = signTx_handleWitness_ui_runStep;
+    sign_tx_witness_data_t* witness = &WITNESS_CTX->stageData.witness;
+    ASSERT(witness->shownWitness < witness->numWitnesses);
 
     UI_STEP_BEGIN(ctx->ui_step, this_fn);
 
@@ -1569,17 +1572,17 @@ void signTx_handleWitness_ui_runStep() {
         ui_displayPaginatedText("WARNING:", "unusual witness requested", this_fn);
 #elif defined(HAVE_NBGL)
         set_light_confirmation(true);
-        display_warning("Unusual\nwitness requested", this_fn, respond_with_user_reject);
+        display_warning("Unusual\nwitness requested", this_fn, _wipeWitnessSignature);
 #endif  // HAVE_BAGL
     }
     UI_STEP(HANDLE_WITNESS_STEP_DISPLAY) {
 #ifdef HAVE_BAGL
-        ui_displayPathScreen("Witness path", &WITNESS_CTX->stageData.witness.path, this_fn);
+        ui_displayPathScreen("Witness path", &witness->paths[witness->shownWitness], this_fn);
 #elif defined(HAVE_NBGL)
         set_light_confirmation(true);
         char pathStr[BIP44_PATH_STRING_SIZE_MAX + 1] = {0};
-        ui_getPathScreen(pathStr, SIZEOF(pathStr), &WITNESS_CTX->stageData.witness.path);
-        fill_and_display_if_required("Witness path", pathStr, this_fn, respond_with_user_reject);
+        ui_getPathScreen(pathStr, SIZEOF(pathStr), &witness->paths[witness->shownWitness]);
+        fill_and_display_if_required("Witness path", pathStr, this_fn, _wipeWitnessSignature);
 #endif  // HAVE_BAGL
     }
     UI_STEP(HANDLE_WITNESS_STEP_CONFIRM) {
@@ -1594,17 +1597,24 @@ void signTx_handleWitness_ui_runStep() {
 #endif  // HAVE_BAGL
     }
     UI_STEP(HANDLE_WITNESS_STEP_RESPOND) {
+        if (witness->shownWitness + 1 < witness->numWitnesses) {
+            // the next witness of a batch, the response waits for all of them
+            witness->shownWitness++;
+            UI_STEP_JUMP(HANDLE_WITNESS_STEP_WARNING + witness->ui_steps[witness->shownWitness]);
+        }
+
+        // the signatures are stored one after another
+        const size_t responseSize = witness->numWitnesses * SIZEOF(witness->signatures[0]);
         TRACE("Sending witness data");
-        TRACE_BUFFER(WITNESS_CTX->stageData.witness.signature,
-                     SIZEOF(WITNESS_CTX->stageData.witness.signature));
-        io_send_buf(SUCCESS,
-                    WITNESS_CTX->stageData.witness.signature,
-                    SIZEOF(WITNESS_CTX->stageData.witness.signature));
+        TRACE_BUFFER((uint8_t*) witness->signatures, responseSize);
+        io_send_buf(SUCCESS, (uint8_t*) witness->signatures, responseSize);
+        // safer not to keep the signatures in memory
+        explicit_bzero(witness->signatures, SIZEOF(witness->signatures));
 #ifdef HAVE_BAGL
         ui_displayBusy();  // displays dots, called only after I/O to avoid freezing
 #endif                     // HAVE_BAGL
 
-        WITNESS_CTX->currentWitness++;
+        WITNESS_CTX->currentWitness += witness->numWitnesses;
         if (WITNESS_CTX->currentWitness == ctx->numWitnesses) {
             tx_advanceStage();
         }
@@ -56,6 +56,7 @@ void swap_handle_check_address(check_address_parameters_t *params) {
             // chain element
             addressParams.stakingKeyPath.path[BIP44_I_CHAIN] = 2;
             addressParams.stakingKeyPath.path[BIP44_I_ADDRESS] = 0;
+            bip44_classify(&addressParams.stakingKeyPath);
             nbBytes = deriveAddress(&addressParams, rawAddressBuffer, SIZEOF(rawAddressBuffer));
             humanReadableAddress(rawAddressBuffer,
                                  nbBytes,
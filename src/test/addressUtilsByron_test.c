@@ -10,6 +10,7 @@
 static void pathSpec_init(bip44_path_t* pathSpec, const uint32_t* pathArray, uint32_t pathLength) {
     pathSpec->length = pathLength;
     memmove(pathSpec->path, pathArray, pathLength * 4);
+    bip44_classify(pathSpec);
 }
 
 void testcase_deriveAddress_byron(uint32_t* path,
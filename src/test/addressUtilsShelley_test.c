@@ -12,6 +12,7 @@
 static void pathSpec_init(bip44_path_t* pathSpec, const uint32_t* pathArray, uint32_t pathLength) {
     pathSpec->length = pathLength;
     memmove(pathSpec->path, pathArray, pathLength * 4);
+    bip44_classify(pathSpec);
 }
 
 // networkIdOrProtocolMagic is used as networkId for Shelley addresses and as protocol magic for
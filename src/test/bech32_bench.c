@@ -0,0 +1,150 @@
+#ifdef HOST_BENCHMARK
+
+#include <string.h>
+
+#include "bech32.h"
+#include "benchUtils.h"
+
+// Compares bech32_encode with the previous implementation (kept below): conversion
+// of all bytes into a buffer of 5-bit symbols first, then the checksum computed
+// by a polymod step with a conditional xor for each of the 5 shifted-out bits.
+
+enum {
+    ITERATIONS = 500000,
+};
+
+static uint32_t legacy_polymod_step(uint32_t pre) {
+    const uint8_t b = pre >> 25;
+    return ((pre & 0x1FFFFFF) << 5) ^ (-((b >> 0) & 1) & 0x3b6a57b2UL) ^
+           (-((b >> 1) & 1) & 0x26508e6dUL) ^ (-((b >> 2) & 1) & 0x1ea119faUL) ^
+           (-((b >> 3) & 1) & 0x3d4233ddUL) ^ (-((b >> 4) & 1) & 0x2a1462b3UL);
+}
+
+/* cspell:disable-next-line */
+static const char* legacy_charset = "qpzry9x8gf2tvdw0s3jn54khce6mua7l";
+
+static void legacy_encode_5bit(const char* hrp,
+                               const uint8_t* data,
+                               size_t data_len,
+                               char* output,
+                               size_t maxOutputSize) {
+    const char* outputLimit = output + maxOutputSize;
+
+#define APPEND_OUT(value)             \
+    {                                 \
+        ASSERT(output < outputLimit); \
+        *(output++) = (value);        \
+    }
+
+    uint32_t chk = 1;
+    for (size_t i = 0; hrp[i] != 0; ++i) {
+        chk = legacy_polymod_step(chk) ^ (hrp[i] >> 5);
+    }
+    chk = legacy_polymod_step(chk);
+    while (*hrp != 0) {
+        chk = legacy_polymod_step(chk) ^ (*hrp & 0x1f);
+        APPEND_OUT(*(hrp++));
+    }
+    APPEND_OUT('1');
+    for (size_t i = 0; i < data_len; ++i) {
+        ASSERT((*data >> 5) == 0);
+        chk = legacy_polymod_step(chk) ^ (*data);
+        APPEND_OUT(legacy_charset[*(data++)]);
+    }
+    for (size_t i = 0; i < 6; ++i) {
+        chk = legacy_polymod_step(chk);
+    }
+    chk ^= 1;
+    for (size_t i = 0; i < 6; ++i) {
+        APPEND_OUT(legacy_charset[(chk >> ((5 - i) * 5)) & 0x1f]);
+    }
+    APPEND_OUT(0);
+
+#undef APPEND_OUT
+}
+
+static size_t legacy_encode(const char* hrp,
+                            const uint8_t* bytes,
+                            size_t bytesSize,
+                            char* output,
+                            size_t maxOutputSize) {
+    uint8_t data5bit[(8 * 65 + 4) / 5] = {0};
+    size_t data5bitLength = 0;
+    uint32_t val = 0;
+    int bits = 0;
+    while (bytesSize--) {
+        val = (val << 8) | *(bytes++);
+        bits += 8;
+        while (bits >= 5) {
+            bits -= 5;
+            ASSERT(data5bitLength < SIZEOF(data5bit));
+            data5bit[data5bitLength++] = (val >> bits) & 0x1f;
+        }
+    }
+    if (bits) {
+        ASSERT(data5bitLength < SIZEOF(data5bit));
+        data5bit[data5bitLength++] = (val << (5 - bits)) & 0x1f;
+    }
+    legacy_encode_5bit(hrp, data5bit, data5bitLength, output, maxOutputSize);
+    return strlen(output);
+}
+
+typedef size_t (*encode_fn)(const char*, const uint8_t*, size_t, char*, size_t);
+
+static void bench_encode(const char* name,
+                         encode_fn encode,
+                         const char* hrp,
+                         const uint8_t* bytes,
+                         size_t bytesSize) {
+    char output[BECH32_STRING_SIZE_MAX] = {0};
+    bench_timer_t timer;
+
+    bench_start(&timer);
+    for (uint32_t i = 0; i < ITERATIONS; i++) {
+        encode(hrp, bytes, bytesSize, output, SIZEOF(output));
+        BENCH_KEEP(output[0]);
+    }
+    bench_report(&timer, name, ITERATIONS);
+}
+
+static void bench_item(const char* name, const char* hrp, const uint8_t* bytes, size_t bytesSize) {
+    char expected[BECH32_STRING_SIZE_MAX] = {0};
+    char actual[BECH32_STRING_SIZE_MAX] = {0};
+    legacy_encode(hrp, bytes, bytesSize, expected, SIZEOF(expected));
+    bech32_encode(hrp, bytes, bytesSize, actual, SIZEOF(actual));
+    // both implementations must give the same string
+    ASSERT(strcmp(expected, actual) == 0);
+    printf("%s: %u chars\n", name, (unsigned) strlen(actual));
+
+    char label[64];
+    snprintf(label, SIZEOF(label), "%s (legacy)", name);
+    bench_encode(label, legacy_encode, hrp, bytes, bytesSize);
+    snprintf(label, SIZEOF(label), "%s (table)", name);
+    bench_encode(label, bech32_encode, hrp, bytes, bytesSize);
+}
+
+int main() {
+    uint8_t address[57];
+    for (size_t i = 0; i < SIZEOF(address); i++) {
+        address[i] = (uint8_t) (i * 37 + 11);
+    }
+    address[0] = 0x00;  // testnet base address
+
+    int result = 0;
+    BEGIN_TRY {
+        TRY {
+            bench_item("base address", "addr_test", address, SIZEOF(address));
+            bench_item("pool id", "pool", address + 1, 28);
+        }
+        CATCH_ALL {
+            printf("benchmark failed\n");
+            result = 1;
+        }
+        FINALLY {
+        }
+    }
+    END_TRY;
+    return result;
+}
+
+#endif  // HOST_BENCHMARK
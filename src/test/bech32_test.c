@@ -56,7 +56,75 @@ void run_bech32_test() {
          "009493315cd92eb5d8c4304e67b7e16ae36d61d34502694657811a2c8e32c728d3861e164cab28cb8f0064481"
          "39c8f1740ffb8e7aa9e5232dc",
          "addr1qz2fxv2umyhttkxyxp8x0dlpdt3k6cwng5pxj3jhsydzer3jcu5d8ps7zex2k2xt3uqxgjqnnj83ws8lhrn6"
-         "48jjxtwqcyl47r"}
+         "48jjxtwqcyl47r"},
+        // generated by tests/bech32_vectors.py
+        {"addr",
+         "",
+         "addr1mykd6t"},
+        {"addr",
+         "eb",
+         "addr1avr94gdg"},
+        {"addr",
+         "eb2c",
+         "addr1avkqmn8dgv"},
+        {"addr",
+         "eb2cb7",
+         "addr1avktwx2ptaf"},
+        {"addr",
+         "eb2cb710",
+         "addr1avktwyqjfx6ma"},
+        {"addr",
+         "eb2cb71055",
+         "addr1avktwyz4kvnktg"},
+        {"addr",
+         "eb2cb71055e4",
+         "addr1avktwyz4us2ycfcq"},
+        {"addr",
+         "eb2cb71055e4c2",
+         "addr1avktwyz4unpqr4nl6f"},
+        {"addr",
+         "eb2cb71055e4c2a9",
+         "addr1avktwyz4unp2jqf79u4"},
+        {"addr",
+         "eb2cb71055e4c2a94f",
+         "addr1avktwyz4unp2jncpfhqp3"},
+        {"addr",
+         "eb2cb71055e4c2a94fb8",
+         "addr1avktwyz4unp2jnac9xzfgr"},
+        {"addr",
+         "eb2cb71055e4c2a94fb8727024c143cfa5cc3a7ff2229ae7c7985a23ab954da9d0cb6cd0fc3ccaa55a884b8c3"
+         "94e34d69a604083a0c9b82c5cd681a845f84f1b",
+         "addr1avktwyz4unp2jnacwfczfs2re7jucwnl7g3f4e78npdz82u4fk5apjmv6r7rej49t2yyhrpefc6ddxnqgzp6"
+         "pjdc93wddqdgghuy7xc8qfdr8"},
+        {"addr",
+         "eb2cb71055e4c2a94fb8727024c143cfa5cc3a7ff2229ae7c7985a23ab954da9d0cb6cd0fc3ccaa55a884b8c3"
+         "94e34d69a604083a0c9b82c5cd681a845f84f1b13",
+         "addr1avktwyz4unp2jnacwfczfs2re7jucwnl7g3f4e78npdz82u4fk5apjmv6r7rej49t2yyhrpefc6ddxnqgzp6"
+         "pjdc93wddqdgghuy7xcn6z8aug"},
+        {"addr",
+         "01fa0f80a3b99181661d386f460ecd5fc23ec144ccf31356bb2cc93d704885c7e92fc6097d8caf9b1094b6ec2"
+         "0d3b9e66adc6065a1aad5fb6f",
+         "addr1q8aqlq9rhxgczesa8ph5vrkdtlpras2yene3x44m9nyn6uzgshr7jt7xp97cetumzz2tdmpq6wu7v6kuvpj6"
+         "r2k4ldhse24s6e"},
+        {"addr_test",
+         "00f2d7cd0ed8cbad475a33c2cfee2be0bda8920ee683907500f286758f48a1e7c0bd12bafcdcb18a7b84c2378"
+         "bc4d02f5f91cd5fbc046bb84d",
+         "addr_test1qred0ngwmr966366x0pvlm3tuz763yswu6peqagq72r8tr6g58nup0gjht7devv20wzvydutcngz7hu"
+         "3e40mcprthpxs3vxcvf"},
+        {"stake",
+         "e101467df881651a4d8116c212b9723b9f2af63bd435e9f4140f9169a7",
+         "stake1uyq5vl0cs9j35nvpzmpp9wtj8w0j4a3m6s67naq5p7gknfclx2tg5"},
+        {"pool",
+         "6c6afab7c2cf14fd4f1c3d3de777686038a982c3284a8c28695c6471",
+         "pool1d3404d7zeu206ncu8577wamgvqu2nqkr9p9gc2rft3j8zml74nt"},
+        {"asset",
+         "b3902d0d14724e14744ec099dc682e505e2696e0",
+         "asset1kwgz6rg5wf8pgazwczvac6pw2p0zd9hqvye0pa"},
+        {"addr",
+         "fffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff"
+         "fffffffffffffffffffffffff",
+         "addr1llllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllllll"
+         "llllllls05fezf"}
         /* cspell:enable */
     };
     ITERATE(it, testVectors) {
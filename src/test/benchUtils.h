@@ -0,0 +1,58 @@
+#ifndef H_CARDANO_APP_BENCH_UTILS
+#define H_CARDANO_APP_BENCH_UTILS
+
+#ifdef HOST_BUILD
+
+#include <stdint.h>
+#include <stdio.h>
+#include <time.h>
+
+#if defined(__x86_64__) || defined(__i386__)
+#include <x86intrin.h>
+#endif
+
+// Helpers for host-built benchmarks (see benchmark/README.md),
+// also used by the host crypto to count its cycles
+
+static inline uint64_t bench_nowNs() {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t) ts.tv_sec * 1000000000u + (uint64_t) ts.tv_nsec;
+}
+
+// Returns 0 on architectures without a cheap cycle counter
+static inline uint64_t bench_cycles() {
+#if defined(__x86_64__) || defined(__i386__)
+    return __rdtsc();
+#else
+    return 0;
+#endif
+}
+
+typedef struct {
+    uint64_t startNs;
+    uint64_t startCycles;
+} bench_timer_t;
+
+static inline void bench_start(bench_timer_t* timer) {
+    timer->startCycles = bench_cycles();
+    timer->startNs = bench_nowNs();
+}
+
+// Prints a single result line: name, iterations, ns and cycles per iteration
+static inline void bench_report(const bench_timer_t* timer, const char* name, uint64_t iterations) {
+    const uint64_t elapsedNs = bench_nowNs() - timer->startNs;
+    const uint64_t elapsedCycles = bench_cycles() - timer->startCycles;
+    printf("%-40s %10llu iter %10.2f ns/iter %10.2f cycles/iter\n",
+           name,
+           (unsigned long long) iterations,
+           (double) elapsedNs / (double) iterations,
+           (double) elapsedCycles / (double) iterations);
+}
+
+// Prevents the compiler from optimizing away a computed value
+#define BENCH_KEEP(value) __asm__ volatile("" : : "g"(value) : "memory")
+
+#endif  // HOST_BUILD
+
+#endif  // H_CARDANO_APP_BENCH_UTILS
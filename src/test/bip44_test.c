@@ -9,6 +9,7 @@
 static void pathSpec_init(bip44_path_t* pathSpec, const uint32_t* pathArray, uint32_t pathLength) {
     pathSpec->length = pathLength;
     memmove(pathSpec->path, pathArray, pathLength * 4);
+    bip44_classify(pathSpec);
 }
 
 void testcase_printToStr(const uint32_t* path,
@@ -30,6 +31,228 @@ void testcase_printToStr(const uint32_t* path,
     EXPECT_EQ_BYTES(result, expected, expectedSize);
 }
 
+// reference classification reading the path elements,
+// the cached classification must agree with it
+
+static bool ref_hasPrefix(const uint32_t* path, uint32_t pathLen, uint32_t purpose) {
+    return pathLen > BIP44_I_COIN_TYPE && path[BIP44_I_PURPOSE] == HD + purpose &&
+           path[BIP44_I_COIN_TYPE] == HD + ADA_COIN_TYPE;
+}
+
+static bool ref_isChainKeyPath(const uint32_t* path,
+                               uint32_t pathLen,
+                               uint32_t purpose,
+                               uint32_t chainType) {
+    return pathLen == BIP44_I_ADDRESS + 1 && ref_hasPrefix(path, pathLen, purpose) &&
+           isHardened(path[BIP44_I_ACCOUNT]) && path[BIP44_I_CHAIN] == chainType &&
+           !isHardened(path[BIP44_I_ADDRESS]);
+}
+
+static bool ref_isMintKeyPath(const uint32_t* path, uint32_t pathLen) {
+    return pathLen == BIP44_I_MINT_POLICY + 1 && ref_hasPrefix(path, pathLen, PURPOSE_MINT) &&
+           isHardened(path[BIP44_I_MINT_POLICY]);
+}
+
+static bool ref_isPoolColdKeyPath(const uint32_t* path, uint32_t pathLen) {
+    return pathLen == BIP44_I_POOL_COLD_KEY + 1 &&
+           ref_hasPrefix(path, pathLen, PURPOSE_POOL_COLD_KEY) &&
+           path[BIP44_I_POOL_COLD_KEY_USECASE] == HD + 0 && isHardened(path[BIP44_I_POOL_COLD_KEY]);
+}
+
+static bip44_path_type_t ref_classifyPath(const uint32_t* path, uint32_t pathLen) {
+    const bool ordinary = ref_hasPrefix(path, pathLen, PURPOSE_BYRON) ||
+                          ref_hasPrefix(path, pathLen, PURPOSE_SHELLEY);
+    const bool multisig = ref_hasPrefix(path, pathLen, PURPOSE_MULTISIG);
+    const bool cvote = ref_hasPrefix(path, pathLen, PURPOSE_CVOTE_KEY);
+
+    if (ref_hasPrefix(path, pathLen, PURPOSE_MINT)) {
+        return ref_isMintKeyPath(path, pathLen) ? PATH_MINT_KEY : PATH_INVALID;
+    }
+    if (ref_hasPrefix(path, pathLen, PURPOSE_POOL_COLD_KEY)) {
+        return ref_isPoolColdKeyPath(path, pathLen) ? PATH_POOL_COLD_KEY : PATH_INVALID;
+    }
+    if (!ordinary && !multisig && !cvote) {
+        return PATH_INVALID;
+    }
+    if (pathLen <= BIP44_I_ACCOUNT || !isHardened(path[BIP44_I_ACCOUNT])) {
+        return PATH_INVALID;
+    }
+    if (pathLen == BIP44_I_ACCOUNT + 1) {
+        return ordinary ? PATH_ORDINARY_ACCOUNT
+                        : (multisig ? PATH_MULTISIG_ACCOUNT : PATH_CVOTE_ACCOUNT);
+    }
+    if (pathLen != BIP44_I_ADDRESS + 1) {
+        return PATH_INVALID;
+    }
+    if (cvote) {
+        return ref_isChainKeyPath(path, pathLen, PURPOSE_CVOTE_KEY, 0) ? PATH_CVOTE_KEY
+                                                                       : PATH_INVALID;
+    }
+    // the chain type is read as a byte
+    switch ((uint8_t) path[BIP44_I_CHAIN]) {
+        case 0:
+            if (multisig && isHardened(path[BIP44_I_ADDRESS])) return PATH_INVALID;
+            return ordinary ? PATH_ORDINARY_PAYMENT_KEY : PATH_MULTISIG_PAYMENT_KEY;
+        case 1:
+            return ordinary ? PATH_ORDINARY_PAYMENT_KEY : PATH_INVALID;
+        case 2:
+            if (ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 2)) {
+                return PATH_ORDINARY_STAKING_KEY;
+            }
+            if (ref_isChainKeyPath(path, pathLen, PURPOSE_MULTISIG, 2)) {
+                return PATH_MULTISIG_STAKING_KEY;
+            }
+            return PATH_INVALID;
+        case 3:
+            return ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 3) ? PATH_DREP_KEY
+                                                                         : PATH_INVALID;
+        case 4:
+            return ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 4) ? PATH_COMMITTEE_COLD_KEY
+                                                                         : PATH_INVALID;
+        case 5:
+            return ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 5) ? PATH_COMMITTEE_HOT_KEY
+                                                                         : PATH_INVALID;
+        default:
+            return PATH_INVALID;
+    }
+}
+
+static bool ref_isPathReasonable(const uint32_t* path, uint32_t pathLen) {
+    const bool reasonableAccount = pathLen > BIP44_I_ACCOUNT && isHardened(path[BIP44_I_ACCOUNT]) &&
+                                   path[BIP44_I_ACCOUNT] - HD <= 100;
+    const bool reasonableAddress = pathLen > BIP44_I_ADDRESS && path[BIP44_I_ADDRESS] <= 1000000;
+
+    switch (ref_classifyPath(path, pathLen)) {
+        case PATH_ORDINARY_ACCOUNT:
+        case PATH_MULTISIG_ACCOUNT:
+        case PATH_CVOTE_ACCOUNT:
+            return reasonableAccount;
+        case PATH_DREP_KEY:
+        case PATH_COMMITTEE_COLD_KEY:
+        case PATH_COMMITTEE_HOT_KEY:
+            return reasonableAccount && reasonableAddress && path[BIP44_I_ADDRESS] == 0;
+        case PATH_MINT_KEY:
+            return path[BIP44_I_MINT_POLICY] - HD <= 1000000;
+        case PATH_POOL_COLD_KEY:
+            return path[BIP44_I_POOL_COLD_KEY] - HD <= 1000000;
+        default:
+            return reasonableAccount && reasonableAddress;
+    }
+}
+
+static void testcase_classification(const uint32_t* path, uint32_t pathLen) {
+    bip44_path_t pathSpec;
+    pathSpec_init(&pathSpec, path, pathLen);
+    EXPECT_EQ(pathSpec.classification.tag, BIP44_CLASSIFICATION_TAG);
+
+    // zero-initialized paths which are not classified explicitly
+    bip44_path_t unclassified = {0};
+    unclassified.length = pathLen;
+    memmove(unclassified.path, path, pathLen * 4);
+
+    const bip44_path_t* specs[] = {&pathSpec, &unclassified};
+    for (size_t i = 0; i < ARRAY_LEN(specs); i++) {
+        const bip44_path_t* spec = specs[i];
+        const bip44_path_type_t pathType = ref_classifyPath(path, pathLen);
+
+        EXPECT_EQ(bip44_hasByronPrefix(spec), ref_hasPrefix(path, pathLen, PURPOSE_BYRON));
+        EXPECT_EQ(bip44_hasShelleyPrefix(spec), ref_hasPrefix(path, pathLen, PURPOSE_SHELLEY));
+        EXPECT_EQ(bip44_hasOrdinaryWalletKeyPrefix(spec),
+                  (bip44_hasByronPrefix(spec) || bip44_hasShelleyPrefix(spec)));
+        EXPECT_EQ(bip44_hasMultisigWalletKeyPrefix(spec),
+                  ref_hasPrefix(path, pathLen, PURPOSE_MULTISIG));
+        EXPECT_EQ(bip44_hasMintKeyPrefix(spec), ref_hasPrefix(path, pathLen, PURPOSE_MINT));
+        EXPECT_EQ(bip44_hasPoolColdKeyPrefix(spec),
+                  ref_hasPrefix(path, pathLen, PURPOSE_POOL_COLD_KEY));
+        EXPECT_EQ(bip44_hasCVoteKeyPrefix(spec), ref_hasPrefix(path, pathLen, PURPOSE_CVOTE_KEY));
+
+        EXPECT_EQ(bip44_isOrdinaryStakingKeyPath(spec),
+                  ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 2));
+        EXPECT_EQ(bip44_isMultisigStakingKeyPath(spec),
+                  ref_isChainKeyPath(path, pathLen, PURPOSE_MULTISIG, 2));
+        EXPECT_EQ(bip44_isMultidelegationStakingKeyPath(spec),
+                  ((bip44_isOrdinaryStakingKeyPath(spec) || bip44_isMultisigStakingKeyPath(spec)) &&
+                   path[BIP44_I_ADDRESS] > 0));
+        EXPECT_EQ(bip44_isDRepKeyPath(spec), ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 3));
+        EXPECT_EQ(bip44_isCommitteeColdKeyPath(spec),
+                  ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 4));
+        EXPECT_EQ(bip44_isCommitteeHotKeyPath(spec),
+                  ref_isChainKeyPath(path, pathLen, PURPOSE_SHELLEY, 5));
+        EXPECT_EQ(bip44_isMintKeyPath(spec), ref_isMintKeyPath(path, pathLen));
+        EXPECT_EQ(bip44_isPoolColdKeyPath(spec), ref_isPoolColdKeyPath(path, pathLen));
+        EXPECT_EQ(bip44_isCVoteKeyPath(spec),
+                  ref_isChainKeyPath(path, pathLen, PURPOSE_CVOTE_KEY, 0));
+
+        EXPECT_EQ(bip44_classifyPath(spec), pathType);
+        if (pathType != PATH_INVALID) {
+            EXPECT_EQ(bip44_isPathReasonable(spec), ref_isPathReasonable(path, pathLen));
+        }
+    }
+}
+
+static void run_classification_test() {
+    PRINTF("testcase_bip44_classification\n");
+
+    const uint32_t purposes[] = {HD + PURPOSE_BYRON,
+                                 HD + PURPOSE_SHELLEY,
+                                 HD + PURPOSE_MULTISIG,
+                                 HD + PURPOSE_MINT,
+                                 HD + PURPOSE_POOL_COLD_KEY,
+                                 HD + PURPOSE_CVOTE_KEY,
+                                 PURPOSE_SHELLEY,
+                                 HD + 0};
+    const uint32_t coinTypes[] = {HD + ADA_COIN_TYPE, ADA_COIN_TYPE, HD + 0};
+    const uint32_t accounts[] = {HD + 0, HD + 100, HD + 101, HD + 1000001, 0, 5};
+    const uint32_t chains[] = {0, 1, 2, 3, 4, 5, 6, 256, 258, HD + 0, HD + 1000001};
+    const uint32_t addresses[] = {0, 1, 1000000, 1000001, HD + 0};
+
+    const uint32_t* grid[BIP44_MAX_PATH_ELEMENTS] = {purposes,
+                                                     coinTypes,
+                                                     accounts,
+                                                     chains,
+                                                     addresses};
+    const size_t gridSizes[BIP44_MAX_PATH_ELEMENTS] = {ARRAY_LEN(purposes),
+                                                       ARRAY_LEN(coinTypes),
+                                                       ARRAY_LEN(accounts),
+                                                       ARRAY_LEN(chains),
+                                                       ARRAY_LEN(addresses)};
+
+    for (uint32_t pathLen = 0; pathLen <= BIP44_MAX_PATH_ELEMENTS; pathLen++) {
+        // odometer over the first pathLen dimensions of the grid
+        size_t indices[BIP44_MAX_PATH_ELEMENTS] = {0};
+        while (true) {
+            uint32_t path[BIP44_MAX_PATH_ELEMENTS] = {0};
+            for (size_t i = 0; i < pathLen; i++) {
+                path[i] = grid[i][indices[i]];
+            }
+            testcase_classification(path, pathLen);
+
+            size_t i = 0;
+            while (i < pathLen && ++indices[i] == gridSizes[i]) {
+                indices[i] = 0;
+                i++;
+            }
+            if (i == pathLen) break;
+        }
+    }
+}
+
+static void run_stale_classification_test() {
+    PRINTF("testcase_bip44_stale_classification\n");
+
+    const uint32_t path[] = {HD + PURPOSE_SHELLEY, HD + ADA_COIN_TYPE, HD + 0, 2, 0};
+    bip44_path_t pathSpec;
+    pathSpec_init(&pathSpec, path, ARRAY_LEN(path));
+    EXPECT_EQ(bip44_isOrdinaryStakingKeyPath(&pathSpec), true);
+
+    // the chain is changed without classifying the path again
+    pathSpec.path[BIP44_I_CHAIN] = 0;
+    EXPECT_THROWS(bip44_classifyPath(&pathSpec), ERR_ASSERT);
+
+    bip44_classify(&pathSpec);
+    EXPECT_EQ(bip44_classifyPath(&pathSpec), PATH_ORDINARY_PAYMENT_KEY);
+}
+
 void run_bip44_test() {
 #define TESTCASE(path_, outputSize_, expected_)                             \
     {                                                                       \
@@ -45,6 +268,9 @@ void run_bip44_test() {
              "m/44'/1815'/0'/1/55");
     TESTCASE((HD + 44, HD + 1815), BIP44_PATH_STRING_SIZE_MAX + 1, "m/44'/1815'");
 #undef TESTCASE
+
+    run_classification_test();
+    run_stale_classification_test();
 }
 
 #endif  // DEVEL
@@ -0,0 +1,155 @@
+#ifdef HOST_BENCHMARK
+
+#include "cbor.h"
+#include "benchUtils.h"
+
+// Compares the per-token serialization into a temporary buffer followed by a separate
+// hash update (the way the hash builders used to work) with batched serialization
+// flushed once per item.
+//
+// The hash function itself is replaced by a counting sink: its cost is the same
+// for both variants (same bytes), we are interested in serialization overhead
+// and the number of updates. On the device, every update is a call into the
+// cryptographic library (a syscall), which dominates the serialization cost,
+// so updates/item is the figure to watch.
+
+enum {
+    ITERATIONS = 2000000,
+};
+
+typedef struct {
+    size_t updates;
+    size_t bytes;
+    uint8_t checksum;
+} sink_t;
+
+static __attribute__((noinline)) void sink_append(sink_t* sink,
+                                                  const uint8_t* buffer,
+                                                  size_t size) {
+    sink->updates++;
+    sink->bytes += size;
+    for (size_t i = 0; i < size; i++) {
+        sink->checksum ^= buffer[i];
+    }
+}
+
+// amounts spread over all widths, as in real transactions
+static const uint64_t AMOUNTS[] = {
+    7,
+    200,
+    40000,
+    1000000,
+    2000000,
+    45000000000,
+    1,
+    18446744073709551615u,
+};
+
+static uint8_t hashBuffer[32] = {0x3b, 0x40, 0x26, 0x51};
+
+static void bench_writeToken() {
+    uint8_t buffer[CBOR_TOKEN_MAX_SIZE];
+    bench_timer_t timer;
+    size_t total = 0;
+
+    bench_start(&timer);
+    for (uint32_t i = 0; i < ITERATIONS; i++) {
+        total += cbor_writeToken(CBOR_TYPE_UNSIGNED,
+                                 AMOUNTS[i % ARRAY_LEN(AMOUNTS)],
+                                 buffer,
+                                 SIZEOF(buffer));
+        BENCH_KEEP(buffer[0]);
+    }
+    bench_report(&timer, "writeToken", ITERATIONS);
+    BENCH_KEEP(total);
+}
+
+static void appendToken_perToken(sink_t* sink, uint8_t type, uint64_t value) {
+    uint8_t buffer[10] = {0};
+    size_t size = cbor_writeToken(type, value, buffer, SIZEOF(buffer));
+    sink_append(sink, buffer, size);
+}
+
+// tx input: Array(2)[Bytes[hash], Unsigned[index]]
+static void bench_txInput() {
+    bench_timer_t timer;
+    sink_t sink = {0};
+
+    bench_start(&timer);
+    for (uint32_t i = 0; i < ITERATIONS; i++) {
+        appendToken_perToken(&sink, CBOR_TYPE_ARRAY, 2);
+        appendToken_perToken(&sink, CBOR_TYPE_BYTES, SIZEOF(hashBuffer));
+        sink_append(&sink, hashBuffer, SIZEOF(hashBuffer));
+        appendToken_perToken(&sink, CBOR_TYPE_UNSIGNED, i);
+    }
+    bench_report(&timer, "tx input (per-token updates)", ITERATIONS);
+    printf("%-40s %10.2f updates/item\n", "", (double) sink.updates / ITERATIONS);
+    const size_t perTokenBytes = sink.bytes;
+
+    sink = (sink_t){0};
+    bench_start(&timer);
+    for (uint32_t i = 0; i < ITERATIONS; i++) {
+        cbor_batch_t batch;
+        cbor_batch_init(&batch);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_ARRAY, 2);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, SIZEOF(hashBuffer));
+        cbor_batch_appendData(&batch, hashBuffer, SIZEOF(hashBuffer));
+        cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, i);
+        sink_append(&sink, batch.buffer, batch.size);
+    }
+    bench_report(&timer, "tx input (batched)", ITERATIONS);
+    printf("%-40s %10.2f updates/item\n", "", (double) sink.updates / ITERATIONS);
+
+    // both variants must serialize the same data
+    ASSERT(sink.bytes == perTokenBytes);
+}
+
+// multiasset token: Bytes[asset_name], Unsigned[amount]
+static void bench_token() {
+    bench_timer_t timer;
+    sink_t sink = {0};
+    const uint8_t assetName[] = "TokenName0123456789";
+
+    bench_start(&timer);
+    for (uint32_t i = 0; i < ITERATIONS; i++) {
+        appendToken_perToken(&sink, CBOR_TYPE_BYTES, SIZEOF(assetName));
+        sink_append(&sink, assetName, SIZEOF(assetName));
+        appendToken_perToken(&sink, CBOR_TYPE_UNSIGNED, AMOUNTS[i % ARRAY_LEN(AMOUNTS)]);
+    }
+    bench_report(&timer, "token (per-token updates)", ITERATIONS);
+    printf("%-40s %10.2f updates/item\n", "", (double) sink.updates / ITERATIONS);
+
+    sink = (sink_t){0};
+    bench_start(&timer);
+    for (uint32_t i = 0; i < ITERATIONS; i++) {
+        cbor_batch_t batch;
+        cbor_batch_init(&batch);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, SIZEOF(assetName));
+        cbor_batch_appendData(&batch, assetName, SIZEOF(assetName));
+        cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, AMOUNTS[i % ARRAY_LEN(AMOUNTS)]);
+        sink_append(&sink, batch.buffer, batch.size);
+    }
+    bench_report(&timer, "token (batched)", ITERATIONS);
+    printf("%-40s %10.2f updates/item\n", "", (double) sink.updates / ITERATIONS);
+}
+
+int main() {
+    int result = 0;
+    BEGIN_TRY {
+        TRY {
+            bench_writeToken();
+            bench_txInput();
+            bench_token();
+        }
+        CATCH_ALL {
+            printf("benchmark failed\n");
+            result = 1;
+        }
+        FINALLY {
+        }
+    }
+    END_TRY;
+    return result;
+}
+
+#endif  // HOST_BENCHMARK
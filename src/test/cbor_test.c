@@ -122,6 +122,17 @@ static void test_cbor_serialization() {
         {"1b000000e8d4a51000", CBOR_TYPE_UNSIGNED, 1000000000000},
         {"1bffFFffFFffFFffFF", CBOR_TYPE_UNSIGNED, 18446744073709551615u},
 
+        // width boundaries
+        {"18ff", CBOR_TYPE_UNSIGNED, 255},
+        {"190100", CBOR_TYPE_UNSIGNED, 256},
+        {"19ffff", CBOR_TYPE_UNSIGNED, 65535},
+        {"1a00010000", CBOR_TYPE_UNSIGNED, 65536},
+        {"1a01000000", CBOR_TYPE_UNSIGNED, 16777216},
+        {"1affffffff", CBOR_TYPE_UNSIGNED, 4294967295},
+        {"1b0000000100000000", CBOR_TYPE_UNSIGNED, 4294967296},
+        {"1b0000010000000000", CBOR_TYPE_UNSIGNED, 1099511627776},
+        {"1b0100000000000000", CBOR_TYPE_UNSIGNED, 72057594037927936},
+
         // 0b0010 0000
         {"20", CBOR_TYPE_NEGATIVE, -1},
         // 0b0010 1001
@@ -186,10 +197,41 @@ static void test_cbor_serialization() {
     }
 }
 
+static void test_cbor_batch() {
+    PRINTF("test_cbor_batch\n");
+
+    // Array(2)[Bytes[hash], Unsigned[index]] as in a tx input
+    const char* expectedHex =
+        "825820"
+        "3b40265111d8bb3c3c608d95b3a0bf83461ace32d79336579a1939b3aad1c0b7"
+        "1a000f4240";
+    uint8_t expected[50] = {0};
+    size_t expectedSize = decode_hex(expectedHex, expected, SIZEOF(expected));
+
+    cbor_batch_t batch;
+    cbor_batch_init(&batch);
+    cbor_batch_appendToken(&batch, CBOR_TYPE_ARRAY, 2);
+    cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, 32);
+    cbor_batch_appendData(&batch, expected + 3, 32);
+    cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, 1000000);
+
+    EXPECT_EQ(batch.size, expectedSize);
+    EXPECT_EQ_BYTES(batch.buffer, expected, expectedSize);
+
+    // the batch must not overflow
+    cbor_batch_init(&batch);
+    while (batch.size + CBOR_TOKEN_MAX_SIZE <= SIZEOF(batch.buffer)) {
+        cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, UINT64_MAX);
+    }
+    EXPECT_THROWS(cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, UINT64_MAX),
+                  ERR_DATA_TOO_LARGE);
+}
+
 void run_cbor_test() {
     test_cbor_peek_token();
     test_cbor_parse_noncanonical();
     test_cbor_serialization();
+    test_cbor_batch();
 }
 
 #endif  // DEVEL
@@ -1,12 +1,14 @@
 #ifdef DEVEL
 
 #include "keyDerivation.h"
+#include "messageSigning.h"
 #include "hexUtils.h"
 #include "testUtils.h"
 
 static void pathSpec_init(bip44_path_t* pathSpec, const uint32_t* pathArray, uint32_t pathLength) {
     pathSpec->length = pathLength;
     memmove(pathSpec->path, pathArray, pathLength * 4);
+    bip44_classify(pathSpec);
 }
 
 void testcase_derivePublicKey(uint32_t* path, uint32_t pathLen, const char* expected) {
@@ -59,11 +61,60 @@ void testPublicKeyDerivation() {
 #undef TESTCASE
 }
 
+void testcase_signWithAccountKey(uint32_t* path, uint32_t pathLen, crypto_account_key_t* accountKey) {
+    PRINTF("testcase_signWithAccountKey ");
+
+    bip44_path_t pathSpec;
+    pathSpec_init(&pathSpec, path, pathLen);
+
+    BIP44_PRINTF(&pathSpec);
+    PRINTF("\n");
+
+    uint8_t hash[32] = {0};
+    decode_hex("2f3a5ae8e7ce1e80e2c8f8bd3c2bfa64fba9aabd0b2cf80ce1d8f90a91e8d5b6",
+               hash,
+               SIZEOF(hash));
+
+    uint8_t expected[64] = {0};
+    getWitness(&pathSpec, hash, SIZEOF(hash), expected, SIZEOF(expected));
+
+    uint8_t actual[64] = {0};
+    getWitnessWithAccountKey(&pathSpec, accountKey, hash, SIZEOF(hash), actual, SIZEOF(actual));
+    EXPECT_EQ_BYTES(expected, actual, SIZEOF(expected));
+}
+
+void testSignWithAccountKey() {
+    crypto_account_key_t accountKey;
+    crypto_account_key_wipe(&accountKey);
+
+#define TESTCASE(path_)                                                  \
+    {                                                                    \
+        uint32_t path[] = {UNWRAP path_};                                \
+        testcase_signWithAccountKey(path, ARRAY_LEN(path), &accountKey); \
+    }
+
+    // the account key is derived by the first one and reused by the second one
+    TESTCASE((HD + 1852, HD + 1815, HD + 0, 0, 0));
+    TESTCASE((HD + 1852, HD + 1815, HD + 0, 2, 0));
+
+    // another account
+    TESTCASE((HD + 1852, HD + 1815, HD + 1, 0, 5));
+    TESTCASE((HD + 44, HD + 1815, HD + 1, 1, 189));
+
+    // not an account child, full derivation
+    TESTCASE((HD + 1853, HD + 1815, HD + 0, HD + 2));
+
+#undef TESTCASE
+
+    crypto_account_key_wipe(&accountKey);
+}
+
 void run_key_derivation_test() {
     PRINTF("Running key derivation tests\n");
     PRINTF("If they fail, make sure you seeded your device with\n");
     PRINTF("12-word mnemonic: 11*abandon about\n");
     testPublicKeyDerivation();
+    testSignWithAccountKey();
 }
 
 #endif  // DEVEL
@@ -44,6 +44,15 @@ blake2b_256_append_cbor_tx_body(blake2b_256_context_t* hashCtx, uint8_t type, ui
     blake2b_256_append(hashCtx, buffer, size);
 }
 
+// Appends the whole batch (usually all tokens of a single item) in one hash update
+#define BUILDER_APPEND_BATCH(batch) blake2b_256_append_batch_tx_body(&builder->txHash, batch)
+
+static void blake2b_256_append_batch_tx_body(blake2b_256_context_t* hashCtx, cbor_batch_t* batch) {
+    TRACE_BUFFER(batch->buffer, batch->size);
+    blake2b_256_append(hashCtx, batch->buffer, batch->size);
+    cbor_batch_init(batch);
+}
+
 #define BUILDER_TAG_CBOR_SET()                            \
     if (builder->tagCborSets) {                           \
         TRACE("appending set tag 258");                   \
@@ -52,21 +61,24 @@ blake2b_256_append_cbor_tx_body(blake2b_256_context_t* hashCtx, uint8_t type, ui
 
 /* End of hash computation utilities. */
 
-static void cbor_append_txInput(tx_hash_builder_t* builder,
-                                const uint8_t* utxoHashBuffer,
-                                size_t utxoHashSize,
-                                uint32_t utxoIndex) {
+__noinline_due_to_stack__ static void cbor_append_txInput(tx_hash_builder_t* builder,
+                                                          const uint8_t* utxoHashBuffer,
+                                                          size_t utxoHashSize,
+                                                          uint32_t utxoIndex) {
     // Array(2)[
     //    Bytes[hash],
     //    Unsigned[index]
     // ]
-    BUILDER_APPEND_CBOR(CBOR_TYPE_ARRAY, 2);
+    cbor_batch_t batch;
+    cbor_batch_init(&batch);
+    cbor_batch_appendToken(&batch, CBOR_TYPE_ARRAY, 2);
     {
         ASSERT(utxoHashSize == TX_HASH_LENGTH);
-        BUILDER_APPEND_CBOR(CBOR_TYPE_BYTES, utxoHashSize);
-        BUILDER_APPEND_DATA(utxoHashBuffer, utxoHashSize);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, utxoHashSize);
+        cbor_batch_appendData(&batch, utxoHashBuffer, utxoHashSize);
     }
-    { BUILDER_APPEND_CBOR(CBOR_TYPE_UNSIGNED, utxoIndex); }
+    { cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, utxoIndex); }
+    BUILDER_APPEND_BATCH(&batch);
 }
 
 static void cbor_append_txOutput_array(tx_hash_builder_t* builder,
@@ -435,11 +447,14 @@ __noinline_due_to_stack__ static void addTokenGroup(tx_hash_builder_t* builder,
         // Map(numTokens)[
         //   // entries added later { * asset_name => uint }
         // ]
+        cbor_batch_t batch;
+        cbor_batch_init(&batch);
         {
-            BUILDER_APPEND_CBOR(CBOR_TYPE_BYTES, policyIdSize);
-            BUILDER_APPEND_DATA(policyIdBuffer, policyIdSize);
+            cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, policyIdSize);
+            cbor_batch_appendData(&batch, policyIdBuffer, policyIdSize);
         }
-        { BUILDER_APPEND_CBOR(CBOR_TYPE_MAP, numTokens); }
+        { cbor_batch_appendToken(&batch, CBOR_TYPE_MAP, numTokens); }
+        BUILDER_APPEND_BATCH(&batch);
     }
 
     builder->outputData.outputState = TX_OUTPUT_ASSET_GROUP;
@@ -472,11 +487,14 @@ __noinline_due_to_stack__ static void addToken(tx_hash_builder_t* builder,
         // add a map entry:
         // Bytes[asset_name]
         // Unsigned[Amount]
+        cbor_batch_t batch;
+        cbor_batch_init(&batch);
         {
-            BUILDER_APPEND_CBOR(CBOR_TYPE_BYTES, assetNameSize);
-            BUILDER_APPEND_DATA(assetNameBuffer, assetNameSize);
+            cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, assetNameSize);
+            cbor_batch_appendData(&batch, assetNameBuffer, assetNameSize);
         }
-        { BUILDER_APPEND_CBOR(typeTag, amount); }
+        { cbor_batch_appendToken(&batch, typeTag, amount); }
+        BUILDER_APPEND_BATCH(&batch);
     }
 
     builder->outputData.outputState = TX_OUTPUT_ASSET_GROUP;
@@ -1462,11 +1480,14 @@ void txHashBuilder_addWithdrawal(tx_hash_builder_t* builder,
     // map entry
     //   Bytes[address]
     //   Unsigned[amount]
+    cbor_batch_t batch;
+    cbor_batch_init(&batch);
     {
-        BUILDER_APPEND_CBOR(CBOR_TYPE_BYTES, rewardAddressSize);
-        BUILDER_APPEND_DATA(rewardAddressBuffer, rewardAddressSize);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, rewardAddressSize);
+        cbor_batch_appendData(&batch, rewardAddressBuffer, rewardAddressSize);
     }
-    { BUILDER_APPEND_CBOR(CBOR_TYPE_UNSIGNED, amount); }
+    { cbor_batch_appendToken(&batch, CBOR_TYPE_UNSIGNED, amount); }
+    BUILDER_APPEND_BATCH(&batch);
 }
 
 static void txHashBuilder_assertCanLeaveWithdrawals(tx_hash_builder_t* builder) {
@@ -1754,8 +1775,11 @@ void txHashBuilder_addRequiredSigner(tx_hash_builder_t* builder,
     // ]
     {
         ASSERT(vkeySize == ADDRESS_KEY_HASH_LENGTH);
-        BUILDER_APPEND_CBOR(CBOR_TYPE_BYTES, vkeySize);
-        BUILDER_APPEND_DATA(vkeyBuffer, vkeySize);
+        cbor_batch_t batch;
+        cbor_batch_init(&batch);
+        cbor_batch_appendToken(&batch, CBOR_TYPE_BYTES, vkeySize);
+        cbor_batch_appendData(&batch, vkeyBuffer, vkeySize);
+        BUILDER_APPEND_BATCH(&batch);
     }
 }
 
@@ -106,6 +106,19 @@ cbor_token_t cbor_parseToken(const uint8_t* buf, size_t size) {
 #undef ENSURE_AVAILABLE_BYTES
 }
 
+// Canonical width of the value (i.e. the number of additional bytes)
+// indexed by the number of significant bytes of the value
+static const uint8_t VALUE_WIDTH_BY_SIGNIFICANT_BYTES[1 + 8] = {0, 1, 2, 4, 4, 8, 8, 8, 8};
+
+static inline uint8_t cbor_valueWidth(uint64_t value) {
+    if (value < VALUE_W1_UPPER_THRESHOLD) {
+        return 0;
+    }
+    // value > 0 so clz is well defined and significantBytes is within 1..8
+    const uint8_t significantBytes = (uint8_t)(8 - (__builtin_clzll(value) / 8));
+    return VALUE_WIDTH_BY_SIGNIFICANT_BYTES[significantBytes];
+}
+
 size_t cbor_writeToken(uint8_t type, uint64_t value, uint8_t* buffer, size_t bufferSize) {
     ASSERT(bufferSize < BUFFER_SIZE_PARANOIA);
 
@@ -151,34 +164,54 @@ size_t cbor_writeToken(uint8_t type, uint64_t value, uint8_t* buffer, size_t buf
     // Warning(ppershing): It might be tempting but we don't want to call stream_appendData() twice
     // Instead we have to construct the whole buffer at once to make append operation atomic.
 
-    if (value < VALUE_W1_UPPER_THRESHOLD) {
-        CHECK_BUF_LEN(1);
-        u1be_write(buffer, (uint8_t)(type | value));
-        return 1;
-    } else if (value < VALUE_W2_UPPER_THRESHOLD) {
-        CHECK_BUF_LEN(1 + 1);
-        u1be_write(buffer, type | 24);
-        u1be_write(buffer + 1, (uint8_t) value);
-        return 1 + 1;
-    } else if (value < VALUE_W4_UPPER_THRESHOLD) {
-        CHECK_BUF_LEN(1 + 2);
-        u1be_write(buffer, type | 25);
-        u2be_write(buffer + 1, (uint16_t) value);
-        return 1 + 2;
-    } else if (value < VALUE_W8_UPPER_THRESHOLD) {
-        CHECK_BUF_LEN(1 + 4);
-        u1be_write(buffer, type | 26);
-        u4be_write(buffer + 1, (uint32_t) value);
-        return 1 + 4;
-    } else {
-        CHECK_BUF_LEN(1 + 8);
-        u1be_write(buffer, type | 27);
-        u8be_write(buffer + 1, value);
-        return 1 + 8;
+    const uint8_t width = cbor_valueWidth(value);
+    CHECK_BUF_LEN(1 + width);
+    switch (width) {
+        case 0:
+            u1be_write(buffer, (uint8_t)(type | value));
+            break;
+        case 1:
+            u1be_write(buffer, type | 24);
+            u1be_write(buffer + 1, (uint8_t) value);
+            break;
+        case 2:
+            u1be_write(buffer, type | 25);
+            u2be_write(buffer + 1, (uint16_t) value);
+            break;
+        case 4:
+            u1be_write(buffer, type | 26);
+            u4be_write(buffer + 1, (uint32_t) value);
+            break;
+        case 8:
+            u1be_write(buffer, type | 27);
+            u8be_write(buffer + 1, value);
+            break;
+        default:
+            ASSERT(false);
     }
+    return 1 + width;
 #undef CHECK_BUF_LEN
 }
 
+void cbor_batch_init(cbor_batch_t* batch) {
+    batch->size = 0;
+}
+
+void cbor_batch_appendToken(cbor_batch_t* batch, uint8_t type, uint64_t value) {
+    ASSERT(batch->size <= SIZEOF(batch->buffer));
+    batch->size += cbor_writeToken(type,
+                                   value,
+                                   batch->buffer + batch->size,
+                                   SIZEOF(batch->buffer) - batch->size);
+}
+
+void cbor_batch_appendData(cbor_batch_t* batch, const uint8_t* buffer, size_t bufferSize) {
+    ASSERT(batch->size <= SIZEOF(batch->buffer));
+    ASSERT(bufferSize <= SIZEOF(batch->buffer) - batch->size);
+    memmove(batch->buffer + batch->size, buffer, bufferSize);
+    batch->size += bufferSize;
+}
+
 bool cbor_mapKeyFulfillsCanonicalOrdering(const uint8_t* previousBuffer,
                                           size_t previousSize,
                                           const uint8_t* nextBuffer,
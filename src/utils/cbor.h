@@ -51,9 +51,28 @@ typedef struct {
 
 typedef cbor_token_t token_t;  // legacy
 
+enum {
+    // initial byte + up to 8 bytes of value
+    CBOR_TOKEN_MAX_SIZE = 1 + 8,
+    // enough for a few token headers together with a hash or a short asset name
+    CBOR_BATCH_BUFFER_SIZE = 48,
+};
+
+// Accumulates serialized tokens and short data of a single item
+// so that they can be passed to the hash function in one update
+typedef struct {
+    uint8_t buffer[CBOR_BATCH_BUFFER_SIZE];
+    size_t size;
+} cbor_batch_t;
+
 // Serializes token into buffer, returning number of written bytes
 size_t cbor_writeToken(uint8_t type, uint64_t value, uint8_t* buffer, size_t bufferSize);
 
+void cbor_batch_init(cbor_batch_t* batch);
+// Serializes token at the end of the batch, throws ERR_DATA_TOO_LARGE if it does not fit
+void cbor_batch_appendToken(cbor_batch_t* batch, uint8_t type, uint64_t value);
+void cbor_batch_appendData(cbor_batch_t* batch, const uint8_t* buffer, size_t bufferSize);
+
 cbor_token_t cbor_parseToken(const uint8_t* buf, size_t size);
 
 bool cbor_mapKeyFulfillsCanonicalOrdering(const uint8_t* previousBuffer,
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the human readable address codecs: bech32 for the Shelley addresses and
+base58 for the Byron addresses.
+
+The bech32 checksum is computed with the generator table of src/crypto/bech32.c.
+The Byron addresses are checked as in src/addressUtils/addressUtilsByron.c: the CBOR
+envelope, the CRC32 of the embedded payload and the protocol magic attribute.
+The Cardano addresses are longer than the 90 characters of BIP-173, no limit applies.
+"""
+
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+from application_client.app_def import AddressType, NetworkIds
+
+# cspell:disable-next-line
+BECH32_CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+# cspell:disable-next-line
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+MAINNET_PROTOCOL_MAGIC = 764824073
+BYRON_ADDRESS_ROOT_SIZE = 28
+BYRON_PROTOCOL_MAGIC_ATTRIBUTE_KEY = 2
+BYRON_MAX_ADDRESS_ATTRIBUTES = 3
+
+ADDRESS_CACHE_SIZE = 4096
+
+# Contribution of the generator to the checksum for each value of the 5 bits
+# shifted out in a polymod step, see POLYMOD_GENERATOR_TABLE in src/crypto/bech32.c
+_POLYMOD_GENERATOR_TABLE = (
+    0x00000000, 0x3b6a57b2, 0x26508e6d, 0x1d3ad9df, 0x1ea119fa, 0x25cb4e48, 0x38f19797, 0x039bc025,
+    0x3d4233dd, 0x0628646f, 0x1b12bdb0, 0x2078ea02, 0x23e32a27, 0x18897d95, 0x05b3a44a, 0x3ed9f3f8,
+    0x2a1462b3, 0x117e3501, 0x0c44ecde, 0x372ebb6c, 0x34b57b49, 0x0fdf2cfb, 0x12e5f524, 0x298fa296,
+    0x1756516e, 0x2c3c06dc, 0x3106df03, 0x0a6c88b1, 0x09f74894, 0x329d1f26, 0x2fa7c6f9, 0x14cd914b,
+)
+
+# Symbol values of the characters, -1 for the characters out of the charset
+_BECH32_VALUES = [-1] * 128
+for _value, _char in enumerate(BECH32_CHARSET):
+    _BECH32_VALUES[ord(_char)] = _value
+_BASE58_VALUES = [-1] * 128
+for _value, _char in enumerate(BASE58_ALPHABET):
+    _BASE58_VALUES[ord(_char)] = _value
+
+# CBOR major types
+_CBOR_UNSIGNED = 0
+_CBOR_BYTES = 2
+_CBOR_ARRAY = 4
+_CBOR_MAP = 5
+_CBOR_TAG = 6
+_CBOR_TAG_EMBEDDED_CBOR_BYTE_STRING = 24
+
+
+def _polymod(symbols: Iterable[int], chk: int = 1) -> int:
+    for symbol in symbols:
+        chk = ((chk & 0x1FFFFFF) << 5) ^ _POLYMOD_GENERATOR_TABLE[chk >> 25] ^ symbol
+    return chk
+
+
+def _hrp_expand(hrp: str) -> List[int]:
+    return [ord(c) >> 5 for c in hrp] + [0] + [ord(c) & 0x1F for c in hrp]
+
+
+def _to_symbols(data: bytes) -> List[int]:
+    """Regroups the bytes in 5-bit symbols, the last one padded with zero bits"""
+
+    bits = len(data) * 8
+    pad = -bits % 5
+    value = int.from_bytes(data, "big") << pad
+    return [(value >> shift) & 0x1F for shift in range(bits + pad - 5, -1, -5)]
+
+
+def _from_symbols(symbols: List[int]) -> bytes:
+    bits = len(symbols) * 5
+    pad = bits % 8
+    value = 0
+    for symbol in symbols:
+        value = (value << 5) | symbol
+    if pad >= 5 or value & ((1 << pad) - 1):
+        raise ValueError("Invalid bech32 padding")
+    return (value >> pad).to_bytes(bits // 8, "big")
+
+
+def bech32_encode(hrp: str, data: bytes) -> str:
+    """Bech32 (BIP-173 checksum) encoding of bytes
+
+    Args:
+        hrp (str): The human readable part, lower case
+        data (bytes): The bytes to encode
+
+    Returns:
+        The bech32 string
+    """
+
+    assert hrp and hrp == hrp.lower()
+    symbols = _to_symbols(data)
+    chk = _polymod(symbols + [0] * 6, _polymod(_hrp_expand(hrp))) ^ 1
+    checksum = [(chk >> (5 * (5 - i))) & 0x1F for i in range(6)]
+    return hrp + "1" + "".join(BECH32_CHARSET[s] for s in symbols + checksum)
+
+
+def bech32_decode(text: str) -> Tuple[str, bytes]:
+    """Decoding of a bech32 string, with its checksum
+
+    Args:
+        text (str): The bech32 string
+
+    Returns:
+        The human readable part and the decoded bytes
+    """
+
+    if text.lower() != text and text.upper() != text:
+        raise ValueError("Mixed case bech32 string")
+    text = text.lower()
+    separator = text.rfind("1")
+    if separator < 1 or separator + 7 > len(text):
+        raise ValueError("Invalid bech32 separator position")
+    hrp = text[:separator]
+    if any(ord(c) < 33 or ord(c) > 126 for c in hrp):
+        raise ValueError("Invalid bech32 human readable part")
+    symbols = [_BECH32_VALUES[ord(c)] if ord(c) < 128 else -1 for c in text[separator + 1:]]
+    if -1 in symbols:
+        raise ValueError("Invalid bech32 character")
+    if _polymod(symbols, _polymod(_hrp_expand(hrp))) != 1:
+        raise ValueError("Invalid bech32 checksum")
+    return hrp, _from_symbols(symbols[:-6])
+
+
+def base58_encode(data: bytes) -> str:
+    zeros = len(data) - len(data.lstrip(b"\x00"))
+    value = int.from_bytes(data, "big")
+    digits = []
+    while value:
+        value, digit = divmod(value, 58)
+        digits.append(BASE58_ALPHABET[digit])
+    return "1" * zeros + "".join(reversed(digits))
+
+
+def base58_decode(text: str) -> bytes:
+    value = 0
+    for c in text:
+        digit = _BASE58_VALUES[ord(c)] if ord(c) < 128 else -1
+        if digit < 0:
+            raise ValueError(f"Invalid base58 character: {c!r}")
+        value = value * 58 + digit
+    zeros = len(text) - len(text.lstrip("1"))
+    return b"\x00" * zeros + value.to_bytes((value.bit_length() + 7) // 8, "big")
+
+
+def _cbor_token(data: bytes, offset: int) -> Tuple[int, int, int]:
+    """Parses a CBOR token header
+
+    Returns:
+        The major type, the value and the offset of the next token
+    """
+
+    if offset >= len(data):
+        raise ValueError("Truncated CBOR")
+    major, info = data[offset] >> 5, data[offset] & 0x1F
+    offset += 1
+    if info < 24:
+        return major, info, offset
+    if info > 27:
+        raise ValueError("Unsupported CBOR length")
+    size = 1 << (info - 24)
+    if offset + size > len(data):
+        raise ValueError("Truncated CBOR")
+    return major, int.from_bytes(data[offset:offset + size], "big"), offset + size
+
+
+def _cbor_expect(data: bytes, offset: int, major: int) -> Tuple[int, int]:
+    tokenMajor, value, offset = _cbor_token(data, offset)
+    if tokenMajor != major:
+        raise ValueError("Unexpected CBOR type")
+    return value, offset
+
+
+def _cbor_bytes(data: bytes, offset: int) -> Tuple[bytes, int]:
+    size, offset = _cbor_expect(data, offset, _CBOR_BYTES)
+    if offset + size > len(data):
+        raise ValueError("Truncated CBOR")
+    return data[offset:offset + size], offset + size
+
+
+def byron_protocol_magic(address: bytes) -> int:
+    """Checks a Byron address, as extractProtocolMagic in src/addressUtils/addressUtilsByron.c
+
+    Args:
+        address (bytes): The raw address [tag(24):bytes(payload), crc32(payload)]
+
+    Returns:
+        The protocol magic, MAINNET_PROTOCOL_MAGIC if the address has none
+    """
+
+    if _cbor_expect(address, 0, _CBOR_ARRAY) != (2, 1):
+        raise ValueError("Invalid Byron address envelope")
+    tag, offset = _cbor_expect(address, 1, _CBOR_TAG)
+    if tag != _CBOR_TAG_EMBEDDED_CBOR_BYTE_STRING:
+        raise ValueError("Invalid Byron address envelope")
+    payload, offset = _cbor_bytes(address, offset)
+    checksum, offset = _cbor_expect(address, offset, _CBOR_UNSIGNED)
+    if offset != len(address):
+        raise ValueError("Trailing data after the Byron address")
+    if checksum != zlib.crc32(payload):
+        raise ValueError("Invalid Byron address checksum")
+
+    protocolMagic = MAINNET_PROTOCOL_MAGIC
+    if _cbor_expect(payload, 0, _CBOR_ARRAY) != (3, 1):
+        raise ValueError("Invalid Byron address payload")
+    root, offset = _cbor_bytes(payload, 1)
+    if len(root) != BYRON_ADDRESS_ROOT_SIZE:
+        raise ValueError("Invalid Byron address root")
+    attributes, offset = _cbor_expect(payload, offset, _CBOR_MAP)
+    if attributes > BYRON_MAX_ADDRESS_ATTRIBUTES:
+        raise ValueError("Too many Byron address attributes")
+    found = False
+    for _ in range(attributes):
+        key, offset = _cbor_expect(payload, offset, _CBOR_UNSIGNED)
+        value, offset = _cbor_bytes(payload, offset)
+        if key == BYRON_PROTOCOL_MAGIC_ATTRIBUTE_KEY:
+            # the protocol magic is bytes with cbor-encoded content
+            if found:
+                raise ValueError("Duplicate Byron protocol magic")
+            protocolMagic, _ = _cbor_expect(value, 0, _CBOR_UNSIGNED)
+            # mainnet addresses are not supposed to explicitly contain protocol magic
+            if protocolMagic >= 1 << 32 or protocolMagic == MAINNET_PROTOCOL_MAGIC:
+                raise ValueError("Invalid Byron protocol magic")
+            found = True
+    _, offset = _cbor_expect(payload, offset, _CBOR_UNSIGNED)
+    if offset != len(payload):
+        raise ValueError("Trailing data in the Byron address payload")
+    return protocolMagic
+
+
+def address_hrp(addrType: AddressType, networkId: int) -> str:
+    if addrType in (AddressType.REWARD_KEY, AddressType.REWARD_SCRIPT):
+        return "stake_test" if networkId == NetworkIds.TESTNET else "stake"
+    return "addr_test" if networkId == NetworkIds.TESTNET else "addr"
+
+
+def format_address(address: bytes) -> str:
+    """Human readable address: bech32 for Shelley, base58 for Byron
+
+    Args:
+        address (bytes): The raw address
+
+    Returns:
+        The encoded address
+    """
+
+    addrType = AddressType(address[0] >> 4)
+    if addrType == AddressType.BYRON:
+        return base58_encode(address)
+    return bech32_encode(address_hrp(addrType, address[0] & 0x0F), address)
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def parse_address(text: str) -> bytes:
+    """Raw bytes of a human readable address, the decoded addresses being cached
+
+    Args:
+        text (str): A bech32 Shelley address or a base58 Byron address
+
+    Returns:
+        The raw address
+    """
+
+    separator = text.rfind("1")
+    if separator > 0 and text[:separator].lower() in ("addr", "addr_test", "stake", "stake_test"):
+        hrp, address = bech32_decode(text)
+        if not address:
+            raise ValueError("Empty address")
+        addrType = AddressType(address[0] >> 4)
+        if addrType == AddressType.BYRON or hrp != address_hrp(addrType, address[0] & 0x0F):
+            raise ValueError(f"Address prefix {hrp} does not match the address header")
+        return address
+    address = base58_decode(text)
+    byron_protocol_magic(address)
+    return address
+
+
+def parse_addresses(texts: Iterable[str]) -> List[bytes]:
+    return [parse_address(text) for text in texts]
+
+
+def format_addresses(addresses: Iterable[bytes]) -> List[str]:
+    return [format_address(address) for address in addresses]
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the bulk Shelley address generation from an account public key.
+
+The addresses are built as in src/addressUtils/addressUtilsShelley.c: a header byte
+(address type and network id) followed by the payment part and the staking part.
+The child public keys are derived with the BIP32-Ed25519 soft derivation, the point
+operations being done by libsodium.
+"""
+
+import hashlib
+import hmac
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from nacl.bindings import crypto_core_ed25519_add, crypto_scalarmult_ed25519_base_noclamp
+
+from application_client.address_codec import address_hrp, bech32_encode
+from application_client.app_def import AddressType, NetworkIds
+
+PUBLIC_KEY_SIZE = 32
+CHAIN_CODE_SIZE = 32
+KEY_HASH_SIZE = 28
+
+HARDENED = 0x80000000
+
+# Roles of the CIP-1852 paths: m/1852'/1815'/account'/role/index
+ROLE_EXTERNAL = 0
+ROLE_INTERNAL = 1
+ROLE_STAKING = 2
+
+BATCH_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class ExtendedPublicKey:
+    publicKey: bytes
+    chainCode: bytes
+
+
+    @classmethod
+    def from_bytes(cls, xpub: bytes) -> "ExtendedPublicKey":
+        """Parses the public key and chain code returned by GET_PUBLIC_KEY"""
+
+        assert len(xpub) == PUBLIC_KEY_SIZE + CHAIN_CODE_SIZE
+        return cls(xpub[:PUBLIC_KEY_SIZE], xpub[PUBLIC_KEY_SIZE:])
+
+
+    def child_public_key(self, index: int) -> bytes:
+        """Soft child derivation, without the chain code (leaf keys)"""
+
+        assert 0 <= index < HARDENED, "Hardened derivation needs the private key"
+        z = hmac.digest(self.chainCode, b"\x02" + self.publicKey + index.to_bytes(4, "little"), "sha512")
+        # A + [8 * ZL]B, ZL being the first 28 bytes of Z
+        scalar = (int.from_bytes(z[:28], "little") * 8).to_bytes(32, "little")
+        return crypto_core_ed25519_add(self.publicKey, crypto_scalarmult_ed25519_base_noclamp(scalar))
+
+
+    def child(self, index: int) -> "ExtendedPublicKey":
+        """Soft child derivation, with its chain code"""
+
+        chainCode = hmac.digest(self.chainCode, b"\x03" + self.publicKey + index.to_bytes(4, "little"), "sha512")
+        return ExtendedPublicKey(self.child_public_key(index), chainCode[32:])
+
+
+def key_hash(publicKey: bytes) -> bytes:
+    return hashlib.blake2b(publicKey, digest_size=KEY_HASH_SIZE).digest()
+
+
+def encode_variable_uint(value: int) -> bytes:
+    """Variable length encoding of the pointer fields, 7 bits per byte, most significant first"""
+
+    assert value >= 0
+    out = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        out.append(0x80 | (value & 0x7F))
+        value >>= 7
+    out.reverse()
+    return bytes(out)
+
+
+def pointer_bytes(blockIndex: int, txIndex: int, certificateIndex: int) -> bytes:
+    return encode_variable_uint(blockIndex) + encode_variable_uint(txIndex) + encode_variable_uint(certificateIndex)
+
+
+def header_byte(addrType: AddressType, networkId: int) -> int:
+    return (int(addrType) << 4) | int(networkId)
+
+
+def to_bech32(address: bytes) -> str:
+    """Human readable Shelley address"""
+
+    addrType = AddressType(address[0] >> 4)
+    assert addrType != AddressType.BYRON
+    return bech32_encode(address_hrp(addrType, address[0] & 0x0F), address)
+
+
+class AddressEngine:
+    """Generates the addresses of an account, in batches"""
+
+    def __init__(self, accountXpub: bytes, networkId: int = NetworkIds.MAINNET, workers: int = 4) -> None:
+        """Class initializer
+
+        Args:
+            accountXpub (bytes): Public key and chain code of m/1852'/1815'/account'
+            networkId (int): The network id of the addresses
+            workers (int): Number of threads hashing and deriving the batches
+        """
+
+        self.account = ExtendedPublicKey.from_bytes(accountXpub)
+        self.networkId = networkId
+        self.workers = workers
+        # the role keys are derived once
+        self._roles = {role: self.account.child(role) for role in (ROLE_EXTERNAL, ROLE_INTERNAL, ROLE_STAKING)}
+
+
+    def payment_key_hashes(self, role: int, indices: Sequence[int]) -> List[bytes]:
+        """Payment key hashes of m/1852'/1815'/account'/role/index
+
+        Args:
+            role (int): ROLE_EXTERNAL or ROLE_INTERNAL
+            indices (Sequence[int]): The address indices
+
+        Returns:
+            The key hashes, in the order of the indices
+        """
+
+        roleKey = self._roles[role]
+        batches = [indices[i:i + BATCH_SIZE] for i in range(0, len(indices), BATCH_SIZE)]
+
+        def hashBatch(batch: Sequence[int]) -> List[bytes]:
+            return [key_hash(roleKey.child_public_key(index)) for index in batch]
+
+        if self.workers <= 1 or len(batches) <= 1:
+            return [h for batch in batches for h in hashBatch(batch)]
+        with ThreadPoolExecutor(self.workers) as executor:
+            return [h for hashes in executor.map(hashBatch, batches) for h in hashes]
+
+
+    def staking_key_hash(self, index: int = 0) -> bytes:
+        return key_hash(self._roles[ROLE_STAKING].child_public_key(index))
+
+
+    def base_addresses(self,
+                       indices: Iterable[int],
+                       role: int = ROLE_EXTERNAL,
+                       stakingKeyHash: Optional[bytes] = None) -> List[bytes]:
+        """Base addresses (payment key, staking key) of an index range
+
+        Args:
+            indices (Iterable[int]): The address indices
+            role (int): ROLE_EXTERNAL or ROLE_INTERNAL
+            stakingKeyHash (bytes): The staking key hash, the account staking key by default
+
+        Returns:
+            The raw addresses
+        """
+
+        staking = stakingKeyHash if stakingKeyHash is not None else self.staking_key_hash()
+        header = bytes([header_byte(AddressType.BASE_PAYMENT_KEY_STAKE_KEY, self.networkId)])
+        return [header + h + staking for h in self.payment_key_hashes(role, list(indices))]
+
+
+    def enterprise_addresses(self, indices: Iterable[int], role: int = ROLE_EXTERNAL) -> List[bytes]:
+        header = bytes([header_byte(AddressType.ENTERPRISE_KEY, self.networkId)])
+        return [header + h for h in self.payment_key_hashes(role, list(indices))]
+
+
+    def pointer_addresses(self,
+                          indices: Iterable[int],
+                          pointer: Tuple[int, int, int],
+                          role: int = ROLE_EXTERNAL) -> List[bytes]:
+        header = bytes([header_byte(AddressType.POINTER_KEY, self.networkId)])
+        suffix = pointer_bytes(*pointer)
+        return [header + h + suffix for h in self.payment_key_hashes(role, list(indices))]
+
+
+    def reward_address(self, index: int = 0) -> bytes:
+        return bytes([header_byte(AddressType.REWARD_KEY, self.networkId)]) + self.staking_key_hash(index)
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the asyncio command sending part.
+
+AsyncCommandSender has the methods of CommandSender as coroutines returning the response.
+There is no UI navigation: the commands waiting for the user return once the device
+answers (a user, or Speculos automation rules, see transcript.set_automation_rules).
+"""
+
+from typing import Any, Callable, Coroutine, List, Optional
+
+from ragger.backend.interface import RAPDU
+
+from input_files.cvote import CVoteTestCase
+from input_files.signMsg import SignMsgTestCase
+
+from application_client.command_builder import CommandBuilder
+from application_client.command_sender import CommandSender
+from application_client.app_def import Errors
+from application_client.transcript import Transcript, TranscriptRecorder
+from application_client.transport import Transport
+
+
+def _command(name: str) -> Callable[..., Coroutine[Any, Any, RAPDU]]:
+    """Coroutine sending the APDU built by the CommandBuilder method of the same name"""
+
+    async def method(self: "AsyncCommandSender", *args: Any, **kwargs: Any) -> RAPDU:
+        return await self._exchange(getattr(self._cmd_builder, name)(*args, **kwargs))  # pylint: disable=protected-access
+
+    summary = (getattr(CommandSender, name).__doc__ or name).strip().splitlines()[0]
+    method.__name__ = name
+    method.__doc__ = f"{summary}\n\nSame arguments as CommandSender.{name}, returns the response APDU"
+    return method
+
+
+class AsyncCommandSender:
+    """Base class to send APDU to the selected transport, with asyncio"""
+
+    def __init__(self, transport: Transport, recorder: Optional[TranscriptRecorder] = None) -> None:
+        """Class initializer
+
+        Args:
+            transport (Transport): The device transport, opened by the caller
+            recorder (TranscriptRecorder): Records the exchanged APDU
+        """
+
+        self.transport = transport
+        self._cmd_builder = CommandBuilder()
+        self._recorder = recorder
+
+
+    async def _exchange(self, payload: bytes) -> RAPDU:
+        """APDU exchange with response
+
+        Args:
+            payload (bytes): APDU data to send
+
+        Returns:
+            Response APDU
+        """
+
+        if self._recorder is not None:
+            self._recorder.record_command(payload)
+        rapdu = await self.transport.exchange(payload)
+        if self._recorder is not None:
+            self._recorder.record_response(rapdu)
+        return rapdu
+
+
+    async def _exchange_chunks(self, chunks: List[bytes]) -> RAPDU:
+        """Sends APDU chunks, all but the last one must succeed
+
+        Args:
+            chunks (List[bytes]): APDU data to send
+
+        Returns:
+            Response APDU of the last chunk
+        """
+
+        for chunk in chunks[:-1]:
+            rapdu = await self._exchange(chunk)
+            if rapdu.status != Errors.SW_SUCCESS:
+                return rapdu
+        return await self._exchange(chunks[-1])
+
+
+    async def send_raw(self, cla: int, ins: int, p1: int, p2: int, payload: bytes) -> RAPDU:
+        return await self._exchange(bytes([cla, ins, p1, p2, len(payload)]) + payload)
+
+
+    async def replay(self, transcript: Transcript) -> List[RAPDU]:
+        """Sends the commands of a recorded transcript
+
+        Args:
+            transcript (Transcript): The transcript
+
+        Returns:
+            The responses
+        """
+
+        return [await self._exchange(exchange.command) for exchange in transcript.exchanges()]
+
+
+    async def get_version(self) -> bytes:
+        """APDU Get Version
+
+        Returns:
+            Version data
+        """
+
+        rapdu = await self._exchange(self._cmd_builder.get_version())
+        assert rapdu.status == Errors.SW_SUCCESS
+        return rapdu.data
+
+
+    async def get_serial(self) -> bytes:
+        """APDU Get Serial
+
+        Returns:
+            Serial data
+        """
+
+        rapdu = await self._exchange(self._cmd_builder.get_serial())
+        assert rapdu.status == Errors.SW_SUCCESS
+        return rapdu.data
+
+
+    async def sign_cip36_chunk(self, testCase: CVoteTestCase) -> RAPDU:
+        """APDU CIP36 Vote - CHUNK step
+
+        Args:
+            testCase (CVoteTestCase): Test parameters
+
+        Returns:
+            Response APDU
+        """
+
+        return await self._exchange_chunks(self._cmd_builder.sign_cip36_chunk(testCase))
+
+
+    async def sign_msg_chunk(self, testCase: SignMsgTestCase) -> RAPDU:
+        """APDU Sign Message - CHUNK step
+
+        Args:
+            testCase (SignMsgTestCase): Test parameters
+
+        Returns:
+            Response APDU
+        """
+
+        return await self._exchange_chunks(self._cmd_builder.sign_msg_chunk(testCase))
+
+
+    derive_address = _command("derive_address")
+    get_pubkey = _command("get_pubkey")
+
+    sign_cip36_init = _command("sign_cip36_init")
+    sign_cip36_confirm = _command("sign_cip36_confirm")
+    sign_cip36_witness = _command("sign_cip36_witness")
+
+    sign_opCert = _command("sign_opCert")
+
+    sign_msg_init = _command("sign_msg_init")
+    sign_msg_confirm = _command("sign_msg_confirm")
+
+    sign_tx_init = _command("sign_tx_init")
+    sign_tx_aux_data_serialize = _command("sign_tx_aux_data_serialize")
+    sign_tx_aux_data_init = _command("sign_tx_aux_data_init")
+    sign_tx_aux_data_vote_key = _command("sign_tx_aux_data_vote_key")
+    sign_tx_aux_data_delegation = _command("sign_tx_aux_data_delegation")
+    sign_tx_aux_data_staking = _command("sign_tx_aux_data_staking")
+    sign_tx_aux_data_payment = _command("sign_tx_aux_data_payment")
+    sign_tx_aux_data_nonce = _command("sign_tx_aux_data_nonce")
+    sign_tx_aux_data_voting_purpose = _command("sign_tx_aux_data_voting_purpose")
+    sign_tx_aux_data_confirm = _command("sign_tx_aux_data_confirm")
+    sign_tx_inputs = _command("sign_tx_inputs")
+    sign_tx_inputs_batch = _command("sign_tx_inputs_batch")
+    sign_tx_outputs_basic = _command("sign_tx_outputs_basic")
+    sign_tx_outputs_datum = _command("sign_tx_outputs_datum")
+    sign_tx_outputs_ref_script = _command("sign_tx_outputs_ref_script")
+    sign_tx_outputs_chunk = _command("sign_tx_outputs_chunk")
+    sign_tx_outputs_confirm = _command("sign_tx_outputs_confirm")
+    sign_tx_fee = _command("sign_tx_fee")
+    sign_tx_ttl = _command("sign_tx_ttl")
+    sign_tx_withdrawal = _command("sign_tx_withdrawal")
+    sign_tx_validity = _command("sign_tx_validity")
+    sign_tx_script_data_hash = _command("sign_tx_script_data_hash")
+    sign_tx_mint_init = _command("sign_tx_mint_init")
+    sign_tx_mint_confirm = _command("sign_tx_mint_confirm")
+    sign_tx_asset_group = _command("sign_tx_asset_group")
+    sign_tx_token = _command("sign_tx_token")
+    sign_tx_voting_procedure = _command("sign_tx_voting_procedure")
+    sign_tx_treasury = _command("sign_tx_treasury")
+    sign_tx_donation = _command("sign_tx_donation")
+    sign_tx_collateral_inputs = _command("sign_tx_collateral_inputs")
+    sign_tx_collateral_output_basic = _command("sign_tx_collateral_output_basic")
+    sign_tx_collateral_output_confirm = _command("sign_tx_collateral_output_confirm")
+    sign_tx_total_collateral = _command("sign_tx_total_collateral")
+    sign_tx_reference_inputs = _command("sign_tx_reference_inputs")
+    sign_tx_required_signers = _command("sign_tx_required_signers")
+    sign_tx_certificate = _command("sign_tx_certificate")
+    sign_tx_cert_pool_reg_init = _command("sign_tx_cert_pool_reg_init")
+    sign_tx_cert_pool_reg_pool_key = _command("sign_tx_cert_pool_reg_pool_key")
+    sign_tx_cert_pool_reg_vrf = _command("sign_tx_cert_pool_reg_vrf")
+    sign_tx_cert_pool_reg_financials = _command("sign_tx_cert_pool_reg_financials")
+    sign_tx_cert_pool_reg_reward = _command("sign_tx_cert_pool_reg_reward")
+    sign_tx_cert_pool_reg_owner = _command("sign_tx_cert_pool_reg_owner")
+    sign_tx_cert_pool_reg_relay = _command("sign_tx_cert_pool_reg_relay")
+    sign_tx_cert_pool_reg_metadata = _command("sign_tx_cert_pool_reg_metadata")
+    sign_tx_cert_pool_reg_confirm = _command("sign_tx_cert_pool_reg_confirm")
+    sign_tx_confirm = _command("sign_tx_confirm")
+    sign_tx_witness = _command("sign_tx_witness")
+    sign_tx_witnesses_batch = _command("sign_tx_witnesses_batch")
+
+    derive_script_add_simple = _command("derive_script_add_simple")
+    derive_script_add_complex = _command("derive_script_add_complex")
+    derive_script_finish = _command("derive_script_finish")
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the classification of the derivation paths, as in src/crypto/bip44.c.
+"""
+
+from enum import IntEnum, auto
+from functools import lru_cache
+from typing import Tuple
+
+HARDENED = 0x80000000
+MAX_PATH_ELEMENTS = 5
+
+PURPOSE_BYRON = 44
+PURPOSE_SHELLEY = 1852
+PURPOSE_MULTISIG = 1854
+PURPOSE_MINT = 1855
+PURPOSE_POOL_COLD_KEY = 1853
+PURPOSE_CVOTE_KEY = 1694
+ADA_COIN_TYPE = 1815
+
+I_PURPOSE = 0
+I_COIN_TYPE = 1
+I_ACCOUNT = 2
+I_CHAIN = 3
+I_ADDRESS = 4
+I_MINT_POLICY = 2
+I_POOL_COLD_KEY_USECASE = 2
+I_POOL_COLD_KEY = 3
+
+CHAIN_EXTERNAL = 0
+CHAIN_INTERNAL = 1
+CHAIN_STAKING_KEY = 2
+CHAIN_DREP_KEY = 3
+CHAIN_COMMITTEE_COLD_KEY = 4
+CHAIN_COMMITTEE_HOT_KEY = 5
+
+MAX_REASONABLE_ACCOUNT = 100
+MAX_REASONABLE_ADDRESS = 1000000
+MAX_REASONABLE_COLD_KEY_INDEX = 1000000
+MAX_REASONABLE_MINT_POLICY_INDEX = 1000000
+
+Path = Tuple[int, ...]
+
+
+class PathType(IntEnum):
+    ORDINARY_ACCOUNT = auto()
+    MULTISIG_ACCOUNT = auto()
+    ORDINARY_PAYMENT_KEY = auto()
+    MULTISIG_PAYMENT_KEY = auto()
+    ORDINARY_STAKING_KEY = auto()
+    MULTISIG_STAKING_KEY = auto()
+    DREP_KEY = auto()
+    COMMITTEE_COLD_KEY = auto()
+    COMMITTEE_HOT_KEY = auto()
+    MINT_KEY = auto()
+    POOL_COLD_KEY = auto()
+    CVOTE_ACCOUNT = auto()
+    CVOTE_KEY = auto()
+    INVALID = auto()
+
+
+@lru_cache(maxsize=1024)
+def parse_path(text: str) -> Path:
+    """Derivation path indexes, as sent to the device
+
+    Args:
+        text (str): The path, e.g. "m/1852'/1815'/0'/0/0"
+
+    Returns:
+        The indexes, hardened ones having the HARDENED bit
+    """
+
+    elements = text.split("/")
+    if elements[0] != "m" or len(elements) - 1 > MAX_PATH_ELEMENTS:
+        raise ValueError(f"Invalid path {text}")
+    path = []
+    for element in elements[1:]:
+        hardened = element.endswith("'")
+        index = int(element[:-1] if hardened else element)
+        if index >= HARDENED:
+            raise ValueError(f"Invalid path {text}")
+        path.append(index | HARDENED if hardened else index)
+    return tuple(path)
+
+
+def is_hardened(value: int) -> bool:
+    return value & HARDENED != 0
+
+
+def harden(value: int) -> int:
+    return value | HARDENED
+
+
+def _has_prefix(path: Path, purpose: int) -> bool:
+    return len(path) > I_COIN_TYPE and path[I_PURPOSE] == harden(purpose) and path[I_COIN_TYPE] == harden(ADA_COIN_TYPE)
+
+
+def has_byron_prefix(path: Path) -> bool:
+    return _has_prefix(path, PURPOSE_BYRON)
+
+
+def has_shelley_prefix(path: Path) -> bool:
+    return _has_prefix(path, PURPOSE_SHELLEY)
+
+
+def has_ordinary_wallet_key_prefix(path: Path) -> bool:
+    return has_byron_prefix(path) or has_shelley_prefix(path)
+
+
+def contains_account(path: Path) -> bool:
+    return len(path) > I_ACCOUNT
+
+
+def _is_chain_key_path(path: Path, purpose: int, chain: int) -> bool:
+    """Staking, DRep and committee keys: prefix/account'/chain/address"""
+
+    return (len(path) == I_ADDRESS + 1
+            and _has_prefix(path, purpose)
+            and is_hardened(path[I_ACCOUNT])
+            and path[I_CHAIN] == chain
+            and not is_hardened(path[I_ADDRESS]))
+
+
+def is_ordinary_staking_key_path(path: Path) -> bool:
+    return _is_chain_key_path(path, PURPOSE_SHELLEY, CHAIN_STAKING_KEY)
+
+
+def is_multisig_staking_key_path(path: Path) -> bool:
+    return _is_chain_key_path(path, PURPOSE_MULTISIG, CHAIN_STAKING_KEY)
+
+
+def is_multidelegation_staking_key_path(path: Path) -> bool:
+    return (is_ordinary_staking_key_path(path) or is_multisig_staking_key_path(path)) and path[I_ADDRESS] > 0
+
+
+def is_drep_key_path(path: Path) -> bool:
+    return _is_chain_key_path(path, PURPOSE_SHELLEY, CHAIN_DREP_KEY)
+
+
+def is_committee_cold_key_path(path: Path) -> bool:
+    return _is_chain_key_path(path, PURPOSE_SHELLEY, CHAIN_COMMITTEE_COLD_KEY)
+
+
+def is_committee_hot_key_path(path: Path) -> bool:
+    return _is_chain_key_path(path, PURPOSE_SHELLEY, CHAIN_COMMITTEE_HOT_KEY)
+
+
+def is_mint_key_path(path: Path) -> bool:
+    return len(path) == I_MINT_POLICY + 1 and _has_prefix(path, PURPOSE_MINT) and is_hardened(path[I_MINT_POLICY])
+
+
+def is_pool_cold_key_path(path: Path) -> bool:
+    return (len(path) == I_POOL_COLD_KEY + 1
+            and _has_prefix(path, PURPOSE_POOL_COLD_KEY)
+            and path[I_POOL_COLD_KEY_USECASE] == harden(0)
+            and is_hardened(path[I_POOL_COLD_KEY]))
+
+
+def is_cvote_key_path(path: Path) -> bool:
+    return _is_chain_key_path(path, PURPOSE_CVOTE_KEY, 0)
+
+
+def _classify_ordinary_wallet_path(path: Path) -> PathType:
+    if len(path) == I_ACCOUNT + 1:
+        return PathType.ORDINARY_ACCOUNT
+    if len(path) != I_ADDRESS + 1:
+        return PathType.INVALID
+    # the chain type is read as a byte by the app, so 0' is the external chain
+    chain = path[I_CHAIN] & 0xFF
+    if chain in (CHAIN_EXTERNAL, CHAIN_INTERNAL):
+        # hardened address indexes are allowed for legacy reasons, but they are not reasonable
+        return PathType.ORDINARY_PAYMENT_KEY
+    chainTypes = {
+        CHAIN_STAKING_KEY: (is_ordinary_staking_key_path, PathType.ORDINARY_STAKING_KEY),
+        CHAIN_DREP_KEY: (is_drep_key_path, PathType.DREP_KEY),
+        CHAIN_COMMITTEE_COLD_KEY: (is_committee_cold_key_path, PathType.COMMITTEE_COLD_KEY),
+        CHAIN_COMMITTEE_HOT_KEY: (is_committee_hot_key_path, PathType.COMMITTEE_HOT_KEY),
+    }
+    if chain not in chainTypes:
+        return PathType.INVALID
+    predicate, pathType = chainTypes[chain]
+    return pathType if predicate(path) else PathType.INVALID
+
+
+def _classify_multisig_wallet_path(path: Path) -> PathType:
+    if len(path) == I_ACCOUNT + 1:
+        return PathType.MULTISIG_ACCOUNT
+    if len(path) != I_ADDRESS + 1:
+        return PathType.INVALID
+    chain = path[I_CHAIN] & 0xFF
+    if chain == CHAIN_EXTERNAL:
+        # the address index must not be hardened (CIP 1854)
+        return PathType.INVALID if is_hardened(path[I_ADDRESS]) else PathType.MULTISIG_PAYMENT_KEY
+    if chain == CHAIN_STAKING_KEY:
+        return PathType.MULTISIG_STAKING_KEY if is_multisig_staking_key_path(path) else PathType.INVALID
+    return PathType.INVALID
+
+
+def _classify_cvote_path(path: Path) -> PathType:
+    if len(path) == I_ACCOUNT + 1:
+        return PathType.CVOTE_ACCOUNT
+    if len(path) == I_ADDRESS + 1:
+        return PathType.CVOTE_KEY if is_cvote_key_path(path) else PathType.INVALID
+    return PathType.INVALID
+
+
+@lru_cache(maxsize=1024)
+def classify_path(path: Path) -> PathType:  # pylint: disable=too-many-return-statements
+    """Type of the path, as bip44_classifyPath"""
+
+    if has_ordinary_wallet_key_prefix(path) or _has_prefix(path, PURPOSE_MULTISIG) or _has_prefix(path, PURPOSE_CVOTE_KEY):
+        # the account must be hardened
+        if not contains_account(path) or not is_hardened(path[I_ACCOUNT]):
+            return PathType.INVALID
+        if has_ordinary_wallet_key_prefix(path):
+            return _classify_ordinary_wallet_path(path)
+        if _has_prefix(path, PURPOSE_MULTISIG):
+            return _classify_multisig_wallet_path(path)
+        return _classify_cvote_path(path)
+    if _has_prefix(path, PURPOSE_MINT):
+        return PathType.MINT_KEY if is_mint_key_path(path) else PathType.INVALID
+    if _has_prefix(path, PURPOSE_POOL_COLD_KEY):
+        return PathType.POOL_COLD_KEY if is_pool_cold_key_path(path) else PathType.INVALID
+    return PathType.INVALID
+
+
+def _has_reasonable_account(path: Path) -> bool:
+    return contains_account(path) and is_hardened(path[I_ACCOUNT]) and path[I_ACCOUNT] & ~HARDENED <= MAX_REASONABLE_ACCOUNT
+
+
+def _has_reasonable_address(path: Path) -> bool:
+    return len(path) > I_ADDRESS and path[I_ADDRESS] <= MAX_REASONABLE_ADDRESS
+
+
+def _has_reasonable_hardened_index(path: Path, index: int, maximum: int) -> bool:
+    return is_hardened(path[index]) and path[index] & ~HARDENED <= maximum
+
+
+def is_path_reasonable(path: Path) -> bool:
+    """Whether the path is usual for its type, as bip44_isPathReasonable"""
+
+    pathType = classify_path(path)
+    if pathType in (PathType.ORDINARY_ACCOUNT, PathType.MULTISIG_ACCOUNT, PathType.CVOTE_ACCOUNT):
+        return _has_reasonable_account(path)
+    if pathType in (PathType.ORDINARY_PAYMENT_KEY, PathType.MULTISIG_PAYMENT_KEY,
+                    PathType.ORDINARY_STAKING_KEY, PathType.MULTISIG_STAKING_KEY, PathType.CVOTE_KEY):
+        return _has_reasonable_account(path) and _has_reasonable_address(path)
+    if pathType in (PathType.DREP_KEY, PathType.COMMITTEE_COLD_KEY, PathType.COMMITTEE_HOT_KEY):
+        # strongly recommended in CIP-0105 to only use 0 as address
+        return _has_reasonable_account(path) and _has_reasonable_address(path) and path[I_ADDRESS] == 0
+    if pathType == PathType.MINT_KEY:
+        return _has_reasonable_hardened_index(path, I_MINT_POLICY, MAX_REASONABLE_MINT_POLICY_INDEX)
+    if pathType == PathType.POOL_COLD_KEY:
+        return _has_reasonable_hardened_index(path, I_POOL_COLD_KEY, MAX_REASONABLE_COLD_KEY_INDEX)
+    raise ValueError("Invalid path")
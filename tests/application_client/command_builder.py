@@ -27,7 +27,7 @@ from input_files.signTx import ResignCommitteeParams, AuthorizeCommitteeParams,
 from input_files.signTx import StakeDelegationParams, StakeRegistrationConwayParams, StakeRegistrationParams
 from input_files.signTx import PoolRegistrationParams, PoolKey, Relay, PoolMetadataParams, RelayType
 from input_files.signTx import SingleHostIpAddrRelayParams, SingleHostHostnameRelayParams, MultiHostRelayParams
-from input_files.signTx import MAX_SIGN_TX_CHUNK_SIZE
+from input_files.signTx import MAX_SIGN_TX_CHUNK_SIZE, MAX_SIGN_TX_INPUTS_BATCH, MAX_SIGN_TX_WITNESSES_BATCH
 from input_files.derive_native_script import NativeScript, NativeScriptType, NativeScriptHashDisplayFormat
 from input_files.derive_native_script import NativeScriptParamsPubkey, NativeScriptParamsInvalid
 from input_files.derive_native_script import NativeScriptParamsScripts, NativeScriptParamsNofK
@@ -75,6 +75,10 @@ class P1Type(IntEnum):
 
 
 class P2Type(IntEnum):
+    # SignTx Inputs, Collateral Inputs, Reference Inputs
+    P2_INPUTS_BATCH = 0x01
+    # SignTx Witnesses
+    P2_WITNESSES_BATCH = 0x01
     # SignTx Outputs
     P2_BASIC_DATA = 0x30
     P2_DATUM = 0x34
@@ -599,6 +603,26 @@ class CommandBuilder:
         return self._serialize(InsType.SIGN_TX, P1Type.P1_INPUTS, 0x00, data)
 
 
+    def sign_tx_inputs_batch(self, p1: P1Type, txInputs: List[TxInput]) -> bytes:
+        """APDU Builder for Sign TX - several INPUTS, COLLATERAL INPUTS or REFERENCE INPUTS at once
+
+        Args:
+            p1 (P1Type): The tx section (inputs, collateral inputs or reference inputs)
+            txInputs (List[TxInput]): Test parameters, at most MAX_SIGN_TX_INPUTS_BATCH
+
+        Returns:
+            Serial data APDU
+        """
+
+        assert 0 < len(txInputs) <= MAX_SIGN_TX_INPUTS_BATCH
+        # Serialization format:
+        #    Inputs, one after another
+        data = bytes()
+        for txInput in txInputs:
+            data += self._serializeTxInput(txInput)
+        return self._serialize(InsType.SIGN_TX, p1, P2Type.P2_INPUTS_BATCH, data)
+
+
     def sign_tx_outputs_basic(self, txOutput: TxOutput) -> bytes:
         """APDU Builder for Sign TX - OUTPUTS step - BASIC DATA level
 
@@ -1327,6 +1351,27 @@ class CommandBuilder:
         return self._serialize(InsType.SIGN_TX, P1Type.P1_TX_WITNESSES, 0x00, data)
 
 
+    def sign_tx_witnesses_batch(self, paths: List[str]) -> bytes:
+        """APDU Builder for Sign TX - several WITNESSES at once
+
+        Args:
+            paths (List[str]): Input Test paths, at most MAX_SIGN_TX_WITNESSES_BATCH
+
+        Returns:
+            Serial data APDU
+        """
+
+        assert 0 < len(paths) <= MAX_SIGN_TX_WITNESSES_BATCH
+        # Serialization format:
+        #    Number of paths (1B)
+        #    Witness Paths, one after another
+        data = bytes()
+        data += len(paths).to_bytes(1, "big")
+        for path in paths:
+            data += pack_derivation_path(path)
+        return self._serialize(InsType.SIGN_TX, P1Type.P1_TX_WITNESSES, P2Type.P2_WITNESSES_BATCH, data)
+
+
     def derive_script_add_simple(self, script: NativeScript) -> bytes:
         """APDU Builder for DERIVE NATIVE SCRIPT HASH - SIMPLE SCRIPT step
 
@@ -6,10 +6,12 @@ This module provides Ragger tests Client application.
 It contains the command sending part.
 """
 
-from typing import Generator, Optional
+from typing import Generator, List, Optional
 from contextlib import contextmanager
+from dataclasses import replace
 
 from ragger.backend.interface import BackendInterface, RAPDU
+from ragger.error import ExceptionRAPDU
 
 from input_files.derive_address import DeriveAddressTestCase
 from input_files.cvote import CVoteTestCase
@@ -21,18 +23,28 @@ from input_files.signTx import PoolRegistrationParams, PoolKey, Relay, PoolMetad
 from input_files.derive_native_script import NativeScript, NativeScriptHashDisplayFormat
 
 from application_client.command_builder import CommandBuilder, P1Type, P2Type
-from application_client.app_def import Errors
+from application_client.app_def import Errors, InsType
+from application_client.security_policy import TxStep, evaluate_tx, ensure_not_denied, tx_witness_paths
+from application_client.token_bundle import canonical_tx
+from application_client.transcript import TranscriptRecorder, active_recorder, screen_texts
 
 
 class CommandSender:
     """Base class to send APDU to the selected backend"""
 
-    def __init__(self, backend: BackendInterface) -> None:
-        """Class initializer"""
+    def __init__(self, backend: BackendInterface, recorder: Optional[TranscriptRecorder] = None) -> None:
+        """Class initializer
+
+        Args:
+            backend (BackendInterface): The backend
+            recorder (TranscriptRecorder): Records the exchanged APDU, the active recorder by default
+        """
 
         self._backend = backend
         self._firmware = backend.firmware
         self._cmd_builder = CommandBuilder()
+        self._recorder = recorder if recorder is not None else active_recorder()
+        self._last_command: Optional[bytes] = None
 
 
     def _exchange(self, payload: bytes) -> RAPDU:
@@ -45,7 +57,18 @@ class CommandSender:
             Response APDU
         """
 
-        return self._backend.exchange_raw(payload)
+        self._last_command = payload
+        if self._recorder is None:
+            return self._backend.exchange_raw(payload)
+
+        self._recorder.record_command(payload)
+        try:
+            rapdu = self._backend.exchange_raw(payload)
+        except ExceptionRAPDU as e:
+            self._recorder.record_response(RAPDU(e.status, e.data))
+            raise
+        self._recorder.record_response(rapdu)
+        return rapdu
 
 
     @contextmanager
@@ -59,8 +82,26 @@ class CommandSender:
             Generator
         """
 
-        with self._backend.exchange_async_raw(payload):
-            yield
+        self._last_command = payload
+        if self._recorder is None:
+            with self._backend.exchange_async_raw(payload):
+                yield
+            return
+
+        self._recorder.record_command(payload)
+        self._recorder.record_interaction()
+        shown = len(screen_texts(self._backend))
+        try:
+            with self._backend.exchange_async_raw(payload):
+                yield
+        except ExceptionRAPDU as e:
+            self._recorder.record_texts(screen_texts(self._backend)[shown:])
+            self._recorder.record_response(RAPDU(e.status, e.data))
+            raise
+        self._recorder.record_texts(screen_texts(self._backend)[shown:])
+        rapdu = self._backend.last_async_response
+        if rapdu is not None:
+            self._recorder.record_response(rapdu)
 
 
     def get_async_response(self) -> Optional[RAPDU]:
@@ -73,6 +114,18 @@ class CommandSender:
         return self._backend.last_async_response
 
 
+    def last_sign_tx_step(self) -> Optional[TxStep]:
+        """Step of the last APDU sent, i.e. the one answered by an error
+
+        Returns:
+            The step (P1) of the last APDU, None if it is not a Sign TX one
+        """
+
+        if self._last_command is None or self._last_command[1] != InsType.SIGN_TX:
+            return None
+        return TxStep(self._last_command[2])
+
+
     def send_raw(self, cla: int, ins: int, p1: int, p2: int, payload: bytes) -> RAPDU:
         header = bytearray()
         header.append(cla)
@@ -289,6 +342,33 @@ class CommandSender:
             yield
 
 
+    def sign_tx_test_case(self, testCase: SignTxTestCase, checkPolicy: bool = True) -> SignTxTestCase:
+        """Test case as sent by the Sign TX APDU
+
+        The token bundles of the outputs, collateral output and mint are sent in the canonical order
+        required by the app, unless the test case opts out with canonical=False.
+        A transaction denied by the security policy of the app is refused before any APDU is sent.
+
+        Args:
+            testCase (SignTxTestCase): Test parameters
+            checkPolicy (bool): Evaluate the security policy on the host
+
+        Returns:
+            The test case to send
+
+        Raises:
+            ExceptionRAPDU: SW_REJECTED_BY_POLICY, the error the app would answer
+        """
+
+        if checkPolicy:
+            witnessPaths = tx_witness_paths(testCase.tx, testCase.signingMode) + testCase.additionalWitnessPaths
+            ensure_not_denied(evaluate_tx(testCase.tx, testCase.signingMode, list(dict.fromkeys(witnessPaths))))
+        if not testCase.canonical:
+            return testCase
+        tx = canonical_tx(testCase.tx)
+        return testCase if tx is testCase.tx else replace(testCase, tx=tx)
+
+
     @contextmanager
     def sign_tx_init(self, testCase: SignTxTestCase, nbWitnessPaths: int) -> Generator[None, None, None]:
         """APDU Sign TX - INIT step
@@ -446,6 +526,20 @@ class CommandSender:
         return self._exchange(self._cmd_builder.sign_tx_inputs(txInput))
 
 
+    def sign_tx_inputs_batch(self, p1: P1Type, txInputs: List[TxInput]) -> RAPDU:
+        """APDU Sign TX - several INPUTS, COLLATERAL INPUTS or REFERENCE INPUTS at once
+
+        Args:
+            p1 (P1Type): The tx section (inputs, collateral inputs or reference inputs)
+            txInputs (List[TxInput]): Test parameters
+
+        Returns:
+            Response APDU
+        """
+
+        return self._exchange(self._cmd_builder.sign_tx_inputs_batch(p1, txInputs))
+
+
     @contextmanager
     def sign_tx_outputs_basic(self, txOutput: TxOutput) -> Generator[None, None, None]:
         """APDU Sign TX - OUTPUTS step - BASIC DATA level
@@ -939,6 +1033,21 @@ class CommandSender:
             yield
 
 
+    @contextmanager
+    def sign_tx_witnesses_batch(self, paths: List[str]) -> Generator[None, None, None]:
+        """APDU Sign TX - several WITNESSES at once, the signatures come in a single response
+
+        Args:
+            paths (List[str]): Input Test paths
+
+        Returns:
+            Generator
+        """
+
+        with self._exchange_async(self._cmd_builder.sign_tx_witnesses_batch(paths)):
+            yield
+
+
     @contextmanager
     def derive_script_add_simple(self, script: NativeScript) -> Generator[None, None, None]:
         """APDU NATIVE SCRIPT HASH - SIMPLE SCRIPT step
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the pool routing independent jobs to idle devices.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Iterable, List, TypeVar
+
+from application_client.async_command_sender import AsyncCommandSender
+
+T = TypeVar("T")
+
+Job = Callable[[AsyncCommandSender], Awaitable[T]]
+
+
+class DevicePool:
+    """Runs each job on an idle device, a device runs one job at a time"""
+
+    def __init__(self, senders: Iterable[AsyncCommandSender]) -> None:
+        """Class initializer
+
+        Args:
+            senders (Iterable[AsyncCommandSender]): One sender per device
+        """
+
+        self.senders = list(senders)
+        assert self.senders, "Empty device pool"
+        self._idle: "asyncio.Queue[AsyncCommandSender]" = asyncio.Queue()
+        for sender in self.senders:
+            self._idle.put_nowait(sender)
+
+
+    async def run(self, job: Job[T]) -> T:
+        """Runs a job on the first idle device
+
+        Args:
+            job (Job): Coroutine function taking the sender of the device
+
+        Returns:
+            The result of the job
+        """
+
+        sender = await self._idle.get()
+        try:
+            return await job(sender)
+        finally:
+            self._idle.put_nowait(sender)
+
+
+    async def run_all(self, jobs: Iterable[Job[T]]) -> List[T]:
+        """Runs independent jobs concurrently on the devices of the pool
+
+        Args:
+            jobs (Iterable[Job]): The jobs
+
+        Returns:
+            The results, in the order of the jobs
+        """
+
+        return list(await asyncio.gather(*(self.run(job) for job in jobs)))
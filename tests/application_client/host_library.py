@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the ctypes wrapper of the host shared library (see hostlib/README.md):
+the app's own CBOR, bech32/base58, Byron address, native script hash and tx hash code,
+built for the host, so that bulk computations match the firmware bit for bit.
+
+The library is found with the CARDANO_HOST_LIB environment variable,
+hostlib/build/libcardano_host.so by default.
+"""
+
+import ctypes
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from input_files.derive_native_script import NativeScript, NativeScriptType
+from input_files.derive_native_script import NativeScriptParamsInvalid, NativeScriptParamsNofK
+from input_files.derive_native_script import NativeScriptParamsPubkey, NativeScriptParamsScripts
+from input_files.signTx import TxOutputFormat
+
+DEFAULT_LIBRARY_PATH = Path(__file__).parents[2] / "hostlib" / "build" / "libcardano_host.so"
+
+TX_HASH_LENGTH = 32
+SCRIPT_HASH_LENGTH = 28
+ADDRESS_KEY_HASH_LENGTH = 28
+AUX_DATA_HASH_LENGTH = 32
+REWARD_ACCOUNT_SIZE = 29
+# BECH32_STRING_SIZE_MAX in src/crypto/bech32.h, also enough for the base58 Byron addresses
+ADDRESS_STRING_SIZE_MAX = 1 + 11 + 16 + 2 * 150
+
+# native_script_type in src/cardano.h, the client has a distinct type for the third party keys
+NATIVE_SCRIPT_PUBKEY = 0
+
+
+class HostLibraryError(Exception):
+    """Error code thrown by the app code"""
+
+    def __init__(self, function: str, status: int) -> None:
+        super().__init__(f"{function} failed with 0x{status:04x}")
+        self.status = status
+
+
+class _TxInput(ctypes.Structure):
+    _fields_ = [("txHashBuffer", ctypes.c_uint8 * TX_HASH_LENGTH),
+                ("index", ctypes.c_uint32)]
+
+
+class _TxOutput(ctypes.Structure):
+    _fields_ = [("address", ctypes.c_char_p),
+                ("addressSize", ctypes.c_size_t),
+                ("amount", ctypes.c_uint64),
+                ("format", ctypes.c_uint8)]
+
+
+class _TxWithdrawal(ctypes.Structure):
+    _fields_ = [("rewardAccount", ctypes.c_char_p),
+                ("amount", ctypes.c_uint64)]
+
+
+class _TxBody(ctypes.Structure):
+    _fields_ = [("tagCborSets", ctypes.c_bool),
+                ("inputs", ctypes.POINTER(_TxInput)),
+                ("numInputs", ctypes.c_uint16),
+                ("outputs", ctypes.POINTER(_TxOutput)),
+                ("numOutputs", ctypes.c_uint16),
+                ("fee", ctypes.c_uint64),
+                ("includeTtl", ctypes.c_bool),
+                ("ttl", ctypes.c_uint64),
+                ("withdrawals", ctypes.POINTER(_TxWithdrawal)),
+                ("numWithdrawals", ctypes.c_uint16),
+                ("auxDataHash", ctypes.c_char_p),
+                ("includeValidityIntervalStart", ctypes.c_bool),
+                ("validityIntervalStart", ctypes.c_uint64)]
+
+
+class _NativeScript(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_uint8),
+                ("numScripts", ctypes.c_uint32),
+                ("requiredScripts", ctypes.c_uint32),
+                ("timelock", ctypes.c_uint64),
+                ("keyHash", ctypes.c_uint8 * ADDRESS_KEY_HASH_LENGTH)]
+
+
+@dataclass
+class HostTxOutput:
+    address: bytes
+    amount: int
+    format: TxOutputFormat = TxOutputFormat.ARRAY_LEGACY
+
+
+@dataclass
+class HostTxBody:
+    """Transaction body supported by the host library: no certificates, tokens, datums, ..."""
+    inputs: List[Tuple[bytes, int]]
+    outputs: List[HostTxOutput]
+    fee: int
+    ttl: Optional[int] = None
+    withdrawals: List[Tuple[bytes, int]] = field(default_factory=list)
+    auxDataHash: Optional[bytes] = None
+    validityIntervalStart: Optional[int] = None
+    tagCborSets: bool = False
+
+
+def _script_nodes(script: NativeScript, nodes: List[_NativeScript]) -> None:
+    """Lists the script and its subscripts in pre-order"""
+
+    fields: dict = {"type": script.type}
+    if isinstance(script.params, NativeScriptParamsPubkey):
+        assert script.type == NativeScriptType.PUBKEY_THIRD_PARTY, "Only key hashes can be hashed on the host"
+        fields["type"] = NATIVE_SCRIPT_PUBKEY
+        fields["keyHash"] = (ctypes.c_uint8 * ADDRESS_KEY_HASH_LENGTH)(*bytes.fromhex(script.params.key))
+    elif isinstance(script.params, NativeScriptParamsInvalid):
+        fields["timelock"] = script.params.slot
+    elif isinstance(script.params, NativeScriptParamsNofK):
+        fields["requiredScripts"] = script.params.requiredCount
+    subscripts = []
+    if isinstance(script.params, (NativeScriptParamsScripts, NativeScriptParamsNofK)):
+        subscripts = script.params.scripts
+        fields["numScripts"] = len(subscripts)
+    nodes.append(_NativeScript(**fields))
+    for subscript in subscripts:
+        _script_nodes(subscript, nodes)
+
+
+class HostLibrary:
+    """The host build of the app modules"""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        """Class initializer
+
+        Args:
+            path (Path): The shared library, see the module docstring for the default
+        """
+
+        if path is None:
+            path = Path(os.environ.get("CARDANO_HOST_LIB", DEFAULT_LIBRARY_PATH))
+        self._lib = ctypes.CDLL(str(path))
+        # the app code keeps its exception context in a global variable
+        self._lock = threading.Lock()
+
+        size_p = ctypes.POINTER(ctypes.c_size_t)
+        self._declare("cardano_host_cbor_writeToken",
+                      ctypes.c_uint8, ctypes.c_uint64, ctypes.c_char_p, ctypes.c_size_t, size_p)
+        self._declare("cardano_host_bech32_encode",
+                      ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t)
+        self._declare("cardano_host_humanReadableAddress",
+                      ctypes.c_char_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t)
+        self._declare("cardano_host_humanReadableAddresses",
+                      ctypes.c_char_p, size_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t, size_p)
+        self._declare("cardano_host_extractProtocolMagic",
+                      ctypes.c_char_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_uint32))
+        self._declare("cardano_host_nativeScriptHash",
+                      ctypes.POINTER(_NativeScript), ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t)
+        self._declare("cardano_host_txHashes",
+                      ctypes.POINTER(_TxBody), ctypes.c_size_t, ctypes.c_char_p, ctypes.c_size_t)
+
+
+    def _declare(self, name: str, *argtypes: type) -> None:
+        function = getattr(self._lib, name)
+        function.argtypes = list(argtypes)
+        function.restype = ctypes.c_uint16
+
+
+    def _call(self, name: str, *args: object) -> None:
+        with self._lock:
+            status = getattr(self._lib, name)(*args)
+        if status != 0:
+            raise HostLibraryError(name, status)
+
+
+    def cbor_token(self, cborType: int, value: int) -> bytes:
+        """CBOR token header, as cbor_writeToken
+
+        Args:
+            cborType (int): The CBOR_TYPE_* constant of src/utils/cbor.h (major type << 5)
+            value (int): The value or length
+
+        Returns:
+            The encoded token
+        """
+
+        out = ctypes.create_string_buffer(9)
+        written = ctypes.c_size_t()
+        self._call("cardano_host_cbor_writeToken", cborType, value, out, len(out), ctypes.byref(written))
+        return out.raw[:written.value]
+
+
+    def bech32_encode(self, hrp: str, data: bytes) -> str:
+        out = ctypes.create_string_buffer(ADDRESS_STRING_SIZE_MAX)
+        self._call("cardano_host_bech32_encode", hrp.encode(), data, len(data), out, len(out))
+        return out.value.decode()
+
+
+    def human_readable_address(self, address: bytes) -> str:
+        out = ctypes.create_string_buffer(ADDRESS_STRING_SIZE_MAX)
+        self._call("cardano_host_humanReadableAddress", address, len(address), out, len(out))
+        return out.value.decode()
+
+
+    def human_readable_addresses(self, addresses: Sequence[bytes]) -> List[str]:
+        """Bech32 or base58 form of the addresses, in a single call
+
+        Args:
+            addresses (Sequence[bytes]): The raw addresses
+
+        Returns:
+            The encoded addresses
+        """
+
+        sizes = (ctypes.c_size_t * len(addresses))(*(len(a) for a in addresses))
+        out = ctypes.create_string_buffer(ADDRESS_STRING_SIZE_MAX * len(addresses))
+        converted = ctypes.c_size_t()
+        self._call("cardano_host_humanReadableAddresses",
+                   b"".join(addresses), sizes, len(addresses),
+                   out, ADDRESS_STRING_SIZE_MAX, ctypes.byref(converted))
+        raw = out.raw
+        return [raw[i:raw.index(b"\0", i)].decode()
+                for i in range(0, ADDRESS_STRING_SIZE_MAX * len(addresses), ADDRESS_STRING_SIZE_MAX)]
+
+
+    def protocol_magic(self, byronAddress: bytes) -> int:
+        """Protocol magic of a Byron address, the address structure being validated"""
+
+        protocolMagic = ctypes.c_uint32()
+        self._call("cardano_host_extractProtocolMagic",
+                   byronAddress, len(byronAddress), ctypes.byref(protocolMagic))
+        return protocolMagic.value
+
+
+    def native_script_hash(self, script: NativeScript) -> bytes:
+        """Native script hash, the public keys being given by their hash (PUBKEY_THIRD_PARTY)
+
+        Args:
+            script (NativeScript): The script
+
+        Returns:
+            The script hash
+        """
+
+        nodes: List[_NativeScript] = []
+        _script_nodes(script, nodes)
+        out = ctypes.create_string_buffer(SCRIPT_HASH_LENGTH)
+        self._call("cardano_host_nativeScriptHash",
+                   (_NativeScript * len(nodes))(*nodes), len(nodes), out, len(out))
+        return out.raw
+
+
+    def tx_hashes(self, txs: Sequence[HostTxBody]) -> List[bytes]:
+        """Hashes of the transaction bodies, in a single call
+
+        Args:
+            txs (Sequence[HostTxBody]): The transaction bodies
+
+        Returns:
+            The tx hashes
+        """
+
+        bodies = (_TxBody * len(txs))()
+        # the arrays must outlive the call
+        keep: List[object] = []
+        for body, tx in zip(bodies, txs):
+            inputs = (_TxInput * len(tx.inputs))()
+            for txInput, (txHash, index) in zip(inputs, tx.inputs):
+                txInput.txHashBuffer[:] = txHash
+                txInput.index = index
+            outputs = (_TxOutput * len(tx.outputs))(*(_TxOutput(o.address, len(o.address), o.amount, o.format)
+                                                      for o in tx.outputs))
+            withdrawals = (_TxWithdrawal * len(tx.withdrawals))(*(_TxWithdrawal(account, amount)
+                                                                  for account, amount in tx.withdrawals))
+            keep += [inputs, outputs, withdrawals]
+
+            body.tagCborSets = tx.tagCborSets
+            body.inputs, body.numInputs = inputs, len(tx.inputs)
+            body.outputs, body.numOutputs = outputs, len(tx.outputs)
+            body.fee = tx.fee
+            body.includeTtl, body.ttl = tx.ttl is not None, tx.ttl or 0
+            body.withdrawals, body.numWithdrawals = withdrawals, len(tx.withdrawals)
+            body.auxDataHash = tx.auxDataHash
+            body.includeValidityIntervalStart = tx.validityIntervalStart is not None
+            body.validityIntervalStart = tx.validityIntervalStart or 0
+
+        out = ctypes.create_string_buffer(TX_HASH_LENGTH * len(txs))
+        self._call("cardano_host_txHashes", bodies, len(txs), out, len(out))
+        return [out.raw[i:i + TX_HASH_LENGTH] for i in range(0, len(out.raw), TX_HASH_LENGTH)]
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the Speculos backends of the tests: SpeculosRestBackend, exchanging the APDU
+through the REST API as the Ragger one, and SpeculosRawBackend, exchanging the APDU on
+the raw APDU port (--apdu-port) instead: one persistent TCP connection, preallocated
+buffers and no HTTP or JSON per APDU. The screens, buttons and automation still go
+through the REST API.
+
+Both tell whether the device answered the async APDU in progress (async_response_available),
+which the screen navigation polls.
+"""
+
+import select
+import socket
+import time
+from contextlib import contextmanager
+from typing import Any, Generator, Optional
+
+from ragger.backend import SpeculosBackend
+from ragger.backend.speculos import has_data_available, raise_policy_enforcer
+from ragger.utils import RAPDU
+
+# 4-byte length, then the data and the status word
+HEADER_SIZE = 4
+STATUS_SIZE = 2
+# extended APDU
+MAX_APDU_SIZE = 7 + 0xFFFF
+MAX_RESPONSE_SIZE = 0xFFFF + STATUS_SIZE
+
+CONNECT_TIMEOUT = 10.0
+CONNECT_RETRY_DELAY = 0.05
+
+
+class SpeculosApduSocket:
+    """Persistent connection to the APDU port of Speculos (--apdu-port)
+
+    Same framing as SpeculosTcpTransport: each APDU is sent prefixed by its length
+    (4 bytes BE), the response is its data length (4 bytes BE), the data and the status word.
+    Speculos forwards the responses to the last connected client only.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9999) -> None:
+        """Class initializer"""
+
+        self.host = host
+        self.port = port
+        self._socket: Optional[socket.socket] = None
+        self._sendBuffer = bytearray(HEADER_SIZE + MAX_APDU_SIZE)
+        self._receiveBuffer = bytearray(HEADER_SIZE + MAX_RESPONSE_SIZE)
+        self._sendView = memoryview(self._sendBuffer)
+        self._receiveView = memoryview(self._receiveBuffer)
+
+
+    def open(self, timeout: float = CONNECT_TIMEOUT) -> None:
+        """Connects to Speculos, retrying until the port listens
+
+        Args:
+            timeout (float): Connection timeout in seconds
+        """
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._socket = socket.create_connection((self.host, self.port), timeout=timeout)
+                break
+            except ConnectionRefusedError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(CONNECT_RETRY_DELAY)
+        self._socket.settimeout(None)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+
+    def close(self) -> None:
+        if self._socket is not None:
+            self._socket.close()
+        self._socket = None
+
+
+    def send(self, apdu: bytes) -> None:
+        assert self._socket is not None, "Socket not open"
+        size = HEADER_SIZE + len(apdu)
+        self._sendBuffer[:HEADER_SIZE] = len(apdu).to_bytes(HEADER_SIZE, "big")
+        self._sendBuffer[HEADER_SIZE:size] = apdu
+        self._socket.sendall(self._sendView[:size])
+
+
+    def has_response(self, timeout: float = 0) -> bool:
+        """Whether the response is available, without reading it
+
+        Args:
+            timeout (float): Time to wait for it in seconds
+
+        Returns:
+            True if the response can be received without blocking
+        """
+
+        assert self._socket is not None, "Socket not open"
+        ready, _, _ = select.select([self._socket], [], [], timeout)
+        return len(ready) > 0
+
+
+    def _receive_into(self, start: int, end: int) -> None:
+        assert self._socket is not None, "Socket not open"
+        while start < end:
+            received = self._socket.recv_into(self._receiveView[start:end])
+            if received == 0:
+                raise ConnectionError("Connection closed by Speculos")
+            start += received
+
+
+    def receive(self) -> RAPDU:
+        """Waits for the response of the APDU sent
+
+        Returns:
+            Response APDU
+        """
+
+        self._receive_into(0, HEADER_SIZE)
+        size = int.from_bytes(self._receiveView[:HEADER_SIZE], "big")
+        if size > MAX_RESPONSE_SIZE - STATUS_SIZE:
+            raise ConnectionError(f"Response too long ({size} bytes)")
+        end = HEADER_SIZE + size + STATUS_SIZE
+        self._receive_into(HEADER_SIZE, end)
+        status = int.from_bytes(self._receiveView[end - STATUS_SIZE:end], "big")
+        return RAPDU(status, bytes(self._receiveView[HEADER_SIZE:end - STATUS_SIZE]))
+
+
+    def exchange(self, apdu: bytes) -> RAPDU:
+        self.send(apdu)
+        return self.receive()
+
+
+class SpeculosRestBackend(SpeculosBackend):
+    """Ragger Speculos backend, telling whether the async APDU in progress was answered"""
+
+    def async_response_available(self) -> bool:
+        """Whether the device answered the APDU of the exchange_async_raw block in progress
+
+        Returns:
+            True if the response was received or can be received without blocking,
+            False if it cannot or if no async exchange is in progress
+        """
+
+        pending = self._pending_async_response
+        if pending is None:
+            return False
+        return self._last_async_response is not None or has_data_available(pending)
+
+
+class SpeculosRawBackend(SpeculosRestBackend):
+    """Ragger Speculos backend sending the APDU on the raw APDU port
+
+    Drop-in replacement of SpeculosRestBackend (same constructor), with the same raise policy and APDU logs.
+    The tick_timeout of exchange_raw is not supported, the exchange waits for the response.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._apduSocket = SpeculosApduSocket(port=self._apdu_port)
+        self._pendingRaw = False
+        self._asyncInProgress = False
+
+
+    def __enter__(self) -> "SpeculosRawBackend":
+        super().__enter__()
+        self._apduSocket.open()
+        return self
+
+
+    def __exit__(self, *args: Any) -> None:
+        self._apduSocket.close()
+        super().__exit__(*args)
+
+
+    def send_raw(self, data: bytes = b"") -> None:
+        self.apdu_logger.info("=> %s", data.hex())
+        self._apduSocket.send(data)
+        self._pendingRaw = True
+
+
+    @raise_policy_enforcer
+    def _receive_raw(self) -> RAPDU:
+        self._pendingRaw = False
+        return self._apduSocket.receive()
+
+
+    def receive(self) -> RAPDU:
+        if not self._pendingRaw:
+            raise RuntimeError("No pending APDU to receive")
+        return self._receive_raw()
+
+
+    def exchange_raw(self, data: bytes = b"", tick_timeout: int = 5 * 60 * 10) -> RAPDU:  # pylint: disable=unused-argument
+        self.send_raw(data)
+        return self._receive_raw()
+
+
+    def _check_async_error(self) -> None:
+        # called by the navigation, raises as soon as the pending APDU failed
+        if self._pendingRaw and self._last_async_response is None and self._apduSocket.has_response():
+            self.logger.info("[Ragger] Early async data available, retrieving it now.")
+            self._last_async_response = self._receive_raw()
+
+
+    def async_response_available(self) -> bool:
+        if not self._asyncInProgress:
+            return False
+        return self._last_async_response is not None or self._apduSocket.has_response()
+
+
+    @contextmanager
+    def exchange_async_raw(self, data: bytes = b"") -> Generator[bool, None, None]:
+        self._last_async_response = None
+        self.send_raw(data)
+        self._asyncInProgress = True
+        try:
+            yield self._apduSocket.has_response(self.apdu_timeout)
+            if self._last_async_response is None:
+                self._last_async_response = self._receive_raw()
+        finally:
+            self._asyncInProgress = False
+            if self._pendingRaw:
+                # left on an error: drops the response if already sent, otherwise the app
+                # answers the next APDU instead (ERR_STILL_IN_CALL aborts the pending one)
+                if self._apduSocket.has_response():
+                    self._apduSocket.receive()
+                self._pendingRaw = False
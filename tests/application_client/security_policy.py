@@ -0,0 +1,870 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the host mirror of the sign tx security policy of src/securityPolicy/securityPolicy.c.
+
+A whole transaction is evaluated in one pass, in the order of the SIGN_TX APDUs, the policy of
+each item being the one the app applies. The first denied item gives the step whose APDU the app
+rejects with SW_REJECTED_BY_POLICY, so that a client can refuse the transaction before opening
+a device session. Only the policy is mirrored: malformed data (SW_INVALID_DATA) is not predicted.
+"""
+
+# the policies are ported with the early returns of the app
+# pylint: disable=too-many-return-statements
+
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Callable, List, Optional, Tuple, Union
+
+from ragger.error import ExceptionRAPDU
+
+from application_client.address_codec import byron_protocol_magic
+from application_client.app_def import AddressType, Errors, NetworkIds, ProtocolMagics, StakingDataSourceType
+from application_client.bip44 import I_ACCOUNT, Path, PathType, classify_path, has_byron_prefix, has_ordinary_wallet_key_prefix
+from application_client.bip44 import has_shelley_prefix, harden, is_committee_cold_key_path, is_committee_hot_key_path
+from application_client.bip44 import is_drep_key_path, is_multidelegation_staking_key_path, is_ordinary_staking_key_path
+from application_client.bip44 import is_path_reasonable, is_pool_cold_key_path, parse_path
+
+from input_files.derive_address import DeriveAddressTestCase
+from input_files.signTx import AuthorizeCommitteeParams, Certificate, CertificateType
+from input_files.signTx import CIP36VoteRegistrationFormat, CredentialParams, CredentialParamsType, DRepParams
+from input_files.signTx import DRepParamsType, PoolRegistrationParams, RequiredSigner, ThirdPartyAddressParams
+from input_files.signTx import Transaction, TransactionSigningMode, TxAuxiliaryDataCIP36, TxAuxiliaryDataType
+from input_files.signTx import TxOutput, TxOutputDestination, TxRequiredSignerType
+from input_files.signTx import Voter, VoterType
+
+KEY_HASH_LENGTH = 28
+SCRIPT_HASH_LENGTH = 28
+MAXIMUM_NETWORK_ID = 0b1111
+
+
+class SecurityPolicy(IntEnum):
+    DENY = 1
+    ALLOW_WITHOUT_PROMPT = 2
+    PROMPT_BEFORE_RESPONSE = 3
+    PROMPT_WARN_UNUSUAL = 4
+    SHOW_BEFORE_RESPONSE = 5
+
+
+DENY = SecurityPolicy.DENY
+ALLOW = SecurityPolicy.ALLOW_WITHOUT_PROMPT
+PROMPT = SecurityPolicy.PROMPT_BEFORE_RESPONSE
+WARN = SecurityPolicy.PROMPT_WARN_UNUSUAL
+SHOW = SecurityPolicy.SHOW_BEFORE_RESPONSE
+
+
+class TxStep(IntEnum):
+    """SIGN_TX steps (P1 of the APDU)"""
+    INIT = 0x01
+    INPUTS = 0x02
+    OUTPUTS = 0x03
+    FEE = 0x04
+    TTL = 0x05
+    CERTIFICATES = 0x06
+    WITHDRAWALS = 0x07
+    AUX_DATA = 0x08
+    VALIDITY_INTERVAL_START = 0x09
+    CONFIRM = 0x0a
+    MINT = 0x0b
+    SCRIPT_DATA_HASH = 0x0c
+    COLLATERAL_INPUTS = 0x0d
+    REQUIRED_SIGNERS = 0x0e
+    WITNESSES = 0x0f
+    TOTAL_COLLATERAL = 0x10
+    REFERENCE_INPUTS = 0x11
+    COLLATERAL_OUTPUT = 0x12
+    VOTING_PROCEDURES = 0x13
+    TREASURY = 0x15
+    DONATION = 0x16
+
+
+SigningMode = TransactionSigningMode
+
+SHELLEY_ADDRESS_TYPES = (
+    AddressType.BASE_PAYMENT_KEY_STAKE_KEY,
+    AddressType.BASE_PAYMENT_SCRIPT_STAKE_KEY,
+    AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT,
+    AddressType.BASE_PAYMENT_SCRIPT_STAKE_SCRIPT,
+    AddressType.POINTER_KEY,
+    AddressType.POINTER_SCRIPT,
+    AddressType.ENTERPRISE_KEY,
+    AddressType.ENTERPRISE_SCRIPT,
+    AddressType.REWARD_KEY,
+    AddressType.REWARD_SCRIPT,
+)
+
+# addresses whose payment part is a key, the only ones a change output can have
+PAYMENT_KEY_ADDRESS_TYPES = (
+    AddressType.BASE_PAYMENT_KEY_STAKE_KEY,
+    AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT,
+    AddressType.POINTER_KEY,
+    AddressType.ENTERPRISE_KEY,
+    AddressType.BYRON,
+)
+
+PAYMENT_SCRIPT_ADDRESS_TYPES = (
+    AddressType.BASE_PAYMENT_SCRIPT_STAKE_KEY,
+    AddressType.BASE_PAYMENT_SCRIPT_STAKE_SCRIPT,
+    AddressType.POINTER_SCRIPT,
+    AddressType.ENTERPRISE_SCRIPT,
+)
+
+# expected size of the address bytes
+ADDRESS_SIZES = {
+    AddressType.BASE_PAYMENT_KEY_STAKE_KEY: 1 + KEY_HASH_LENGTH + KEY_HASH_LENGTH,
+    AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT: 1 + KEY_HASH_LENGTH + SCRIPT_HASH_LENGTH,
+    AddressType.BASE_PAYMENT_SCRIPT_STAKE_KEY: 1 + SCRIPT_HASH_LENGTH + KEY_HASH_LENGTH,
+    AddressType.BASE_PAYMENT_SCRIPT_STAKE_SCRIPT: 1 + SCRIPT_HASH_LENGTH + SCRIPT_HASH_LENGTH,
+    AddressType.ENTERPRISE_KEY: 1 + KEY_HASH_LENGTH,
+    AddressType.ENTERPRISE_SCRIPT: 1 + SCRIPT_HASH_LENGTH,
+}
+
+# certificates witnessed by their stake credential
+STAKING_CERTIFICATE_TYPES = (
+    CertificateType.STAKE_REGISTRATION,
+    CertificateType.STAKE_DEREGISTRATION,
+    CertificateType.STAKE_REGISTRATION_CONWAY,
+    CertificateType.STAKE_DEREGISTRATION_CONWAY,
+    CertificateType.STAKE_DELEGATION,
+)
+
+DREP_CERTIFICATE_TYPES = (
+    CertificateType.DREP_REGISTRATION,
+    CertificateType.DREP_DEREGISTRATION,
+    CertificateType.DREP_UPDATE,
+)
+
+PATH_VOTER_TYPES = (VoterType.COMMITTEE_KEY_PATH, VoterType.DREP_KEY_PATH, VoterType.STAKE_POOL_KEY_PATH)
+
+
+def _is_path(value: Optional[str]) -> bool:
+    return value is not None and value.startswith("m/")
+
+
+@dataclass
+class AddressParams:
+    """Address params of a device owned address, as parsed by the app"""
+    type: AddressType
+    networkId: int
+    protocolMagic: int
+    stakingDataSource: StakingDataSourceType
+    paymentKeyPath: Optional[Path] = None
+    stakingKeyPath: Optional[Path] = None
+
+
+def address_params(params: DeriveAddressTestCase) -> AddressParams:
+    """Address params sent to the app, the staking choice being determined as by the command builder"""
+
+    if params.addrType in (AddressType.BYRON, AddressType.ENTERPRISE_KEY, AddressType.ENTERPRISE_SCRIPT):
+        staking = StakingDataSourceType.NONE
+    elif params.addrType in (AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT, AddressType.BASE_PAYMENT_SCRIPT_STAKE_SCRIPT,
+                             AddressType.REWARD_SCRIPT):
+        staking = StakingDataSourceType.SCRIPT_HASH
+    elif params.addrType in (AddressType.POINTER_KEY, AddressType.POINTER_SCRIPT):
+        staking = StakingDataSourceType.BLOCKCHAIN_POINTER
+    elif not _is_path(params.stakingValue):
+        staking = StakingDataSourceType.KEY_HASH
+    else:
+        staking = StakingDataSourceType.KEY_PATH
+    return AddressParams(params.addrType, params.netDesc.networkId, params.netDesc.protocol, staking,
+                         parse_path(params.spendingValue) if _is_path(params.spendingValue) else None,
+                         parse_path(params.stakingValue) if staking == StakingDataSourceType.KEY_PATH else None)
+
+
+def _is_staking_info_consistent(params: AddressParams) -> bool:
+    if params.type in (AddressType.BASE_PAYMENT_KEY_STAKE_KEY, AddressType.BASE_PAYMENT_SCRIPT_STAKE_KEY,
+                       AddressType.REWARD_KEY):
+        return params.stakingDataSource in (StakingDataSourceType.KEY_HASH, StakingDataSourceType.KEY_PATH)
+    if params.type in (AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT, AddressType.BASE_PAYMENT_SCRIPT_STAKE_SCRIPT,
+                       AddressType.REWARD_SCRIPT):
+        return params.stakingDataSource in (StakingDataSourceType.SCRIPT_HASH, StakingDataSourceType.BLOCKCHAIN_POINTER)
+    if params.type in (AddressType.POINTER_KEY, AddressType.POINTER_SCRIPT):
+        return params.stakingDataSource == StakingDataSourceType.BLOCKCHAIN_POINTER
+    return params.stakingDataSource == StakingDataSourceType.NONE
+
+
+def is_valid_address_params(params: AddressParams) -> bool:
+    """As isValidAddressParams in src/addressUtils/addressUtilsShelley.c"""
+
+    if params.type != AddressType.BYRON and params.networkId > MAXIMUM_NETWORK_ID:
+        return False
+    if not _is_staking_info_consistent(params):
+        return False
+    if params.stakingDataSource == StakingDataSourceType.KEY_PATH:
+        if params.stakingKeyPath is None or classify_path(params.stakingKeyPath) != PathType.ORDINARY_STAKING_KEY:
+            return False
+    if params.type in PAYMENT_KEY_ADDRESS_TYPES:
+        path = params.paymentKeyPath
+        if path is None or classify_path(path) != PathType.ORDINARY_PAYMENT_KEY:
+            return False
+        return has_byron_prefix(path) if params.type == AddressType.BYRON else has_shelley_prefix(path)
+    return True
+
+
+def is_standard_base_address(params: AddressParams) -> bool:
+    """Base address whose stake key has the same account as the payment key"""
+
+    if params.type != AddressType.BASE_PAYMENT_KEY_STAKE_KEY or params.stakingDataSource != StakingDataSourceType.KEY_PATH:
+        return False
+    payment, staking = params.paymentKeyPath, params.stakingKeyPath
+    assert payment is not None and staking is not None
+    return (classify_path(payment) == PathType.ORDINARY_PAYMENT_KEY and is_path_reasonable(payment)
+            and classify_path(staking) == PathType.ORDINARY_STAKING_KEY and is_path_reasonable(staking)
+            # most SW wallets do not use multidelegation, such outputs should not be hidden
+            and not is_multidelegation_staking_key_path(staking)
+            and staking[I_ACCOUNT] == payment[I_ACCOUNT])
+
+
+def is_network_usual(networkId: int, protocolMagic: int) -> bool:
+    if networkId == NetworkIds.MAINNET and protocolMagic == ProtocolMagics.MAINNET:
+        return True
+    return networkId == NetworkIds.TESTNET and protocolMagic in (ProtocolMagics.TESTNET_LEGACY,
+                                                                  ProtocolMagics.TESTNET_PREPROD,
+                                                                  ProtocolMagics.TESTNET_PREVIEW)
+
+
+def _has_plutus_elements(output: TxOutput) -> bool:
+    return output.datum is not None or getattr(output, "referenceScriptHex", None) is not None
+
+
+def _destination_address_type(destination: TxOutputDestination) -> AddressType:
+    if isinstance(destination.params, ThirdPartyAddressParams):
+        return AddressType(bytes.fromhex(destination.params.addressHex)[0] >> 4)
+    return destination.params.addrType
+
+
+@dataclass
+class PolicyStep:
+    """Policy of an item of the transaction"""
+    step: TxStep
+    index: int
+    policy: SecurityPolicy
+    item: str = ""
+
+
+@dataclass
+class PolicyEvaluation:
+    """Policies of the items, up to the first denied one"""
+    steps: List[PolicyStep] = field(default_factory=list)
+
+    @property
+    def denied(self) -> Optional[PolicyStep]:
+        if self.steps and self.steps[-1].policy == DENY:
+            return self.steps[-1]
+        return None
+
+    @property
+    def status(self) -> Errors:
+        return Errors.SW_SUCCESS if self.denied is None else Errors.SW_REJECTED_BY_POLICY
+
+
+class _PolicyDenied(Exception):
+    pass
+
+
+class SignTxPolicy:
+    """Security policy of a transaction, with the state the app keeps between the APDUs"""
+
+    def __init__(self, tx: Transaction, signingMode: TransactionSigningMode, expertMode: bool = False) -> None:
+        """Class initializer
+
+        Args:
+            tx (Transaction): The transaction
+            signingMode (TransactionSigningMode): The signing mode
+            expertMode (bool): Whether the app is in expert mode
+        """
+
+        self.tx = tx
+        self.signingMode = signingMode
+        self.expertMode = expertMode
+        self.networkId = tx.network.networkId
+        self.protocolMagic = tx.network.protocol
+        if self.networkId > MAXIMUM_NETWORK_ID:
+            # rejected by the app as invalid data, before the policy
+            raise ValueError(f"Invalid network id {self.networkId}")
+        # single account model: the account (and era) of the first key path
+        self._singleAccount: Optional[Tuple[int, bool]] = None
+        self.poolOwnerPath: Optional[Path] = None
+
+
+    def _show_if_expert(self) -> SecurityPolicy:
+        return SHOW if self.expertMode else ALLOW
+
+
+    def violates_single_account(self, path: Path) -> bool:
+        """Whether the key path is of another account than the previous ones, stores the first one"""
+
+        assert has_ordinary_wallet_key_prefix(path) and len(path) > I_ACCOUNT, "Invalid path in single account check"
+        isByron = has_byron_prefix(path)
+        account = path[I_ACCOUNT]
+        if self._singleAccount is None:
+            self._singleAccount = (account, isByron)
+            return False
+        storedAccount, storedIsByron = self._singleAccount
+        if account != storedAccount:
+            return True
+        # Byron and Shelley keys are only combined on the account 0
+        return storedIsByron != isByron and storedAccount != harden(0)
+
+
+    def sign_tx_init(self) -> SecurityPolicy:
+        tx, mode = self.tx, self.signingMode
+        # Shelley mainnet with another protocol magic
+        if self.networkId == NetworkIds.MAINNET and self.protocolMagic != ProtocolMagics.MAINNET:
+            return DENY
+
+        includeScriptDataHash = tx.scriptDataHash is not None
+        if mode in (SigningMode.POOL_REGISTRATION_AS_OPERATOR, SigningMode.POOL_REGISTRATION_AS_OWNER):
+            if len(tx.certificates) != 1 or tx.withdrawals or tx.mint:
+                return DENY
+            if includeScriptDataHash or tx.collateralInputs or tx.requiredSigners or tx.collateralOutput is not None:
+                return DENY
+            if tx.totalCollateral is not None or tx.referenceInputs:
+                return DENY
+            if tx.votingProcedures or tx.treasury is not None or tx.donation is not None:
+                return DENY
+        elif mode in (SigningMode.ORDINARY_TRANSACTION, SigningMode.MULTISIG_TRANSACTION):
+            # collateral inputs are allowed only in PLUTUS_TRANSACTION
+            if tx.collateralInputs or tx.collateralOutput is not None:
+                return DENY
+            if tx.totalCollateral is not None or tx.referenceInputs:
+                return DENY
+        else:
+            # warn the user about Plutus script execution itself
+            return WARN
+
+        networkIdVerifiable = (bool(tx.includeNetworkId) or len(tx.outputs) > 0 or len(tx.withdrawals) > 0
+                               or mode in (SigningMode.POOL_REGISTRATION_AS_OPERATOR, SigningMode.POOL_REGISTRATION_AS_OWNER))
+        if not networkIdVerifiable or not is_network_usual(self.networkId, self.protocolMagic):
+            return WARN
+        if tx.collateralInputs:
+            return WARN
+        return PROMPT
+
+
+    def sign_tx_aux_data(self) -> List[SecurityPolicy]:
+        """Policies of the auxiliary data, then of the items of a CIP-36 registration"""
+
+        auxData = self.tx.auxiliaryData
+        assert auxData is not None
+        if auxData.type == TxAuxiliaryDataType.ARBITRARY_HASH:
+            return [self._show_if_expert()]
+        params = auxData.params
+        assert isinstance(params, TxAuxiliaryDataCIP36)
+
+        policies = [SHOW]
+        voteKeys = [params.voteKey] if params.voteKey is not None else [d.votingKeyPath for d in params.delegations]
+        for voteKey in voteKeys:
+            if not _is_path(voteKey):
+                policies.append(SHOW)
+                continue
+            path = parse_path(voteKey)
+            # encourages the new format, so that the support of CIP-15 can be dropped sooner
+            if params.format != CIP36VoteRegistrationFormat.CIP_36 or classify_path(path) != PathType.CVOTE_KEY:
+                return policies + [DENY]
+            policies.append(SHOW if is_path_reasonable(path) else WARN)
+
+        stakingPath = parse_path(params.stakingPath)
+        if not is_ordinary_staking_key_path(stakingPath):
+            return policies + [DENY]
+        policies.append(SHOW if is_path_reasonable(stakingPath) else WARN)
+
+        policies.append(self._cvote_payment_destination(params.paymentDestination))
+        if policies[-1] == DENY:
+            return policies
+        # nonce, voting purpose and confirmation
+        policies.append(SHOW)
+        if params.format == CIP36VoteRegistrationFormat.CIP_36:
+            policies.append(self._show_if_expert())
+        return policies + [PROMPT]
+
+
+    def _cvote_payment_destination(self, destination: TxOutputDestination) -> SecurityPolicy:
+        if isinstance(destination.params, ThirdPartyAddressParams):
+            header = bytes.fromhex(destination.params.addressHex)[0]
+            if header >> 4 not in SHELLEY_ADDRESS_TYPES or header & 0x0F != self.networkId:
+                return DENY
+            # the owner of the address is unknown
+            return WARN
+        params = address_params(destination.params)
+        if not is_valid_address_params(params) or params.type not in SHELLEY_ADDRESS_TYPES:
+            return DENY
+        if params.networkId != self.networkId:
+            return DENY
+        return SHOW if is_standard_base_address(params) else WARN
+
+
+    def sign_tx_input(self) -> SecurityPolicy:
+        if self.signingMode == SigningMode.PLUTUS_TRANSACTION:
+            # inputs are not interchangeable for Plutus scripts
+            return self._show_if_expert()
+        return ALLOW
+
+
+    def _address_bytes_suitable(self, address: bytes) -> bool:
+        addressType = AddressType(address[0] >> 4)
+        if addressType in (AddressType.REWARD_KEY, AddressType.REWARD_SCRIPT):
+            return False
+        if addressType == AddressType.BYRON:
+            if byron_protocol_magic(address) != self.protocolMagic:
+                return False
+        elif address[0] & 0x0F != self.networkId:
+            return False
+        return addressType not in ADDRESS_SIZES or len(address) == ADDRESS_SIZES[addressType]
+
+
+    def _address_params_suitable(self, params: AddressParams) -> bool:
+        if not is_valid_address_params(params):
+            return False
+        if params.type in (AddressType.REWARD_KEY, AddressType.REWARD_SCRIPT):
+            return False
+        if params.type == AddressType.BYRON:
+            if params.protocolMagic != self.protocolMagic:
+                return False
+        elif params.networkId != self.networkId:
+            return False
+        # a change output: the payment is controlled by a key of this device
+        if params.type not in PAYMENT_KEY_ADDRESS_TYPES:
+            return False
+        assert params.paymentKeyPath is not None
+        return not self.violates_single_account(params.paymentKeyPath)
+
+
+    def _forbidden_plutus_elements(self, output: TxOutput) -> bool:
+        return _has_plutus_elements(output) and self.signingMode in (SigningMode.POOL_REGISTRATION_AS_OWNER,
+                                                          SigningMode.POOL_REGISTRATION_AS_OPERATOR)
+
+
+    def sign_tx_output(self, output: TxOutput) -> SecurityPolicy:
+        """Policy of an output (its address), the datum, script and confirmation policies never deny"""
+
+        mode = self.signingMode
+        if isinstance(output.destination.params, ThirdPartyAddressParams):
+            if not self._address_bytes_suitable(bytes.fromhex(output.destination.params.addressHex)):
+                return DENY
+            if self._forbidden_plutus_elements(output):
+                return DENY
+            if mode == SigningMode.POOL_REGISTRATION_AS_OWNER:
+                # the funds are provided by the operator, the outputs are irrelevant to the owner
+                return ALLOW
+            # an output on a script address without datum is unspendable by Plutus scripts
+            if _destination_address_type(output.destination) in PAYMENT_SCRIPT_ADDRESS_TYPES and output.datum is None:
+                return WARN
+            return SHOW
+
+        params = address_params(output.destination.params)
+        if not self._address_params_suitable(params) or self._forbidden_plutus_elements(output):
+            return DENY
+        if mode in (SigningMode.POOL_REGISTRATION_AS_OPERATOR, SigningMode.ORDINARY_TRANSACTION):
+            if not is_standard_base_address(params):
+                return SHOW
+            if _has_plutus_elements(output):
+                return self._show_if_expert()
+            return ALLOW
+        if mode == SigningMode.PLUTUS_TRANSACTION:
+            return self._show_if_expert()
+        # multisig outputs are given as addresses, owner outputs too (the addresses derived are not shown)
+        return DENY
+
+
+    def sign_tx_collateral_output(self, output: TxOutput) -> SecurityPolicy:
+        params = None
+        if isinstance(output.destination.params, ThirdPartyAddressParams):
+            if not self._address_bytes_suitable(bytes.fromhex(output.destination.params.addressHex)):
+                return DENY
+        else:
+            params = address_params(output.destination.params)
+            if not self._address_params_suitable(params):
+                return DENY
+        # only addresses with payment controlled by a key
+        if _destination_address_type(output.destination) not in (AddressType.BASE_PAYMENT_KEY_STAKE_KEY,
+                                                                 AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT,
+                                                                 AddressType.POINTER_KEY, AddressType.ENTERPRISE_KEY):
+            return DENY
+        if _has_plutus_elements(output) or self.signingMode != SigningMode.PLUTUS_TRANSACTION:
+            return DENY
+        if params is None or self.tx.totalCollateral is None:
+            # the collateral return ADA must be shown
+            return SHOW
+        # change outputs can be hidden
+        return ALLOW if is_standard_base_address(params) else SHOW
+
+
+    def sign_tx_fee(self) -> SecurityPolicy:
+        # the fees are paid by the operator, they are irrelevant to owners
+        return ALLOW if self.signingMode == SigningMode.POOL_REGISTRATION_AS_OWNER else SHOW
+
+
+    def sign_tx_certificate(self, certificateType: CertificateType) -> SecurityPolicy:
+        """Generic policy of a certificate, on its type only"""
+
+        isPoolRegistration = certificateType == CertificateType.STAKE_POOL_REGISTRATION
+        if self.signingMode in (SigningMode.POOL_REGISTRATION_AS_OPERATOR, SigningMode.POOL_REGISTRATION_AS_OWNER):
+            return ALLOW if isPoolRegistration else DENY
+        if isPoolRegistration:
+            return DENY
+        if self.signingMode == SigningMode.MULTISIG_TRANSACTION and certificateType == CertificateType.STAKE_POOL_RETIREMENT:
+            return DENY
+        return ALLOW
+
+
+    def _forbidden_credential(self, credential: CredentialParams) -> bool:
+        """Credentials witnessed in the transaction: hashes in ordinary txs, keys in multisig txs"""
+
+        if self.signingMode == SigningMode.MULTISIG_TRANSACTION:
+            return credential.type != CredentialParamsType.SCRIPT_HASH
+        if self.signingMode == SigningMode.ORDINARY_TRANSACTION:
+            return credential.type != CredentialParamsType.KEY_PATH
+        return False
+
+
+    def _credential_policy(self, credential: CredentialParams, isValidPath: Callable[[Path], bool]) -> SecurityPolicy:
+        if self._forbidden_credential(credential):
+            return DENY
+        if credential.type == CredentialParamsType.KEY_PATH:
+            assert credential.keyValue is not None
+            path = parse_path(credential.keyValue)
+            if not isValidPath(path) or self.violates_single_account(path):
+                return DENY
+        return PROMPT
+
+
+    def _drep_policy(self, dRep: DRepParams) -> SecurityPolicy:
+        if dRep.type == DRepParamsType.KEY_PATH:
+            assert dRep.keyValue is not None
+            if not is_drep_key_path(parse_path(dRep.keyValue)):
+                return DENY
+        return PROMPT
+
+
+    def _committee_auth_policy(self, params: AuthorizeCommitteeParams) -> SecurityPolicy:
+        policy = self._credential_policy(params.coldCredential, is_committee_cold_key_path)
+        if policy == DENY:
+            return DENY
+        hot = params.hotCredential
+        # the hot key might be governed outside of this device, but a path must be a hot key path
+        if hot.type == CredentialParamsType.KEY_PATH:
+            assert hot.keyValue is not None
+            if not is_committee_hot_key_path(parse_path(hot.keyValue)):
+                return DENY
+        return PROMPT
+
+
+    def sign_tx_certificate_details(self, certificate: Certificate) -> List[SecurityPolicy]:
+        """Policies of a certificate, after the generic one"""
+
+        params = certificate.params
+        if certificate.type in STAKING_CERTIFICATE_TYPES:
+            return [self._credential_policy(params.stakeCredential, is_ordinary_staking_key_path)]  # type: ignore
+        if certificate.type == CertificateType.VOTE_DELEGATION:
+            if self._drep_policy(params.dRep) == DENY:  # type: ignore
+                return [DENY]
+            return [self._credential_policy(params.stakeCredential, is_ordinary_staking_key_path)]  # type: ignore
+        if certificate.type == CertificateType.AUTHORIZE_COMMITTEE_HOT:
+            assert isinstance(params, AuthorizeCommitteeParams)
+            return [self._committee_auth_policy(params)]
+        if certificate.type == CertificateType.RESIGN_COMMITTEE_COLD:
+            return [self._credential_policy(params.coldCredential, is_committee_cold_key_path)]  # type: ignore
+        if certificate.type in DREP_CERTIFICATE_TYPES:
+            return [self._credential_policy(params.dRepCredential, is_drep_key_path)]  # type: ignore
+        if certificate.type == CertificateType.STAKE_POOL_RETIREMENT:
+            # only in ordinary transactions, the pool cold key being given by path
+            poolKeyPath: str = params.poolKeyPath  # type: ignore
+            if not _is_path(poolKeyPath) or not is_pool_cold_key_path(parse_path(poolKeyPath)):
+                return [DENY]
+            return [PROMPT]
+        assert isinstance(params, PoolRegistrationParams)
+        return self._pool_registration(params)
+
+
+    def _pool_registration(self, params: PoolRegistrationParams) -> List[SecurityPolicy]:
+        isOwner = self.signingMode == SigningMode.POOL_REGISTRATION_AS_OWNER
+        # there should be an owner given by path for which a witness is provided
+        if isOwner and not params.poolOwners:
+            return [DENY]
+        policies = [ALLOW]
+        # the owner sees the pool id as a hash, the operator as a path
+        if _is_path(params.poolKey.key) == isOwner:
+            return policies + [DENY]
+        # pool id, vrf key and reward account
+        policies += [SHOW, SHOW if not isOwner else ALLOW, SHOW]
+
+        numOwnersGivenByPath = 0
+        for owner in params.poolOwners:
+            if _is_path(owner.key):
+                path = parse_path(owner.key)
+                if not is_ordinary_staking_key_path(path) or self.violates_single_account(path):
+                    return policies + [DENY]
+                numOwnersGivenByPath += 1
+                self.poolOwnerPath = path
+                # the operator gets the owners given by hash
+                if not isOwner or numOwnersGivenByPath > 1:
+                    return policies + [DENY]
+            policies.append(SHOW)
+        policies += [ALLOW if isOwner else SHOW for _ in params.relays]
+        # metadata, then the confirmation if there are no owners or relays
+        policies.append(SHOW)
+        policies.append(PROMPT if not params.poolOwners or not params.relays else ALLOW)
+        return policies
+
+
+    def sign_tx_withdrawal(self, credential: CredentialParams) -> SecurityPolicy:
+        mode = self.signingMode
+        if credential.type == CredentialParamsType.KEY_PATH:
+            assert credential.keyValue is not None
+            path = parse_path(credential.keyValue)
+            if not is_ordinary_staking_key_path(path) or self.violates_single_account(path):
+                return DENY
+            allowed: Tuple[TransactionSigningMode, ...] = (SigningMode.ORDINARY_TRANSACTION,
+                                                           SigningMode.PLUTUS_TRANSACTION)
+        elif credential.type == CredentialParamsType.KEY_HASH:
+            # the hash might be of a key used in a witness
+            allowed = (SigningMode.PLUTUS_TRANSACTION,)
+        else:
+            allowed = (SigningMode.MULTISIG_TRANSACTION, SigningMode.PLUTUS_TRANSACTION)
+        return self._show_if_expert() if mode in allowed else DENY
+
+
+    def sign_tx_mint(self) -> SecurityPolicy:
+        # the minted tokens are shown
+        return SHOW
+
+
+    def sign_tx_script_data_hash(self) -> SecurityPolicy:
+        if self.signingMode in (SigningMode.POOL_REGISTRATION_AS_OWNER, SigningMode.POOL_REGISTRATION_AS_OPERATOR):
+            return DENY
+        return self._show_if_expert()
+
+
+    def sign_tx_collateral_input(self) -> SecurityPolicy:
+        if self.signingMode != SigningMode.PLUTUS_TRANSACTION:
+            return DENY
+        # safe to hide if the total collateral is given
+        return SHOW if self.tx.totalCollateral is None and self.expertMode else ALLOW
+
+
+    def sign_tx_required_signer(self, signer: RequiredSigner) -> SecurityPolicy:
+        if self.signingMode not in (SigningMode.PLUTUS_TRANSACTION, SigningMode.ORDINARY_TRANSACTION,
+                                    SigningMode.MULTISIG_TRANSACTION):
+            return DENY
+        if signer.type == TxRequiredSignerType.PATH:
+            path = parse_path(signer.addressHex)
+            pathType = classify_path(path)
+            if pathType in (PathType.ORDINARY_ACCOUNT, PathType.ORDINARY_PAYMENT_KEY, PathType.ORDINARY_STAKING_KEY):
+                allowed = has_shelley_prefix(path)
+            else:
+                allowed = pathType in (PathType.MULTISIG_ACCOUNT, PathType.MULTISIG_PAYMENT_KEY,
+                                       PathType.MULTISIG_STAKING_KEY, PathType.DREP_KEY, PathType.COMMITTEE_COLD_KEY,
+                                       PathType.COMMITTEE_HOT_KEY, PathType.MINT_KEY)
+            if not allowed:
+                return DENY
+        return self._show_if_expert()
+
+
+    def sign_tx_reference_input(self) -> SecurityPolicy:
+        return self._show_if_expert() if self.signingMode == SigningMode.PLUTUS_TRANSACTION else DENY
+
+
+    def sign_tx_voting_procedure(self, voter: Voter) -> SecurityPolicy:
+        if self.signingMode == SigningMode.ORDINARY_TRANSACTION:
+            # keys must be given by path, otherwise the user does not know if the hash is of his keys
+            isValidPath = {
+                VoterType.COMMITTEE_KEY_PATH: is_committee_hot_key_path,
+                VoterType.DREP_KEY_PATH: is_drep_key_path,
+                VoterType.STAKE_POOL_KEY_PATH: is_pool_cold_key_path,
+            }.get(voter.type)
+            if isValidPath is None or not isValidPath(parse_path(voter.keyValue)):
+                return DENY
+        elif self.signingMode == SigningMode.MULTISIG_TRANSACTION:
+            # everything is expected to be governed by native scripts
+            if voter.type not in (VoterType.COMMITTEE_SCRIPT_HASH, VoterType.DREP_SCRIPT_HASH):
+                return DENY
+        return SHOW
+
+
+    def sign_tx_witness(self, path: Path) -> SecurityPolicy:
+        mode = self.signingMode
+        pathType = classify_path(path)
+        reasonable = pathType != PathType.INVALID and is_path_reasonable(path)
+        includeMint = bool(self.tx.mint)
+
+        if mode == SigningMode.ORDINARY_TRANSACTION:
+            if pathType in (PathType.ORDINARY_PAYMENT_KEY, PathType.ORDINARY_STAKING_KEY):
+                if self.violates_single_account(path):
+                    return DENY
+                return WARN if not reasonable else self._show_if_expert()
+            if pathType in (PathType.DREP_KEY, PathType.COMMITTEE_COLD_KEY, PathType.COMMITTEE_HOT_KEY):
+                if self.violates_single_account(path):
+                    return DENY
+                return SHOW if reasonable else WARN
+            if pathType == PathType.POOL_COLD_KEY:
+                return SHOW if reasonable else WARN
+            if pathType == PathType.MINT_KEY:
+                return SHOW if includeMint else DENY
+            # multisig keys are forbidden
+            return DENY
+
+        if mode == SigningMode.MULTISIG_TRANSACTION:
+            if pathType in (PathType.MULTISIG_PAYMENT_KEY, PathType.MULTISIG_STAKING_KEY):
+                return SHOW if reasonable else WARN
+            if pathType == PathType.MINT_KEY:
+                return SHOW if includeMint else DENY
+            return DENY
+
+        if mode == SigningMode.PLUTUS_TRANSACTION:
+            if pathType in (PathType.ORDINARY_PAYMENT_KEY, PathType.ORDINARY_STAKING_KEY, PathType.MULTISIG_PAYMENT_KEY,
+                            PathType.MULTISIG_STAKING_KEY, PathType.DREP_KEY, PathType.COMMITTEE_COLD_KEY,
+                            PathType.COMMITTEE_HOT_KEY):
+                return SHOW if reasonable else WARN
+            return SHOW if pathType == PathType.MINT_KEY else DENY
+
+        if mode == SigningMode.POOL_REGISTRATION_AS_OWNER:
+            # the witness is the one of the owner given by path, it might witness owners given by hash otherwise
+            if pathType != PathType.ORDINARY_STAKING_KEY or self.poolOwnerPath != path:
+                return DENY
+            return SHOW if reasonable else WARN
+
+        # operator: the payment keys of the inputs and the pool cold key
+        if pathType not in (PathType.ORDINARY_PAYMENT_KEY, PathType.POOL_COLD_KEY):
+            return DENY
+        return SHOW if reasonable else WARN
+
+
+    def evaluate(self, witnessPaths: List[str]) -> PolicyEvaluation:
+        """Policies of the items in the order of the APDUs, up to the first denied one
+
+        Args:
+            witnessPaths (List[str]): The paths of the requested witnesses
+
+        Returns:
+            The evaluation
+        """
+
+        evaluation = PolicyEvaluation()
+
+        def add(step: TxStep, index: int, policies: Union[SecurityPolicy, List[SecurityPolicy]], item: str = "") -> None:
+            for policy in policies if isinstance(policies, list) else [policies]:
+                evaluation.steps.append(PolicyStep(step, index, policy, item))
+                if policy == DENY:
+                    raise _PolicyDenied()
+
+        tx = self.tx
+        try:
+            add(TxStep.INIT, 0, self.sign_tx_init())
+            if tx.auxiliaryData is not None:
+                add(TxStep.AUX_DATA, 0, self.sign_tx_aux_data())
+            for i, _ in enumerate(tx.inputs):
+                add(TxStep.INPUTS, i, self.sign_tx_input())
+            for i, output in enumerate(tx.outputs):
+                add(TxStep.OUTPUTS, i, self.sign_tx_output(output))
+            add(TxStep.FEE, 0, self.sign_tx_fee())
+            if tx.ttl is not None:
+                add(TxStep.TTL, 0, self._show_if_expert())
+            for i, certificate in enumerate(tx.certificates):
+                add(TxStep.CERTIFICATES, i, self.sign_tx_certificate(certificate.type), certificate.type.name)
+                add(TxStep.CERTIFICATES, i, self.sign_tx_certificate_details(certificate), certificate.type.name)
+            for i, withdrawal in enumerate(tx.withdrawals):
+                add(TxStep.WITHDRAWALS, i, self.sign_tx_withdrawal(withdrawal.stakeCredential))
+            if tx.validityIntervalStart is not None:
+                add(TxStep.VALIDITY_INTERVAL_START, 0, self._show_if_expert())
+            if tx.mint:
+                add(TxStep.MINT, 0, self.sign_tx_mint())
+            if tx.scriptDataHash is not None:
+                add(TxStep.SCRIPT_DATA_HASH, 0, self.sign_tx_script_data_hash())
+            for i, _ in enumerate(tx.collateralInputs):
+                add(TxStep.COLLATERAL_INPUTS, i, self.sign_tx_collateral_input())
+            for i, signer in enumerate(tx.requiredSigners):
+                add(TxStep.REQUIRED_SIGNERS, i, self.sign_tx_required_signer(signer))
+            if tx.collateralOutput is not None:
+                add(TxStep.COLLATERAL_OUTPUT, 0, self.sign_tx_collateral_output(tx.collateralOutput))
+            if tx.totalCollateral is not None:
+                # shown against an unlimited collateral loss
+                add(TxStep.TOTAL_COLLATERAL, 0, SHOW)
+            for i, _ in enumerate(tx.referenceInputs):
+                add(TxStep.REFERENCE_INPUTS, i, self.sign_tx_reference_input())
+            for i, voterVotes in enumerate(tx.votingProcedures):
+                add(TxStep.VOTING_PROCEDURES, i, self.sign_tx_voting_procedure(voterVotes.voter))
+            if tx.treasury is not None:
+                add(TxStep.TREASURY, 0, SHOW)
+            if tx.donation is not None:
+                add(TxStep.DONATION, 0, SHOW)
+            add(TxStep.CONFIRM, 0, PROMPT)
+            for i, path in enumerate(witnessPaths):
+                add(TxStep.WITNESSES, i, self.sign_tx_witness(parse_path(path)), path)
+        except _PolicyDenied:
+            pass
+        return evaluation
+
+
+def tx_witness_paths(tx: Transaction, signingMode: TransactionSigningMode) -> List[str]:
+    """Paths of the witnesses of the transaction, in the order of the items, without duplicates"""
+
+    witnessPaths: List[Optional[str]] = []
+    if signingMode != SigningMode.MULTISIG_TRANSACTION:
+        witnessPaths += [txInput.path for txInput in tx.inputs]
+        for certificate in tx.certificates:
+            params = certificate.params
+            if certificate.type == CertificateType.STAKE_REGISTRATION:
+                # not witnessed
+                continue
+            if certificate.type in STAKING_CERTIFICATE_TYPES or certificate.type == CertificateType.VOTE_DELEGATION:
+                credential = params.stakeCredential  # type: ignore
+            elif certificate.type in (CertificateType.AUTHORIZE_COMMITTEE_HOT, CertificateType.RESIGN_COMMITTEE_COLD):
+                credential = params.coldCredential  # type: ignore
+            elif certificate.type in DREP_CERTIFICATE_TYPES:
+                credential = params.dRepCredential  # type: ignore
+            elif certificate.type == CertificateType.STAKE_POOL_RETIREMENT:
+                witnessPaths.append(params.poolKeyPath)  # type: ignore
+                continue
+            elif certificate.type == CertificateType.STAKE_POOL_REGISTRATION:
+                assert isinstance(params, PoolRegistrationParams)
+                witnessPaths += [owner.key for owner in params.poolOwners if _is_path(owner.key)]
+                witnessPaths += [params.poolKey.key] if _is_path(params.poolKey.key) else []
+                continue
+            else:
+                continue
+            if credential.type == CredentialParamsType.KEY_PATH:
+                witnessPaths.append(credential.keyValue)
+        witnessPaths += [withdrawal.stakeCredential.keyValue for withdrawal in tx.withdrawals
+                         if withdrawal.stakeCredential.type == CredentialParamsType.KEY_PATH]
+        witnessPaths += [signer.addressHex for signer in tx.requiredSigners if signer.type == TxRequiredSignerType.PATH]
+        witnessPaths += [collateral.path for collateral in tx.collateralInputs]
+        witnessPaths += [voterVotes.voter.keyValue for voterVotes in tx.votingProcedures
+                         if voterVotes.voter.type in PATH_VOTER_TYPES]
+    return list(dict.fromkeys(path for path in witnessPaths if path is not None))
+
+
+def evaluate_tx(tx: Transaction,
+                signingMode: TransactionSigningMode,
+                witnessPaths: Optional[List[str]] = None,
+                expertMode: bool = False) -> PolicyEvaluation:
+    """Evaluates the security policy of a whole transaction
+
+    Args:
+        tx (Transaction): The transaction
+        signingMode (TransactionSigningMode): The signing mode
+        witnessPaths (List[str]): The paths of the requested witnesses, those of the tx items by default
+        expertMode (bool): Whether the app is in expert mode
+
+    Returns:
+        The policies of the items, up to the first denied one
+    """
+
+    if witnessPaths is None:
+        witnessPaths = tx_witness_paths(tx, signingMode)
+    return SignTxPolicy(tx, signingMode, expertMode).evaluate(witnessPaths)
+
+
+def ensure_not_denied(evaluation: PolicyEvaluation) -> None:
+    """Raises the error of the app if the transaction is rejected by the policy
+
+    Args:
+        evaluation (PolicyEvaluation): The evaluation of the transaction
+    """
+
+    denied = evaluation.denied
+    if denied is not None:
+        raise ExceptionRAPDU(Errors.SW_REJECTED_BY_POLICY,
+                             f"{denied.step.name} {denied.index} {denied.item}".strip().encode())
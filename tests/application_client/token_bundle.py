@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the canonical ordering of the token bundles (outputs, collateral output and mint).
+
+The app checks that the policy ids and asset names are map keys in the canonical CBOR order
+(cbor_mapKeyFulfillsCanonicalOrdering: shorter keys first, then byte by byte) and rejects
+a misordered item with SW_INVALID_DATA when it is received, i.e. possibly after most of the
+transaction has been sent. Sorting the bundles before building the APDUs avoids that.
+"""
+
+from dataclasses import replace
+from typing import List, Sequence, Tuple, TypeVar
+
+from input_files.signTx import AssetGroup, Token, Transaction, TxOutput
+
+# (length, bytes) of a CBOR map key
+CanonicalKey = Tuple[int, bytes]
+
+_Item = TypeVar("_Item")
+
+
+def canonical_key(keyHex: str) -> CanonicalKey:
+    """Sort key of a policy id or asset name, as in cbor_mapKeyFulfillsCanonicalOrdering"""
+
+    key = bytes.fromhex(keyHex)
+    return (len(key), key)
+
+
+def _sorted_unique(items: Sequence[_Item], keys: Sequence[CanonicalKey], name: str) -> List[_Item]:
+    # the keys are computed once, not at every comparison
+    order = sorted(range(len(items)), key=keys.__getitem__)
+    for previous, current in zip(order, order[1:]):
+        if keys[previous] == keys[current]:
+            raise ValueError(f"Duplicate {name} {keys[current][1].hex()}")
+    return [items[i] for i in order]
+
+
+def _is_ordered(keys: Sequence[CanonicalKey]) -> bool:
+    return all(previous < current for previous, current in zip(keys, keys[1:]))
+
+
+def is_canonical_token_bundle(assetGroups: Sequence[AssetGroup]) -> bool:
+    """Whether the asset groups and their tokens are strictly in the canonical order"""
+
+    if not _is_ordered([canonical_key(group.policyIdHex) for group in assetGroups]):
+        return False
+    return all(_is_ordered([canonical_key(token.assetNameHex) for token in group.tokens])
+               for group in assetGroups)
+
+
+def canonical_token_bundle(assetGroups: Sequence[AssetGroup]) -> List[AssetGroup]:
+    """Asset groups and tokens sorted in the canonical order, the given ones are not modified
+
+    Args:
+        assetGroups (Sequence[AssetGroup]): The token bundle
+
+    Returns:
+        The sorted token bundle
+
+    Raises:
+        ValueError: A policy id is repeated, or an asset name within an asset group,
+            which the app rejects whatever the order
+    """
+
+    groups: List[AssetGroup] = []
+    for group in assetGroups:
+        tokens: List[Token] = _sorted_unique(group.tokens,
+                                             [canonical_key(token.assetNameHex) for token in group.tokens],
+                                             "asset name")
+        groups.append(replace(group, tokens=tokens))
+    return _sorted_unique(groups, [canonical_key(group.policyIdHex) for group in groups], "policy id")
+
+
+def _canonical_output(txOutput: TxOutput) -> TxOutput:
+    if is_canonical_token_bundle(txOutput.tokenBundle):
+        return txOutput
+    return replace(txOutput, tokenBundle=canonical_token_bundle(txOutput.tokenBundle))
+
+
+def canonical_tx(tx: Transaction) -> Transaction:
+    """Transaction with the token bundles of the outputs, collateral output and mint in the canonical order
+
+    The transaction is returned as it is if it is already canonical. Otherwise, the tx body signed
+    by the device is the canonical one, which differs from a misordered serialization of the tx.
+    """
+
+    outputs = [_canonical_output(txOutput) for txOutput in tx.outputs]
+    collateralOutput = None if tx.collateralOutput is None else _canonical_output(tx.collateralOutput)
+    mintCanonical = is_canonical_token_bundle(tx.mint)
+    if mintCanonical and collateralOutput is tx.collateralOutput and \
+            all(output is original for output, original in zip(outputs, tx.outputs)):
+        return tx
+    return replace(tx,
+                   outputs=outputs,
+                   collateralOutput=collateralOutput,
+                   mint=tx.mint if mintCanonical else canonical_token_bundle(tx.mint))
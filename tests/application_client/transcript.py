@@ -0,0 +1,312 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the APDU transcript recording and replay.
+
+A transcript is a compact binary file:
+    magic "CATR", version (1 byte)
+    entries: kind (1 byte), time since the start of the recording in ms (4 bytes BE),
+             data length (2 bytes BE), data
+
+The entries are the exchanged commands, the responses (status, 2 bytes BE, followed by the data),
+markers of the exchanges waiting for an interaction with the device UI, the texts displayed during
+these exchanges on Speculos (x and y, 2 bytes BE each, followed by the UTF-8 text) and free-form
+text markers.
+"""
+
+import struct
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Generator, List, Optional
+
+import requests
+
+from ragger.backend.interface import BackendInterface, RAPDU
+from ragger.error import ExceptionRAPDU
+
+from application_client.app_def import Errors
+
+
+TRANSCRIPT_MAGIC = b"CATR"
+TRANSCRIPT_VERSION = 1
+
+_ENTRY_HEADER = struct.Struct(">BIH")
+_TEXT_POSITION = struct.Struct(">HH")
+
+
+class EntryKind(IntEnum):
+    COMMAND = 0x01
+    RESPONSE = 0x02
+    INTERACTION = 0x03
+    MARKER = 0x04
+    TEXT = 0x05
+
+
+@dataclass
+class TranscriptEntry:
+    kind: EntryKind
+    timeMs: int
+    data: bytes
+
+
+@dataclass
+class ScreenText:
+    """Text drawn on the screen, as reported by the Speculos text events"""
+    text: str
+    x: int
+    y: int
+
+
+    def to_bytes(self) -> bytes:
+        return _TEXT_POSITION.pack(self.x, self.y) + self.text.encode()
+
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "ScreenText":
+        x, y = _TEXT_POSITION.unpack_from(data)
+        return ScreenText(data[_TEXT_POSITION.size:].decode(), x, y)
+
+
+@dataclass
+class Exchange:
+    command: bytes
+    status: int
+    data: bytes
+    interactive: bool = False
+    texts: List[ScreenText] = field(default_factory=list)
+
+    @property
+    def rejected(self) -> bool:
+        """Whether the user rejected the operation"""
+        return self.status == Errors.SW_REJECTED_BY_USER
+
+
+@dataclass
+class Transcript:
+    entries: List[TranscriptEntry] = field(default_factory=list)
+
+
+    def exchanges(self) -> List[Exchange]:
+        """Pairs the commands with their responses
+
+        Returns:
+            The exchanges in the recorded order
+        """
+
+        exchanges: List[Exchange] = []
+        command: Optional[bytes] = None
+        interactive = False
+        texts: List[ScreenText] = []
+        for entry in self.entries:
+            if entry.kind == EntryKind.COMMAND:
+                assert command is None, "Command without response in the transcript"
+                command = entry.data
+                interactive = False
+                texts = []
+            elif entry.kind == EntryKind.INTERACTION:
+                interactive = True
+            elif entry.kind == EntryKind.TEXT:
+                texts.append(ScreenText.from_bytes(entry.data))
+            elif entry.kind == EntryKind.RESPONSE:
+                assert command is not None, "Response without command in the transcript"
+                status = int.from_bytes(entry.data[:2], "big")
+                exchanges.append(Exchange(command, status, entry.data[2:], interactive, texts))
+                command = None
+        assert command is None, "Command without response in the transcript"
+        return exchanges
+
+
+    def to_bytes(self) -> bytes:
+        """Serializes the transcript
+
+        Returns:
+            The transcript file content
+        """
+
+        out = bytearray(TRANSCRIPT_MAGIC)
+        out.append(TRANSCRIPT_VERSION)
+        for entry in self.entries:
+            out += _ENTRY_HEADER.pack(entry.kind, entry.timeMs, len(entry.data))
+            out += entry.data
+        return bytes(out)
+
+
+    @staticmethod
+    def from_bytes(content: bytes) -> "Transcript":
+        """Parses a transcript
+
+        Args:
+            content (bytes): The transcript file content
+
+        Returns:
+            The transcript
+        """
+
+        if content[:len(TRANSCRIPT_MAGIC)] != TRANSCRIPT_MAGIC:
+            raise ValueError("Not a transcript")
+        offset = len(TRANSCRIPT_MAGIC)
+        if content[offset] != TRANSCRIPT_VERSION:
+            raise ValueError(f"Unsupported transcript version {content[offset]}")
+        offset += 1
+
+        transcript = Transcript()
+        while offset < len(content):
+            kind, timeMs, size = _ENTRY_HEADER.unpack_from(content, offset)
+            offset += _ENTRY_HEADER.size
+            if offset + size > len(content):
+                raise ValueError("Truncated transcript")
+            transcript.entries.append(TranscriptEntry(EntryKind(kind), timeMs, content[offset:offset + size]))
+            offset += size
+        return transcript
+
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+
+
+    @staticmethod
+    def load(path: Path) -> "Transcript":
+        return Transcript.from_bytes(path.read_bytes())
+
+
+class TranscriptRecorder:
+    """Records the APDU exchanged by a CommandSender"""
+
+    def __init__(self) -> None:
+        """Class initializer"""
+
+        self.transcript = Transcript()
+        self._start = time.monotonic()
+
+
+    def _append(self, kind: EntryKind, data: bytes) -> None:
+        timeMs = int((time.monotonic() - self._start) * 1000)
+        self.transcript.entries.append(TranscriptEntry(kind, timeMs, bytes(data)))
+
+
+    def record_command(self, apdu: bytes) -> None:
+        self._append(EntryKind.COMMAND, apdu)
+
+
+    def record_interaction(self) -> None:
+        self._append(EntryKind.INTERACTION, b"")
+
+
+    def record_texts(self, texts: List[ScreenText]) -> None:
+        for text in texts:
+            self._append(EntryKind.TEXT, text.to_bytes())
+
+
+    def record_response(self, rapdu: RAPDU) -> None:
+        self._append(EntryKind.RESPONSE, rapdu.status.to_bytes(2, "big") + rapdu.data)
+
+
+    def record_marker(self, label: str) -> None:
+        self._append(EntryKind.MARKER, label.encode())
+
+
+_activeRecorder: Optional[TranscriptRecorder] = None
+
+
+def active_recorder() -> Optional[TranscriptRecorder]:
+    """Recorder used by default by the new CommandSender instances
+
+    Returns:
+        The recorder, None when not recording
+    """
+
+    return _activeRecorder
+
+
+@contextmanager
+def recording(path: Path) -> Generator[TranscriptRecorder, None, None]:
+    """Records the exchanges of the CommandSender instances created in the context
+
+    Args:
+        path (Path): Transcript file, written when leaving the context
+
+    Returns:
+        Generator
+    """
+
+    global _activeRecorder  # pylint: disable=global-statement
+    previous = _activeRecorder
+    recorder = TranscriptRecorder()
+    _activeRecorder = recorder
+    try:
+        yield recorder
+    finally:
+        _activeRecorder = previous
+        if recorder.transcript.entries:
+            recorder.transcript.save(path)
+
+
+class TranscriptMismatch(AssertionError):
+    pass
+
+
+def screen_texts(backend: BackendInterface) -> List[ScreenText]:
+    """Texts displayed since the start of Speculos, in the drawing order
+
+    Args:
+        backend (BackendInterface): The backend
+
+    Returns:
+        The texts, none on the other backends
+    """
+
+    url = getattr(backend, "url", None)
+    if url is None:
+        return []
+    response = requests.get(f"{url}/events", timeout=10)
+    response.raise_for_status()
+    return [ScreenText(event["text"], event["x"], event["y"]) for event in response.json()["events"]]
+
+
+def set_automation_rules(backend: BackendInterface, rules: dict) -> None:
+    """Sets the Speculos automation rules answering the UI interactions
+
+    Args:
+        backend (BackendInterface): A Speculos backend
+        rules (dict): Rules in the Speculos automation format
+    """
+
+    url = getattr(backend, "url", None)
+    if url is None:
+        raise ValueError("Automation rules are only supported by the Speculos backend")
+    response = requests.post(f"{url}/automation", json=rules, timeout=10)
+    response.raise_for_status()
+
+
+def replay(backend: BackendInterface, transcript: Transcript, check: bool = True) -> List[RAPDU]:
+    """Sends the commands of a transcript, without waiting between them
+
+    The UI interactions have to be answered by Speculos automation rules (see set_automation_rules).
+
+    Args:
+        backend (BackendInterface): The backend
+        transcript (Transcript): The transcript
+        check (bool): Whether to check the responses against the recorded ones
+
+    Returns:
+        The responses
+    """
+
+    responses = []
+    for index, exchange in enumerate(transcript.exchanges()):
+        try:
+            rapdu = backend.exchange_raw(exchange.command)
+        except ExceptionRAPDU as e:
+            rapdu = RAPDU(e.status, e.data)
+        if check and (rapdu.status != exchange.status or rapdu.data != exchange.data):
+            raise TranscriptMismatch(f"Exchange {index} ({exchange.command[:4].hex()}): "
+                                     f"expected {exchange.status:04x} {exchange.data.hex()}, "
+                                     f"got {rapdu.status:04x} {rapdu.data.hex()}")
+        responses.append(rapdu)
+    return responses
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the asyncio transports used by the AsyncCommandSender:
+the APDU port of Speculos (TCP) and the USB HID of a real device.
+"""
+
+import asyncio
+import struct
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from ragger.backend.interface import RAPDU
+
+
+class Transport(ABC):
+    """APDU exchange with one device"""
+
+    @abstractmethod
+    async def open(self) -> None:
+        ...
+
+
+    @abstractmethod
+    async def exchange(self, apdu: bytes) -> RAPDU:
+        """Sends an APDU and waits for its response, whatever its status
+
+        Args:
+            apdu (bytes): APDU to send
+
+        Returns:
+            Response APDU
+        """
+
+
+    @abstractmethod
+    async def close(self) -> None:
+        ...
+
+
+    async def __aenter__(self) -> "Transport":
+        await self.open()
+        return self
+
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+
+class SpeculosTcpTransport(Transport):
+    """APDU port of Speculos (--apdu-port)
+
+    Each APDU is sent prefixed by its length (4 bytes BE), the response is
+    its data length (4 bytes BE), the data and the status word.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9999) -> None:
+        """Class initializer"""
+
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+
+    async def open(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+
+    async def exchange(self, apdu: bytes) -> RAPDU:
+        assert self._reader is not None and self._writer is not None, "Transport not open"
+        self._writer.write(len(apdu).to_bytes(4, "big") + apdu)
+        await self._writer.drain()
+        size = int.from_bytes(await self._reader.readexactly(4), "big")
+        data = await self._reader.readexactly(size)
+        status = int.from_bytes(await self._reader.readexactly(2), "big")
+        return RAPDU(status, data)
+
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+        self._reader = self._writer = None
+
+
+class HidTransport(Transport):
+    """USB HID of a Ledger device
+
+    The APDU are split into 64-byte frames: channel (2 bytes), tag 0x05, sequence
+    number (2 bytes), and in the first frame the APDU length (2 bytes).
+    The blocking HID calls run in the default executor.
+    """
+
+    LEDGER_VENDOR_ID = 0x2C97
+    CHANNEL = 0x0101
+    TAG_APDU = 0x05
+    FRAME_SIZE = 64
+
+    def __init__(self, path: Optional[bytes] = None) -> None:
+        """Class initializer
+
+        Args:
+            path (bytes): HID path of the device, the first Ledger device by default
+        """
+
+        self.path = path
+        self._device: Any = None
+
+
+    @staticmethod
+    def enumerate_paths() -> list:
+        import hid  # pylint: disable=import-outside-toplevel
+        return [info["path"] for info in hid.enumerate(HidTransport.LEDGER_VENDOR_ID, 0)]
+
+
+    async def open(self) -> None:
+        import hid  # pylint: disable=import-outside-toplevel
+        path = self.path
+        if path is None:
+            paths = self.enumerate_paths()
+            if not paths:
+                raise ConnectionError("No Ledger device found")
+            path = paths[0]
+        self._device = hid.device()
+        self._device.open_path(path)
+        self._device.set_nonblocking(False)
+
+
+    def _exchange_blocking(self, apdu: bytes) -> RAPDU:
+        payload = len(apdu).to_bytes(2, "big") + apdu
+        sequence = 0
+        while payload:
+            header = struct.pack(">HBH", self.CHANNEL, self.TAG_APDU, sequence)
+            chunk = payload[:self.FRAME_SIZE - len(header)]
+            payload = payload[len(chunk):]
+            frame = header + chunk
+            # the report id (0) is prepended
+            self._device.write(b"\x00" + frame + b"\x00" * (self.FRAME_SIZE - len(frame)))
+            sequence += 1
+
+        response = b""
+        size = None
+        sequence = 0
+        while size is None or len(response) < size:
+            frame = bytes(self._device.read(self.FRAME_SIZE))
+            channel, tag, frameSequence = struct.unpack(">HBH", frame[:5])
+            if channel != self.CHANNEL or tag != self.TAG_APDU or frameSequence != sequence:
+                raise ConnectionError("Unexpected HID frame")
+            if sequence == 0:
+                size = int.from_bytes(frame[5:7], "big")
+                response += frame[7:]
+            else:
+                response += frame[5:]
+            sequence += 1
+        response = response[:size]
+        return RAPDU(int.from_bytes(response[-2:], "big"), response[:-2])
+
+
+    async def exchange(self, apdu: bytes) -> RAPDU:
+        assert self._device is not None, "Transport not open"
+        return await asyncio.get_running_loop().run_in_executor(None, self._exchange_blocking, apdu)
+
+
+    async def close(self) -> None:
+        if self._device is not None:
+            self._device.close()
+        self._device = None
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the assembler of the signed transaction from the witness signatures
+returned by the device.
+
+The tx body (and the auxiliary data) are copied as they are, never re-encoded, so that
+the tx hash signed by the device stays valid. Only the witness set is written:
+a vkey witness per Shelley path, a bootstrap witness per Byron path (m/44'/...),
+with the public key and chain code of the path. The witness arrays are tagged as sets
+(tag 258) when the body uses the Conway set encoding.
+
+The CIP-36 registration auxiliary data is rebuilt as src/auxDataHashBuilder serializes it,
+from the keys of the registration and the signature returned by the device.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from application_client.app_def import ProtocolMagics
+from application_client.tx_importer import CBOR_ARRAY, CBOR_BYTES, CBOR_MAP, CBOR_NULL, CBOR_TAG, CBOR_TAG_SET
+from application_client.tx_importer import CBOR_TRUE, CBOR_UINT, CborReader
+
+BYRON_PURPOSE = "m/44'"
+BYRON_PROTOCOL_MAGIC_ATTRIBUTE_KEY = 2
+
+
+class WitnessSetKeys:
+    """Keys of the witness set map"""
+    VKEY = 0
+    BOOTSTRAP = 2
+
+
+class CIP36Keys:
+    """Metadata keys of the CIP-36 registration, see src/auxDataHashBuilder.h"""
+    PAYLOAD = 61284
+    SIGNATURE = 61285
+    VOTE_KEY = 1
+    STAKING_KEY = 2
+    PAYMENT_ADDRESS = 3
+    NONCE = 4
+    VOTING_PURPOSE = 5
+    SIGNATURE_VALUE = 1
+
+
+# Public key and chain code of a path
+KeyProvider = Callable[[str], Tuple[bytes, bytes]]
+
+
+def _cbor_header(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes([major << 5 | value])
+    for info, size in ((24, 1), (25, 2), (26, 4), (27, 8)):
+        if value < 1 << (8 * size):
+            return bytes([major << 5 | info]) + value.to_bytes(size, "big")
+    raise ValueError("CBOR value too large")
+
+
+def _cbor_bytes(data: bytes) -> bytes:
+    return _cbor_header(CBOR_BYTES, len(data)) + data
+
+
+def _cbor_array(items: Sequence[bytes]) -> bytes:
+    return _cbor_header(CBOR_ARRAY, len(items)) + b"".join(items)
+
+
+def byron_address_attributes(protocolMagic: int) -> bytes:
+    """CBOR of the attributes of the Byron addresses, the protocol magic being omitted on mainnet"""
+
+    if protocolMagic == ProtocolMagics.MAINNET:
+        return _cbor_header(CBOR_MAP, 0)
+    return (_cbor_header(CBOR_MAP, 1) + _cbor_header(CBOR_UINT, BYRON_PROTOCOL_MAGIC_ATTRIBUTE_KEY)
+            + _cbor_bytes(_cbor_header(CBOR_UINT, protocolMagic)))
+
+
+@dataclass
+class UnsignedTx:
+    """Raw CBOR parts of a transaction"""
+    body: bytes
+    # raw items of the vkey and bootstrap witnesses, the other entries of the witness set are kept as they are
+    witnesses: Dict[int, List[bytes]] = field(default_factory=dict)
+    otherWitnesses: Dict[int, bytes] = field(default_factory=dict)
+    isValid: bytes = bytes([CBOR_TRUE])
+    auxiliaryData: bytes = bytes([CBOR_NULL])
+    # the sets of the body are tagged (Conway encoding), so are the witness sets
+    setTags: bool = False
+
+
+def _uses_set_tags(body: bytes) -> bool:
+    """Whether a field of the tx body is tagged as a set"""
+
+    reader = CborReader(body)
+    count = reader.read_map()
+    i = 0
+    while reader.has_next(count, i):
+        reader.skip()
+        if reader.peek_type() == CBOR_TAG and reader.read_tag() == CBOR_TAG_SET:
+            return True
+        reader.skip()
+        i += 1
+    return False
+
+
+def split_tx(tx: bytes) -> UnsignedTx:
+    """Splits a tx body or a full transaction into its raw parts
+
+    Args:
+        tx (bytes): The CBOR
+
+    Returns:
+        The raw parts, the body and auxiliary data being slices of the input
+    """
+
+    reader = CborReader(tx)
+    if reader.peek_type() == CBOR_MAP:
+        body = bytes(reader.read_item())
+        return UnsignedTx(body, setTags=_uses_set_tags(body))
+
+    if reader.read_array() != 4:
+        raise ValueError("Invalid transaction")
+    body = bytes(reader.read_item())
+    unsigned = UnsignedTx(body, setTags=_uses_set_tags(body))
+    count = reader.read_map()
+    i = 0
+    while reader.has_next(count, i):
+        key = reader.read_uint()
+        if key not in (WitnessSetKeys.VKEY, WitnessSetKeys.BOOTSTRAP):
+            unsigned.otherWitnesses[key] = bytes(reader.read_item())
+        else:
+            if reader.peek_type() == CBOR_TAG and reader.read_tag() != CBOR_TAG_SET:
+                raise ValueError("Unexpected tag in the witness set")
+            items = unsigned.witnesses.setdefault(key, [])
+            itemCount = reader.read_array()
+            while reader.has_next(itemCount, len(items)):
+                items.append(bytes(reader.read_item()))
+        i += 1
+    unsigned.isValid = bytes(reader.read_item())
+    unsigned.auxiliaryData = bytes(reader.read_item())
+    return unsigned
+
+
+def assemble_signed_tx(tx: bytes,
+                       signatures: Sequence[Tuple[str, bytes]],
+                       keys: KeyProvider,
+                       protocolMagic: int = ProtocolMagics.MAINNET,
+                       auxiliaryData: Optional[bytes] = None) -> bytes:
+    """Signed transaction from the tx body and the witness signatures of the device
+
+    Args:
+        tx (bytes): The tx body, or an unsigned full transaction whose witnesses are kept
+        signatures (Sequence): The (path, signature) of the witnesses, as returned by the sign tx flow
+        keys (KeyProvider): The public key and chain code of a path
+        protocolMagic (int): The protocol magic, in the bootstrap witnesses on testnets
+        auxiliaryData (bytes): The CBOR of the auxiliary data whose hash is in the body, if any
+
+    Returns:
+        The CBOR of the signed transaction
+    """
+
+    unsigned = split_tx(tx)
+    if auxiliaryData is not None:
+        unsigned.auxiliaryData = auxiliaryData
+
+    seen = set()
+    for path, signature in signatures:
+        if path in seen:
+            continue
+        seen.add(path)
+        publicKey, chainCode = keys(path)
+        if path.startswith(BYRON_PURPOSE):
+            witness = _cbor_array([_cbor_bytes(publicKey), _cbor_bytes(signature), _cbor_bytes(chainCode),
+                                   _cbor_bytes(byron_address_attributes(protocolMagic))])
+            unsigned.witnesses.setdefault(WitnessSetKeys.BOOTSTRAP, []).append(witness)
+        else:
+            witness = _cbor_array([_cbor_bytes(publicKey), _cbor_bytes(signature)])
+            unsigned.witnesses.setdefault(WitnessSetKeys.VKEY, []).append(witness)
+
+    setTag = _cbor_header(CBOR_TAG, CBOR_TAG_SET) if unsigned.setTags else b""
+    entries = {key: setTag + _cbor_array(items) for key, items in unsigned.witnesses.items()}
+    entries.update(unsigned.otherWitnesses)
+    witnessSet = _cbor_header(CBOR_MAP, len(entries))
+    for key in sorted(entries):
+        witnessSet += _cbor_header(CBOR_UINT, key) + entries[key]
+
+    # [body, witness set, is valid, auxiliary data]
+    return b"".join([_cbor_header(CBOR_ARRAY, 4), unsigned.body, witnessSet,
+                     unsigned.isValid, unsigned.auxiliaryData])
+
+
+def cip36_auxiliary_data(voteKeys: Sequence[Tuple[bytes, Optional[int]]],
+                         stakingKey: bytes,
+                         paymentAddress: bytes,
+                         nonce: int,
+                         votingPurpose: Optional[int],
+                         signature: bytes) -> bytes:
+    """CBOR of the auxiliary data of a CIP-15 / CIP-36 registration
+
+    Args:
+        voteKeys (Sequence): The (public key, weight) of the delegations, or a single
+            (public key, None) for a vote key
+        stakingKey (bytes): The staking public key
+        paymentAddress (bytes): The raw payment address
+        nonce (int): The nonce
+        votingPurpose (int): The voting purpose, None for CIP-15
+        signature (bytes): The registration signature returned by the device
+
+    Returns:
+        The CBOR of [{61284: payload, 61285: {1: signature}}, []]
+    """
+
+    if len(voteKeys) == 1 and voteKeys[0][1] is None:
+        voteKey = _cbor_bytes(voteKeys[0][0])
+    else:
+        voteKey = _cbor_array([_cbor_array([_cbor_bytes(key), _cbor_header(CBOR_UINT, weight or 0)])
+                               for key, weight in voteKeys])
+    entries = [
+        (CIP36Keys.VOTE_KEY, voteKey),
+        (CIP36Keys.STAKING_KEY, _cbor_bytes(stakingKey)),
+        (CIP36Keys.PAYMENT_ADDRESS, _cbor_bytes(paymentAddress)),
+        (CIP36Keys.NONCE, _cbor_header(CBOR_UINT, nonce)),
+    ]
+    if votingPurpose is not None:
+        entries.append((CIP36Keys.VOTING_PURPOSE, _cbor_header(CBOR_UINT, votingPurpose)))
+    payload = _cbor_header(CBOR_MAP, len(entries))
+    payload += b"".join(_cbor_header(CBOR_UINT, key) + value for key, value in entries)
+
+    metadata = b"".join([_cbor_header(CBOR_MAP, 2),
+                         _cbor_header(CBOR_UINT, CIP36Keys.PAYLOAD), payload,
+                         _cbor_header(CBOR_UINT, CIP36Keys.SIGNATURE), _cbor_header(CBOR_MAP, 1),
+                         _cbor_header(CBOR_UINT, CIP36Keys.SIGNATURE_VALUE), _cbor_bytes(signature)])
+    # auxiliary scripts hard-coded to an empty list, as on the device
+    return _cbor_array([metadata, _cbor_array([])])
@@ -0,0 +1,747 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests Client application.
+It contains the importer of CBOR transactions (a tx body, a full tx or a cardano-cli
+text envelope) into the Transaction model of input_files/signTx.py.
+
+The CBOR is read token by token from a memoryview, without building the intermediate
+Python objects of a generic decoder: the byte strings are slices of the input until
+they are stored in the model, the inline datums and reference scripts (embedded CBOR)
+are not decoded. Files are memory-mapped.
+
+The body contains no derivation path: the inputs have no path, the destinations are
+third-party addresses, and the credentials, pool keys and required signers are hashes.
+"""
+
+import json
+import mmap
+from pathlib import Path
+from types import TracebackType
+from typing import Callable, List, Optional, Tuple, Type, TypeVar, Union
+
+from application_client.address_codec import byron_protocol_magic
+from application_client.app_def import AddressType, Mainnet, NetworkDesc, NetworkIds, ProtocolMagics
+
+from input_files.signTx import AnchorParams, AssetGroup, AuthorizeCommitteeParams, Certificate, CertificateType
+from input_files.signTx import CredentialParams, CredentialParamsType, Datum, DatumType, DRepParams, DRepParamsType
+from input_files.signTx import DRepRegistrationParams, DRepUpdateParams, GovActionId, Margin, MultiHostRelayParams
+from input_files.signTx import PoolKey, PoolKeyType, PoolMetadataParams, PoolRegistrationParams, PoolRetirementParams
+from input_files.signTx import Relay, RelayType, RequiredSigner, ResignCommitteeParams, SingleHostHostnameRelayParams
+from input_files.signTx import SingleHostIpAddrRelayParams, StakeDelegationParams, StakeRegistrationConwayParams
+from input_files.signTx import StakeRegistrationParams, ThirdPartyAddressParams, Token, Transaction
+from input_files.signTx import TxAuxiliaryData, TxAuxiliaryDataHash, TxAuxiliaryDataType, TxInput, TxOutput
+from input_files.signTx import TxOutputAlonzo, TxOutputBabbage, TxOutputDestination, TxOutputDestinationType
+from input_files.signTx import TxOutputFormat, TxRequiredSignerType, Vote, VoteDelegationParams, VoteOption, Voter
+from input_files.signTx import VoterType, VoterVotes, VotingProcedure, Withdrawal
+
+T = TypeVar("T")
+
+# CBOR major types
+CBOR_UINT = 0
+CBOR_NINT = 1
+CBOR_BYTES = 2
+CBOR_TEXT = 3
+CBOR_ARRAY = 4
+CBOR_MAP = 5
+CBOR_TAG = 6
+CBOR_SIMPLE = 7
+
+CBOR_INDEFINITE = 31
+CBOR_FALSE = 0xF4
+CBOR_TRUE = 0xF5
+CBOR_NULL = 0xF6
+CBOR_BREAK = 0xFF
+
+CBOR_TAG_EMBEDDED_CBOR = 24
+CBOR_TAG_UNIT_INTERVAL = 30
+CBOR_TAG_SET = 258
+
+
+class TxBodyKeys:
+    """Keys of the transaction body map"""
+    INPUTS = 0
+    OUTPUTS = 1
+    FEE = 2
+    TTL = 3
+    CERTIFICATES = 4
+    WITHDRAWALS = 5
+    AUX_DATA_HASH = 7
+    VALIDITY_INTERVAL_START = 8
+    MINT = 9
+    SCRIPT_DATA_HASH = 11
+    COLLATERAL_INPUTS = 13
+    REQUIRED_SIGNERS = 14
+    NETWORK_ID = 15
+    COLLATERAL_OUTPUT = 16
+    TOTAL_COLLATERAL = 17
+    REFERENCE_INPUTS = 18
+    VOTING_PROCEDURES = 19
+    PROPOSAL_PROCEDURES = 20
+    TREASURY = 21
+    DONATION = 22
+
+
+class TxOutputKeys:
+    """Keys of the Babbage output map"""
+    ADDRESS = 0
+    AMOUNT = 1
+    DATUM = 2
+    REFERENCE_SCRIPT = 3
+
+
+class CborReader:
+    """Pull reader of the CBOR items of a buffer, the byte strings are returned as views"""
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview, mmap.mmap]) -> None:
+        """Class initializer
+
+        Args:
+            data (bytes): The CBOR data, not copied
+        """
+
+        self._data = memoryview(data).cast("B")
+        self.offset = 0
+
+
+    def at_end(self) -> bool:
+        return self.offset >= len(self._data)
+
+
+    def _byte(self, offset: int) -> int:
+        if offset >= len(self._data):
+            raise ValueError("Truncated CBOR")
+        return self._data[offset]
+
+
+    def peek_type(self) -> int:
+        return self._byte(self.offset) >> 5
+
+
+    def peek_byte(self) -> int:
+        return self._byte(self.offset)
+
+
+    def _header(self) -> Tuple[int, Optional[int]]:
+        """Reads a token header
+
+        Returns:
+            The major type and the value, None for the indefinite lengths
+        """
+
+        initial = self._byte(self.offset)
+        major, info = initial >> 5, initial & 0x1F
+        self.offset += 1
+        if info < 24:
+            return major, info
+        if info == CBOR_INDEFINITE and major in (CBOR_BYTES, CBOR_TEXT, CBOR_ARRAY, CBOR_MAP):
+            return major, None
+        if info > 27:
+            raise ValueError(f"Invalid CBOR token 0x{initial:02x} at {self.offset - 1}")
+        size = 1 << (info - 24)
+        if self.offset + size > len(self._data):
+            raise ValueError("Truncated CBOR")
+        value = int.from_bytes(self._data[self.offset:self.offset + size], "big")
+        self.offset += size
+        return major, value
+
+
+    def _expect(self, expected: int) -> Optional[int]:
+        start = self.offset
+        major, value = self._header()
+        if major != expected:
+            raise ValueError(f"Unexpected CBOR major type {major} at {start}, expected {expected}")
+        return value
+
+
+    def read_uint(self) -> int:
+        value = self._expect(CBOR_UINT)
+        assert value is not None
+        return value
+
+
+    def read_int(self) -> int:
+        start = self.offset
+        major, value = self._header()
+        if major not in (CBOR_UINT, CBOR_NINT) or value is None:
+            raise ValueError(f"Expected an integer at {start}")
+        return value if major == CBOR_UINT else -1 - value
+
+
+    def _read_string(self, major: int) -> memoryview:
+        size = self._expect(major)
+        if size is None:
+            # indefinite length, the only case where the chunks are copied
+            chunks = bytearray()
+            while self.peek_byte() != CBOR_BREAK:
+                chunks += self._read_string(major)
+            self.offset += 1
+            return memoryview(bytes(chunks))
+        if self.offset + size > len(self._data):
+            raise ValueError("Truncated CBOR")
+        view = self._data[self.offset:self.offset + size]
+        self.offset += size
+        return view
+
+
+    def read_bytes(self) -> memoryview:
+        return self._read_string(CBOR_BYTES)
+
+
+    def read_text(self) -> str:
+        return str(self._read_string(CBOR_TEXT), "utf-8")
+
+
+    def read_array(self) -> Optional[int]:
+        """Array header
+
+        Returns:
+            The number of items, None for an indefinite length array (ended by a break)
+        """
+
+        return self._expect(CBOR_ARRAY)
+
+
+    def read_map(self) -> Optional[int]:
+        return self._expect(CBOR_MAP)
+
+
+    def read_tag(self) -> int:
+        tag = self._expect(CBOR_TAG)
+        assert tag is not None
+        return tag
+
+
+    def read_bool(self) -> bool:
+        value = self._byte(self.offset)
+        if value not in (CBOR_FALSE, CBOR_TRUE):
+            raise ValueError(f"Expected a boolean at {self.offset}")
+        self.offset += 1
+        return value == CBOR_TRUE
+
+
+    def read_null(self) -> bool:
+        """Reads a null if present
+
+        Returns:
+            Whether a null was read
+        """
+
+        if self._byte(self.offset) == CBOR_NULL:
+            self.offset += 1
+            return True
+        return False
+
+
+    def has_next(self, count: Optional[int], index: int) -> bool:
+        """Whether the array or map of the given length has an item at the index, reads the break"""
+
+        if count is not None:
+            return index < count
+        if self._byte(self.offset) == CBOR_BREAK:
+            self.offset += 1
+            return False
+        return True
+
+
+    def skip(self) -> None:
+        """Skips the next item"""
+
+        major, value = self._header()
+        if major in (CBOR_BYTES, CBOR_TEXT):
+            if value is None:
+                while self.peek_byte() != CBOR_BREAK:
+                    self.skip()
+                self.offset += 1
+            else:
+                self.offset += value
+        elif major in (CBOR_ARRAY, CBOR_MAP):
+            items = 2 if major == CBOR_MAP else 1
+            i = 0
+            while self.has_next(value, i):
+                for _ in range(items):
+                    self.skip()
+                i += 1
+        elif major == CBOR_TAG:
+            self.skip()
+
+
+    def read_item(self) -> memoryview:
+        """Raw CBOR of the next item"""
+
+        start = self.offset
+        self.skip()
+        return self._data[start:self.offset]
+
+
+class _ArrayItems:
+    """Items of an array of a known shape, read in order, of definite or indefinite length
+
+    Used as a context manager: on leaving the block, the array must have no item left
+    (the break of an indefinite length array is read there, or by a missing trailing item).
+    """
+
+    def __init__(self, reader: CborReader, name: str) -> None:
+        """Class initializer, reads the array header
+
+        Args:
+            reader (CborReader): The reader, positioned on the array
+            name (str): The name of the array in the errors
+        """
+
+        self._reader = reader
+        self._name = name
+        self._count = reader.read_array()
+        self._index = 0
+        self._ended = False
+
+
+    def __enter__(self) -> "_ArrayItems":
+        return self
+
+
+    def __exit__(self,
+                 exc_type: Optional[Type[BaseException]],
+                 exc_value: Optional[BaseException],
+                 traceback: Optional[TracebackType]) -> None:
+        if exc_type is None and self._has_next():
+            raise ValueError(f"Invalid {self._name}, too many items")
+
+
+    def _has_next(self) -> bool:
+        # the only place where the break is read, once
+        if not self._ended and not self._reader.has_next(self._count, self._index):
+            self._ended = True
+        return not self._ended
+
+
+    def read(self, item: Callable[[CborReader], T]) -> T:
+        if not self._has_next():
+            raise ValueError(f"Invalid {self._name}, missing item {self._index}")
+        self._index += 1
+        return item(self._reader)
+
+
+    def read_nullable(self, item: Callable[[CborReader], T]) -> Optional[T]:
+        return self.read(lambda reader: _read_optional(reader, item))
+
+
+    def read_trailing(self, item: Callable[[CborReader], T]) -> Optional[T]:
+        """The optional last item, None if the array has no more items"""
+
+        return self.read(item) if self._has_next() else None
+
+
+def _read_list(reader: CborReader, item: Callable[[CborReader], T]) -> List[T]:
+    count = reader.read_array()
+    items: List[T] = []
+    while reader.has_next(count, len(items)):
+        items.append(item(reader))
+    return items
+
+
+def _read_set(reader: CborReader, item: Callable[[CborReader], T]) -> List[T]:
+    """Array, possibly tagged as a set (Conway)"""
+
+    if reader.peek_type() == CBOR_TAG:
+        if reader.read_tag() != CBOR_TAG_SET:
+            raise ValueError("Unexpected tag, expected a set")
+    return _read_list(reader, item)
+
+
+def _read_entries(reader: CborReader, entry: Callable[[CborReader], T]) -> List[T]:
+    """Map, the entry function reading the key and the value"""
+
+    count = reader.read_map()
+    entries: List[T] = []
+    while reader.has_next(count, len(entries)):
+        entries.append(entry(reader))
+    return entries
+
+
+def _read_hex(reader: CborReader) -> str:
+    return reader.read_bytes().hex()
+
+
+def _read_optional(reader: CborReader, item: Callable[[CborReader], T]) -> Optional[T]:
+    return None if reader.read_null() else item(reader)
+
+
+def _read_tx_input(reader: CborReader) -> TxInput:
+    with _ArrayItems(reader, "tx input") as items:
+        txHashHex = items.read(_read_hex)
+        return TxInput(txHashHex, outputIndex=items.read(CborReader.read_uint))
+
+
+def _read_multiasset(reader: CborReader, amount: Callable[[CborReader], int]) -> List[AssetGroup]:
+    def token(reader: CborReader) -> Token:
+        assetNameHex = _read_hex(reader)
+        return Token(assetNameHex, amount(reader))
+
+    def assetGroup(reader: CborReader) -> AssetGroup:
+        policyIdHex = _read_hex(reader)
+        return AssetGroup(policyIdHex, _read_entries(reader, token))
+
+    return _read_entries(reader, assetGroup)
+
+
+def _read_value(reader: CborReader) -> Tuple[int, List[AssetGroup]]:
+    if reader.peek_type() == CBOR_UINT:
+        return reader.read_uint(), []
+    with _ArrayItems(reader, "output value") as items:
+        coin = items.read(CborReader.read_uint)
+        return coin, items.read(lambda r: _read_multiasset(r, CborReader.read_uint))
+
+
+def _read_embedded_cbor(reader: CborReader) -> str:
+    if reader.read_tag() != CBOR_TAG_EMBEDDED_CBOR:
+        raise ValueError("Expected embedded CBOR")
+    return _read_hex(reader)
+
+
+def _read_datum_option(reader: CborReader) -> Datum:
+    with _ArrayItems(reader, "datum option") as items:
+        datumType = DatumType(items.read(CborReader.read_uint))
+        if datumType == DatumType.HASH:
+            return Datum(datumType, items.read(_read_hex))
+        return Datum(datumType, items.read(_read_embedded_cbor))
+
+
+def _destination(address: memoryview) -> TxOutputDestination:
+    return TxOutputDestination(TxOutputDestinationType.THIRD_PARTY, ThirdPartyAddressParams(address.hex()))
+
+
+def _read_tx_output(reader: CborReader) -> TxOutput:
+    if reader.peek_type() == CBOR_ARRAY:
+        with _ArrayItems(reader, "legacy output") as items:
+            address = items.read(CborReader.read_bytes)
+            amount, tokenBundle = items.read(_read_value)
+            datumHashHex = items.read_trailing(_read_hex)
+        datum = Datum(DatumType.HASH, datumHashHex) if datumHashHex is not None else None
+        return TxOutputAlonzo(_destination(address), amount, TxOutputFormat.ARRAY_LEGACY, tokenBundle, datum)
+
+    count = reader.read_map()
+    output = TxOutputBabbage(_destination(memoryview(b"")), 0)
+    i = 0
+    while reader.has_next(count, i):
+        key = reader.read_uint()
+        if key == TxOutputKeys.ADDRESS:
+            output.destination = _destination(reader.read_bytes())
+        elif key == TxOutputKeys.AMOUNT:
+            output.amount, output.tokenBundle = _read_value(reader)
+        elif key == TxOutputKeys.DATUM:
+            output.datum = _read_datum_option(reader)
+        elif key == TxOutputKeys.REFERENCE_SCRIPT:
+            output.referenceScriptHex = _read_embedded_cbor(reader)
+        else:
+            raise ValueError(f"Unknown output key {key}")
+        i += 1
+    return output
+
+
+def _read_credential(reader: CborReader) -> CredentialParams:
+    with _ArrayItems(reader, "credential") as items:
+        isScript = items.read(CborReader.read_uint)
+        if isScript > 1:
+            raise ValueError("Invalid credential type")
+        credentialType = CredentialParamsType.SCRIPT_HASH if isScript else CredentialParamsType.KEY_HASH
+        return CredentialParams(credentialType, items.read(_read_hex))
+
+
+def _read_anchor(reader: CborReader) -> AnchorParams:
+    with _ArrayItems(reader, "anchor") as items:
+        url = items.read(CborReader.read_text)
+        return AnchorParams(url, items.read(_read_hex))
+
+
+def _read_drep(reader: CborReader) -> DRepParams:
+    with _ArrayItems(reader, "DRep") as items:
+        dRepType = DRepParamsType(items.read(CborReader.read_uint))
+        if dRepType in (DRepParamsType.KEY_HASH, DRepParamsType.SCRIPT_HASH):
+            return DRepParams(dRepType, items.read(_read_hex))
+        if dRepType in (DRepParamsType.ABSTAIN, DRepParamsType.NO_CONFIDENCE):
+            return DRepParams(dRepType)
+        raise ValueError("Invalid DRep")
+
+
+def _ipv6(ip: memoryview) -> str:
+    # the 4 words of the address are little endian in the CBOR (see signTxPoolRegistration.c)
+    ordered = b"".join(bytes(ip[i:i + 4])[::-1] for i in range(0, len(ip), 4))
+    return ":".join(ordered[i:i + 2].hex() for i in range(0, len(ordered), 2))
+
+
+def _read_relay(reader: CborReader) -> Relay:
+    with _ArrayItems(reader, "relay") as items:
+        relayType = RelayType(items.read(CborReader.read_uint))
+        if relayType == RelayType.SINGLE_HOST_IP_ADDR:
+            portNumber = items.read_nullable(CborReader.read_uint)
+            ipv4 = items.read_nullable(CborReader.read_bytes)
+            ipv6 = items.read_nullable(CborReader.read_bytes)
+            return Relay(relayType,
+                         SingleHostIpAddrRelayParams(portNumber,
+                                                     ".".join(str(b) for b in ipv4) if ipv4 is not None else None,
+                                                     _ipv6(ipv6) if ipv6 is not None else None))
+        if relayType == RelayType.SINGLE_HOST_HOSTNAME:
+            port = items.read_nullable(CborReader.read_uint)
+            dnsName = items.read(CborReader.read_text)
+            if port is None:
+                raise ValueError("Hostname relays without port are not supported by the model")
+            return Relay(relayType, SingleHostHostnameRelayParams(port, dnsName))
+        return Relay(relayType, MultiHostRelayParams(items.read(CborReader.read_text)))
+
+
+def _read_margin(reader: CborReader) -> Margin:
+    if reader.read_tag() != CBOR_TAG_UNIT_INTERVAL:
+        raise ValueError("Invalid pool margin")
+    with _ArrayItems(reader, "pool margin") as items:
+        numerator = items.read(CborReader.read_uint)
+        return Margin(numerator, items.read(CborReader.read_uint))
+
+
+def _read_pool_metadata(reader: CborReader) -> PoolMetadataParams:
+    with _ArrayItems(reader, "pool metadata") as items:
+        url = items.read(CborReader.read_text)
+        return PoolMetadataParams(url, items.read(_read_hex))
+
+
+def _read_pool_key(reader: CborReader) -> PoolKey:
+    return PoolKey(PoolKeyType.THIRD_PARTY, _read_hex(reader))
+
+
+def _read_pool_params(items: _ArrayItems) -> PoolRegistrationParams:
+    """Reads the pool parameters, which follow the type in the certificate array"""
+
+    poolKey = items.read(_read_pool_key)
+    vrfKeyHashHex = items.read(_read_hex)
+    pledge = items.read(CborReader.read_uint)
+    cost = items.read(CborReader.read_uint)
+    margin = items.read(_read_margin)
+    rewardAccount = items.read(_read_pool_key)
+    owners = items.read(lambda r: _read_set(r, _read_pool_key))
+    relays = items.read(lambda r: _read_list(r, _read_relay))
+    return PoolRegistrationParams(poolKey, vrfKeyHashHex, pledge, cost, margin, rewardAccount, owners, relays,
+                                  items.read_nullable(_read_pool_metadata))
+
+
+def _read_certificate(reader: CborReader) -> Certificate:
+    with _ArrayItems(reader, "certificate") as items:
+        certType = items.read(CborReader.read_uint)
+        if certType not in list(CertificateType):
+            raise ValueError(f"Certificate type {certType} not supported by the app")
+        certificateType = CertificateType(certType)
+
+        params: Union[StakeRegistrationParams, StakeRegistrationConwayParams, StakeDelegationParams,
+                      VoteDelegationParams, AuthorizeCommitteeParams, ResignCommitteeParams, DRepRegistrationParams,
+                      DRepUpdateParams, PoolRegistrationParams, PoolRetirementParams]
+        if certificateType in (CertificateType.STAKE_REGISTRATION, CertificateType.STAKE_DEREGISTRATION):
+            params = StakeRegistrationParams(items.read(_read_credential))
+        elif certificateType in (CertificateType.STAKE_REGISTRATION_CONWAY,
+                                 CertificateType.STAKE_DEREGISTRATION_CONWAY):
+            params = StakeRegistrationConwayParams(items.read(_read_credential), items.read(CborReader.read_uint))
+        elif certificateType == CertificateType.STAKE_DELEGATION:
+            params = StakeDelegationParams(items.read(_read_credential), items.read(_read_hex))
+        elif certificateType == CertificateType.VOTE_DELEGATION:
+            params = VoteDelegationParams(items.read(_read_credential), items.read(_read_drep))
+        elif certificateType == CertificateType.AUTHORIZE_COMMITTEE_HOT:
+            params = AuthorizeCommitteeParams(items.read(_read_credential), items.read(_read_credential))
+        elif certificateType == CertificateType.RESIGN_COMMITTEE_COLD:
+            params = ResignCommitteeParams(items.read(_read_credential), items.read_nullable(_read_anchor))
+        elif certificateType == CertificateType.DREP_REGISTRATION:
+            params = DRepRegistrationParams(items.read(_read_credential), items.read(CborReader.read_uint),
+                                            items.read_nullable(_read_anchor))
+        elif certificateType == CertificateType.DREP_DEREGISTRATION:
+            params = DRepRegistrationParams(items.read(_read_credential), items.read(CborReader.read_uint))
+        elif certificateType == CertificateType.DREP_UPDATE:
+            params = DRepUpdateParams(items.read(_read_credential), items.read_nullable(_read_anchor))
+        elif certificateType == CertificateType.STAKE_POOL_REGISTRATION:
+            params = _read_pool_params(items)
+        else:
+            # the pool key hash, the model also takes a path
+            params = PoolRetirementParams(items.read(_read_hex), items.read(CborReader.read_uint))
+        return Certificate(certificateType, params)
+
+
+def _read_withdrawal(reader: CborReader, networkIds: List[int]) -> Withdrawal:
+    """Reads a withdrawal, the network id of the reward account is appended to networkIds"""
+
+    rewardAccount = reader.read_bytes()
+    addressType = rewardAccount[0] >> 4
+    if addressType == AddressType.REWARD_KEY:
+        credential = CredentialParams(CredentialParamsType.KEY_HASH, rewardAccount[1:].hex())
+    elif addressType == AddressType.REWARD_SCRIPT:
+        credential = CredentialParams(CredentialParamsType.SCRIPT_HASH, rewardAccount[1:].hex())
+    else:
+        raise ValueError("Invalid reward account")
+    networkIds.append(rewardAccount[0] & 0x0F)
+    return Withdrawal(credential, reader.read_uint())
+
+
+def _read_voter_votes(reader: CborReader) -> VoterVotes:
+    with _ArrayItems(reader, "voter") as items:
+        voterType = VoterType(items.read(CborReader.read_uint))
+        if voterType not in (VoterType.COMMITTEE_KEY_HASH, VoterType.COMMITTEE_SCRIPT_HASH, VoterType.DREP_KEY_HASH,
+                             VoterType.DREP_SCRIPT_HASH, VoterType.STAKE_POOL_KEY_HASH):
+            raise ValueError("Invalid voter type")
+        voter = Voter(voterType, items.read(_read_hex))
+
+    def govActionId(reader: CborReader) -> GovActionId:
+        with _ArrayItems(reader, "governance action id") as items:
+            txHashHex = items.read(_read_hex)
+            return GovActionId(txHashHex, items.read(CborReader.read_uint))
+
+    def votingProcedure(reader: CborReader) -> VotingProcedure:
+        with _ArrayItems(reader, "voting procedure") as items:
+            voteOption = VoteOption(items.read(CborReader.read_uint))
+            return VotingProcedure(voteOption, items.read_nullable(_read_anchor))
+
+    def vote(reader: CborReader) -> Vote:
+        return Vote(govActionId(reader), votingProcedure(reader))
+
+    return VoterVotes(voter, _read_entries(reader, vote))
+
+
+def _network(tx: Transaction, networkId: Optional[int], protocolMagic: Optional[int],
+             rewardNetworkIds: List[int]) -> NetworkDesc:
+    """Network of the tx: the network id of the body, of the Shelley addresses or of the reward accounts,
+    the protocol magic of the Byron addresses, the mainnet or testnet ones otherwise"""
+
+    outputs = tx.outputs + ([tx.collateralOutput] if tx.collateralOutput is not None else [])
+    for output in outputs:
+        assert isinstance(output.destination.params, ThirdPartyAddressParams)
+        header = int(output.destination.params.addressHex[:2], 16)
+        if header >> 4 == AddressType.BYRON:
+            if protocolMagic is None:
+                protocolMagic = byron_protocol_magic(bytes.fromhex(output.destination.params.addressHex))
+        elif networkId is None:
+            networkId = header & 0x0F
+    if networkId is None and rewardNetworkIds:
+        networkId = rewardNetworkIds[0]
+
+    if networkId is None:
+        networkId = NetworkIds.MAINNET if protocolMagic in (None, ProtocolMagics.MAINNET) else NetworkIds.TESTNET
+    if protocolMagic is None:
+        protocolMagic = ProtocolMagics.MAINNET if networkId == NetworkIds.MAINNET else ProtocolMagics.TESTNET
+    if networkId in set(NetworkIds):
+        networkId = NetworkIds(networkId)
+    if protocolMagic in set(ProtocolMagics):
+        protocolMagic = ProtocolMagics(protocolMagic)
+    return NetworkDesc(networkId, protocolMagic)
+
+
+def read_tx_body(reader: CborReader, protocolMagic: Optional[int] = None) -> Transaction:
+    """Reads a transaction body into the Transaction model
+
+    Args:
+        reader (CborReader): The reader, positioned on the body map
+        protocolMagic (int): The protocol magic, by default the one of the Byron outputs or of the network id
+
+    Returns:
+        The transaction
+    """
+
+    tx = Transaction(Mainnet, [], [], 0)
+    networkId: Optional[int] = None
+    rewardNetworkIds: List[int] = []
+    count = reader.read_map()
+    i = 0
+    while reader.has_next(count, i):
+        key = reader.read_uint()
+        if key == TxBodyKeys.INPUTS:
+            tx.inputs = _read_set(reader, _read_tx_input)
+        elif key == TxBodyKeys.OUTPUTS:
+            tx.outputs = _read_list(reader, _read_tx_output)
+        elif key == TxBodyKeys.FEE:
+            tx.fee = reader.read_uint()
+        elif key == TxBodyKeys.TTL:
+            tx.ttl = reader.read_uint()
+        elif key == TxBodyKeys.CERTIFICATES:
+            tx.certificates = _read_set(reader, _read_certificate)
+        elif key == TxBodyKeys.WITHDRAWALS:
+            tx.withdrawals = _read_entries(reader, lambda r: _read_withdrawal(r, rewardNetworkIds))
+        elif key == TxBodyKeys.AUX_DATA_HASH:
+            tx.auxiliaryData = TxAuxiliaryData(TxAuxiliaryDataType.ARBITRARY_HASH,
+                                               TxAuxiliaryDataHash(_read_hex(reader)))
+        elif key == TxBodyKeys.VALIDITY_INTERVAL_START:
+            tx.validityIntervalStart = reader.read_uint()
+        elif key == TxBodyKeys.MINT:
+            tx.mint = _read_multiasset(reader, CborReader.read_int)
+        elif key == TxBodyKeys.SCRIPT_DATA_HASH:
+            tx.scriptDataHash = _read_hex(reader)
+        elif key == TxBodyKeys.COLLATERAL_INPUTS:
+            tx.collateralInputs = _read_set(reader, _read_tx_input)
+        elif key == TxBodyKeys.REQUIRED_SIGNERS:
+            tx.requiredSigners = _read_set(reader, lambda r: RequiredSigner(TxRequiredSignerType.HASH, _read_hex(r)))
+        elif key == TxBodyKeys.NETWORK_ID:
+            networkId = reader.read_uint()
+            tx.includeNetworkId = True
+        elif key == TxBodyKeys.COLLATERAL_OUTPUT:
+            tx.collateralOutput = _read_tx_output(reader)
+        elif key == TxBodyKeys.TOTAL_COLLATERAL:
+            tx.totalCollateral = reader.read_uint()
+        elif key == TxBodyKeys.REFERENCE_INPUTS:
+            tx.referenceInputs = _read_set(reader, _read_tx_input)
+        elif key == TxBodyKeys.VOTING_PROCEDURES:
+            tx.votingProcedures = _read_entries(reader, _read_voter_votes)
+        elif key == TxBodyKeys.TREASURY:
+            tx.treasury = reader.read_uint()
+        elif key == TxBodyKeys.DONATION:
+            tx.donation = reader.read_uint()
+        else:
+            # e.g. the proposal procedures
+            raise ValueError(f"Tx body item {key} not supported by the app")
+        i += 1
+
+    tx.network = _network(tx, networkId, protocolMagic, rewardNetworkIds)
+    return tx
+
+
+def tx_from_cbor(data: Union[bytes, bytearray, memoryview, mmap.mmap],
+                 protocolMagic: Optional[int] = None) -> Transaction:
+    """Imports a transaction body, or the body of a full transaction [body, witnesses, valid, aux data]
+
+    Args:
+        data (bytes): The CBOR, not copied
+        protocolMagic (int): The protocol magic, by default the one of the Byron outputs or of the network id
+
+    Returns:
+        The transaction
+    """
+
+    reader = CborReader(data)
+    if reader.peek_type() == CBOR_ARRAY:
+        # full tx, the rest is ignored
+        reader.read_array()
+    tx = read_tx_body(reader, protocolMagic)
+    return tx
+
+
+def tx_from_envelope(envelope: dict, protocolMagic: Optional[int] = None) -> Transaction:
+    """Imports a cardano-cli text envelope ({"type": ..., "cborHex": ...}) of a tx or tx body"""
+
+    return tx_from_cbor(bytes.fromhex(envelope["cborHex"]), protocolMagic)
+
+
+def load_tx(path: Path, protocolMagic: Optional[int] = None) -> Transaction:
+    """Imports a transaction file: a cardano-cli text envelope (JSON), hex text or binary CBOR
+
+    Args:
+        path (Path): The file
+        protocolMagic (int): The protocol magic, by default the one of the Byron outputs or of the network id
+
+    Returns:
+        The transaction
+    """
+
+    with open(path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            first = data[:1]
+            if first == b"{":
+                return tx_from_envelope(json.loads(data[:]), protocolMagic)
+            if first.isalnum() and first.lower() in b"0123456789abcdef":
+                return tx_from_cbor(bytes.fromhex(data[:].decode().strip()), protocolMagic)
+            view = memoryview(data)
+            try:
+                return tx_from_cbor(view, protocolMagic)
+            finally:
+                view.release()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+Reference bech32 encoder (BIP-173, straightforward bit by bit implementation)
+used to generate the test vectors of src/test/bech32_test.c.
+
+Usage: python3 bech32_vectors.py
+prints the vectors as C initializers, to be pasted into bech32_test.c
+"""
+
+import hashlib
+from typing import Iterator, List, Sequence, Tuple
+
+CHARSET = "qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+GENERATOR = [0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3]
+
+
+def polymod(values: Sequence[int]) -> int:
+    chk = 1
+    for value in values:
+        top = chk >> 25
+        chk = (chk & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            chk ^= GENERATOR[i] if ((top >> i) & 1) else 0
+    return chk
+
+
+def hrp_expand(hrp: str) -> List[int]:
+    return [ord(x) >> 5 for x in hrp] + [0] + [ord(x) & 31 for x in hrp]
+
+
+def convert_bits(data: Sequence[int], from_bits: int, to_bits: int) -> List[int]:
+    acc = 0
+    bits = 0
+    ret = []
+    maxv = (1 << to_bits) - 1
+    for value in data:
+        acc = (acc << from_bits) | value
+        bits += from_bits
+        while bits >= to_bits:
+            bits -= to_bits
+            ret.append((acc >> bits) & maxv)
+    if bits:
+        ret.append((acc << (to_bits - bits)) & maxv)
+    return ret
+
+
+def bech32_encode(hrp: str, data: bytes) -> str:
+    data5bit = convert_bits(data, 8, 5)
+    values = hrp_expand(hrp) + data5bit
+    mod = polymod(values + [0] * 6) ^ 1
+    checksum = [(mod >> 5 * (5 - i)) & 31 for i in range(6)]
+    return hrp + "1" + "".join(CHARSET[d] for d in data5bit + checksum)
+
+
+def pseudo_random_bytes(seed: str, size: int) -> bytes:
+    out = b""
+    counter = 0
+    while len(out) < size:
+        out += hashlib.sha256(f"{seed}-{counter}".encode()).digest()
+        counter += 1
+    return out[:size]
+
+
+def vectors() -> Iterator[Tuple[str, bytes]]:
+    # all remainders of the 5-byte groups, with and without whole groups, and the maximum length
+    for size in list(range(0, 11)) + [64, 65]:
+        yield "addr", pseudo_random_bytes("len", size)
+    # Cardano items of typical sizes
+    yield "addr", bytes([0x01]) + pseudo_random_bytes("base", 56)
+    yield "addr_test", bytes([0x00]) + pseudo_random_bytes("base_test", 56)
+    yield "stake", bytes([0xe1]) + pseudo_random_bytes("reward", 28)
+    yield "pool", pseudo_random_bytes("pool", 28)
+    yield "asset", pseudo_random_bytes("fingerprint", 20)
+    yield "addr", b"\xff" * 57
+
+
+def c_string(value: str, indent: int) -> str:
+    # split long strings the way clang-format does in the test file
+    width = 89
+    parts = [value[i:i + width] for i in range(0, len(value), width)] or [""]
+    return ("\n" + " " * indent).join(f'"{part}"' for part in parts)
+
+
+def main() -> None:
+    for hrp, data in vectors():
+        print(f'        {{"{hrp}",')
+        print(f"         {c_string(data.hex(), 9)},")
+        print(f"         {c_string(bech32_encode(hrp, data), 9)}}},")
+
+
+if __name__ == "__main__":
+    main()
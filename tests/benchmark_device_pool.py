@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+Throughput of the DevicePool over several Speculos instances.
+
+Starts the emulators, then runs the same jobs on pools of 1, 2, 4... of them.
+The jobs are public key exports (no UI) or, with --transcripts, the replay of
+transcripts recorded on Speculos (see test_transcripts.py), their screens being
+answered by the Speculos automation rules generated from them (Nano devices).
+
+Usage:
+    python3 benchmark_device_pool.py --app ../build/nanox/bin/app.elf --model nanox --devices 8
+    python3 benchmark_device_pool.py --app ../build/nanox/bin/app.elf --model nanox --transcripts transcripts
+"""
+
+import argparse
+import asyncio
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, List
+
+from ledgered.devices import Devices
+from ragger.firmware import Firmware
+from speculos.client import SpeculosClient
+
+from application_client.async_command_sender import AsyncCommandSender
+from application_client.command_builder import P1Type
+from application_client.app_def import Errors
+from application_client.device_pool import DevicePool, Job
+from application_client.transcript import Transcript
+from application_client.transport import SpeculosTcpTransport
+
+from screen_navigator import approve_rules, replay_rules
+
+API_PORT_BASE = 5000
+APDU_PORT_BASE = 9999
+
+
+def _pubkeyJob(account: int) -> Job:
+    async def job(sender: AsyncCommandSender) -> None:
+        rapdu = await sender.get_pubkey(P1Type.P1_KEY_INIT, f"m/1852'/1815'/{account % 100}'/0/{account}")
+        assert rapdu.status == Errors.SW_SUCCESS
+    return job
+
+
+def _transcriptJob(transcript: Transcript, rules: dict, clients: Dict[AsyncCommandSender, SpeculosClient]) -> Job:
+    async def job(sender: AsyncCommandSender) -> None:
+        # the rules answer the screens of this transcript only
+        await asyncio.to_thread(clients[sender].set_automation_rules, rules)
+        responses = await sender.replay(transcript)
+        for exchange, rapdu in zip(transcript.exchanges(), responses):
+            assert (rapdu.status, rapdu.data) == (exchange.status, exchange.data)
+    return job
+
+
+async def _measure(senders: List[AsyncCommandSender], jobs: List[Job]) -> float:
+    """Runs the jobs on a pool of the given devices
+
+    Args:
+        senders (List[AsyncCommandSender]): The devices
+        jobs (List[Job]): The jobs
+
+    Returns:
+        Jobs per second
+    """
+
+    pool = DevicePool(senders)
+    start = time.monotonic()
+    await pool.run_all(jobs)
+    return len(jobs) / (time.monotonic() - start)
+
+
+async def _benchmark(senders: List[AsyncCommandSender], jobs: List[Job]) -> None:
+    for sender in senders:
+        await sender.transport.open()
+    try:
+        size = 1
+        while True:
+            size = min(size, len(senders))
+            print(f"{size:>3} devices: {await _measure(senders[:size], jobs):8.2f} jobs/s")
+            if size == len(senders):
+                break
+            size *= 2
+    finally:
+        for sender in senders:
+            await sender.transport.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures the signing throughput over several emulators")
+    parser.add_argument("--app", type=Path, required=True, help="application elf")
+    parser.add_argument("--model", default="nanox", help="device model")
+    parser.add_argument("--devices", type=int, default=8, help="number of emulators")
+    parser.add_argument("--jobs", type=int, default=200, help="number of public key jobs")
+    parser.add_argument("--transcripts", type=Path, default=None, help="replay the transcripts of the directory as jobs")
+    args = parser.parse_args()
+
+    senders = [AsyncCommandSender(SpeculosTcpTransport(port=APDU_PORT_BASE + i)) for i in range(args.devices)]
+    clients = {sender: SpeculosClient(str(args.app),
+                                      ["--model", args.model,
+                                       "--api-port", str(API_PORT_BASE + i),
+                                       "--apdu-port", str(APDU_PORT_BASE + i)],
+                                      api_url=f"http://127.0.0.1:{API_PORT_BASE + i}")
+               for i, sender in enumerate(senders)}
+
+    firmware = Firmware(Devices.get_by_name(args.model).type)
+    if args.transcripts is not None:
+        transcripts = [Transcript.load(path) for path in sorted(args.transcripts.glob("*.apdt"))]
+        jobs = [_transcriptJob(transcript, replay_rules(firmware, transcript), clients) for transcript in transcripts]
+    else:
+        jobs = [_pubkeyJob(i) for i in range(args.jobs)]
+
+    with ExitStack() as stack:
+        for client in clients.values():
+            stack.enter_context(client)
+            if args.transcripts is None:
+                client.set_automation_rules(approve_rules(firmware))
+        asyncio.run(_benchmark(senders, jobs))
+
+
+if __name__ == "__main__":
+    main()
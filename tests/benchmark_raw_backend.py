@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+APDU latency of the Speculos REST API (SpeculosBackend) against the raw APDU port (SpeculosRawBackend).
+
+Starts an emulator per backend, one after the other, and times the same loops through
+CommandSender: public key exports, and the inputs of transactions (SIGN_TX INPUTS step,
+the tx init being approved by Speculos automation rules on Nano devices).
+
+Usage:
+    python3 benchmark_raw_backend.py --app ../build/nanox/bin/app.elf --model nanox
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from dataclasses import replace
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Type
+
+from ledgered.devices import Devices
+from ragger.backend import SpeculosBackend
+from ragger.error import ExceptionRAPDU
+from ragger.firmware import Firmware
+
+from application_client.app_def import Errors
+from application_client.command_builder import P1Type
+from application_client.command_sender import CommandSender
+from application_client.raw_backend import SpeculosRawBackend
+
+from input_files.signTx import testsByron
+from screen_navigator import approve_rules
+
+
+def _latencies(loop: Callable[[Callable[[Callable[[], object]], None]], None]) -> List[float]:
+    """Runs a loop, the loop timing its APDU exchanges with the given function"""
+
+    times: List[float] = []
+
+    def timed(exchange: Callable[[], object]) -> None:
+        start = time.perf_counter()
+        exchange()
+        times.append(time.perf_counter() - start)
+
+    loop(timed)
+    return times
+
+
+def _pubkeyLoop(client: CommandSender, count: int) -> Callable:
+    def loop(timed: Callable[[Callable[[], object]], None]) -> None:
+        for i in range(count):
+            timed(partial(client.get_pubkey, P1Type.P1_KEY_INIT, f"m/1852'/1815'/0'/0/{i}"))
+    return loop
+
+
+def _txInputsLoop(client: CommandSender, count: int, inputsPerTx: int) -> Callable:
+    testCase = testsByron[0]
+    testCase = replace(testCase, tx=replace(testCase.tx, inputs=testCase.tx.inputs * inputsPerTx))
+
+    def loop(timed: Callable[[Callable[[], object]], None]) -> None:
+        for _ in range(0, count, inputsPerTx):
+            with client.sign_tx_init(testCase, 1):
+                pass
+            for txInput in testCase.tx.inputs:
+                timed(partial(client.sign_tx_inputs, txInput))
+            # aborts the tx, ERR_STILL_IN_CALL
+            try:
+                client.get_version()
+            except ExceptionRAPDU as e:
+                assert e.status == Errors.SW_STILL_IN_CALL
+    return loop
+
+
+def _measure(backendClass: Type[SpeculosBackend], args: argparse.Namespace) -> Dict[str, List[float]]:
+    device = Devices.get_by_name(args.model)
+    with tempfile.NamedTemporaryFile("w", suffix=".json") as rules:
+        json.dump(approve_rules(Firmware(device.type)), rules)
+        rules.flush()
+        backend = backendClass(args.app, device,
+                               args=["--automation", f"file:{rules.name}"])
+        with backend:
+            client = CommandSender(backend)
+            client.get_version()
+            return {
+                "get_pubkey": _latencies(_pubkeyLoop(client, args.count)),
+                "sign_tx_inputs": _latencies(_txInputsLoop(client, args.count, args.inputs_per_tx)),
+            }
+
+
+def _summary(times: List[float]) -> str:
+    ms = sorted(t * 1000 for t in times)
+    return (f"mean {statistics.mean(ms):7.2f} ms  median {statistics.median(ms):7.2f} ms"
+            f"  p95 {ms[int(len(ms) * 0.95)]:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares the APDU latency of the REST API and the raw APDU port")
+    parser.add_argument("--app", type=Path, required=True, help="application elf")
+    parser.add_argument("--model", default="nanox", help="device model")
+    parser.add_argument("--count", type=int, default=200, help="number of APDU per loop")
+    parser.add_argument("--inputs_per_tx", type=int, default=20, help="number of inputs of each transaction")
+    args = parser.parse_args()
+
+    results = {name: _measure(backendClass, args)
+               for name, backendClass in (("REST API", SpeculosBackend), ("raw APDU port", SpeculosRawBackend))}
+    for loop in ("get_pubkey", "sign_tx_inputs"):
+        print(f"{loop}:")
+        for name, times in results.items():
+            print(f"  {name:<14} {_summary(times[loop])}")
+        rest, raw = (statistics.mean(times[loop]) for times in results.values())
+        print(f"  speedup        {rest / raw:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,24 @@
+# the fixtures take the other fixtures of this module as arguments
+# pylint: disable=redefined-outer-name
+
+import json
+import re
+from pathlib import Path
+from typing import Generator, List, Optional
 import pytest
+from ledgered.devices import Device
 from ragger.conftest import configuration
 from ragger.backend import BackendInterface
+from ragger.error import MissingElfError
+from ragger.firmware import Firmware
+from ragger.navigator import Navigator
 
 from application_client.command_sender import CommandSender
+from application_client.raw_backend import SpeculosRawBackend, SpeculosRestBackend
+from application_client.transcript import recording
+from screen_navigator import ScreenNavigator
+from speculos_pool import SpeculosPool
+from utils import REFERENCE_SIGNER
 
 ###########################
 ### CONFIGURATION START ###
@@ -20,11 +36,122 @@ from application_client.command_sender import CommandSender
 # Pull all features from the base ragger conftest using the overridden configuration
 pytest_plugins = ("ragger.conftest.base_conftest", )
 
+_POOL_METRICS_KEY = pytest.StashKey()
+_TEST_FAILED_KEY = pytest.StashKey()
+
 
 ##########################
 # CONFIGURATION OVERRIDE #
 ##########################
 
+def _create_backend(rawApdu: bool,
+                    root_pytest_dir: Path,
+                    backend_name: str,
+                    device: Device,
+                    display: bool,
+                    pki_prod: bool,
+                    log_apdu_file: Optional[Path],
+                    cli_user_seed: str,
+                    speculosArgs: List[str],
+                    verbose_speculos: bool,
+                    ignore_missing_binaries: bool,
+                    coverage_trace_dir: Optional[Path] = None) -> BackendInterface:
+    """Ragger create_backend, with the Speculos backends of raw_backend.py (APDU sent on the raw APDU port if rawApdu)"""
+
+    # imported here, the module is loaded by pytest_plugins
+    from ragger.conftest.base_conftest import create_backend, prepare_speculos_args  # pylint: disable=import-outside-toplevel
+
+    if backend_name.lower() != "speculos":
+        return create_backend(root_pytest_dir, backend_name, device, display, pki_prod, log_apdu_file,
+                              cli_user_seed, speculosArgs, verbose_speculos, ignore_missing_binaries,
+                              coverage_trace_dir)
+    app_path, speculos_args = prepare_speculos_args(root_pytest_dir, device, display, pki_prod, cli_user_seed,
+                                                    speculosArgs, verbose_speculos, ignore_missing_binaries)
+    backendClass = SpeculosRawBackend if rawApdu else SpeculosRestBackend
+    return backendClass(app_path, device=device, log_apdu_file=log_apdu_file,
+                        coverage_trace_dir=coverage_trace_dir, **speculos_args)
+
+
+@pytest.fixture(scope="session")
+def speculosPool(request,
+                 root_pytest_dir: Path,
+                 backend_name: str,
+                 display: bool,
+                 pki_prod: bool,
+                 cli_user_seed: str,
+                 verbose_speculos: bool,
+                 ignore_missing_binaries: bool) -> Generator[Optional[SpeculosPool], None, None]:
+    if not request.config.getoption("warm_pool") or backend_name.lower() != "speculos":
+        yield None
+        return
+
+    rawApdu = request.config.getoption("raw_apdu")
+
+    def factory(device: Device, speculosArgs: List[str]) -> BackendInterface:
+        return _create_backend(rawApdu, root_pytest_dir, backend_name, device, display, pki_prod, None,
+                               cli_user_seed, speculosArgs, verbose_speculos, ignore_missing_binaries)
+
+    pool = SpeculosPool(factory)
+    request.config.stash[_POOL_METRICS_KEY] = pool.metrics
+    yield pool
+    pool.close()
+
+
+# Same as the Ragger backend fixture, the Speculos instances are leased from the warm pool if enabled
+@pytest.fixture(scope=configuration.OPTIONAL.BACKEND_SCOPE)
+def backend(request,
+            skip_tests_for_unsupported_devices,  # pylint: disable=unused-argument
+            speculosPool: Optional[SpeculosPool],
+            root_pytest_dir: Path,
+            backend_name: str,
+            device: Device,
+            display: bool,
+            pki_prod: bool,
+            log_apdu_file: Optional[Path],
+            cli_user_seed: str,
+            additional_speculos_arguments: List[str],
+            verbose_speculos: bool,
+            ignore_missing_binaries: bool,
+            coverage_enabled: bool) -> Generator[BackendInterface, None, None]:
+    if speculosPool is not None:
+        try:
+            instance = speculosPool.lease(device, additional_speculos_arguments)
+        except MissingElfError as e:
+            pytest.fail(f"Missing ELF: {e}")
+        yield instance
+        speculosPool.release(device, additional_speculos_arguments, instance)
+        return
+
+    from ragger.conftest.base_conftest import COVERAGE_TRACE_ROOT  # pylint: disable=import-outside-toplevel
+
+    coverage_trace_dir = root_pytest_dir / COVERAGE_TRACE_ROOT / device.name if coverage_enabled else None
+    try:
+        instance = _create_backend(request.config.getoption("raw_apdu"), root_pytest_dir, backend_name, device,
+                                   display, pki_prod, log_apdu_file, cli_user_seed, additional_speculos_arguments,
+                                   verbose_speculos, ignore_missing_binaries, coverage_trace_dir)
+    except MissingElfError as e:
+        pytest.fail(f"Missing ELF: {e}")
+    with instance as b:
+        yield b
+
+
+@pytest.hookimpl(wrapper=True, tryfirst=True)
+def pytest_runtest_makereport(item):
+    report = yield
+    if report.when == "call":
+        item.stash[_TEST_FAILED_KEY] = report.failed
+    return report
+
+
+@pytest.fixture(autouse=True)
+def warmPoolReset(request, speculosPool: Optional[SpeculosPool]) -> Generator[None, None, None]:
+    yield
+    if speculosPool is None or "backend" not in request.fixturenames:
+        return
+    failed = request.node.stash.get(_TEST_FAILED_KEY, True)
+    speculosPool.reset(request.getfixturevalue("backend"), clean=not failed)
+
+
 @pytest.fixture(scope=configuration.OPTIONAL.BACKEND_SCOPE)
 def appFlags(backend: BackendInterface) -> dict:
     # Use the app interface instead of raw interface
@@ -37,3 +164,75 @@ def appFlags(backend: BackendInterface) -> dict:
     }
 
     return app_flags
+
+
+@pytest.fixture
+def screenNavigator(backend: BackendInterface,
+                    navigator: Navigator,
+                    firmware: Firmware) -> Generator[ScreenNavigator, None, None]:
+    screens = ScreenNavigator(backend, navigator, firmware)
+    yield screens
+    screens.close()
+
+
+def pytest_addoption(parser):
+    parser.addoption("--record_transcripts", type=Path, default=None,
+                     help="Record the APDU transcript of every test in the given directory")
+    parser.addoption("--replay_transcripts", type=Path, default=None,
+                     help="Replay the APDU transcripts of the given directory (see test_transcripts.py)")
+    parser.addoption("--replay_automation", type=Path, default=None,
+                     help="Speculos automation rules (JSON) answering the UI during the replay")
+    parser.addoption("--replay_no_check", action="store_true", default=False,
+                     help="Replay without checking the responses against the recorded ones")
+    parser.addoption("--warm_pool", action="store_true", default=False,
+                     help="Reuse warm Speculos instances between the tests, the app state being reset by APDU")
+    parser.addoption("--raw_apdu", action="store_true", default=False,
+                     help="Send the APDU on the raw APDU port of Speculos instead of its REST API")
+    parser.addoption("--signature_cache", type=Path, default=None,
+                     help="JSON file keeping the expected signatures of the reference signer between runs")
+
+
+def pytest_configure(config):
+    path = config.getoption("signature_cache", None)
+    if path is not None:
+        REFERENCE_SIGNER.load(path)
+
+
+def pytest_sessionfinish():
+    REFERENCE_SIGNER.save()
+
+
+def pytest_generate_tests(metafunc):
+    if "transcriptPath" in metafunc.fixturenames:
+        directory = metafunc.config.getoption("replay_transcripts")
+        paths = sorted(directory.glob("*.apdt")) if directory is not None else []
+        metafunc.parametrize("transcriptPath", paths, ids=[path.stem for path in paths])
+
+
+@pytest.fixture(autouse=True)
+def transcriptRecording(request) -> Generator[None, None, None]:
+    directory = request.config.getoption("record_transcripts")
+    if directory is None:
+        yield
+        return
+    name = re.sub(r"[^\w.-]", "_", request.node.name)
+    with recording(directory / f"{name}.apdt") as recorder:
+        recorder.record_marker(request.node.nodeid)
+        yield
+
+
+@pytest.fixture
+def automationRules(request) -> dict:
+    path = request.config.getoption("replay_automation")
+    if path is None:
+        return {}
+    return json.loads(path.read_text())
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    metrics = config.stash.get(_POOL_METRICS_KEY, None)
+    if metrics is None:
+        return
+    terminalreporter.write_sep("=", "warm Speculos pool")
+    for line in metrics.summary():
+        terminalreporter.write_line(f"  {line}")
@@ -21,7 +21,6 @@ class DeriveAddressTestCase:
     spendingValue: str      # spending path or keyHash
     stakingValue: str = ""  # staking path or keyHash
     result: Optional[str] = ""
-    nano_nav_confirm: Optional[List[NavInsID]] = None  # list of specific navigation instructions for Nano
     nano_nav_show: Optional[List[NavInsID]] = None  # list of specific navigation instructions for Nano
 
 
@@ -261,9 +260,6 @@ shelleyTestCasesNoConfirm = [
                     nano_nav_show=[NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2),
 ]
 
-nav_inst_1 = [NavInsID.BOTH_CLICK] * 3 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2
-nav_inst_2 = [NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 3
-
 shelleyTestCasesWithConfirm = [
     DeriveAddressTestCase("base address path/path unusual spending path account",
                     FakeNet,
@@ -300,34 +296,29 @@ shelleyTestCasesWithConfirm = [
                     AddressType.BASE_PAYMENT_KEY_STAKE_KEY,
                     "m/1852'/1815'/101'/0/1",
                     "1d227aefa4b773149170885aadba30aab3127cc611ddbc4999def61c",
-                    nano_nav_confirm=nav_inst_1,
                     nano_nav_show=[NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] + [NavInsID.RIGHT_CLICK] * 2 + [NavInsID.BOTH_CLICK] * 2),
     DeriveAddressTestCase("base address path/keyHash unusual address index",
                     Testnet,
                     AddressType.BASE_PAYMENT_KEY_STAKE_KEY,
                     "m/1852'/1815'/0'/0/1'",
                     "1d227aefa4b773149170885aadba30aab3127cc611ddbc4999def61c",
-                    nano_nav_confirm=nav_inst_1,
                     nano_nav_show=[NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] + [NavInsID.RIGHT_CLICK] * 2 + [NavInsID.BOTH_CLICK] * 2),
     DeriveAddressTestCase("base address scriptHash/path unusual account",
                     Testnet, AddressType.BASE_PAYMENT_SCRIPT_STAKE_KEY,
                     "122a946b9ad3d2ddf029d3a828f0468aece76895f15c9efbd69b4277",
                     "m/1852'/1815'/200'/2/0",
-                    nano_nav_confirm=nav_inst_2,
                     nano_nav_show=[NavInsID.BOTH_CLICK] + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] * 2 + [NavInsID.BOTH_CLICK] * 2),
     DeriveAddressTestCase("base address path/scriptHash unusual account",
                     Testnet,
                     AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT,
                     "m/1852'/1815'/101'/0/1",
                     "122a946b9ad3d2ddf029d3a828f0468aece76895f15c9efbd69b4277",
-                    nano_nav_confirm=nav_inst_1,
                     nano_nav_show=[NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] + [NavInsID.RIGHT_CLICK] * 2 + [NavInsID.BOTH_CLICK] * 2),
     DeriveAddressTestCase("base address path/scriptHash unusual address index",
                     Testnet,
                     AddressType.BASE_PAYMENT_KEY_STAKE_SCRIPT,
                     "m/1852'/1815'/0'/0/1'",
                     "122a946b9ad3d2ddf029d3a828f0468aece76895f15c9efbd69b4277",
-                    nano_nav_confirm=nav_inst_1,
                     nano_nav_show=[NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] + [NavInsID.RIGHT_CLICK] * 2 + [NavInsID.BOTH_CLICK] * 2),
     DeriveAddressTestCase("pointer address unusual account",
                     Testnet,
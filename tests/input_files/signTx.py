@@ -8,13 +8,17 @@ This module provides Ragger tests for Sign TX check
 from enum import IntEnum
 from typing import List, Optional, Union
 from dataclasses import dataclass, field
-import base58
 
+from application_client.address_codec import parse_address
 from application_client.app_def import Errors, NetworkDesc, Mainnet, Testnet, Testnet_legacy
 from input_files.derive_address import DeriveAddressTestCase, AddressType, pointer_to_str
 
 
 MAX_SIGN_TX_CHUNK_SIZE = 240
+# inputs sent in a single APDU with P2_INPUTS_BATCH
+MAX_SIGN_TX_INPUTS_BATCH = 6
+# witnesses requested in a single APDU with P2_WITNESSES_BATCH
+MAX_SIGN_TX_WITNESSES_BATCH = 3
 
 class TransactionSigningMode(IntEnum):
     ORDINARY_TRANSACTION = 0x03
@@ -124,8 +128,15 @@ class AssetGroup:
 
 @dataclass
 class ThirdPartyAddressParams:
+    # raw address in hex, or a bech32 (Shelley) / base58 (Byron) address
     addressHex: str
 
+    def __post_init__(self) -> None:
+        try:
+            bytes.fromhex(self.addressHex)
+        except ValueError:
+            self.addressHex = parse_address(self.addressHex).hex()
+
 
 @dataclass
 class TxOutputDestination:
@@ -396,6 +407,9 @@ class SignTxTestCase:
     expected_sw: Optional[Errors] = Errors.SW_SUCCESS
     # TODO: Debug navigation
     nano_skip: Optional[bool] = False
+    # False for the vectors checking that the app rejects misordered or repeated token bundles,
+    # which are sent as they are instead of in the canonical order
+    canonical: bool = True
 
 
 # pylint: disable=line-too-long
@@ -414,13 +428,13 @@ inputs: dict[str, TxInput] = {
 destinations: dict[str, TxOutputDestination] = {
     "externalByronMainnet":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            ThirdPartyAddressParams(base58.b58decode("Ae2tdPwUPEZCanmBz5g2GEwFqKTKpNJcGYPKfDxoNeKZ8bRHr8366kseiK2").hex())),
+                            ThirdPartyAddressParams("Ae2tdPwUPEZCanmBz5g2GEwFqKTKpNJcGYPKfDxoNeKZ8bRHr8366kseiK2")),
     "externalByronDaedalusMainnet":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            ThirdPartyAddressParams(base58.b58decode("DdzFFzCqrht7HGoJ87gznLktJGywK1LbAJT2sbd4txmgS7FcYLMQFhawb18ojS9Hx55mrbsHPr7PTraKh14TSQbGBPJHbDZ9QVh6Z6Di").hex())),
+                            ThirdPartyAddressParams("DdzFFzCqrht7HGoJ87gznLktJGywK1LbAJT2sbd4txmgS7FcYLMQFhawb18ojS9Hx55mrbsHPr7PTraKh14TSQbGBPJHbDZ9QVh6Z6Di")),
     "externalByronTestnet":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            ThirdPartyAddressParams(base58.b58decode("2657WMsDfac6Cmfg4Varph2qyLKGi2K9E8jrtvjHVzfSjmbTMGy5sY3HpxCKsmtDA").hex())),
+                            ThirdPartyAddressParams("2657WMsDfac6Cmfg4Varph2qyLKGi2K9E8jrtvjHVzfSjmbTMGy5sY3HpxCKsmtDA")),
     "internalBaseWithStakingPath":
         TxOutputDestination(TxOutputDestinationType.DEVICE_OWNED,
                             DeriveAddressTestCase("",
@@ -464,24 +478,19 @@ destinations: dict[str, TxOutputDestination] = {
                                                   "m/1852'/1815'/0'/2/0")),
     "externalShelleyBaseKeyhashKeyhash":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            # bech32 addr1q97tqh7wzy8mnx0sr2a57c4ug40zzl222877jz06nt49g4zr43fuq3k0dfpqjh3uvqcsl2qzwuwsvuhclck3scgn3vys6wkj5d
-                            ThirdPartyAddressParams("017cb05fce110fb999f01abb4f62bc455e217d4a51fde909fa9aea545443ac53c046cf6a42095e3c60310fa802771d0672f8fe2d1861138b09")),
+                            ThirdPartyAddressParams("addr1q97tqh7wzy8mnx0sr2a57c4ug40zzl222877jz06nt49g4zr43fuq3k0dfpqjh3uvqcsl2qzwuwsvuhclck3scgn3vys6wkj5d")),
     "externalShelleyBaseScripthashKeyhash":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            # bech32 addr_test1zp0z7zqwhya6mpk5q929ur897g3pp9kkgalpreny8y304rfw6j2jxnwq6enuzvt0lp89wgcsufj7mvcnxpzgkd4hz70qe8ugl4
-                            ThirdPartyAddressParams("105e2f080eb93bad86d401545e0ce5f2221096d6477e11e6643922fa8d2ed495234dc0d667c1316ff84e572310e265edb31330448b36b7179e")),
+                            ThirdPartyAddressParams("addr_test1zp0z7zqwhya6mpk5q929ur897g3pp9kkgalpreny8y304rfw6j2jxnwq6enuzvt0lp89wgcsufj7mvcnxpzgkd4hz70qe8ugl4")),
     "multiassetThirdParty":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            # bech32 addr1q84sh2j72ux0l03fxndjnhctdg7hcppsaejafsa84vh7lwgmcs5wgus8qt4atk45lvt4xfxpjtwfhdmvchdf2m3u3hlsd5tq5r
-                            ThirdPartyAddressParams("01eb0baa5e570cffbe2934db29df0b6a3d7c0430ee65d4c3a7ab2fefb91bc428e4720702ebd5dab4fb175324c192dc9bb76cc5da956e3c8dff")),
+                            ThirdPartyAddressParams("addr1q84sh2j72ux0l03fxndjnhctdg7hcppsaejafsa84vh7lwgmcs5wgus8qt4atk45lvt4xfxpjtwfhdmvchdf2m3u3hlsd5tq5r")),
     "trezorParityDatumHash":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            # bech32 addr1w9rhu54nz94k9l5v6d9rzfs47h7dv7xffcwkekuxcx3evnqpvuxu0
-                            ThirdPartyAddressParams("71477e52b3116b62fe8cd34a312615f5fcd678c94e1d6cdb86c1a3964c")),
+                            ThirdPartyAddressParams("addr1w9rhu54nz94k9l5v6d9rzfs47h7dv7xffcwkekuxcx3evnqpvuxu0")),
     "externalShelleyBaseKeyhashScripthash":
         TxOutputDestination(TxOutputDestinationType.THIRD_PARTY,
-                            # bech32 addr1yyfatq352yhh7ctw7c3s33qpwrq3pvhcmqg0yvzq9308g9msqj6hs5cg8q8zmtpf2hfrfds25jmcvpta6k5nnpzrn5eqy6fknd
-                            ThirdPartyAddressParams("2113d58234512f7f616ef62308c40170c110b2f8d810f230402c5e74177004b5785308380e2dac2955d234b60aa4b786057dd5a93984439d32")),
+                            ThirdPartyAddressParams("addr1yyfatq352yhh7ctw7c3s33qpwrq3pvhcmqg0yvzq9308g9msqj6hs5cg8q8zmtpf2hfrfds25jmcvpta6k5nnpzrn5eqy6fknd")),
     "paymentScriptPath":
         TxOutputDestination(TxOutputDestinationType.DEVICE_OWNED,
                             DeriveAddressTestCase("",
@@ -3232,7 +3241,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
                                10),
                    TransactionSigningMode.ORDINARY_TRANSACTION,
                    "",
-                   expected_sw=Errors.SW_INVALID_DATA),
+                   expected_sw=Errors.SW_INVALID_DATA,
+                   canonical=False),
     SignTxTestCase("Reject tx where asset groups are not unique",
                    Transaction(Mainnet,
                                [inputs["utxoShelley"]],
@@ -3241,7 +3251,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
                                10),
                    TransactionSigningMode.ORDINARY_TRANSACTION,
                    "",
-                   expected_sw=Errors.SW_INVALID_DATA),
+                   expected_sw=Errors.SW_INVALID_DATA,
+                   canonical=False),
     # TODO: Debug navigation
     # SignTxTestCase("Reject tx where tokens within an asset group are not ordered - alphabetical",
     #                Transaction(Mainnet,
@@ -3251,7 +3262,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
     #                            10),
     #                TransactionSigningMode.ORDINARY_TRANSACTION,
     #                "",
-    #                expected_sw=Errors.SW_INVALID_DATA),
+    #                expected_sw=Errors.SW_INVALID_DATA,
+    #                canonical=False),
     # SignTxTestCase("Reject tx where tokens within an asset group are not ordered - length",
     #                Transaction(Mainnet,
     #                            [inputs["utxoShelley"]],
@@ -3260,7 +3272,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
     #                            10),
     #                TransactionSigningMode.ORDINARY_TRANSACTION,
     #                "",
-    #                expected_sw=Errors.SW_INVALID_DATA),
+    #                expected_sw=Errors.SW_INVALID_DATA,
+    #                canonical=False),
     # SignTxTestCase("Reject tx where tokens within an asset group are not unique",
     #                Transaction(Mainnet,
     #                            [inputs["utxoShelley"]],
@@ -3269,7 +3282,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
     #                            10),
     #                TransactionSigningMode.ORDINARY_TRANSACTION,
     #                "",
-    #                expected_sw=Errors.SW_INVALID_DATA),
+    #                expected_sw=Errors.SW_INVALID_DATA,
+    #                canonical=False),
     SignTxTestCase("Reject tx with mint fields with invalid canonical ordering of policies",
                    Transaction(Mainnet,
                                [inputs["utxoShelley"]],
@@ -3279,7 +3293,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
                                mint=mints["mintInvalidCanonicalOrderingPolicy"]),
                    TransactionSigningMode.ORDINARY_TRANSACTION,
                    "",
-                   expected_sw=Errors.SW_INVALID_DATA),
+                   expected_sw=Errors.SW_INVALID_DATA,
+                   canonical=False),
     # SignTxTestCase("Reject tx with mint fields with invalid canonical ordering of asset names",
     #                Transaction(Mainnet,
     #                            [inputs["utxoShelley"]],
@@ -3289,7 +3304,8 @@ testsInvalidTokenBundleOrdering: List[SignTxTestCase] = [
     #                            mint=mints["mintInvalidCanonicalOrderingAssetName"]),
     #                TransactionSigningMode.ORDINARY_TRANSACTION,
     #                "",
-    #                expected_sw=Errors.SW_INVALID_DATA),
+    #                expected_sw=Errors.SW_INVALID_DATA,
+    #                canonical=False),
 ]
 
 singleAccountRejectTestCases: List[SignTxTestCase] = [
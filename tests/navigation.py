@@ -0,0 +1,393 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+Rule tables describing the Sign TX navigation.
+
+The moves of a review step depend on the device family and on the test case.
+A table is a list of cases, the first case whose condition holds is used; its rules
+for the device family are all evaluated in order and the moves of the matching ones
+are concatenated. The moves of all the steps are compiled once per (firmware, test case).
+
+A new device type is supported by adding it to DEVICE_FAMILIES, or by adding
+rules for a new family to the tables.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ragger.firmware import Firmware
+from ragger.navigator import NavInsID
+
+from application_client.app_def import NetworkIds
+from application_client.security_policy import tx_witness_paths
+
+from input_files.derive_address import AddressType
+from input_files.signTx import SignTxTestCase, DeriveAddressTestCase, ThirdPartyAddressParams, Certificate, TxOutput
+from input_files.signTx import CertificateType, CredentialParamsType, DRepParamsType, TxAuxiliaryDataType
+from input_files.signTx import TransactionSigningMode
+from input_files.signTx import DRepUpdateParams, DRepRegistrationParams, StakeRegistrationConwayParams
+from input_files.signTx import ResignCommitteeParams, AuthorizeCommitteeParams, VoteDelegationParams
+
+
+NANO = "nano"
+TOUCH = "touch"
+
+DEVICE_FAMILIES: Dict[Firmware, str] = {
+    Firmware.NANOS: NANO,
+    Firmware.NANOX: NANO,
+    Firmware.NANOSP: NANO,
+    Firmware.STAX: TOUCH,
+    Firmware.FLEX: TOUCH,
+}
+
+BOTH = NavInsID.BOTH_CLICK
+RIGHT = NavInsID.RIGHT_CLICK
+SWIPE = NavInsID.SWIPE_CENTER_TO_LEFT
+TAP = NavInsID.TAPPABLE_CENTER_TAP
+
+
+@dataclass
+class NavContext:
+    firmware: Firmware
+    testCase: SignTxTestCase
+    # the output or certificate being reviewed
+    item: Optional[object] = None
+
+
+Condition = Callable[[NavContext], bool]
+
+
+@dataclass(frozen=True)
+class Rule:
+    when: Condition
+    moves: Tuple[NavInsID, ...]
+
+
+@dataclass(frozen=True)
+class Case:
+    when: Condition
+    rules: Dict[str, Tuple[Rule, ...]] = field(default_factory=dict)
+
+
+def _always(_: NavContext) -> bool:
+    return True
+
+
+def device_family(firmware: Firmware) -> str:
+    return DEVICE_FAMILIES.get(firmware, NANO if firmware.is_nano else TOUCH)
+
+
+def _matching_rules(table: Tuple[Case, ...], ctx: NavContext) -> List[Rule]:
+    family = device_family(ctx.firmware)
+    for case in table:
+        if case.when(ctx):
+            return [rule for rule in case.rules.get(family, ()) if rule.when(ctx)]
+    return []
+
+
+def _evaluate(table: Tuple[Case, ...], ctx: NavContext) -> List[NavInsID]:
+    return [move for rule in _matching_rules(table, ctx) for move in rule.moves]
+
+
+# ----- Conditions on the test case -----
+
+def _isTestnet(ctx: NavContext) -> bool:
+    return ctx.testCase.tx.network.networkId == NetworkIds.TESTNET
+
+
+def _isPlutus(ctx: NavContext) -> bool:
+    return ctx.testCase.signingMode == TransactionSigningMode.PLUTUS_TRANSACTION
+
+
+def _isPoolOwner(ctx: NavContext) -> bool:
+    return ctx.testCase.signingMode == TransactionSigningMode.POOL_REGISTRATION_AS_OWNER
+
+
+def _isMultisig(ctx: NavContext) -> bool:
+    return ctx.testCase.signingMode == TransactionSigningMode.MULTISIG_TRANSACTION
+
+
+def _isPlainMultisig(ctx: NavContext) -> bool:
+    """Multisig transaction without certificates and withdrawals"""
+    tx = ctx.testCase.tx
+    return _isMultisig(ctx) and len(tx.certificates) == 0 and len(tx.withdrawals) == 0
+
+
+def _hasNoOutputs(ctx: NavContext) -> bool:
+    return len(ctx.testCase.tx.outputs) == 0
+
+
+def _hasNoScriptDataHash(ctx: NavContext) -> bool:
+    return ctx.testCase.tx.scriptDataHash is None
+
+
+def _hasHighFee(ctx: NavContext) -> bool:
+    return ctx.testCase.tx.fee > 5 * 1000000
+
+
+# ----- INIT -----
+
+INIT_TABLE = (
+    Case(_always, {
+        NANO: (
+            Rule(_always, (BOTH,)),
+            Rule(_isTestnet, (BOTH,)),
+            Rule(lambda ctx: _hasNoOutputs(ctx) and _hasNoScriptDataHash(ctx), (RIGHT, BOTH)),
+            Rule(_isPlutus, (BOTH,)),
+            Rule(lambda ctx: _isPlutus(ctx) and _hasNoScriptDataHash(ctx), (BOTH,) * 2),
+        ),
+        TOUCH: (
+            Rule(_always, (SWIPE,)),
+            Rule(_hasNoOutputs, (SWIPE,)),
+            Rule(_isPlutus, (SWIPE,) * 3),
+        ),
+    }),
+)
+
+
+# ----- FEE -----
+
+FEE_TABLE = (
+    Case(_always, {
+        NANO: (
+            Rule(lambda ctx: not _isPoolOwner(ctx), (BOTH,)),
+            Rule(_hasHighFee, (BOTH,)),
+        ),
+        TOUCH: (
+            Rule(_hasHighFee, (SWIPE,)),
+            Rule(lambda ctx: not _hasHighFee(ctx), (TAP,)),
+        ),
+    }),
+)
+
+
+# ----- OUTPUT (basic data) -----
+
+def _output(ctx: NavContext) -> TxOutput:
+    assert isinstance(ctx.item, TxOutput)
+    return ctx.item
+
+
+def _derivedAddress(ctx: NavContext) -> Optional[DeriveAddressTestCase]:
+    params = _output(ctx).destination.params
+    return params if isinstance(params, DeriveAddressTestCase) else None
+
+
+def _hasDerivedAddressOfType(addrType: AddressType) -> Condition:
+    def condition(ctx: NavContext) -> bool:
+        params = _derivedAddress(ctx)
+        return params is not None and params.addrType == addrType
+    return condition
+
+
+def _hasDerivedAddressWithStakingHash(ctx: NavContext) -> bool:
+    params = _derivedAddress(ctx)
+    return params is not None and not params.stakingValue.startswith("m/")
+
+
+def _isCIP36Registration(ctx: NavContext) -> bool:
+    auxData = ctx.testCase.tx.auxiliaryData
+    return auxData is not None and auxData.type == TxAuxiliaryDataType.CIP36_REGISTRATION
+
+
+_POINTER_OR_ENTERPRISE_TOUCH = (Rule(_always, (TAP, SWIPE, TAP, TAP)),)
+
+OUTPUT_TABLE = (
+    Case(lambda ctx: ctx.testCase.txBody == ""),
+    Case(_isCIP36Registration),
+    Case(lambda ctx: isinstance(_output(ctx).destination.params, ThirdPartyAddressParams), {
+        NANO: (
+            Rule(_isPlainMultisig, (RIGHT,)),
+            Rule(lambda ctx: not _isPoolOwner(ctx), (RIGHT, BOTH, BOTH)),
+            Rule(_isPlainMultisig, (BOTH,)),
+        ),
+        TOUCH: (
+            Rule(_isTestnet, (TAP,)),
+            Rule(lambda ctx: _output(ctx).datum is None, (TAP, SWIPE)),
+            Rule(_isPlainMultisig, (TAP, SWIPE)),
+            Rule(lambda ctx: ctx.firmware == Firmware.FLEX and _output(ctx).amount > 10000000, (TAP,)),
+        ),
+    }),
+    Case(_hasDerivedAddressOfType(AddressType.POINTER_KEY), {
+        NANO: (Rule(_always, (BOTH,) * 3 + (RIGHT,) + (BOTH,) * 2),),
+        TOUCH: _POINTER_OR_ENTERPRISE_TOUCH,
+    }),
+    Case(_hasDerivedAddressOfType(AddressType.ENTERPRISE_KEY), {
+        NANO: (Rule(_always, (BOTH,) * 5),),
+        TOUCH: _POINTER_OR_ENTERPRISE_TOUCH,
+    }),
+    # the auxiliary data review changes the following screens
+    Case(lambda ctx: _derivedAddress(ctx) is not None and ctx.testCase.tx.auxiliaryData is not None, {
+        NANO: (Rule(_always, (BOTH,) * 3 + (RIGHT,) + (BOTH,) * 2),),
+        TOUCH: (Rule(_always, (SWIPE, TAP, TAP)),),
+    }),
+    Case(_hasDerivedAddressWithStakingHash, {
+        NANO: (Rule(_always, (BOTH,) * 2 + (RIGHT, BOTH, RIGHT) + (BOTH,) * 2),),
+        TOUCH: _POINTER_OR_ENTERPRISE_TOUCH,
+    }),
+)
+
+
+# ----- CERTIFICATE (Nano only, the touch devices use the review scenario) -----
+
+_STAKE_CERTIFICATES = (CertificateType.STAKE_REGISTRATION,
+                       CertificateType.STAKE_DEREGISTRATION,
+                       CertificateType.STAKE_DELEGATION)
+
+
+def _certificate(ctx: NavContext) -> Certificate:
+    assert isinstance(ctx.item, Certificate)
+    return ctx.item
+
+
+def _isCertificateType(certificateType: CertificateType) -> Condition:
+    return lambda ctx: _certificate(ctx).type == certificateType
+
+
+def _hasParams(*types: type) -> Condition:
+    return lambda ctx: isinstance(_certificate(ctx).params, types)
+
+
+def _isMultisigStake(ctx: NavContext) -> bool:
+    return _isMultisig(ctx) and _certificate(ctx).type in _STAKE_CERTIFICATES
+
+
+def _hasAnchor(ctx: NavContext) -> bool:
+    params = _certificate(ctx).params
+    return isinstance(params, (ResignCommitteeParams, DRepRegistrationParams, DRepUpdateParams)) and \
+        params.anchor is not None
+
+
+CERTIFICATE_TABLE = (
+    Case(_always, {
+        NANO: (
+            Rule(_isMultisigStake, (BOTH,)),
+            Rule(lambda ctx: _isMultisigStake(ctx) and
+                 _certificate(ctx).params.stakeCredential.type == CredentialParamsType.KEY_PATH, (BOTH,)),
+            Rule(_isMultisigStake, (RIGHT,)),
+            Rule(_isCertificateType(CertificateType.STAKE_POOL_RETIREMENT), (RIGHT,)),
+            Rule(_always, (BOTH,)),
+            Rule(lambda ctx: not _isMultisigStake(ctx), (BOTH,)),
+            Rule(lambda ctx: _hasParams(AuthorizeCommitteeParams, ResignCommitteeParams)(ctx) and
+                 _certificate(ctx).params.coldCredential.type != CredentialParamsType.KEY_PATH, (RIGHT,)),
+            Rule(lambda ctx: _hasParams(AuthorizeCommitteeParams)(ctx) and
+                 _certificate(ctx).params.hotCredential.type != CredentialParamsType.KEY_PATH, (RIGHT,)),
+            Rule(_isCertificateType(CertificateType.AUTHORIZE_COMMITTEE_HOT), (BOTH,)),
+            Rule(lambda ctx: _hasParams(VoteDelegationParams)(ctx) and
+                 _certificate(ctx).params.dRep.type in (DRepParamsType.KEY_HASH, DRepParamsType.SCRIPT_HASH), (RIGHT,)),
+            Rule(_hasParams(VoteDelegationParams), (BOTH,)),
+            Rule(_hasParams(DRepUpdateParams), (BOTH,)),
+            Rule(_hasParams(StakeRegistrationConwayParams, DRepRegistrationParams), (BOTH,)),
+            # for URL, navigation depends on url length :(
+            Rule(lambda ctx: _hasAnchor(ctx) and len(_certificate(ctx).params.anchor.url) > 50, (RIGHT,) * 2),
+            Rule(_isCertificateType(CertificateType.RESIGN_COMMITTEE_COLD), (BOTH,)),
+            Rule(_hasAnchor, (RIGHT, BOTH)),
+            Rule(_always, (BOTH,)),
+        ),
+    }),
+)
+
+
+# ----- WITNESS (a witness is shown when a rule matches, the touch devices then use the review scenario) -----
+
+def _witnessPath(ctx: NavContext) -> List[int]:
+    assert isinstance(ctx.item, str)
+    # Remove Hardened info
+    return [int(elt) for elt in ctx.item.replace("'", "").split("/")[1:]]
+
+
+def _hasUnusualWitnessPath(ctx: NavContext) -> bool:
+    """Witness path outside of the ordinary payment and staking keys (pool, multisig, DRep, committee...)"""
+    path = _witnessPath(ctx)
+    return path[0] > 1852 or (len(path) > 3 and path[3] > 2)
+
+
+def _isPoolRegistration(ctx: NavContext) -> bool:
+    return ctx.testCase.signingMode in (TransactionSigningMode.POOL_REGISTRATION_AS_OWNER,
+                                        TransactionSigningMode.POOL_REGISTRATION_AS_OPERATOR)
+
+
+def _hasAuxiliaryData(ctx: NavContext) -> bool:
+    return ctx.testCase.tx.auxiliaryData is not None
+
+
+def _isWitnessShownWithAuxData(ctx: NavContext) -> bool:
+    return (not _isCIP36Registration(ctx) and
+            not isinstance(ctx.testCase.tx.outputs[0].destination.params, ThirdPartyAddressParams))
+
+
+WITNESS_TABLE = (
+    Case(_hasUnusualWitnessPath, {
+        NANO: (Rule(_always, (BOTH,) * 2),),
+        TOUCH: (Rule(_always, ()),),
+    }),
+    Case(_hasAuxiliaryData, {
+        NANO: (Rule(_isWitnessShownWithAuxData, (BOTH,) * 3),),
+        TOUCH: (Rule(_isWitnessShownWithAuxData, ()),),
+    }),
+    Case(_isPlutus, {
+        NANO: (Rule(_always, (BOTH,) * 2),),
+        TOUCH: (Rule(_always, ()),),
+    }),
+    Case(_isPoolRegistration, {
+        NANO: (Rule(_always, (BOTH,)),),
+        TOUCH: (Rule(_always, ()),),
+    }),
+)
+
+
+@dataclass
+class WitnessReview:
+    shown: bool
+    # moves of the Nano devices, the touch devices use the review scenario
+    moves: List[NavInsID]
+
+
+def _witness_review(ctx: NavContext) -> WitnessReview:
+    rules = _matching_rules(WITNESS_TABLE, ctx)
+    return WitnessReview(len(rules) > 0, [move for rule in rules for move in rule.moves])
+
+
+@dataclass
+class NavigationPlan:
+    init: List[NavInsID]
+    fee: List[NavInsID]
+    outputs: List[List[NavInsID]]
+    certificates: List[List[NavInsID]]
+    # per witness path
+    witnesses: Dict[str, WitnessReview]
+
+
+_plans: Dict[Tuple[Firmware, int], Tuple[SignTxTestCase, NavigationPlan]] = {}
+
+
+def compile_plan(firmware: Firmware, testCase: SignTxTestCase) -> NavigationPlan:
+    """Moves of the Sign TX review steps, compiled once per firmware and test case
+
+    Args:
+        firmware (Firmware): The firmware version
+        testCase (SignTxTestCase): The test case
+
+    Returns:
+        The moves of each step
+    """
+
+    key = (firmware, id(testCase))
+    cached = _plans.get(key)
+    if cached is not None and cached[0] is testCase:
+        return cached[1]
+
+    ctx = NavContext(firmware, testCase)
+    plan = NavigationPlan(
+        init=_evaluate(INIT_TABLE, ctx),
+        fee=_evaluate(FEE_TABLE, ctx),
+        outputs=[_evaluate(OUTPUT_TABLE, NavContext(firmware, testCase, output)) for output in testCase.tx.outputs],
+        certificates=[_evaluate(CERTIFICATE_TABLE, NavContext(firmware, testCase, certificate))
+                      for certificate in testCase.tx.certificates],
+        witnesses={path: _witness_review(NavContext(firmware, testCase, path))
+                   for path in tx_witness_paths(testCase.tx, testCase.signingMode) +
+                   testCase.additionalWitnessPaths},
+    )
+    _plans[key] = (testCase, plan)
+    return plan
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+Host reference signer of the Speculos seed, used by verify_signature.
+
+Ed25519 signatures being deterministic, the signature expected from the device is computed
+with the BIP32-Ed25519 extended private key (kL, kR) of the path, and compared byte for byte:
+    r = SHA512(kR || data) mod l, R = r.B
+    S = r + SHA512(R || A || data).kL mod l
+The signatures are memoized per (path, data), and can be kept in a JSON file between runs.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from bip_utils import Bip32Ed25519Kholaw, Bip39SeedGenerator
+from nacl.bindings import crypto_core_ed25519_scalar_add, crypto_core_ed25519_scalar_mul
+from nacl.bindings import crypto_core_ed25519_scalar_reduce, crypto_scalarmult_ed25519_base_noclamp
+from ragger.bip.seed import SPECULOS_MNEMONIC
+
+SCALAR_SIZE = 32
+
+
+def _reduce(digest: bytes) -> bytes:
+    """Scalar mod l of a 64-byte little endian number"""
+
+    return crypto_core_ed25519_scalar_reduce(digest)
+
+
+class ReferenceSigner:
+    """Signatures of the Speculos seed, as computed by the device"""
+
+    def __init__(self, mnemonic: str = SPECULOS_MNEMONIC) -> None:
+        """Class initializer
+
+        Args:
+            mnemonic (str): The mnemonic of the device
+        """
+
+        self._rootNode = Bip32Ed25519Kholaw.FromSeed(Bip39SeedGenerator(mnemonic).Generate())
+        self._keys: Dict[str, Tuple[bytes, bytes, bytes]] = {}
+        self._signatures: Dict[str, str] = {}
+        self._dirty = False
+        self.cachePath: Optional[Path] = None
+
+
+    def load(self, cachePath: Path) -> None:
+        """Reads the signatures of the previous runs, the new ones being saved to the same file
+
+        Args:
+            cachePath (Path): The JSON file of the signatures
+        """
+
+        self.cachePath = cachePath
+        if cachePath.exists():
+            self._signatures.update(json.loads(cachePath.read_text()))
+
+
+    def _key(self, path: str) -> Tuple[bytes, bytes, bytes]:
+        """Extended private key of the path
+
+        Args:
+            path (str): Derivation path
+
+        Returns:
+            The scalar kL mod l, the nonce key kR and the public key A
+        """
+
+        key = self._keys.get(path)
+        if key is None:
+            node = self._rootNode.DerivePath(path)
+            extendedKey = node.PrivateKey().Raw().ToBytes()
+            scalar = _reduce(extendedKey[:SCALAR_SIZE] + bytes(SCALAR_SIZE))
+            key = (scalar, extendedKey[SCALAR_SIZE:], node.PublicKey().RawCompressed().ToBytes()[1:])
+            self._keys[path] = key
+        return key
+
+
+    def public_key(self, path: str) -> bytes:
+        return self._key(path)[2]
+
+
+    def sign(self, path: str, data: bytes) -> bytes:
+        """Signature of the data by the key of the path, memoized
+
+        Args:
+            path (str): Derivation path
+            data (bytes): The signed data (e.g. the tx hash)
+
+        Returns:
+            The 64-byte signature R || S
+        """
+
+        cacheKey = f"{path}:{data.hex()}"
+        signature = self._signatures.get(cacheKey)
+        if signature is None:
+            scalar, nonceKey, publicKey = self._key(path)
+            nonce = _reduce(hashlib.sha512(nonceKey + data).digest())
+            commitment = crypto_scalarmult_ed25519_base_noclamp(nonce)
+            challenge = _reduce(hashlib.sha512(commitment + publicKey + data).digest())
+            response = crypto_core_ed25519_scalar_add(nonce, crypto_core_ed25519_scalar_mul(challenge, scalar))
+            signature = (commitment + response).hex()
+            self._signatures[cacheKey] = signature
+            self._dirty = True
+        return bytes.fromhex(signature)
+
+
+    def precompute(self, items: Iterable[Tuple[str, bytes]]) -> None:
+        """Computes the signatures of the (path, data) ahead of the device exchanges
+
+        Args:
+            items (Iterable): The (path, data) to sign
+        """
+
+        for path, data in items:
+            self.sign(path, data)
+
+
+    def save(self) -> None:
+        """Writes the signatures computed since the load to the cache file"""
+
+        if self.cachePath is not None and self._dirty:
+            self.cachePath.parent.mkdir(parents=True, exist_ok=True)
+            self.cachePath.write_text(json.dumps(self._signatures, indent=0, sort_keys=True))
+            self._dirty = False
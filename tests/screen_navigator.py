@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+Screen-driven navigation of the review flows, on Speculos.
+
+Instead of replaying a fixed list of moves, the navigator subscribes to the Speculos
+text events, recognizes the kind of each screen from the texts drawn by the app
+(see src/ui/bagl and src/ui/nbgl) and answers it. A screen is the burst of text
+events following a move, there is no screenshot comparison between the moves.
+
+The review ends when the device answers the pending APDU.
+
+The same recognition turns the screens recorded in a transcript into Speculos automation
+rules answering each of them once, in the recorded order (see replay_rules).
+"""
+
+import json
+import queue
+import re
+import threading
+import time
+from enum import IntEnum, auto
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from ragger.backend import BackendInterface
+from ragger.firmware import Firmware
+from ragger.navigator import Navigator, NavInsID
+
+from application_client.raw_backend import SpeculosRestBackend
+from application_client.transcript import ScreenText, Transcript
+
+from navigation import NANO, TOUCH, device_family
+
+# quiet time closing the burst of text events of a screen
+SETTLE_DELAY = 0.03
+POLL_DELAY = 0.05
+
+
+class ScreenKind(IntEnum):
+    """Kinds of screens, by decreasing priority when several are recognized"""
+    REJECT_PROMPT = auto()
+    REJECT_CONFIRMATION = auto()
+    CONFIRMATION = auto()
+    CHOICE = auto()
+    ADDRESS_CONFIRMATION = auto()
+    PAGE = auto()
+    PROMPT = auto()
+    NEXT_PAGE = auto()
+    REVIEW = auto()
+    WAIT = auto()
+
+
+# Header of the ui_displayPrompt screens, the other screens being paginated texts
+_NANO_SCREENS: Dict[str, ScreenKind] = {
+    **{title: ScreenKind.PROMPT for title in (
+        "Confirm", "Confirm export", "Confirm vote", "Confirm vote key", "Confirm stake", "Confirm collateral",
+        "Sign using", "Sign", "Sign hashed", "Sign non-hashed", "Start new", "Register vote",
+        "New ordinary", "New pool owner", "New pool operator", "New multisig", "New Plutus",
+    )},
+    "Reject?": ScreenKind.REJECT_PROMPT,
+    "...": ScreenKind.WAIT,
+    "is ready": ScreenKind.WAIT,
+    "DEVEL version!": ScreenKind.WAIT,
+}
+
+# Texts of the nbgl pages and use cases
+_TOUCH_SCREENS: Dict[str, ScreenKind] = {
+    "Hold to sign": ScreenKind.CONFIRMATION,
+    "Reject transaction?": ScreenKind.REJECT_CONFIRMATION,
+    "Reject Transaction": ScreenKind.CHOICE,
+    "Don't Allow": ScreenKind.CHOICE,
+    "Confirm": ScreenKind.ADDRESS_CONFIRMATION,
+    "Tap to continue": ScreenKind.PAGE,
+    "Reject transaction": ScreenKind.PROMPT,
+    "Reject if not sure": ScreenKind.PROMPT,
+    "Swipe to review": ScreenKind.PROMPT,
+    "Processing": ScreenKind.WAIT,
+    "Cardano": ScreenKind.WAIT,
+}
+
+_SCREENS = {
+    NANO: _NANO_SCREENS,
+    TOUCH: _TOUCH_SCREENS,
+}
+
+# (approve, reject) moves of each kind of screen
+_Moves = Tuple[List[NavInsID], List[NavInsID]]
+
+_NANO_MOVES: Dict[ScreenKind, _Moves] = {
+    ScreenKind.REVIEW: ([NavInsID.BOTH_CLICK], [NavInsID.BOTH_CLICK]),
+    # the paginated texts are validated on their last page
+    ScreenKind.NEXT_PAGE: ([NavInsID.RIGHT_CLICK], [NavInsID.RIGHT_CLICK]),
+    ScreenKind.PROMPT: ([NavInsID.BOTH_CLICK], [NavInsID.RIGHT_CLICK]),
+    ScreenKind.REJECT_PROMPT: ([NavInsID.LEFT_CLICK], [NavInsID.BOTH_CLICK]),
+}
+
+# Nano S prompts are answered by the right (approve) or the left (reject) button
+_NANOS_MOVES: Dict[ScreenKind, _Moves] = {
+    **_NANO_MOVES,
+    ScreenKind.PROMPT: ([NavInsID.RIGHT_CLICK], [NavInsID.LEFT_CLICK]),
+}
+
+_TOUCH_MOVES: Dict[ScreenKind, _Moves] = {
+    ScreenKind.REVIEW: ([NavInsID.SWIPE_CENTER_TO_LEFT], [NavInsID.SWIPE_CENTER_TO_LEFT]),
+    ScreenKind.PAGE: ([NavInsID.TAPPABLE_CENTER_TAP], [NavInsID.USE_CASE_REVIEW_REJECT]),
+    ScreenKind.PROMPT: ([NavInsID.SWIPE_CENTER_TO_LEFT], [NavInsID.USE_CASE_REVIEW_REJECT]),
+    ScreenKind.CONFIRMATION: ([NavInsID.USE_CASE_REVIEW_CONFIRM], [NavInsID.USE_CASE_REVIEW_REJECT]),
+    ScreenKind.CHOICE: ([NavInsID.USE_CASE_CHOICE_CONFIRM], [NavInsID.USE_CASE_CHOICE_REJECT]),
+    ScreenKind.REJECT_CONFIRMATION: ([NavInsID.USE_CASE_CHOICE_REJECT], [NavInsID.USE_CASE_CHOICE_CONFIRM]),
+    ScreenKind.ADDRESS_CONFIRMATION: ([NavInsID.USE_CASE_ADDRESS_CONFIRMATION_CONFIRM],
+                                      [NavInsID.USE_CASE_ADDRESS_CONFIRMATION_CANCEL]),
+}
+
+# buttons pressed by the Speculos automation actions of the moves
+_BUTTONS: Dict[NavInsID, Tuple[int, ...]] = {
+    NavInsID.LEFT_CLICK: (1,),
+    NavInsID.RIGHT_CLICK: (2,),
+    NavInsID.BOTH_CLICK: (1, 2),
+}
+
+# pagination of the long texts, e.g. "Address (1/3)"
+_PAGINATION = re.compile(r" \((\d+)/(\d+)\)$")
+
+
+def classify(family: str, texts: List[str]) -> ScreenKind:
+    """Kind of a screen
+
+    Args:
+        family (str): The device family
+        texts (List[str]): The texts of the screen
+
+    Returns:
+        The recognized kind of highest priority, REVIEW if none is recognized
+    """
+
+    screens = _SCREENS[family]
+    kinds = []
+    for text in texts:
+        page = _PAGINATION.search(text) if family == NANO else None
+        if page is not None:
+            if int(page.group(1)) < int(page.group(2)):
+                kinds.append(ScreenKind.NEXT_PAGE)
+            text = text[:page.start()]
+        if text in screens:
+            kinds.append(screens[text])
+    return min(kinds, default=ScreenKind.REVIEW)
+
+
+def _device_moves(firmware: Firmware) -> Dict[ScreenKind, _Moves]:
+    if firmware == Firmware.NANOS:
+        return _NANOS_MOVES
+    return _NANO_MOVES if device_family(firmware) == NANO else _TOUCH_MOVES
+
+
+def split_screens(texts: List[ScreenText]) -> List[List[ScreenText]]:
+    """Groups by screen the texts drawn one after the other
+
+    The texts of a screen are drawn from the top: a text drawn above or at the height
+    of the previous one starts the next screen.
+
+    Args:
+        texts (List[ScreenText]): The texts, in the drawing order
+
+    Returns:
+        The texts of each screen
+    """
+
+    screens: List[List[ScreenText]] = []
+    for text in texts:
+        # skip the blank texts, drawn e.g. by the progress bars
+        if not text.text.strip():
+            continue
+        if not screens or text.y <= screens[-1][-1].y:
+            screens.append([])
+        screens[-1].append(text)
+    return screens
+
+
+def _button_actions(moves: List[NavInsID]) -> List[list]:
+    actions: List[list] = []
+    for move in moves:
+        actions += [["button", button, True] for button in _BUTTONS[move]]
+        actions += [["button", button, False] for button in _BUTTONS[move]]
+    return actions
+
+
+def replay_rules(firmware: Firmware, transcript: Transcript) -> dict:
+    """Speculos automation rules answering the screens recorded in a transcript
+
+    Each screen is answered once by the move of its kind, the reject move in the exchanges
+    rejected by the user. The rule of a screen matches its first text, at its position, and
+    is enabled by the rule of the previous screen: the other texts of a screen press nothing.
+
+    Args:
+        firmware (Firmware): The firmware version, a Nano device
+        transcript (Transcript): The transcript, recorded on Speculos
+
+    Returns:
+        The rules in the Speculos automation format
+    """
+
+    if device_family(firmware) != NANO:
+        raise NotImplementedError("The automation rules only press the buttons of the Nano devices")
+    moves = _device_moves(firmware)
+    rules: List[dict] = []
+    for exchange in transcript.exchanges():
+        for texts in split_screens(exchange.texts):
+            kind = classify(NANO, [text.text for text in texts])
+            if kind not in moves:
+                continue
+            approveMoves, rejectMoves = moves[kind]
+            screen = f"screen{len(rules)}"
+            conditions = [[screen, False]]
+            if rules:
+                conditions.append([f"screen{len(rules) - 1}", True])
+            rules.append({
+                "text": texts[0].text,
+                "x": texts[0].x,
+                "y": texts[0].y,
+                "conditions": conditions,
+                "actions": _button_actions(rejectMoves if exchange.rejected else approveMoves) + \
+                           [["setbool", screen, True]],
+            })
+    return {"version": 1, "rules": rules}
+
+
+def approve_rules(firmware: Firmware) -> dict:
+    """Speculos automation rules approving the prompts (ui_displayPrompt) of the Nano devices
+
+    The rules match the header of the prompts, a prompt is approved by a single move.
+    The other screens are not answered, see replay_rules for the whole review flows.
+
+    Args:
+        firmware (Firmware): The firmware version, a Nano device
+
+    Returns:
+        The rules in the Speculos automation format
+    """
+
+    if device_family(firmware) != NANO:
+        raise NotImplementedError("The automation rules only press the buttons of the Nano devices")
+    approveMoves, _ = _device_moves(firmware)[ScreenKind.PROMPT]
+    return {
+        "version": 1,
+        "rules": [{"text": header, "actions": _button_actions(approveMoves)}
+                  for header, kind in _NANO_SCREENS.items() if kind == ScreenKind.PROMPT],
+    }
+
+
+class ScreenNavigator:
+    """Answers the review screens as they are displayed"""
+
+    def __init__(self, backend: BackendInterface, navigator: Navigator, firmware: Firmware) -> None:
+        """Class initializer
+
+        Args:
+            backend (BackendInterface): The backend, a SpeculosRestBackend or SpeculosRawBackend to navigate
+            navigator (Navigator): The navigator instance, running the moves
+            firmware (Firmware): The firmware version
+        """
+
+        self._backend = backend
+        self._navigator = navigator
+        self._family = device_family(firmware)
+        self._moves = _device_moves(firmware)
+        self._events: "queue.Queue[Tuple[float, str]]" = queue.Queue()
+        self._stream: Optional[requests.Response] = None
+        self._reader: Optional[threading.Thread] = None
+
+
+    def _open(self) -> None:
+        if self._stream is not None:
+            return
+        if not isinstance(self._backend, SpeculosRestBackend):
+            raise NotImplementedError("The screen navigation needs the Speculos text events and "
+                                      f"the async response check of SpeculosRestBackend, not {type(self._backend)}")
+        self._stream = requests.get(f"{self._backend.url}/events?stream=true", stream=True, timeout=None)
+        self._stream.raise_for_status()
+        self._reader = threading.Thread(target=self._read, args=(self._stream,), daemon=True)
+        self._reader.start()
+
+
+    def _read(self, stream: requests.Response) -> None:
+        """Queues the text events, with their arrival time"""
+
+        try:
+            while True:
+                line = stream.raw.readline()
+                if not line:
+                    break
+                if not line.startswith(b"data: "):
+                    continue
+                text = json.loads(line[6:]).get("text", "")
+                # skip the blank texts, drawn e.g. by the progress bars
+                if text.strip():
+                    self._events.put((time.monotonic(), text))
+        except (requests.RequestException, AttributeError, ValueError):
+            # the stream was closed
+            pass
+
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._reader is not None:
+            self._reader.join(timeout=1.0)
+            self._reader = None
+
+
+    def _responded(self) -> bool:
+        assert isinstance(self._backend, SpeculosRestBackend)
+        return self._backend.async_response_available()
+
+
+    def _next_screen(self, since: float, deadline: float) -> Optional[List[str]]:
+        """Texts of the next screen drawn after a move
+
+        Args:
+            since (float): Time of the last move, the texts drawn before are skipped
+            deadline (float): Time limit
+
+        Returns:
+            The texts, None if the device answered
+        """
+
+        texts: List[str] = []
+        while True:
+            try:
+                arrival, text = self._events.get(timeout=SETTLE_DELAY if texts else POLL_DELAY)
+            except queue.Empty:
+                if texts:
+                    return texts
+                if self._responded():
+                    return None
+                if time.monotonic() > deadline:
+                    raise TimeoutError("Timeout waiting for a screen") from None
+                continue
+            if arrival >= since:
+                texts.append(text)
+
+
+    def _navigate(self, approve: bool, timeout: float) -> int:
+        self._open()
+        deadline = time.monotonic() + timeout
+        # start from the displayed screen, the events queued before were answered already
+        while not self._events.empty():
+            self._events.get_nowait()
+        since = time.monotonic()
+        texts: Optional[List[str]] = [event["text"] for event in self._backend.get_current_screen_content()["events"]]
+        screens = 0
+        while True:
+            if not texts or self._responded():
+                texts = self._next_screen(since, deadline)
+                if texts is None:
+                    return screens
+            kind = classify(self._family, texts)
+            texts = None
+            if kind not in self._moves:
+                continue
+            approveMoves, rejectMoves = self._moves[kind]
+            since = time.monotonic()
+            self._navigator.navigate(approveMoves if approve else rejectMoves,
+                                     screen_change_before_first_instruction=False,
+                                     screen_change_after_last_instruction=False)
+            screens += 1
+
+
+    def approve(self, timeout: float = 10.0) -> int:
+        """Approves the review in progress, until the device answers
+
+        Args:
+            timeout (float): Time limit of the review
+
+        Returns:
+            The number of screens answered
+        """
+
+        return self._navigate(True, timeout)
+
+
+    def reject(self, timeout: float = 10.0) -> int:
+        """Rejects the review in progress, until the device answers
+
+        Args:
+            timeout (float): Time limit of the review
+
+        Returns:
+            The number of screens answered
+        """
+
+        return self._navigate(False, timeout)
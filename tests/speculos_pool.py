@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+Pool of warm Speculos instances, enabled with the --warm_pool pytest option.
+
+The instances are started once per device model and leased to the tests instead
+of starting a new emulator for each backend fixture. Between two tests, the app
+state is reset by APDU: any instruction aborts the one in progress (ERR_STILL_IN_CALL)
+and brings back the home screen. An instance is restarted only if the test failed
+(an APDU may still be pending) or if the reset fails.
+"""
+
+import time
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+from ledgered.devices import Device
+
+from ragger.backend import BackendInterface
+from ragger.error import ExceptionRAPDU
+
+from application_client.app_def import Errors
+from application_client.command_builder import CommandBuilder
+
+RESET_ATTEMPTS = 2
+HOME_SCREEN_TIMEOUT = 5.0
+
+
+@dataclass
+class PoolMetrics:
+    startups: List[float] = field(default_factory=list)
+    resets: List[float] = field(default_factory=list)
+    restarts: int = 0
+    leases: int = 0
+
+
+    def summary(self) -> List[str]:
+        def stats(times: List[float]) -> str:
+            if not times:
+                return "0"
+            return f"{len(times)} in {sum(times):.1f}s (avg {sum(times) / len(times):.2f}s)"
+
+        return [f"startups: {stats(self.startups)}",
+                f"resets: {stats(self.resets)}",
+                f"restarts after a failure: {self.restarts}",
+                f"leases: {self.leases}"]
+
+
+class SpeculosPool:
+    """Warm instances, per device model"""
+
+    def __init__(self, factory: Callable[[Device, List[str]], BackendInterface]) -> None:
+        """Class initializer
+
+        Args:
+            factory (Callable): Creates the (not started) backend of a device model, with additional Speculos arguments
+        """
+
+        self._factory = factory
+        self._idle: Dict[Tuple[str, Tuple[str, ...]], List[BackendInterface]] = {}
+        # the context of each started instance, by id of the backend
+        self._running: Dict[int, ExitStack] = {}
+        self.metrics = PoolMetrics()
+
+
+    def _start(self, backend: BackendInterface) -> None:
+        start = time.monotonic()
+        with ExitStack() as stack:
+            stack.enter_context(backend)
+            self._running[id(backend)] = stack.pop_all()
+        self.metrics.startups.append(time.monotonic() - start)
+
+
+    def _stop(self, backend: BackendInterface) -> None:
+        self._running.pop(id(backend)).close()
+
+
+    def lease(self, device: Device, speculosArgs: List[str]) -> BackendInterface:
+        """Leases an idle instance, started if needed
+
+        Args:
+            device (Device): The device model
+            speculosArgs (List[str]): Additional Speculos arguments
+
+        Returns:
+            The started backend
+        """
+
+        idle = self._idle.setdefault((device.name, tuple(speculosArgs)), [])
+        if idle:
+            backend = idle.pop()
+        else:
+            backend = self._factory(device, list(speculosArgs))
+            self._start(backend)
+        self.metrics.leases += 1
+        return backend
+
+
+    def release(self, device: Device, speculosArgs: List[str], backend: BackendInterface) -> None:
+        self._idle.setdefault((device.name, tuple(speculosArgs)), []).append(backend)
+
+
+    def _reset_by_apdu(self, backend: BackendInterface) -> bool:
+        for _ in range(RESET_ATTEMPTS):
+            try:
+                status = backend.exchange_raw(CommandBuilder().get_version()).status
+            except ExceptionRAPDU as e:
+                status = e.status
+            if status == Errors.SW_SUCCESS:
+                backend.wait_for_home_screen(timeout=HOME_SCREEN_TIMEOUT)
+                return True
+            if status != Errors.SW_STILL_IN_CALL:
+                return False
+        return False
+
+
+    def reset(self, backend: BackendInterface, clean: bool) -> None:
+        """Brings an instance back to the app start state
+
+        Args:
+            backend (BackendInterface): The instance
+            clean (bool): Whether the last test ended normally, the instance is restarted otherwise
+        """
+
+        start = time.monotonic()
+        try:
+            if clean and self._reset_by_apdu(backend):
+                self.metrics.resets.append(time.monotonic() - start)
+                return
+        except (TimeoutError, ConnectionError):
+            pass
+
+        self.metrics.restarts += 1
+        self._stop(backend)
+        self._start(backend)
+
+
+    def close(self) -> None:
+        for stack in self._running.values():
+            stack.close()
+        self._running.clear()
+        self._idle.clear()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the bech32 and base58 address codecs
+"""
+
+import pytest
+
+from application_client.address_codec import MAINNET_PROTOCOL_MAGIC, bech32_encode, byron_protocol_magic, format_address
+from application_client.address_codec import format_addresses, parse_address, parse_addresses
+
+from input_files.signTx import ThirdPartyAddressParams
+
+
+def test_address_codec() -> None:
+    """Check the round trip and the checks of the address codecs"""
+
+    shelley = "addr1w9rhu54nz94k9l5v6d9rzfs47h7dv7xffcwkekuxcx3evnqpvuxu0"
+    shelleyHex = "71477e52b3116b62fe8cd34a312615f5fcd678c94e1d6cdb86c1a3964c"
+    byronMainnet = "Ae2tdPwUPEZCanmBz5g2GEwFqKTKpNJcGYPKfDxoNeKZ8bRHr8366kseiK2"
+    byronTestnet = "2657WMsDfac6Cmfg4Varph2qyLKGi2K9E8jrtvjHVzfSjmbTMGy5sY3HpxCKsmtDA"
+
+    assert parse_address(shelley).hex() == shelleyHex
+    assert parse_address(shelley.upper()).hex() == shelleyHex
+    assert format_addresses(parse_addresses([shelley, byronMainnet, byronTestnet])) == \
+        [shelley, byronMainnet, byronTestnet]
+    assert byron_protocol_magic(parse_address(byronMainnet)) == MAINNET_PROTOCOL_MAGIC
+    assert byron_protocol_magic(parse_address(byronTestnet)) == 42
+
+    assert ThirdPartyAddressParams(shelley).addressHex == shelleyHex
+    assert ThirdPartyAddressParams(shelleyHex).addressHex == shelleyHex
+    assert format_address(bytes.fromhex(ThirdPartyAddressParams(byronMainnet).addressHex)) == byronMainnet
+
+    # wrong checksum
+    with pytest.raises(ValueError):
+        parse_address(shelley[:-1] + "q")
+    # prefix not matching the network id
+    with pytest.raises(ValueError):
+        parse_address(bech32_encode("addr", bytes.fromhex("70" + shelleyHex[2:])))
+    # wrong CRC32
+    byron = bytearray(parse_address(byronMainnet))
+    byron[-1] ^= 1
+    with pytest.raises(ValueError):
+        byron_protocol_magic(bytes(byron))
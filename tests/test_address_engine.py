@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the bulk address generation, against the reference derivation
+"""
+
+from application_client.address_engine import AddressEngine, ROLE_INTERNAL, to_bech32
+from application_client.app_def import AddressType, Mainnet, Testnet
+
+from input_files.derive_address import DeriveAddressTestCase
+
+from utils import derive_address, get_device_pubkey
+
+
+def test_address_engine() -> None:
+    """Check the addresses of an account against the derivation of each path"""
+
+    pk, chainCode = get_device_pubkey("m/1852'/1815'/0'")
+    accountXpub = pk + bytes.fromhex(chainCode)
+    engine = AddressEngine(accountXpub, Mainnet.networkId, workers=2)
+    indices = [0, 1, 1000, 1000001]
+
+    for index, address in zip(indices, engine.base_addresses(indices, ROLE_INTERNAL)):
+        assert address == derive_address(DeriveAddressTestCase("", Mainnet, AddressType.BASE_PAYMENT_KEY_STAKE_KEY,
+                                                               f"m/1852'/1815'/0'/1/{index}",
+                                                               "m/1852'/1815'/0'/2/0"))
+    for index, address in zip(indices, engine.enterprise_addresses(indices)):
+        assert address == derive_address(DeriveAddressTestCase("", Mainnet, AddressType.ENTERPRISE_KEY,
+                                                               f"m/1852'/1815'/0'/0/{index}"))
+    for index, address in zip(indices, engine.pointer_addresses(indices, (1, 2, 3))):
+        assert address == derive_address(DeriveAddressTestCase("", Mainnet, AddressType.POINTER_KEY,
+                                                               f"m/1852'/1815'/0'/0/{index}",
+                                                               "000000010000000200000003"))
+
+    assert to_bech32(engine.reward_address()).startswith("stake1")
+    testnet = AddressEngine(accountXpub, Testnet.networkId, workers=1)
+    assert to_bech32(testnet.enterprise_addresses([0])[0]).startswith("addr_test1")
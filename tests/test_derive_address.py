@@ -6,7 +6,6 @@ This module provides Ragger tests for Derive Address check
 """
 
 import pytest
-import base58
 
 from ragger.backend import BackendInterface
 from ragger.firmware import Firmware
@@ -14,6 +13,7 @@ from ragger.navigator import Navigator, NavInsID
 from ragger.navigator.navigation_scenario import NavigateWithScenario
 from ragger.error import ExceptionRAPDU
 
+from application_client.address_codec import format_address
 from application_client.app_def import Errors, Testnet
 from application_client.command_sender import CommandSender
 from application_client.command_builder import P1Type
@@ -22,6 +22,7 @@ from input_files.derive_address import DeriveAddressTestCase
 from input_files.derive_address import byronTestCases, rejectTestCases
 from input_files.derive_address import shelleyTestCasesNoConfirm, shelleyTestCasesWithConfirm
 
+from screen_navigator import ScreenNavigator
 from utils import idTestFunc, derive_address
 
 
@@ -32,8 +33,8 @@ from utils import idTestFunc, derive_address
 )
 def test_derive_address_byron(firmware: Firmware,
                               backend: BackendInterface,
-                              navigator: Navigator,
                               scenario_navigator: NavigateWithScenario,
+                              screenNavigator: ScreenNavigator,
                               testCase: DeriveAddressTestCase,
                               appFlags: dict) -> None:
     """Check Derive Byron Address Return"""
@@ -43,21 +44,18 @@ def test_derive_address_byron(firmware: Firmware,
 
     # Use the app interface instead of raw interface
     client = CommandSender(backend)
-    if firmware.is_nano:
-        nav_inst = NavInsID.BOTH_CLICK
-        valid_instr = [NavInsID.BOTH_CLICK]
 
     # Send the APDU
     with client.derive_address_async(P1Type.P1_RETURN, testCase):
         if firmware.is_nano:
-            navigator.navigate_until_text(nav_inst, valid_instr, "Confirm")
+            screenNavigator.approve()
         else:
             scenario_navigator.address_review_approve(do_comparison=False)
 
     # Check the status (Asynchronous)
     response = client.get_async_response()
     assert response and response.status == Errors.SW_SUCCESS
-    encoded = base58.b58encode(response.data).decode()
+    encoded = format_address(response.data)
 
     if testCase.netDesc == Testnet:
         assert encoded == testCase.result
@@ -127,27 +125,18 @@ def test_derive_address_shelley(backend: BackendInterface,
 )
 def test_derive_address_shelley_confirm(firmware: Firmware,
                                         backend: BackendInterface,
-                                        navigator: Navigator,
                                         scenario_navigator: NavigateWithScenario,
+                                        screenNavigator: ScreenNavigator,
                                         testCase: DeriveAddressTestCase) -> None:
     """Check Derive Shelley Address Return with confirmation"""
 
     # Use the app interface instead of raw interface
     client = CommandSender(backend)
-    if firmware.is_nano:
-        nav_inst = NavInsID.BOTH_CLICK
-        if firmware == Firmware.NANOS:
-            valid_instr = [NavInsID.RIGHT_CLICK]
-        else:
-            valid_instr = [NavInsID.BOTH_CLICK]
 
     # Send the APDU
     with client.derive_address_async(P1Type.P1_RETURN, testCase):
         if firmware.is_nano:
-            if firmware != Firmware.NANOS and testCase.nano_nav_confirm:
-                navigator.navigate(testCase.nano_nav_confirm)
-            else:
-                navigator.navigate_until_text(nav_inst, valid_instr, "Confirm")
+            screenNavigator.approve()
         else:
             scenario_navigator.address_review_approve(do_comparison=False)
 
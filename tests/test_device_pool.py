@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the asyncio client and of the device pool, on fake devices
+"""
+
+import asyncio
+from typing import List
+
+from ragger.backend.interface import RAPDU
+
+from application_client.async_command_sender import AsyncCommandSender
+from application_client.command_builder import P1Type
+from application_client.app_def import Errors
+from application_client.device_pool import DevicePool
+from application_client.transport import Transport
+
+
+class _FakeTransport(Transport):
+    """Answers every APDU with its own header after a delay, checks one APDU is sent at a time"""
+
+    def __init__(self) -> None:
+        self.apdus: List[bytes] = []
+        self._busy = False
+
+
+    async def open(self) -> None:
+        pass
+
+
+    async def exchange(self, apdu: bytes) -> RAPDU:
+        assert not self._busy
+        self._busy = True
+        await asyncio.sleep(0.01)
+        self._busy = False
+        self.apdus.append(apdu)
+        return RAPDU(Errors.SW_SUCCESS, apdu[:4])
+
+
+    async def close(self) -> None:
+        pass
+
+
+def test_device_pool() -> None:
+    """Check the jobs are spread over the devices, one job at a time per device"""
+
+    transports = [_FakeTransport() for _ in range(4)]
+
+    async def job(sender: AsyncCommandSender) -> bytes:
+        await sender.get_version()
+        rapdu = await sender.get_pubkey(P1Type.P1_KEY_INIT, "m/1852'/1815'/0'/0/0")
+        return rapdu.data
+
+    async def run() -> List[bytes]:
+        pool = DevicePool(AsyncCommandSender(transport) for transport in transports)
+        return await pool.run_all([job] * 20)
+
+    results = asyncio.run(run())
+    assert len(results) == 20
+    assert all(result == results[0] for result in results)
+    # every device was used, each job sends its two APDU to the same device
+    for transport in transports:
+        assert transport.apdus
+        assert len(transport.apdus) % 2 == 0
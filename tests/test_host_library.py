@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides differential tests of the host library (the app's C modules built
+for the host) against the Python implementations of the client
+"""
+
+import hashlib
+
+import cbor
+import pytest
+
+from application_client.address_codec import byron_protocol_magic, format_address
+from application_client.host_library import HostLibrary, HostTxBody, HostTxOutput, _script_nodes
+
+from input_files.derive_native_script import NativeScriptType, ValidNativeScriptTestCases
+from input_files.signTx import ThirdPartyAddressParams, TxOutputFormat, destinations
+
+
+def _third_party_only(script) -> bool:
+    if script.type == NativeScriptType.PUBKEY_DEVICE_OWNED:
+        return False
+    return all(_third_party_only(s) for s in getattr(script.params, "scripts", []))
+
+
+@pytest.fixture(name="hostLibrary", scope="module")
+def hostLibrary_fixture() -> HostLibrary:
+    library = None
+    try:
+        library = HostLibrary()
+    except OSError:
+        pass
+    if library is None:
+        pytest.skip("The host library is not built, see hostlib/README.md")
+    return library
+
+
+def test_script_nodes() -> None:
+    """Check the pre-order listing of the native scripts"""
+
+    for testCase in ValidNativeScriptTestCases:
+        if not _third_party_only(testCase.script):
+            continue
+        nodes: list = []
+        _script_nodes(testCase.script, nodes)
+        # every complex script is followed by its subscripts
+        remaining = [1]
+        for node in nodes:
+            assert remaining, testCase.name
+            remaining[-1] -= 1
+            remaining.append(node.numScripts)
+            while remaining and remaining[-1] == 0:
+                remaining.pop()
+        assert not remaining, testCase.name
+
+
+def test_host_addresses(hostLibrary: HostLibrary) -> None:
+    """Check the address encodings against the client codec"""
+
+    addresses = [bytes.fromhex(dest.params.addressHex) for dest in destinations.values()
+                 if isinstance(dest.params, ThirdPartyAddressParams)]
+    assert hostLibrary.human_readable_addresses(addresses) == [format_address(a) for a in addresses]
+    for address in addresses:
+        if address[0] >> 4 == 0x08:
+            assert hostLibrary.protocol_magic(address) == byron_protocol_magic(address)
+    assert hostLibrary.cbor_token(0x00, 1 << 40) == cbor.dumps(1 << 40)
+
+
+def test_host_native_script_hash(hostLibrary: HostLibrary) -> None:
+    """Check the native script hashes against the test vectors"""
+
+    for testCase in ValidNativeScriptTestCases:
+        if _third_party_only(testCase.script):
+            assert hostLibrary.native_script_hash(testCase.script).hex() == testCase.expected.hash, testCase.name
+
+
+def test_host_tx_hashes(hostLibrary: HostLibrary) -> None:
+    """Check the tx hashes against the hash of the CBOR body"""
+
+    destination = destinations["externalShelleyBaseKeyhashKeyhash"].params
+    assert isinstance(destination, ThirdPartyAddressParams)
+    address = bytes.fromhex(destination.addressHex)
+    rewardAccount = bytes.fromhex("e1") + address[29:]
+    txs = [HostTxBody([(bytes([i]) * 32, i)], [HostTxOutput(address, 1000000 + i)], 170000 + i,
+                      ttl=None if i % 2 else 10 + i)
+           for i in range(8)]
+    txs.append(HostTxBody([(bytes(32), 0)], [HostTxOutput(address, 1, TxOutputFormat.MAP_BABBAGE)], 42,
+                          withdrawals=[(rewardAccount, 5)], auxDataHash=bytes(range(32)), validityIntervalStart=7))
+
+    for tx, txHash in zip(txs, hostLibrary.tx_hashes(txs)):
+        body = {0: [[txHash_, index] for txHash_, index in tx.inputs],
+                1: [[o.address, o.amount] if o.format == TxOutputFormat.ARRAY_LEGACY else {0: o.address, 1: o.amount}
+                    for o in tx.outputs],
+                2: tx.fee}
+        if tx.ttl is not None:
+            body[3] = tx.ttl
+        if tx.withdrawals:
+            body[5] = dict(tx.withdrawals)
+        if tx.auxDataHash is not None:
+            body[7] = tx.auxDataHash
+        if tx.validityIntervalStart is not None:
+            body[8] = tx.validityIntervalStart
+        assert txHash == hashlib.blake2b(cbor.dumps(body), digest_size=32).digest()
@@ -22,6 +22,7 @@ from input_files.pubkey import PubKeyTestCase
 from input_files.pubkey import rejectTestCases, testsShelleyUsualNoConfirm, testsCVoteKeysNoConfirm
 from input_files.pubkey import byronTestCases, testsShelleyUsual, testsShelleyUnusual, testsColdKeys, testsCVoteKeys
 
+from screen_navigator import ScreenNavigator
 from utils import idTestFunc, get_device_pubkey
 
 @pytest.mark.parametrize(
@@ -31,25 +32,19 @@ from utils import idTestFunc, get_device_pubkey
 )
 def test_pubkey_confirm(firmware: Firmware,
                         backend: BackendInterface,
-                        navigator: Navigator,
                         scenario_navigator: NavigateWithScenario,
+                        screenNavigator: ScreenNavigator,
                         testCase: PubKeyTestCase) -> None:
     """Check Public Key with confirmation"""
 
     # Use the app interface instead of raw interface
     client = CommandSender(backend)
-    if firmware.is_nano:
-        nav_inst = NavInsID.BOTH_CLICK
-        if firmware == Firmware.NANOS:
-            valid_instr = [NavInsID.RIGHT_CLICK]
-        else:
-            valid_instr = [NavInsID.BOTH_CLICK]
 
     # Send the APDU
     with client.get_pubkey_async(P1Type.P1_KEY_INIT, testCase.path):
         if testCase.nav:
             if firmware.is_nano:
-                navigator.navigate_until_text(nav_inst, valid_instr, "Confirm")
+                screenNavigator.approve()
             else:
                 scenario_navigator.address_review_approve(do_comparison=False)
         else:
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the raw APDU port connection, on a fake Speculos APDU server
+"""
+
+import socket
+import threading
+from pathlib import Path
+from typing import Generator, List
+
+import pytest
+from ledgered.devices import Devices, DeviceType
+from ragger.backend import SpeculosBackend
+
+from application_client.app_def import Errors
+from application_client.command_builder import CommandBuilder, P1Type
+from application_client.raw_backend import SpeculosApduSocket, SpeculosRawBackend
+
+
+def _recvall(connection: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError
+        data += chunk
+    return data
+
+
+@pytest.fixture(name="fakeApduPort")
+def fakeApduPort_fixture() -> Generator[tuple, None, None]:
+    """Speculos APDU server answering each APDU with itself repeated 300 times, status 0x9000"""
+
+    server = socket.create_server(("127.0.0.1", 0))
+    received: List[bytes] = []
+
+    def serve() -> None:
+        connection, _ = server.accept()
+        with connection:
+            while True:
+                try:
+                    apdu = _recvall(connection, int.from_bytes(_recvall(connection, 4), "big"))
+                except ConnectionError:
+                    return
+                received.append(apdu)
+                data = apdu * 300
+                connection.sendall(len(data).to_bytes(4, "big") + data + Errors.SW_SUCCESS.to_bytes(2, "big"))
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield server.getsockname()[1], received
+    server.close()
+    thread.join(timeout=5)
+
+
+def test_raw_apdu_socket(fakeApduPort: tuple) -> None:
+    """Check the framing of the APDU and responses on a persistent connection"""
+
+    port, received = fakeApduPort
+    apduSocket = SpeculosApduSocket(port=port)
+    apduSocket.open()
+    try:
+        builder = CommandBuilder()
+        apdus = [builder.get_version()] + [builder.get_pubkey(P1Type.P1_KEY_INIT, f"m/1852'/1815'/0'/0/{i}")
+                                           for i in range(10)]
+        for apdu in apdus:
+            rapdu = apduSocket.exchange(apdu)
+            assert rapdu.status == Errors.SW_SUCCESS
+            assert rapdu.data == apdu * 300
+
+        apduSocket.send(apdus[0])
+        assert apduSocket.has_response(timeout=5)
+        assert apduSocket.receive().data == apdus[0] * 300
+        assert not apduSocket.has_response()
+    finally:
+        apduSocket.close()
+    assert received == apdus + apdus[:1]
+
+
+def test_raw_backend_async_response(fakeApduPort: tuple, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check the async response is available once answered, and only in the exchange_async_raw block"""
+
+    port, received = fakeApduPort
+    # the fake APDU port stands for Speculos, which is not started
+    monkeypatch.setattr(SpeculosBackend, "__enter__", lambda self: self)
+    monkeypatch.setattr(SpeculosBackend, "__exit__", lambda self, *args: None)
+    backend = SpeculosRawBackend(Path("app.elf"), device=Devices.get_by_type(DeviceType.NANOX),
+                                 args=["--apdu-port", str(port)])
+    apdu = CommandBuilder().get_version()
+    with backend:
+        assert not backend.async_response_available()
+        with backend.exchange_async_raw(apdu) as answered:
+            assert answered
+            assert backend.async_response_available()
+        assert not backend.async_response_available()
+        assert backend.last_async_response is not None
+        assert backend.last_async_response.data == apdu * 300
+    assert received == [apdu]
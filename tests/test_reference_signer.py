@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the reference signer, against the Ed25519 verification
+"""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+from ecdsa.curves import Ed25519
+from ecdsa.keys import VerifyingKey
+
+from reference_signer import ReferenceSigner
+from utils import get_device_pubkey
+
+
+@pytest.mark.parametrize("path", [
+    "m/1852'/1815'/0'/0/0",
+    "m/1852'/1815'/0'/2/0",
+    "m/44'/1815'/0'/1/5",
+    "m/1853'/1815'/0'/0'",
+    "m/1854'/1815'/0'/0/1",
+])
+def test_reference_signer(path: str) -> None:
+    """Check the signature and public key of the path against the ones of ragger"""
+
+    signer = ReferenceSigner()
+    refPk, _ = get_device_pubkey(path)
+    assert signer.public_key(path) == refPk
+    for data in (bytes(32), hashlib.blake2b(path.encode(), digest_size=32).digest(), b"message"):
+        signature = signer.sign(path, data)
+        pk: VerifyingKey = VerifyingKey.from_string(refPk, curve=Ed25519)
+        assert pk.verify(signature, data, hashlib.sha512)
+
+
+def test_reference_signer_cache(tmp_path: Path) -> None:
+    """Check the signatures kept in the cache file"""
+
+    path = "m/1852'/1815'/0'/0/0"
+    cachePath = tmp_path / "signatures.json"
+    signer = ReferenceSigner()
+    signer.load(cachePath)
+    signer.precompute([(path, bytes(32)), (path, bytes([1]) * 32)])
+    signer.save()
+
+    cached = ReferenceSigner()
+    cached.load(cachePath)
+    assert cached.sign(path, bytes(32)) == signer.sign(path, bytes(32))
+    # served from the cache, the fake signature is not recomputed
+    cachePath.write_text(f'{{"{path}:{bytes(32).hex()}": "{bytes(64).hex()}"}}')
+    faked = ReferenceSigner()
+    faked.load(cachePath)
+    assert faked.sign(path, bytes(32)) == bytes(64)
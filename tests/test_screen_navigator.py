@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the screen recognition of the screen-driven navigation
+"""
+
+import pytest
+from ledgered.devices import Devices, DeviceType
+from ragger.backend import StubBackend
+from ragger.firmware import Firmware
+from ragger.navigator import NanoNavigator
+
+from navigation import NANO, TOUCH
+from screen_navigator import ScreenKind, ScreenNavigator, classify
+
+
+def test_screen_classification() -> None:
+    """Check the kinds of the app screens"""
+
+    # Nano
+    assert classify(NANO, ["Fee", "0.42 ADA"]) == ScreenKind.REVIEW
+    assert classify(NANO, ["Address (1/3)", "addr1q9"]) == ScreenKind.NEXT_PAGE
+    assert classify(NANO, ["Address (3/3)", "0d3f"]) == ScreenKind.REVIEW
+    assert classify(NANO, ["Confirm export", "public key?"]) == ScreenKind.PROMPT
+    assert classify(NANO, ["New ordinary", "transaction?"]) == ScreenKind.PROMPT
+    assert classify(NANO, ["Reject?"]) == ScreenKind.REJECT_PROMPT
+    assert classify(NANO, ["Cardano", "is ready"]) == ScreenKind.WAIT
+
+    # Touch
+    assert classify(TOUCH, ["Fees", "0.42 ADA", "Tap to continue", "Reject transaction"]) == ScreenKind.PAGE
+    assert classify(TOUCH, ["Review transaction", "Reject transaction"]) == ScreenKind.PROMPT
+    assert classify(TOUCH, ["Confirm transaction", "Hold to sign", "Reject transaction"]) == ScreenKind.CONFIRMATION
+    assert classify(TOUCH, ["Reject transaction?", "Yes, reject", "Go back to transaction"]) == \
+        ScreenKind.REJECT_CONFIRMATION
+    assert classify(TOUCH, ["Sign message?", "Confirm", "Reject Transaction"]) == ScreenKind.CHOICE
+    assert classify(TOUCH, ["Processing"]) == ScreenKind.WAIT
+
+
+def test_screen_navigator_backend() -> None:
+    """Check the navigation fails at once on a backend which cannot tell whether the device answered"""
+
+    device = Devices.get_by_type(DeviceType.NANOX)
+    backend = StubBackend(device)
+    screens = ScreenNavigator(backend, NanoNavigator(backend, device), Firmware.NANOX)
+    with pytest.raises(NotImplementedError):
+        screens.approve(timeout=0)
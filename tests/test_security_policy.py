@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the host mirror of the sign tx security policy, against the Sign TX test cases
+"""
+
+from typing import List
+
+import pytest
+
+from ragger.error import ExceptionRAPDU
+from ragger.firmware import Firmware
+
+from application_client.app_def import Errors
+from application_client.command_sender import CommandSender
+from application_client.security_policy import SecurityPolicy, TxStep, evaluate_tx, ensure_not_denied, tx_witness_paths
+
+from input_files.signTx import SignTxTestCase
+from input_files.signTx import testsByron, testsShelleyNoCertificates, testsShelleyWithCertificates
+from input_files.signTx import testsConwayWithCertificates, testsMultisig, testsAllegra, testsMary
+from input_files.signTx import testsAlonzoTrezorComparison, testsBabbageTrezorComparison
+from input_files.signTx import testsMultidelegation, testsConwayWithoutCertificates, testsConwayVotingProcedures
+from input_files.signTx import testsCatalystRegistration, testsCVoteRegistrationCIP36, testsAlonzo, testsBabbage
+from input_files.signTx import poolRegistrationOwnerTestCases, poolRegistrationOperatorTestCases
+from input_files.signTx import transactionInitRejectTestCases, addressParamsRejectTestCases, certificateStakingRejectTestCases
+from input_files.signTx import withdrawalRejectTestCases, witnessRejectTestCases, singleAccountRejectTestCases
+from input_files.signTx import collateralOutputRejectTestCases, certificateRejectTestCases
+from input_files.signTx import certificateStakePoolRetirementRejectTestCases, invalidCertificates
+from input_files.signTx import stakePoolRegistrationPoolIdRejectTestCases, stakePoolRegistrationOwnerRejectTestCases
+from input_files.signTx import outputRejectTestCases
+from utils import idTestFunc
+
+rejectTestCases = [testCase for testCase in
+                   transactionInitRejectTestCases + addressParamsRejectTestCases + certificateStakingRejectTestCases + \
+                   withdrawalRejectTestCases + witnessRejectTestCases + singleAccountRejectTestCases + \
+                   collateralOutputRejectTestCases + certificateRejectTestCases + \
+                   certificateStakePoolRetirementRejectTestCases + invalidCertificates + \
+                   stakePoolRegistrationPoolIdRejectTestCases + stakePoolRegistrationOwnerRejectTestCases + \
+                   outputRejectTestCases
+                   if testCase.expected_sw == Errors.SW_REJECTED_BY_POLICY]
+
+
+class _NoBackend:
+    """The client refuses the transactions without exchanging any APDU"""
+
+    firmware = Firmware.NANOX
+
+
+def _witnessPaths(testCase: SignTxTestCase) -> List[str]:
+    """The witnesses requested by test_signTx"""
+
+    return list(dict.fromkeys(tx_witness_paths(testCase.tx, testCase.signingMode) + testCase.additionalWitnessPaths))
+
+
+@pytest.mark.parametrize(
+    "testCase",
+    testsByron + testsShelleyNoCertificates + testsShelleyWithCertificates + \
+    testsConwayWithCertificates + testsMultisig + testsAllegra + testsMary + \
+    testsAlonzoTrezorComparison + testsBabbageTrezorComparison + \
+    testsMultidelegation + testsConwayWithoutCertificates + testsConwayVotingProcedures + \
+    testsCatalystRegistration + testsCVoteRegistrationCIP36 + testsAlonzo + testsBabbage + \
+    poolRegistrationOwnerTestCases + poolRegistrationOperatorTestCases,
+    ids=idTestFunc
+)
+@pytest.mark.parametrize("expertMode", [False, True])
+def test_security_policy(testCase: SignTxTestCase, expertMode: bool) -> None:
+    """Check the transactions signed by the app are not denied"""
+
+    evaluation = evaluate_tx(testCase.tx, testCase.signingMode, _witnessPaths(testCase), expertMode)
+    assert evaluation.status == Errors.SW_SUCCESS
+    assert evaluation.steps[-1].step in (TxStep.CONFIRM, TxStep.WITNESSES)
+    ensure_not_denied(evaluation)
+
+
+@pytest.mark.parametrize("testCase", rejectTestCases, ids=idTestFunc)
+def test_security_policy_reject(testCase: SignTxTestCase) -> None:
+    """Check the transactions rejected by the app policy are denied"""
+
+    evaluation = evaluate_tx(testCase.tx, testCase.signingMode, _witnessPaths(testCase))
+    assert evaluation.status == Errors.SW_REJECTED_BY_POLICY
+    assert evaluation.denied is not None and evaluation.denied.policy == SecurityPolicy.DENY
+    with pytest.raises(ExceptionRAPDU) as err:
+        ensure_not_denied(evaluation)
+    assert err.value.status == Errors.SW_REJECTED_BY_POLICY
+
+
+@pytest.mark.parametrize("testCase", rejectTestCases, ids=idTestFunc)
+def test_security_policy_command_sender(testCase: SignTxTestCase) -> None:
+    """Check the client refuses the transactions denied by the policy before sending them"""
+
+    client = CommandSender(_NoBackend())  # type: ignore[arg-type]
+    with pytest.raises(ExceptionRAPDU) as err:
+        client.sign_tx_test_case(testCase)
+    assert err.value.status == Errors.SW_REJECTED_BY_POLICY
+    assert client.last_sign_tx_step() is None
+    assert client.sign_tx_test_case(testCase, checkPolicy=False).tx == testCase.tx
@@ -5,7 +5,8 @@
 This module provides Ragger tests for Sign TX check
 """
 
-from typing import List, Tuple
+from hashlib import blake2b
+from typing import List, Optional, Tuple
 import pytest
 
 from ragger.backend import BackendInterface
@@ -14,17 +15,18 @@ from ragger.navigator import Navigator, NavInsID
 from ragger.navigator.navigation_scenario import NavigateWithScenario
 from ragger.error import ExceptionRAPDU
 
-from application_client.app_def import Errors, NetworkIds
+from application_client.app_def import Errors
 from application_client.command_sender import CommandSender
 from application_client.command_builder import P1Type, P2Type
-
-from input_files.derive_address import AddressType
-from input_files.signTx import MAX_SIGN_TX_CHUNK_SIZE, SignTxTestCase, DeriveAddressTestCase, ThirdPartyAddressParams
-from input_files.signTx import AssetGroup, TxAuxiliaryDataCIP36, TxOutputBabbage
-from input_files.signTx import CertificateType, CredentialParamsType, DRepParamsType, VoterType, TxOutputDestinationType
+from application_client.security_policy import evaluate_tx, tx_witness_paths
+from application_client.tx_assembler import assemble_signed_tx, cip36_auxiliary_data
+from navigation import compile_plan
+
+from input_files.signTx import MAX_SIGN_TX_CHUNK_SIZE, SignTxTestCase
+from input_files.signTx import MAX_SIGN_TX_INPUTS_BATCH, MAX_SIGN_TX_WITNESSES_BATCH
+from input_files.signTx import AssetGroup, TxAuxiliaryDataCIP36, TxInput, TxOutputBabbage
+from input_files.signTx import CertificateType, TxOutputDestinationType, CIP36VoteRegistrationFormat
 from input_files.signTx import TxAuxiliaryDataType, CIP36VoteDelegationType, TransactionSigningMode, DatumType
-from input_files.signTx import DRepUpdateParams, DRepRegistrationParams, StakeRegistrationConwayParams
-from input_files.signTx import ResignCommitteeParams, AuthorizeCommitteeParams, VoteDelegationParams
 from input_files.signTx import testsByron, testsShelleyNoCertificates, testsShelleyWithCertificates
 from input_files.signTx import testsConwayWithCertificates, testsMultisig, testsAllegra, testsMary
 from input_files.signTx import testsAlonzoTrezorComparison, testsBabbageTrezorComparison
@@ -38,7 +40,8 @@ from input_files.signTx import certificateRejectTestCases, certificateStakePoolR
 from input_files.signTx import poolRegistrationOwnerRejectTestCases, invalidCertificates, invalidPoolMetadataTestCases
 from input_files.signTx import invalidRelayTestCases, stakePoolRegistrationPoolIdRejectTestCases
 from input_files.signTx import stakePoolRegistrationOwnerRejectTestCases, outputRejectTestCases
-from utils import idTestFunc, verify_signature
+from input_files.derive_address import DeriveAddressTestCase
+from utils import idTestFunc, derive_address, get_device_keys, verify_signature, verify_signed_tx
 
 
 @pytest.mark.parametrize(
@@ -65,22 +68,108 @@ def test_signTx(firmware: Firmware,
     if firmware.is_nano and testCase.nano_skip is True:
         pytest.skip("Not supported yet on Nano because Navigation should be reviewed")
 
-    # Use the app interface instead of raw interface
-    client = CommandSender(backend)
+    _signTx(firmware, navigator, scenario_navigator, CommandSender(backend), testCase)
+
+
+# The input sections of a tx, sent one input per APDU or in batches
+INPUT_KINDS = {
+    P1Type.P1_INPUTS: "inputs",
+    P1Type.P1_COLLATERAL_INPUTS: "collateral inputs",
+    P1Type.P1_REFERENCE_INPUTS: "reference inputs",
+}
+
+
+def _txInputs(testCase: SignTxTestCase, inputKind: P1Type) -> List[TxInput]:
+    """The inputs of the tx section"""
+    return {
+        P1Type.P1_INPUTS: testCase.tx.inputs,
+        P1Type.P1_COLLATERAL_INPUTS: testCase.tx.collateralInputs,
+        P1Type.P1_REFERENCE_INPUTS: testCase.tx.referenceInputs,
+    }[inputKind]
 
+
+@pytest.mark.parametrize(
+    "testCase, inputKind",
+    [pytest.param(testCase, inputKind, id=f"{label} - {idTestFunc(testCase)}")
+     for inputKind, label in INPUT_KINDS.items()
+     for testCase in testsShelleyNoCertificates + testsMultisig + testsAlonzo + testsBabbage
+     if _txInputs(testCase, inputKind)]
+)
+def test_signTx_batchedInputs(firmware: Firmware,
+                              backend: BackendInterface,
+                              navigator: Navigator,
+                              scenario_navigator: NavigateWithScenario,
+                              testCase: SignTxTestCase,
+                              inputKind: P1Type,
+                              appFlags: dict) -> None:
+    """Check Sign TX with several inputs of a tx section per APDU"""
+
+    if appFlags['isAppXS']:
+        pytest.skip("Not supported by 'AppXS' version")
+
+    if firmware.is_nano and testCase.nano_skip is True:
+        pytest.skip("Not supported yet on Nano because Navigation should be reviewed")
+
+    _signTx(firmware, navigator, scenario_navigator, CommandSender(backend), testCase, batchInputs=inputKind)
+
+
+@pytest.mark.parametrize(
+    "testCase",
+    testsShelleyNoCertificates + testsMultidelegation + poolRegistrationOwnerTestCases,
+    ids=idTestFunc
+)
+def test_signTx_batchedWitnesses(firmware: Firmware,
+                                 backend: BackendInterface,
+                                 navigator: Navigator,
+                                 scenario_navigator: NavigateWithScenario,
+                                 testCase: SignTxTestCase,
+                                 appFlags: dict) -> None:
+    """Check Sign TX with several witnesses per APDU"""
+
+    if appFlags['isAppXS']:
+        pytest.skip("Not supported by 'AppXS' version")
+
+    if firmware.is_nano and testCase.nano_skip is True:
+        pytest.skip("Not supported yet on Nano because Navigation should be reviewed")
+
+    _signTx(firmware, navigator, scenario_navigator, CommandSender(backend), testCase, batchWitnesses=True)
+
+
+def _signTx(firmware: Firmware,
+            navigator: Navigator,
+            scenario_navigator: NavigateWithScenario,
+            client: CommandSender,
+            testCase: SignTxTestCase,
+            batchInputs: Optional[P1Type] = None,
+            batchWitnesses: bool = False,
+            checkPolicy: bool = True) -> None:
+    """Sign TX full flow, checks the signatures
+
+    Args:
+        firmware (Firmware): The firmware version
+        navigator (Navigator): The navigator instance
+        scenario_navigator (NavigateWithScenario): The scenario navigator instance
+        client (CommandSender): The command sender instance
+        testCase (SignTxTestCase): The test case
+        batchInputs (P1Type): The tx section whose inputs are sent several per APDU
+        batchWitnesses (bool): Request several witnesses per APDU
+        checkPolicy (bool): Refuse a transaction denied by the security policy before sending it
+    """
+
+    testCase = client.sign_tx_test_case(testCase, checkPolicy)
     witnessPaths = _gatherWitnessPaths(testCase)
 
     # Send the INIT APDU
     _signTx_init(firmware, navigator, client, testCase, len(witnessPaths))
 
     # Send the AUX DATA APDU
-    auxData: bool = _signTx_setAuxiliaryData(firmware, navigator, scenario_navigator, client, testCase)
+    auxiliaryData = _signTx_setAuxiliaryData(firmware, navigator, scenario_navigator, client, testCase)
 
     # Send the INPUTS APDUs
-    _signTx_addInput(client, testCase)
+    _signTx_addInputs(client, testCase, P1Type.P1_INPUTS, batchInputs)
 
     # Send the OUTPUTS APDUs
-    _signTx_addOutputs(firmware, navigator, scenario_navigator, client, testCase, auxData)
+    _signTx_addOutputs(firmware, navigator, scenario_navigator, client, testCase)
 
     # Send the FEE APDU
     _signTx_setFee(firmware, navigator, client, testCase)
@@ -104,7 +193,7 @@ def test_signTx(firmware: Firmware,
     _signTx_setScriptDataHash(client, testCase)
 
     # Send the COLLATERAL INPUTS APDU
-    _signTx_addCollateralInputs(client, testCase)
+    _signTx_addInputs(client, testCase, P1Type.P1_COLLATERAL_INPUTS, batchInputs)
 
     # Send the REQUIRED SIGNERS APDU
     _signTx_addRequiredSigners(client, testCase)
@@ -116,7 +205,7 @@ def test_signTx(firmware: Firmware,
     _signTx_addTotalCollateral(firmware, navigator, client, testCase)
 
     # Send the REFERENCE INPUTS APDU
-    _signTx_addReferenceInputs(client, testCase)
+    _signTx_addInputs(client, testCase, P1Type.P1_REFERENCE_INPUTS, batchInputs)
 
     # Send the VOTING PROCEDURES APDUs
     _signTx_addVoterVotes(firmware, navigator, scenario_navigator, client, testCase)
@@ -131,12 +220,25 @@ def test_signTx(firmware: Firmware,
     data = _signTx_confirm(firmware, navigator, scenario_navigator, client, testCase.signingMode)
 
     # Send the WITNESS APDUs
-    signatures = _signTx_setWitnesses(firmware, navigator, scenario_navigator, client, testCase, witnessPaths, auxData)
+    if batchWitnesses:
+        signatures = _signTx_setWitnessesBatched(firmware, navigator, scenario_navigator, client,
+                                                 testCase, witnessPaths)
+    else:
+        signatures = _signTx_setWitnesses(firmware, navigator, scenario_navigator, client,
+                                          testCase, witnessPaths)
 
     # Check the signatures validity
     for path, sig in signatures:
         verify_signature(path, sig, data)
 
+    # Check the signed transaction, the preimage of an auxiliary data hash being unknown
+    hashOnly = testCase.tx.auxiliaryData is not None and auxiliaryData is None
+    if testCase.txBody and not hashOnly:
+        txBody = bytes.fromhex(testCase.txBody)
+        signedTx = assemble_signed_tx(txBody, signatures, get_device_keys, testCase.tx.network.protocol,
+                                      auxiliaryData)
+        verify_signed_tx(txBody, signedTx, signatures)
+
 
 def _signTx_init(firmware: Firmware,
                  navigator: Navigator,
@@ -152,25 +254,8 @@ def _signTx_init(firmware: Firmware,
         testCase (SignTxTestCase): The test case
         nbWitnessPaths (int): The number of unique witness paths
     """
-    moves = []
-    if firmware.is_nano:
-        moves += [NavInsID.BOTH_CLICK]
-        if testCase.tx.network.networkId == NetworkIds.TESTNET:
-            moves += [NavInsID.BOTH_CLICK]
-        if len(testCase.tx.outputs) == 0 and testCase.tx.scriptDataHash is None:
-            moves += [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK]
-        if testCase.signingMode == TransactionSigningMode.PLUTUS_TRANSACTION:
-            moves += [NavInsID.BOTH_CLICK]
-            if testCase.tx.scriptDataHash is None:
-                moves += [NavInsID.BOTH_CLICK] * 2
-    else:
-        moves += [NavInsID.SWIPE_CENTER_TO_LEFT]
-        if len(testCase.tx.outputs) == 0:
-            moves += [NavInsID.SWIPE_CENTER_TO_LEFT]
-        if testCase.signingMode == TransactionSigningMode.PLUTUS_TRANSACTION:
-            moves += [NavInsID.SWIPE_CENTER_TO_LEFT] * 3
     with client.sign_tx_init(testCase, nbWitnessPaths):
-        navigator.navigate(moves)
+        navigator.navigate(compile_plan(firmware, testCase).init)
     # Check the status (Asynchronous)
     response = client.get_async_response()
     assert response and response.status == Errors.SW_SUCCESS
@@ -180,7 +265,7 @@ def _signTx_setAuxiliaryData(firmware: Firmware,
                              navigator: Navigator,
                              scenario_navigator: NavigateWithScenario,
                              client: CommandSender,
-                             testCase: SignTxTestCase) -> bool:
+                             testCase: SignTxTestCase) -> Optional[bytes]:
     """Sign TX Set AUX DATA
 
     Args:
@@ -191,11 +276,11 @@ def _signTx_setAuxiliaryData(firmware: Firmware,
         testCase (SignTxTestCase): The test case
 
     Returns:
-        bool: True if the auxiliary data is set, False otherwise
+        The CBOR of the CIP-36 registration auxiliary data, None otherwise
     """
 
     if testCase.tx.auxiliaryData is None:
-        return False
+        return None
     with client.sign_tx_aux_data_serialize(testCase.tx.auxiliaryData):
         if testCase.tx.auxiliaryData.type == TxAuxiliaryDataType.CIP36_REGISTRATION:
             if firmware.is_nano:
@@ -207,7 +292,7 @@ def _signTx_setAuxiliaryData(firmware: Firmware,
     response = client.get_async_response()
     assert response and response.status == Errors.SW_SUCCESS
     if testCase.tx.auxiliaryData.type == TxAuxiliaryDataType.ARBITRARY_HASH:
-        return True
+        return None
 
     assert isinstance(testCase.tx.auxiliaryData.params, TxAuxiliaryDataCIP36)
     response = client.sign_tx_aux_data_init(testCase.tx.auxiliaryData.params)
@@ -288,30 +373,81 @@ def _signTx_setAuxiliaryData(firmware: Firmware,
     response = client.get_async_response()
     assert response and response.status == Errors.SW_SUCCESS
 
-    return True
+    # The response holds the auxiliary data hash and the registration signature
+    auxiliaryData = _cip36AuxiliaryData(testCase.tx.auxiliaryData.params, response.data[32:])
+    assert blake2b(auxiliaryData, digest_size=32).digest() == response.data[:32]
+    return auxiliaryData
+
+
+def _cip36AuxiliaryData(params: TxAuxiliaryDataCIP36, signature: bytes) -> bytes:
+    """CBOR of the CIP-36 registration auxiliary data
+
+    Args:
+        params (TxAuxiliaryDataCIP36): The registration parameters
+        signature (bytes): The registration signature returned by the device
+
+    Returns:
+        The CBOR of the auxiliary data
+    """
+
+    def voteKey(key: str) -> bytes:
+        return get_device_keys(key)[0] if key.startswith("m/") else bytes.fromhex(key)
+
+    voteKeys: List[Tuple[bytes, Optional[int]]]
+    if params.voteKey:
+        voteKeys = [(voteKey(params.voteKey), None)]
+    else:
+        voteKeys = [(voteKey(delegation.votingKeyPath), delegation.weight) for delegation in params.delegations]
+    destination = params.paymentDestination.params
+    if isinstance(destination, DeriveAddressTestCase):
+        paymentAddress = derive_address(destination)
+        assert isinstance(paymentAddress, bytes)
+    else:
+        paymentAddress = bytes.fromhex(destination.addressHex)
+    votingPurpose = None
+    if params.format == CIP36VoteRegistrationFormat.CIP_36:
+        # default voting purpose of the device
+        votingPurpose = params.votingPurpose or 0
+    return cip36_auxiliary_data(voteKeys, get_device_keys(params.stakingPath)[0], paymentAddress,
+                                params.nonce, votingPurpose, signature)
 
 
-def _signTx_addInput(client: CommandSender,
-                     testCase: SignTxTestCase) -> None:
-    """Sign TX Add INPUTS
+def _signTx_addInputs(client: CommandSender,
+                      testCase: SignTxTestCase,
+                      inputKind: P1Type,
+                      batchInputs: Optional[P1Type] = None) -> None:
+    """Sign TX Add INPUTS, COLLATERAL INPUTS or REFERENCE INPUTS
 
     Args:
         client (CommandSender): The command sender instance
         testCase (SignTxTestCase): The test case
+        inputKind (P1Type): The tx section of the inputs
+        batchInputs (P1Type): The tx section whose inputs are sent up to MAX_SIGN_TX_INPUTS_BATCH per APDU
     """
 
-    for txInput in testCase.tx.inputs:
-        response = client.sign_tx_inputs(txInput)
+    txInputs = _txInputs(testCase, inputKind)
+    if batchInputs == inputKind:
+        for k in range(0, len(txInputs), MAX_SIGN_TX_INPUTS_BATCH):
+            response = client.sign_tx_inputs_batch(inputKind, txInputs[k:k + MAX_SIGN_TX_INPUTS_BATCH])
+            assert response and response.status == Errors.SW_SUCCESS
+        return
+
+    sendInput = {
+        P1Type.P1_INPUTS: client.sign_tx_inputs,
+        P1Type.P1_COLLATERAL_INPUTS: client.sign_tx_collateral_inputs,
+        P1Type.P1_REFERENCE_INPUTS: client.sign_tx_reference_inputs,
+    }[inputKind]
+    for txInput in txInputs:
+        response = sendInput(txInput)
         # Check the status
-        assert response.status == Errors.SW_SUCCESS
+        assert response and response.status == Errors.SW_SUCCESS
 
 
 def _signTx_addOutputs(firmware: Firmware,
                        navigator: Navigator,
                        scenario_navigator: NavigateWithScenario,
                        client: CommandSender,
-                       testCase: SignTxTestCase,
-                       auxData: bool) -> None:
+                       testCase: SignTxTestCase) -> None:
     """Sign TX Add OUTPUTS
 
     Args:
@@ -319,61 +455,11 @@ def _signTx_addOutputs(firmware: Firmware,
         navigator (Navigator): The navigator instance
         client (CommandSender): The command sender instance
         testCase (SignTxTestCase): The test case
-        auxData (bool): True if the auxiliary data is set, False otherwise
     """
 
-    for txOutput in testCase.tx.outputs:
+    plan = compile_plan(firmware, testCase)
+    for txOutput, moves in zip(testCase.tx.outputs, plan.outputs):
         # Send Basic DATA
-        moves = []
-        if testCase.txBody == "":
-            pass
-        elif testCase.tx.auxiliaryData is not None and \
-            testCase.tx.auxiliaryData.type == TxAuxiliaryDataType.CIP36_REGISTRATION:
-            pass
-        elif isinstance(txOutput.destination.params, ThirdPartyAddressParams):
-            if firmware.is_nano:
-                if testCase.signingMode == TransactionSigningMode.MULTISIG_TRANSACTION and \
-                    len(testCase.tx.certificates) == 0 and len(testCase.tx.withdrawals) == 0:
-                    moves += [NavInsID.RIGHT_CLICK]
-                if testCase.signingMode != TransactionSigningMode.POOL_REGISTRATION_AS_OWNER:
-                    moves += [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2
-                if testCase.signingMode == TransactionSigningMode.MULTISIG_TRANSACTION and \
-                    len(testCase.tx.certificates) == 0 and len(testCase.tx.withdrawals) == 0:
-                    moves += [NavInsID.BOTH_CLICK]
-            else:
-                if testCase.tx.network.networkId == NetworkIds.TESTNET:
-                    moves = [NavInsID.TAPPABLE_CENTER_TAP]
-                if txOutput.datum is None:
-                    moves += [NavInsID.TAPPABLE_CENTER_TAP] + [NavInsID.SWIPE_CENTER_TO_LEFT]
-                if testCase.signingMode == TransactionSigningMode.MULTISIG_TRANSACTION and \
-                    len(testCase.tx.certificates) == 0 and len(testCase.tx.withdrawals) == 0:
-                    moves += [NavInsID.TAPPABLE_CENTER_TAP] + [NavInsID.SWIPE_CENTER_TO_LEFT]
-                if firmware == Firmware.FLEX and txOutput.amount > 10000000:
-                    moves += [NavInsID.TAPPABLE_CENTER_TAP]
-
-        elif isinstance(txOutput.destination.params, DeriveAddressTestCase):
-            if txOutput.destination.params.addrType == AddressType.POINTER_KEY:
-                if firmware.is_nano:
-                    moves = [NavInsID.BOTH_CLICK] * 3 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2
-                else:
-                    moves = [NavInsID.TAPPABLE_CENTER_TAP] + [NavInsID.SWIPE_CENTER_TO_LEFT] + [NavInsID.TAPPABLE_CENTER_TAP] * 2
-            elif txOutput.destination.params.addrType == AddressType.ENTERPRISE_KEY:
-                if firmware.is_nano:
-                    moves = [NavInsID.BOTH_CLICK] * 5
-                else:
-                    moves = [NavInsID.TAPPABLE_CENTER_TAP] + [NavInsID.SWIPE_CENTER_TO_LEFT] + [NavInsID.TAPPABLE_CENTER_TAP] * 2
-            elif auxData:
-                if firmware.is_nano:
-                    moves = [NavInsID.BOTH_CLICK] * 3 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2
-                else:
-                    moves = [NavInsID.SWIPE_CENTER_TO_LEFT] + [NavInsID.TAPPABLE_CENTER_TAP] + [NavInsID.TAPPABLE_CENTER_TAP]
-            elif not txOutput.destination.params.stakingValue.startswith("m/"):
-                if firmware.is_nano:
-                    moves = [NavInsID.BOTH_CLICK] * 2 + [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK]
-                    moves += [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK] * 2
-                else:
-                    moves = [NavInsID.TAPPABLE_CENTER_TAP] + [NavInsID.SWIPE_CENTER_TO_LEFT] + [NavInsID.TAPPABLE_CENTER_TAP] * 2
-
         with client.sign_tx_outputs_basic(txOutput):
             if len(moves) > 0:
                 navigator.navigate(moves)
@@ -448,17 +534,7 @@ def _signTx_setFee(firmware: Firmware,
     """
 
     with client.sign_tx_fee(testCase):
-        moves = []
-        if firmware.is_nano:
-            if testCase.signingMode != TransactionSigningMode.POOL_REGISTRATION_AS_OWNER:
-                moves += [NavInsID.BOTH_CLICK]
-            if testCase.tx.fee > 5 * 1000000:
-                moves += [NavInsID.BOTH_CLICK]
-        else:
-            if testCase.tx.fee > 5 * 1000000:
-                moves += [NavInsID.SWIPE_CENTER_TO_LEFT]
-            else:
-                moves += [NavInsID.TAPPABLE_CENTER_TAP]
+        moves = compile_plan(firmware, testCase).fee
         if len(moves) > 0:
             navigator.navigate(moves)
         else:
@@ -498,60 +574,10 @@ def _signTx_setCertificates(firmware: Firmware,
         testCase (SignTxTestCase): The test case
     """
 
-    for certificate in testCase.tx.certificates:
+    plan = compile_plan(firmware, testCase)
+    for certificate, moves in zip(testCase.tx.certificates, plan.certificates):
         with client.sign_tx_certificate(certificate):
             if firmware.is_nano:
-                moves = []
-                if testCase.signingMode == TransactionSigningMode.MULTISIG_TRANSACTION:
-                    if certificate.type in (CertificateType.STAKE_REGISTRATION,
-                                            CertificateType.STAKE_DEREGISTRATION,
-                                            CertificateType.STAKE_DELEGATION):
-                        moves += [NavInsID.BOTH_CLICK]
-                        if certificate.params.stakeCredential.type == CredentialParamsType.KEY_PATH:
-                            moves += [NavInsID.BOTH_CLICK]
-                        moves += [NavInsID.RIGHT_CLICK]
-                if certificate.type == CertificateType.STAKE_POOL_RETIREMENT:
-                    moves += [NavInsID.RIGHT_CLICK]
-                moves += [NavInsID.BOTH_CLICK]
-                if testCase.signingMode == TransactionSigningMode.MULTISIG_TRANSACTION:
-                    if certificate.type not in (CertificateType.STAKE_REGISTRATION,
-                                                CertificateType.STAKE_DEREGISTRATION,
-                                                CertificateType.STAKE_DELEGATION):
-                        moves += [NavInsID.BOTH_CLICK]
-                else:
-                    moves += [NavInsID.BOTH_CLICK]
-                if isinstance(certificate.params, (AuthorizeCommitteeParams, ResignCommitteeParams)) and \
-                    certificate.params.coldCredential.type != CredentialParamsType.KEY_PATH:
-                    moves += [NavInsID.RIGHT_CLICK]
-                if isinstance(certificate.params, AuthorizeCommitteeParams) and \
-                    certificate.params.hotCredential.type != CredentialParamsType.KEY_PATH:
-                    moves += [NavInsID.RIGHT_CLICK]
-                if certificate.type == CertificateType.AUTHORIZE_COMMITTEE_HOT:
-                    moves += [NavInsID.BOTH_CLICK]
-                if isinstance(certificate.params, VoteDelegationParams):
-                    if certificate.params.dRep.type in (DRepParamsType.KEY_HASH, DRepParamsType.SCRIPT_HASH):
-                        moves += [NavInsID.RIGHT_CLICK]
-                    moves += [NavInsID.BOTH_CLICK]
-                if isinstance(certificate.params, DRepUpdateParams):
-                    moves += [NavInsID.BOTH_CLICK]
-                if isinstance(certificate.params, (StakeRegistrationConwayParams, DRepRegistrationParams)):
-                    moves += [NavInsID.BOTH_CLICK]
-                if isinstance(certificate.params, (ResignCommitteeParams,
-                                                   DRepRegistrationParams,
-                                                   DRepUpdateParams)) and \
-                    certificate.params.anchor is not None:
-                    if len(certificate.params.anchor.url) > 50:
-                        # For URL, navigation depends on url length :(
-                        moves += [NavInsID.RIGHT_CLICK] * 2
-                if certificate.type == CertificateType.RESIGN_COMMITTEE_COLD:
-                    moves += [NavInsID.BOTH_CLICK]
-                if isinstance(certificate.params, (ResignCommitteeParams,
-                                                   DRepRegistrationParams,
-                                                   DRepUpdateParams)) and \
-                    certificate.params.anchor is not None:
-                    moves += [NavInsID.RIGHT_CLICK] + [NavInsID.BOTH_CLICK]
-                moves += [NavInsID.BOTH_CLICK]
-
                 navigator.navigate(moves)
             else:
                 if certificate.type == CertificateType.STAKE_POOL_REGISTRATION:
@@ -841,21 +867,6 @@ def _signTx_addVoterVotes(firmware: Firmware,
         assert response and response.status == Errors.SW_SUCCESS
 
 
-def _signTx_addCollateralInputs(client: CommandSender,
-                                testCase: SignTxTestCase) -> None:
-    """Sign TX Add COLLATERAL INPUTS
-
-    Args:
-        client (CommandSender): The command sender instance
-        testCase (SignTxTestCase): The test case
-    """
-
-    for txInput in testCase.tx.collateralInputs:
-        response = client.sign_tx_collateral_inputs(txInput)
-        # Check the status
-        assert response and response.status == Errors.SW_SUCCESS
-
-
 def _signTx_addCollateralOutputs(firmware: Firmware,
                                  navigator: Navigator,
                                  scenario_navigator: NavigateWithScenario,
@@ -936,21 +947,6 @@ def _signTx_addTotalCollateral(firmware: Firmware,
     assert response and response.status == Errors.SW_SUCCESS
 
 
-def _signTx_addReferenceInputs(client: CommandSender,
-                               testCase: SignTxTestCase) -> None:
-    """Sign TX Add REFERENCE INPUTS
-
-    Args:
-        client (CommandSender): The command sender instance
-        testCase (SignTxTestCase): The test case
-    """
-
-    for txInput in testCase.tx.referenceInputs:
-        response = client.sign_tx_reference_inputs(txInput)
-        # Check the status
-        assert response and response.status == Errors.SW_SUCCESS
-
-
 def _signTx_addRequiredSigners(client: CommandSender,
                                testCase: SignTxTestCase) -> None:
     """Sign TX Add REQUIRED SIGNERS
@@ -1051,8 +1047,7 @@ def _signTx_setWitnesses(firmware: Firmware,
                          scenario_navigator: NavigateWithScenario,
                          client: CommandSender,
                          testCase: SignTxTestCase,
-                         withnessPaths: List[str],
-                         auxData: bool) -> List[Tuple[str, bytes]]:
+                         withnessPaths: List[str]) -> List[Tuple[str, bytes]]:
     """Sign TX Set WITNESSES
 
     Args:
@@ -1062,40 +1057,22 @@ def _signTx_setWitnesses(firmware: Firmware,
         client (CommandSender): The command sender instance
         testCase (SignTxTestCase): The test case
         withnessPaths (List[str]): The witness paths to send
-        auxData (bool): True if the auxiliary data is set, False otherwise
 
     Returns:
         bytes: List of Tuples with path and signature
     """
 
     signatures = []
+    plan = compile_plan(firmware, testCase)
     for path in withnessPaths:
-        moves = []
-        path_elt = path.replace("'","").split("/") # Remove Hardened info
-        if int(path_elt[1]) > 1852 or (len(path_elt) > 4 and int(path_elt[4]) > 2):
-            moves += [NavInsID.BOTH_CLICK] * 2
-        elif auxData:
-            if testCase.tx.auxiliaryData is not None and \
-                testCase.tx.auxiliaryData.type == TxAuxiliaryDataType.CIP36_REGISTRATION:
-                pass
-            elif isinstance(testCase.tx.outputs[0].destination.params, ThirdPartyAddressParams):
-                pass
-            else:
-                moves += [NavInsID.BOTH_CLICK] * 3
-        elif testCase.signingMode == TransactionSigningMode.PLUTUS_TRANSACTION:
-            moves += [NavInsID.BOTH_CLICK] * 2
-        elif testCase.signingMode in (TransactionSigningMode.POOL_REGISTRATION_AS_OWNER,
-                                      TransactionSigningMode.POOL_REGISTRATION_AS_OPERATOR):
-            moves += [NavInsID.BOTH_CLICK]
+        review = plan.witnesses[path]
 
         with client.sign_tx_witness(path):
-            if len(moves) > 0:
+            if review.shown:
                 if firmware.is_nano:
-                    navigator.navigate(moves)
+                    navigator.navigate(review.moves)
                 else:
                     scenario_navigator.address_review_approve(do_comparison=False)
-            else:
-                pass
         # Check the status (Asynchronous)
         response = client.get_async_response()
         # Check the status (Asynchronous)
@@ -1105,6 +1082,50 @@ def _signTx_setWitnesses(firmware: Firmware,
     return signatures
 
 
+def _signTx_setWitnessesBatched(firmware: Firmware,
+                                navigator: Navigator,
+                                scenario_navigator: NavigateWithScenario,
+                                client: CommandSender,
+                                testCase: SignTxTestCase,
+                                withnessPaths: List[str]) -> List[Tuple[str, bytes]]:
+    """Sign TX Set WITNESSES, up to MAX_SIGN_TX_WITNESSES_BATCH per APDU
+
+    Args:
+        firmware (Firmware): The firmware version
+        navigator (Navigator): The navigator instance
+        scenario_navigator (NavigateWithScenario): The scenario navigator instance
+        client (CommandSender): The command sender instance
+        testCase (SignTxTestCase): The test case
+        withnessPaths (List[str]): The witness paths to send
+
+    Returns:
+        bytes: List of Tuples with path and signature
+    """
+
+    signatures = []
+    plan = compile_plan(firmware, testCase)
+    for k in range(0, len(withnessPaths), MAX_SIGN_TX_WITNESSES_BATCH):
+        paths = withnessPaths[k:k + MAX_SIGN_TX_WITNESSES_BATCH]
+        # the witnesses of the batch are shown one after another
+        reviews = [plan.witnesses[path] for path in paths]
+
+        with client.sign_tx_witnesses_batch(paths):
+            for review in reviews:
+                if review.shown:
+                    if firmware.is_nano:
+                        navigator.navigate(review.moves)
+                    else:
+                        scenario_navigator.address_review_approve(do_comparison=False)
+        # Check the status (Asynchronous)
+        response = client.get_async_response()
+        assert response and response.status == Errors.SW_SUCCESS
+        assert len(response.data) == 64 * len(paths)
+        for i, path in enumerate(paths):
+            signatures.append((path, response.data[64 * i:64 * (i + 1)]))
+
+    return signatures
+
+
 def _gatherWitnessPaths(testCase: SignTxTestCase) -> List[str]:
     """Gather the witness paths
 
@@ -1115,75 +1136,7 @@ def _gatherWitnessPaths(testCase: SignTxTestCase) -> List[str]:
         list: The list of unique witness paths
     """
 
-    witnessPaths = []
-    if testCase.signingMode != TransactionSigningMode.MULTISIG_TRANSACTION:
-        # input witnesses
-        for txInput in testCase.tx.inputs:
-            if txInput.path is not None:
-                witnessPaths.append(txInput.path)
-
-        # certificate witnesses
-        if testCase.tx.certificates is not None:
-            for cert in testCase.tx.certificates:
-                if cert.type in (CertificateType.STAKE_DEREGISTRATION,
-                                 CertificateType.STAKE_REGISTRATION_CONWAY,
-                                 CertificateType.STAKE_DEREGISTRATION_CONWAY,
-                                 CertificateType.STAKE_DELEGATION,
-                                 CertificateType.VOTE_DELEGATION):
-                    if cert.params.stakeCredential.type == CredentialParamsType.KEY_PATH:
-                        witnessPaths.append(cert.params.stakeCredential.keyValue)
-
-                elif cert.type in (CertificateType.AUTHORIZE_COMMITTEE_HOT,
-                                   CertificateType.RESIGN_COMMITTEE_COLD):
-                    if cert.params.coldCredential is not None and \
-                        cert.params.coldCredential.type == CredentialParamsType.KEY_PATH:
-                        witnessPaths.append(cert.params.coldCredential.keyValue)
-
-                elif cert.type in (CertificateType.DREP_REGISTRATION,
-                                   CertificateType.DREP_DEREGISTRATION,
-                                   CertificateType.DREP_UPDATE):
-                    assert cert.params.dRepCredential is not None
-                    if cert.params.dRepCredential.type == CredentialParamsType.KEY_PATH:
-                        witnessPaths.append(cert.params.dRepCredential.keyValue)
-
-                elif cert.type == CertificateType.STAKE_POOL_RETIREMENT:
-                    assert cert.params.poolKeyPath is not None
-                    witnessPaths.append(cert.params.poolKeyPath)
-
-                elif cert.type == CertificateType.STAKE_POOL_REGISTRATION:
-                    for poolOwner in cert.params.poolOwners:
-                        if poolOwner.type == TxOutputDestinationType.THIRD_PARTY and \
-                            poolOwner.key.startswith("m/"):
-                            witnessPaths.append(poolOwner.key)
-                    if cert.params.poolKey.type == TxOutputDestinationType.THIRD_PARTY and \
-                        cert.params.poolKey.key.startswith("m/"):
-                        witnessPaths.append(cert.params.poolKey.key)
-
-        # withdrawal witnesses
-        for withdrawal in testCase.tx.withdrawals:
-            if withdrawal.stakeCredential.type == CredentialParamsType.KEY_PATH:
-                witnessPaths.append(withdrawal.stakeCredential.keyValue)
-
-        # required signers witnesses
-        for signer in testCase.tx.requiredSigners:
-            if signer.type == CredentialParamsType.KEY_PATH:
-                witnessPaths.append(signer.addressHex)
-
-        # collateral inputs witnesses
-        for collateral in testCase.tx.collateralInputs:
-            if collateral.path is not None:
-                witnessPaths.append(collateral.path)
-
-        # voting procedures witnesses
-        for voterVotes in testCase.tx.votingProcedures:
-            if voterVotes.voter.type in (VoterType.COMMITTEE_KEY_PATH,
-                                        VoterType.DREP_KEY_PATH,
-                                        VoterType.STAKE_POOL_KEY_PATH):
-                witnessPaths.append(voterVotes.voter.keyValue)
-
-    for path in testCase.additionalWitnessPaths:
-        witnessPaths.append(path)
-
+    witnessPaths = tx_witness_paths(testCase.tx, testCase.signingMode) + testCase.additionalWitnessPaths
     # return uniqness preserving the order
     return list(dict.fromkeys(witnessPaths))
 
@@ -1211,7 +1164,23 @@ def test_signTx_reject(firmware: Firmware,
     if firmware.is_nano:
         pytest.skip("Not supported yet on Nano because Navigation should be reviewed")
 
+    if appFlags['isAppXS']:
+        pytest.skip("Not supported by 'AppXS' version")
+
+    client = CommandSender(backend)
+    if testCase.expected_sw == Errors.SW_REJECTED_BY_POLICY:
+        # The client refuses the transaction before sending it
+        with pytest.raises(ExceptionRAPDU) as predicted:
+            client.sign_tx_test_case(testCase)
+        assert predicted.value.status == Errors.SW_REJECTED_BY_POLICY
+
     with pytest.raises(ExceptionRAPDU) as err:
         # Send the APDU
-        test_signTx(firmware, backend, navigator, scenario_navigator, testCase, appFlags)
+        _signTx(firmware, navigator, scenario_navigator, client, testCase, checkPolicy=False)
     assert err.value.status == testCase.expected_sw
+
+    if testCase.expected_sw == Errors.SW_REJECTED_BY_POLICY:
+        # The app rejects the item predicted by the host policy
+        denied = evaluate_tx(testCase.tx, testCase.signingMode, _gatherWitnessPaths(testCase)).denied
+        assert denied is not None
+        assert client.last_sign_tx_step() == denied.step
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the canonical ordering of the token bundles, against the Sign TX test cases
+"""
+
+from copy import deepcopy
+from dataclasses import replace
+
+import pytest
+
+from ragger.firmware import Firmware
+
+from application_client.command_sender import CommandSender
+from application_client.token_bundle import canonical_key, canonical_token_bundle, canonical_tx
+from application_client.token_bundle import is_canonical_token_bundle
+
+from input_files.signTx import AssetGroup, SignTxTestCase, Token, outputs, mints
+from input_files.signTx import testsByron, testsShelleyNoCertificates, testsShelleyWithCertificates
+from input_files.signTx import testsConwayWithCertificates, testsMultisig, testsAllegra, testsMary
+from input_files.signTx import testsAlonzoTrezorComparison, testsBabbageTrezorComparison
+from input_files.signTx import testsMultidelegation, testsConwayWithoutCertificates, testsConwayVotingProcedures
+from input_files.signTx import testsCatalystRegistration, testsCVoteRegistrationCIP36, testsAlonzo, testsBabbage
+from input_files.signTx import poolRegistrationOwnerTestCases, poolRegistrationOperatorTestCases
+from input_files.signTx import testsInvalidTokenBundleOrdering
+from utils import idTestFunc
+
+
+class _NoBackend:
+    """The Sign TX test case is prepared without exchanging any APDU"""
+
+    firmware = Firmware.NANOX
+
+
+@pytest.mark.parametrize(
+    "testCase",
+    testsByron + testsShelleyNoCertificates + testsShelleyWithCertificates + \
+    testsConwayWithCertificates + testsMultisig + testsAllegra + testsMary + \
+    testsAlonzoTrezorComparison + testsBabbageTrezorComparison + \
+    testsMultidelegation + testsConwayWithoutCertificates + testsConwayVotingProcedures + \
+    testsCatalystRegistration + testsCVoteRegistrationCIP36 + testsAlonzo + testsBabbage + \
+    poolRegistrationOwnerTestCases + poolRegistrationOperatorTestCases,
+    ids=idTestFunc
+)
+def test_token_bundle_signed_tx(testCase: SignTxTestCase) -> None:
+    """Check the transactions signed by the app are kept as they are"""
+
+    assert canonical_tx(testCase.tx) is testCase.tx
+    for txOutput in testCase.tx.outputs:
+        assert canonical_token_bundle(txOutput.tokenBundle) == txOutput.tokenBundle
+    assert canonical_token_bundle(testCase.tx.mint) == testCase.tx.mint
+
+
+@pytest.mark.parametrize("tokenBundle", [
+    outputs["multiassetInvalidAssetGroupOrdering"].tokenBundle,
+    outputs["multiassetInvalidTokenOrderingSameLength"].tokenBundle,
+    outputs["multiassetInvalidTokenOrderingDifferentLengths"].tokenBundle,
+    mints["mintInvalidCanonicalOrderingPolicy"],
+    mints["mintInvalidCanonicalOrderingAssetName"],
+])
+def test_token_bundle_sorted(tokenBundle: list) -> None:
+    """Check the token bundles rejected by the app for their order are sorted"""
+
+    original = deepcopy(tokenBundle)
+    assert not is_canonical_token_bundle(tokenBundle)
+    sortedBundle = canonical_token_bundle(tokenBundle)
+    assert is_canonical_token_bundle(sortedBundle)
+    assert tokenBundle == original
+    # the same items, only the order changes
+    assert sorted((group.policyIdHex, token.assetNameHex, token.amount)
+                  for group in sortedBundle for token in group.tokens) == \
+           sorted((group.policyIdHex, token.assetNameHex, token.amount)
+                  for group in tokenBundle for token in group.tokens)
+
+
+@pytest.mark.parametrize("tokenBundle", [
+    outputs["multiassetAssetGroupsNotUnique"].tokenBundle,
+    outputs["multiassetTokensNotUnique"].tokenBundle,
+])
+def test_token_bundle_not_unique(tokenBundle: list) -> None:
+    """Check the repeated policy ids and asset names are rejected"""
+
+    assert not is_canonical_token_bundle(tokenBundle)
+    with pytest.raises(ValueError):
+        canonical_token_bundle(tokenBundle)
+
+
+def test_token_bundle_canonical_order() -> None:
+    """Check the shorter keys come first, then the keys are compared byte by byte"""
+
+    names = ["ff", "0000", "", "01", "00ff", "00"]
+    group = AssetGroup("75a292ffee938be03e9bae5657982a74e9014eb4960108c9e23a5b39",
+                       [Token(name, index) for index, name in enumerate(names)])
+    [sortedGroup] = canonical_token_bundle([group])
+    assert [token.assetNameHex for token in sortedGroup.tokens] == ["", "00", "01", "ff", "0000", "00ff"]
+    assert canonical_key("FF") == canonical_key("ff")
+
+
+def test_token_bundle_tx() -> None:
+    """Check the outputs, collateral output and mint of a transaction are sorted"""
+
+    testCase = testsBabbage[0]
+    misordered = outputs["multiassetInvalidAssetGroupOrdering"]
+    tx = deepcopy(testCase.tx)
+    tx.outputs = tx.outputs + [misordered]
+    tx.collateralOutput = misordered
+    tx.mint = mints["mintInvalidCanonicalOrderingPolicy"]
+
+    canonical = canonical_tx(tx)
+    assert canonical is not tx
+    assert canonical.outputs[:-1] == tx.outputs[:-1]
+    assert tx.outputs[-1] is misordered
+    assert canonical.collateralOutput is not None
+    for tokenBundle in (canonical.outputs[-1].tokenBundle, canonical.collateralOutput.tokenBundle, canonical.mint):
+        assert is_canonical_token_bundle(tokenBundle)
+    assert canonical_tx(canonical) is canonical
+
+
+def test_token_bundle_command_sender() -> None:
+    """Check the Sign TX flow of the client sends canonical token bundles, unless the test case opts out"""
+
+    client = CommandSender(_NoBackend())  # type: ignore[arg-type]
+    testCase = testsBabbage[0]
+    assert client.sign_tx_test_case(testCase) is testCase
+
+    for testCase in testsInvalidTokenBundleOrdering:
+        assert not testCase.canonical
+        assert client.sign_tx_test_case(testCase) is testCase
+
+    testCase = replace(testsInvalidTokenBundleOrdering[0], canonical=True)
+    sent = client.sign_tx_test_case(testCase)
+    assert sent.tx == canonical_tx(testCase.tx)
+    assert is_canonical_token_bundle(sent.tx.outputs[0].tokenBundle)
+    assert not is_canonical_token_bundle(testCase.tx.outputs[0].tokenBundle)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides Ragger tests replaying recorded APDU transcripts
+
+Record the transcripts with:
+    pytest --device nanox --record_transcripts transcripts -k signTx
+then replay them, checking the responses against the recorded ones:
+    pytest --device nanox --replay_transcripts transcripts test_transcripts.py
+"""
+
+import json
+from pathlib import Path
+import pytest
+
+from ragger.backend import BackendInterface
+from ragger.backend.interface import RAPDU
+from ragger.firmware import Firmware
+from speculos.mcu.automation import Automation
+
+from application_client.app_def import Errors
+from application_client.transcript import Transcript, TranscriptRecorder, EntryKind, ScreenText
+from application_client.transcript import set_automation_rules, replay
+
+from screen_navigator import approve_rules, replay_rules, split_screens
+
+
+def test_transcript_format() -> None:
+    """Check a transcript is unchanged by a save/load round trip"""
+
+    recorder = TranscriptRecorder()
+    recorder.record_marker("test")
+    recorder.record_command(bytes.fromhex("d700000000"))
+    recorder.record_response(RAPDU(0x9000, bytes.fromhex("07000000")))
+    recorder.record_command(bytes.fromhex("d721010000"))
+    recorder.record_interaction()
+    recorder.record_texts([ScreenText("New ordinary", 20, 3), ScreenText("transaction?", 20, 17)])
+    recorder.record_response(RAPDU(0x6e07, b""))
+
+    transcript = Transcript.from_bytes(recorder.transcript.to_bytes())
+    assert transcript == recorder.transcript
+    assert [entry.kind for entry in transcript.entries] == [EntryKind.MARKER,
+                                                            EntryKind.COMMAND,
+                                                            EntryKind.RESPONSE,
+                                                            EntryKind.COMMAND,
+                                                            EntryKind.INTERACTION,
+                                                            EntryKind.TEXT,
+                                                            EntryKind.TEXT,
+                                                            EntryKind.RESPONSE]
+
+    exchanges = transcript.exchanges()
+    assert len(exchanges) == 2
+    assert not exchanges[0].interactive and exchanges[0].status == 0x9000
+    assert exchanges[1].interactive and exchanges[1].status == 0x6e07 and exchanges[1].data == b""
+    assert not exchanges[0].texts
+    assert exchanges[1].texts == [ScreenText("New ordinary", 20, 3), ScreenText("transaction?", 20, 17)]
+
+
+def _recordedReview(rejected: bool) -> Transcript:
+    """Sign TX init on a Nano X, then an output reviewed and approved or rejected"""
+
+    recorder = TranscriptRecorder()
+    recorder.record_command(bytes.fromhex("d721010000"))
+    recorder.record_interaction()
+    recorder.record_texts([ScreenText("New ordinary", 20, 3), ScreenText("transaction?", 20, 17)])
+    recorder.record_response(RAPDU(Errors.SW_SUCCESS, b""))
+    recorder.record_command(bytes.fromhex("d721030000"))
+    recorder.record_interaction()
+    recorder.record_texts([ScreenText("Send to address (1/2)", 10, 3), ScreenText("addr1q9", 10, 17),
+                           ScreenText("Send to address (2/2)", 10, 3), ScreenText("0d3f", 10, 17),
+                           ScreenText("Send", 10, 3), ScreenText("0.42 ADA", 10, 17),
+                           ScreenText("Confirm", 20, 3), ScreenText("output?", 20, 17)])
+    if rejected:
+        recorder.record_texts([ScreenText("Reject?", 20, 3)])
+        recorder.record_response(RAPDU(Errors.SW_REJECTED_BY_USER, b""))
+    else:
+        recorder.record_response(RAPDU(Errors.SW_SUCCESS, b""))
+    return recorder.transcript
+
+
+def _pressed(automation: Automation, texts: list) -> list:
+    """Buttons pressed by the automation rules for the texts drawn one after the other"""
+
+    pressed = []
+    for text in texts:
+        actions = automation.get_actions(text.text, text.x, text.y)
+        for action in actions:
+            if action[0] == "setbool":
+                automation.set_bool(action[1], action[2])
+        pressed.append(tuple(action[1] for action in actions if action[0] == "button" and action[2]))
+    return pressed
+
+
+def test_transcript_screens() -> None:
+    """Check the texts are grouped by screen, a screen starting from the top"""
+
+    transcript = _recordedReview(rejected=False)
+    screens = split_screens(transcript.exchanges()[1].texts)
+    assert [[text.text for text in screen] for screen in screens] == [["Send to address (1/2)", "addr1q9"],
+                                                                        ["Send to address (2/2)", "0d3f"],
+                                                                        ["Send", "0.42 ADA"],
+                                                                        ["Confirm", "output?"]]
+
+
+@pytest.mark.parametrize("rejected", [False, True])
+def test_transcript_replay_rules(rejected: bool) -> None:
+    """Check the generated rules answer each recorded screen once, in the recorded order"""
+
+    transcript = _recordedReview(rejected)
+    texts = [text for exchange in transcript.exchanges() for text in exchange.texts]
+    automation = Automation(json.dumps(replay_rules(Firmware.NANOX, transcript)))
+    both, right = (1, 2), (2,)
+    # a press per screen: the prompt, the address pages, the amount, then the output prompt
+    expected = [both, (), right, (), both, (), both, ()]
+    expected += [right, (), both] if rejected else [both, ()]
+    assert _pressed(automation, texts) == expected
+
+    # the Nano S prompts are answered by a single button
+    automation = Automation(json.dumps(replay_rules(Firmware.NANOS, transcript)))
+    assert _pressed(automation, texts[:2]) == [right, ()]
+
+
+def test_transcript_approve_rules() -> None:
+    """Check the prompts are approved once, by both buttons or the right one on Nano S"""
+
+    automation = Automation(json.dumps(approve_rules(Firmware.NANOX)))
+    prompt = [ScreenText("New ordinary", 20, 3), ScreenText("transaction?", 20, 17)]
+    assert _pressed(automation, prompt) == [(1, 2), ()]
+    automation = Automation(json.dumps(approve_rules(Firmware.NANOS)))
+    assert _pressed(automation, prompt) == [(2,), ()]
+
+
+def test_transcript_replay(firmware: Firmware,
+                           backend: BackendInterface,
+                           automationRules: dict,
+                           transcriptPath: Path,
+                           request) -> None:
+    """Replay a recorded transcript, the UI is answered by the automation rules"""
+
+    transcript = Transcript.load(transcriptPath)
+    interactions = [exchange for exchange in transcript.exchanges() if exchange.interactive]
+    if interactions:
+        if automationRules:
+            # the given rules cannot tell the screens to reject from the ones to approve
+            if any(exchange.rejected for exchange in interactions):
+                pytest.skip("Rejected prompts are not replayed with the given automation rules")
+            set_automation_rules(backend, automationRules)
+        elif firmware.is_nano and all(exchange.texts for exchange in interactions):
+            set_automation_rules(backend, replay_rules(firmware, transcript))
+        else:
+            pytest.skip("Automation rules needed for the UI interactions (--replay_automation)")
+
+    replay(backend, transcript, check=not request.config.getoption("replay_no_check"))
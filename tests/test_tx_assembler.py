@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the signed transaction assembler, with dummy witness signatures
+"""
+
+from hashlib import blake2b
+
+import cbor
+
+from application_client.app_def import ProtocolMagics
+from application_client.tx_assembler import assemble_signed_tx, byron_address_attributes, cip36_auxiliary_data
+
+from input_files.signTx import testsBabbage, testsByron, testsShelleyNoCertificates
+from utils import get_device_keys, verify_signed_tx
+
+
+def test_tx_assembler() -> None:
+    """Check the vkey and bootstrap witnesses, and the tx body kept as it is"""
+
+    txBody = bytes.fromhex(testsBabbage[0].txBody)
+    signatures = [
+        ("m/1852'/1815'/0'/0/0", bytes(range(64))),
+        ("m/44'/1815'/0'/0/0", bytes(range(1, 65))),
+        ("m/1852'/1815'/0'/0/0", bytes(range(64))),
+    ]
+    signedTx = assemble_signed_tx(txBody, signatures, get_device_keys)
+    verify_signed_tx(txBody, signedTx, signatures)
+
+    _, witnessSet, _, auxiliaryData = cbor.loads(signedTx)
+    publicKey, chainCode = get_device_keys("m/1852'/1815'/0'/0/0")
+    assert witnessSet[0] == [[publicKey, bytes(range(64))]]
+    publicKey, chainCode = get_device_keys("m/44'/1815'/0'/0/0")
+    assert witnessSet[2] == [[publicKey, bytes(range(1, 65)), chainCode, b"\xa0"]]
+    assert auxiliaryData is None
+
+
+def test_tx_assembler_full_tx() -> None:
+    """Check the witnesses and auxiliary data of an unsigned full transaction are kept"""
+
+    testCase = testsByron[0]
+    txBody = bytes.fromhex(testCase.txBody)
+    # [body, {0: [existing vkey witness], 1: [native script]}, valid, aux data]
+    existing = [b"\x01" * 32, b"\x02" * 64]
+    fullTx = b"\x84" + txBody + cbor.dumps({0: [existing], 1: [[0, b"\x03" * 28]]}) + b"\xf5" + b"\xa1\x00\x00"
+    signatures = [("m/44'/1815'/0'/0/0", bytes(64))]
+    signedTx = assemble_signed_tx(fullTx, signatures, get_device_keys, ProtocolMagics.TESTNET_LEGACY)
+
+    assert signedTx[1:1 + len(txBody)] == txBody
+    _, witnessSet, isValid, auxiliaryData = cbor.loads(signedTx)
+    assert witnessSet[0] == [existing]
+    assert witnessSet[1] == [[0, b"\x03" * 28]]
+    assert witnessSet[2][0][3] == byron_address_attributes(ProtocolMagics.TESTNET_LEGACY)
+    assert cbor.loads(witnessSet[2][0][3]) == {2: cbor.dumps(ProtocolMagics.TESTNET_LEGACY)}
+    assert (isValid, auxiliaryData) == (True, {0: 0})
+
+
+def test_tx_assembler_set_tags() -> None:
+    """Check the witness sets are tagged when the body uses the Conway set encoding"""
+
+    testCase = testsShelleyNoCertificates[1]
+    assert testCase.name == "Sign tx with 258 tag on inputs"
+    txBody = bytes.fromhex(testCase.txBody)
+    signatures = [("m/1852'/1815'/0'/0/0", bytes(64))]
+    signedTx = assemble_signed_tx(txBody, signatures, get_device_keys)
+    verify_signed_tx(txBody, signedTx, signatures)
+
+    _, witnessSet, _, _ = cbor.loads(signedTx)
+    assert witnessSet[0].tag == 258
+    assert witnessSet[0].value == [[get_device_keys("m/1852'/1815'/0'/0/0")[0], bytes(64)]]
+    # the tag is kept when the unsigned transaction is assembled again
+    assert cbor.loads(assemble_signed_tx(signedTx, signatures, get_device_keys))[1][0].tag == 258
+
+
+def test_tx_assembler_auxiliary_data() -> None:
+    """Check the CIP-15 / CIP-36 auxiliary data against the vectors of src/test/auxDataHashBuilder_test.c"""
+
+    signature = bytes.fromhex("0ea4a424522dd485f16466cd5a754f3c8dbd4d1976c912624e3465c540b1d077"
+                              "6c92633fc64be057f947aac561012fe55acd3c54ef7bece0da0b90cf02dc760d")
+    cip15 = cip36_auxiliary_data(
+        [(bytes.fromhex("3b40265111d8bb3c3c608d95b3a0bf83461ace32d79336579a1939b3aad1c0b7"), None)],
+        bytes.fromhex("bc65be1b0b9d7531778a1317c2aa6de936963c3f9ac7d5ee9e9eda25e0c97c5e"),
+        bytes.fromhex("0180f9e2c88e6c817008f3a812ed889b4a4da8e0bd103f86e7335422aa122a94"
+                      "6b9ad3d2ddf029d3a828f0468aece76895f15c9efbd69b4277"),
+        22634813, None, signature)
+    assert blake2b(cip15, digest_size=32).hexdigest() == \
+        "07cdec3a795626019739f275582433eabe32da80f82aeb74e4916b547c01a589"
+
+    cip36 = cip36_auxiliary_data(
+        [(bytes.fromhex("a6a3c0447aeb9cc54cf6422ba32b294e5e1c3ef6d782f2acff4a70694c4d1663"), 1),
+         (bytes.fromhex("00588e8e1d18cba576a4d35758069fe94e53f638b6faf7c07b8abd2bc5c5cdee"), 3)],
+        bytes.fromhex("86870efc99c453a873a16492ce87738ec79a0ebd064379a62e2c9cf4e119219e"),
+        bytes.fromhex("e0ae3a0a7aeda4aea522e74e4fe36759fca80789a613a58a4364f6ecef"),
+        1234, 0, signature)
+    assert blake2b(cip36, digest_size=32).hexdigest() == \
+        "3786b3ad677129e43dbb3456e45e5af589e9aae81062ef7e26f15fde00df421d"
+    # the signed payload is the map of the single registration entry
+    payload = cbor.dumps({61284: cbor.loads(cip36)[0][61284]})
+    assert blake2b(payload, digest_size=32).hexdigest() == \
+        "5bc0681f173efd76e1989037a3694b8a7abea22053f5940cbb5cfcdf721007d7"
+
+    txBody = bytes.fromhex(testsBabbage[0].txBody)
+    signedTx = assemble_signed_tx(txBody, [], get_device_keys, auxiliaryData=cip36)
+    assert signedTx.endswith(cip36)
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+# SPDX-FileCopyrightText: 2024 Ledger SAS
+# SPDX-License-Identifier: LicenseRef-LEDGER
+"""
+This module provides tests of the CBOR transaction importer, on the tx bodies of the signTx test cases
+"""
+
+import json
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from application_client.tx_importer import CBOR_ARRAY, CBOR_MAP, CBOR_TAG, CborReader, load_tx, tx_from_cbor
+
+from input_files import signTx
+from input_files.signTx import Certificate, CertificateType, CredentialParams, PoolKey, PoolKeyType
+from input_files.signTx import PoolRegistrationParams, RelayType
+from input_files.signTx import SignTxTestCase, ThirdPartyAddressParams, TxInput, TxOutput, TxOutputDestinationType
+
+
+# test cases whose tx body differs from the transaction in one field, which is not compared
+_MISMATCHED_TX_BODY = {
+    # the body has a single Conway stake deregistration instead of the five vote delegations
+    "Sign tx with vote delegation certificates": "certificates",
+    # the body spends another collateral utxo
+    "Sign tx with collateral inputs": "collateralInputs",
+    # the transaction has no collateral output, unlike the body (and the name)
+    "Sign tx with change output as map and collateral output as array": "collateralOutput",
+    # the transaction has an output, unlike the body (and the name)
+    "Witness pool registration without outputs": "outputs",
+}
+
+
+def _testCases() -> List[SignTxTestCase]:
+    testCases = []
+    for value in vars(signTx).values():
+        if isinstance(value, list) and value and isinstance(value[0], SignTxTestCase):
+            testCases += [testCase for testCase in value if testCase.txBody]
+    return testCases
+
+
+def _inputs(txInputs: List[TxInput]) -> list:
+    return [(txInput.txHashHex, txInput.outputIndex) for txInput in txInputs]
+
+
+def _output(output: Optional[TxOutput]) -> Optional[tuple]:
+    if output is None:
+        return None
+    address = None
+    if output.destination.type == TxOutputDestinationType.THIRD_PARTY:
+        assert isinstance(output.destination.params, ThirdPartyAddressParams)
+        address = output.destination.params.addressHex
+    return (address, output.amount, output.tokenBundle, output.datum, getattr(output, "referenceScriptHex", None))
+
+
+def _hashOnly(value: object) -> bool:
+    """Whether the key, credential or pool key is given by its hash, the only ones found in a tx body"""
+
+    if isinstance(value, CredentialParams):
+        return value.keyValue is not None and not value.keyValue.startswith("m/")
+    if isinstance(value, PoolKey):
+        return value.type == PoolKeyType.THIRD_PARTY
+    if isinstance(value, list):
+        return all(_hashOnly(v) for v in value)
+    return all(_hashOnly(v) for v in vars(value).values() if isinstance(v, (CredentialParams, PoolKey, list)))
+
+
+def _comparable(certificate: Certificate) -> bool:
+    """Whether the certificate of the test case has no path, the pool retirement is always given by a path"""
+
+    return certificate.type != CertificateType.STAKE_POOL_RETIREMENT and _hashOnly(certificate.params)
+
+
+@pytest.mark.parametrize("testCase", _testCases(), ids=lambda testCase: testCase.name)
+def test_tx_importer(testCase: SignTxTestCase) -> None:
+    """Check the transaction imported from the tx body against the test case, except the derivation paths"""
+
+    expected = testCase.tx
+    tx = tx_from_cbor(bytes.fromhex(testCase.txBody))
+    mismatched = _MISMATCHED_TX_BODY.get(testCase.name)
+
+    assert tx.network.networkId == expected.network.networkId
+    assert _inputs(tx.inputs) == _inputs(expected.inputs)
+    if mismatched != "outputs":
+        assert [_output(o)[1:] for o in tx.outputs] == [_output(o)[1:] for o in expected.outputs]
+        for output, expectedOutput in zip(tx.outputs, expected.outputs):
+            if expectedOutput.destination.type == TxOutputDestinationType.THIRD_PARTY:
+                assert _output(output) == _output(expectedOutput)
+    assert (tx.fee, tx.ttl, tx.validityIntervalStart) == (expected.fee, expected.ttl, expected.validityIntervalStart)
+    assert [w.amount for w in tx.withdrawals] == [w.amount for w in expected.withdrawals]
+    assert tx.mint == expected.mint
+    assert tx.scriptDataHash == expected.scriptDataHash
+    if mismatched != "collateralInputs":
+        assert _inputs(tx.collateralInputs) == _inputs(expected.collateralInputs)
+    assert len(tx.requiredSigners) == len(expected.requiredSigners)
+    assert bool(tx.includeNetworkId) == bool(expected.includeNetworkId)
+    if mismatched != "collateralOutput":
+        collateralOutput, expectedCollateralOutput = _output(tx.collateralOutput), _output(expected.collateralOutput)
+        assert (collateralOutput is None) == (expectedCollateralOutput is None)
+        if collateralOutput is not None and expectedCollateralOutput is not None:
+            assert collateralOutput[1:] == expectedCollateralOutput[1:]
+    assert (tx.totalCollateral, tx.treasury, tx.donation) == (expected.totalCollateral, expected.treasury, expected.donation)
+    assert _inputs(tx.referenceInputs) == _inputs(expected.referenceInputs)
+    if mismatched != "certificates":
+        assert [c.type for c in tx.certificates] == [c.type for c in expected.certificates]
+        for certificate, expectedCertificate in zip(tx.certificates, expected.certificates):
+            if _comparable(expectedCertificate):
+                assert certificate == expectedCertificate
+    assert [len(v.votes) for v in tx.votingProcedures] == [len(v.votes) for v in expected.votingProcedures]
+    assert (tx.auxiliaryData is None) == (expected.auxiliaryData is None)
+
+
+def test_tx_importer_formats(tmp_path: Path) -> None:
+    """Check the full tx, text envelope, hex and binary files, and the indefinite lengths"""
+
+    testCase = signTx.testsBabbage[0]
+    body = bytes.fromhex(testCase.txBody)
+    expected = tx_from_cbor(body)
+
+    # [body, witnesses, valid, aux data]
+    fullTx = b"\x84" + body + b"\xa0\xf5\xf6"
+    assert tx_from_cbor(fullTx) == expected
+    envelope = {"type": "Tx ConwayEra", "description": "", "cborHex": fullTx.hex()}
+    (tmp_path / "tx.json").write_text(json.dumps(envelope))
+    (tmp_path / "tx.hex").write_text(body.hex() + "\n")
+    (tmp_path / "tx.cbor").write_bytes(body)
+    for name in ("tx.json", "tx.hex", "tx.cbor"):
+        assert load_tx(tmp_path / name) == expected
+
+    reader = CborReader(bytes.fromhex("9f01820203ff5f42aabb41ccff7f61616162ff"))
+    assert reader.read_array() is None
+    items = []
+    while reader.has_next(None, len(items)):
+        items.append(reader.read_item().hex())
+    assert items == ["01", "820203"]
+    assert bytes(reader.read_bytes()) == bytes.fromhex("aabbcc")
+    assert reader.read_text() == "ab"
+    assert reader.at_end()
+
+    with pytest.raises(ValueError):
+        tx_from_cbor(body[:-1])
+
+
+def _indefinite(data: bytes, reader: CborReader, out: bytearray, minDepth: int, depth: int = 0) -> None:
+    """Copies the next item, the arrays from minDepth on being turned into indefinite length arrays"""
+
+    start = reader.offset
+    major = reader.peek_type()
+    if major == CBOR_ARRAY:
+        count = reader.read_array()
+        out += b"\x9f" if depth >= minDepth else data[start:reader.offset]
+        i = 0
+        while reader.has_next(count, i):
+            _indefinite(data, reader, out, minDepth, depth + 1)
+            i += 1
+        if depth >= minDepth or count is None:
+            out += b"\xff"
+    elif major == CBOR_MAP:
+        count = reader.read_map()
+        out += data[start:reader.offset]
+        i = 0
+        while reader.has_next(count, i):
+            _indefinite(data, reader, out, minDepth, depth + 1)
+            _indefinite(data, reader, out, minDepth, depth + 1)
+            i += 1
+        if count is None:
+            out += b"\xff"
+    elif major == CBOR_TAG:
+        reader.read_tag()
+        out += data[start:reader.offset]
+        _indefinite(data, reader, out, minDepth, depth)
+    else:
+        out += reader.read_item()
+
+
+def _indefiniteBody(txBody: str, minDepth: int) -> bytes:
+    data = bytes.fromhex(txBody)
+    reader = CborReader(data)
+    out = bytearray()
+    _indefinite(data, reader, out, minDepth)
+    assert reader.at_end()
+    return bytes(out)
+
+
+# minDepth 1: all the arrays, 2: the items of the definite length lists (e.g. outputs, certificates)
+@pytest.mark.parametrize("minDepth", [1, 2])
+@pytest.mark.parametrize("testCase", _testCases(), ids=lambda testCase: testCase.name)
+def test_tx_importer_indefinite_lengths(testCase: SignTxTestCase, minDepth: int) -> None:
+    """Check the tx bodies whose arrays have an indefinite length are imported as the original ones"""
+
+    txBody = _indefiniteBody(testCase.txBody, minDepth)
+    assert txBody != bytes.fromhex(testCase.txBody)
+    assert tx_from_cbor(txBody) == tx_from_cbor(bytes.fromhex(testCase.txBody))
+
+
+def test_tx_importer_indefinite_pool_registration() -> None:
+    """Check the relays and the metadata of a pool registration in indefinite length arrays"""
+
+    [testCase] = [testCase for testCase in signTx.poolRegistrationOwnerTestCases
+                  if testCase.name == "Witness pool registration without outputs"]
+    expected = testCase.tx.certificates[0].params
+    assert isinstance(expected, PoolRegistrationParams) and expected.metadata is not None
+    assert {relay.type for relay in expected.relays} == set(RelayType)
+
+    for minDepth in (1, 2):
+        [certificate] = tx_from_cbor(_indefiniteBody(testCase.txBody, minDepth)).certificates
+        assert isinstance(certificate.params, PoolRegistrationParams)
+        assert certificate.params.relays == expected.relays
+        assert certificate.params.metadata == expected.metadata
+
+
+# {0: [[hash, 0]], 1: [output], 2: 42}
+_TX_INPUTS = "00818258203b40265111d8bb3c3c608d95b3a0bf83461ace32d79336579a1939b3aad1c0b700"
+_ADDRESS = "581d61" + "14c16d7f43243bd81478e68b9db53a8528fd4fb1078d58d54a7f1124"
+
+
+@pytest.mark.parametrize("outputs", [
+    # indefinite length output in a definite length array
+    "81" + "9f" + _ADDRESS + "01" + "ff",
+    # indefinite length output in an indefinite length array
+    "9f" + "9f" + _ADDRESS + "01" + "ff" + "ff",
+    # with a datum hash
+    "81" + "9f" + _ADDRESS + "01" + "5820" + "aa" * 32 + "ff",
+    "9f" + "9f" + _ADDRESS + "01" + "5820" + "aa" * 32 + "ff" + "ff",
+])
+def test_tx_importer_indefinite_legacy_output(outputs: str) -> None:
+    """Check the legacy outputs [address, amount, ? datum hash] of indefinite length"""
+
+    tx = tx_from_cbor(bytes.fromhex("a3" + _TX_INPUTS + "01" + outputs + "02182a"))
+    [output] = tx.outputs
+    assert (output.amount, tx.fee) == (1, 42)
+    assert output.datum is None or output.datum.datumHex == "aa" * 32
+
+
+@pytest.mark.parametrize("item", [
+    # legacy output with 4 items
+    "01" + "81" + "84" + _ADDRESS + "01" + "5820" + "aa" * 32 + "00",
+    "01" + "81" + "9f" + _ADDRESS + "01" + "5820" + "aa" * 32 + "00" + "ff",
+    # legacy output without amount
+    "01" + "81" + "9f" + _ADDRESS + "ff",
+    # stake registration [0, credential] with an extra item, or without credential
+    "04" + "81" + "83" + "00" + "8200581c" + "11" * 28 + "00",
+    "04" + "81" + "9f" + "00" + "8200581c" + "11" * 28 + "00" + "ff",
+    "04" + "81" + "81" + "00",
+])
+def test_tx_importer_invalid_arity(item: str) -> None:
+    """Check the arrays of a wrong number of items are rejected, whatever their length encoding"""
+
+    with pytest.raises(ValueError, match="Invalid"):
+        tx_from_cbor(bytes.fromhex("a3" + _TX_INPUTS + item + "02182a"))
@@ -7,16 +7,16 @@ This module provides Ragger tests utility functions
 from pathlib import Path
 from typing import List, Tuple, Union
 import re
-import hashlib
+import cbor
 from bip_utils import Bip44, Bip44Coins, Bip44Changes, Bip39SeedGenerator
 from bip_utils.bip.bip32.bip32_path import Bip32Path, Bip32PathParser
 
-from ecdsa.curves import Ed25519
-from ecdsa.keys import VerifyingKey
 from ragger.bip import calculate_public_key_and_chaincode, CurveChoice
 from ragger.bip.seed import SPECULOS_MNEMONIC
 
+from application_client.address_engine import header_byte, key_hash, pointer_bytes
 from application_client.app_def import AddressType
+from reference_signer import ReferenceSigner
 
 from input_files.cvote import CVoteTestCase
 from input_files.derive_address import DeriveAddressTestCase
@@ -29,6 +29,9 @@ from input_files.signTx import SignTxTestCase
 
 ROOT_SCREENSHOT_PATH = Path(__file__).parent.resolve()
 
+# expected signatures of the Speculos seed, see --signature_cache
+REFERENCE_SIGNER = ReferenceSigner()
+
 
 TestCases = Union[
     CVoteTestCase,
@@ -120,41 +123,23 @@ def _deriveAddressByron(testCase: DeriveAddressTestCase) -> str:
 
 def _deriveAddressShelley(testCase: DeriveAddressTestCase) -> bytes:
     """Derive the Shelley base address from the path"""
-    key = f"{(int(testCase.addrType) << 4) | int(testCase.netDesc.networkId):02x}"
+    address = bytes([header_byte(testCase.addrType, testCase.netDesc.networkId)])
     if testCase.spendingValue.startswith("m/"):
         pk, _ = get_device_pubkey(testCase.spendingValue)
-        key += hashlib.blake2b(pk, digest_size=28).digest().hex()
+        address += key_hash(pk)
     else:
-        key += testCase.spendingValue
+        address += bytes.fromhex(testCase.spendingValue)
     if testCase.addrType in (AddressType.POINTER_KEY,
                              AddressType.POINTER_SCRIPT):
-        key += _appenduint32(int(testCase.stakingValue[0:8], 16))
-        key += _appenduint32(int(testCase.stakingValue[8:16], 16))
-        key += _appenduint32(int(testCase.stakingValue[16:24], 16))
+        address += pointer_bytes(int(testCase.stakingValue[0:8], 16),
+                                 int(testCase.stakingValue[8:16], 16),
+                                 int(testCase.stakingValue[16:24], 16))
     elif testCase.stakingValue.startswith("m/"):
         pk, _ = get_device_pubkey(testCase.stakingValue)
-        key += hashlib.blake2b(pk, digest_size=28).digest().hex()
+        address += key_hash(pk)
     else:
-        key += testCase.stakingValue
-    return bytes.fromhex(key)
-
-
-def _appenduint32(value: int) -> str:
-    """Append a Variable Length uint32 to a buffer"""
-
-    if value == 0:
-        return "00"
-
-    chunks: list[int] = []
-    while value:
-        chunks.append(value & 0x7F)
-        value >>= 7
-
-    result = ""
-    while len(chunks) > 1:
-        result += f"{chunks.pop() | 0x80:02x}"
-    result += f"{chunks.pop():02x}"
-    return result
+        address += bytes.fromhex(testCase.stakingValue)
+    return address
 
 
 def get_device_pubkey(path: str) -> Tuple[bytes, str]:
@@ -170,8 +155,21 @@ def get_device_pubkey(path: str) -> Tuple[bytes, str]:
     return bytes.fromhex(ref_pk[2:]), ref_chain_code
 
 
+def get_device_keys(path: str) -> Tuple[bytes, bytes]:
+    """ Retrieve the Public Key and the Chain Code, for the witnesses of a signed transaction
+
+    Args:
+        path (str): Derivation path
+
+    Returns:
+        The Reference PK and Chain Code
+    """
+    ref_pk, ref_chain_code = get_device_pubkey(path)
+    return ref_pk, bytes.fromhex(ref_chain_code)
+
+
 def verify_signature(path: str, signature: bytes, data: bytes) -> None:
-    """Check the signature validity
+    """Check the signature validity, against the one of the reference signer
 
     Args:
         path (str): The derivation path
@@ -179,9 +177,29 @@ def verify_signature(path: str, signature: bytes, data: bytes) -> None:
         data (bytes): The signed data
     """
 
-    ref_pk, _ = get_device_pubkey(path)
-    pk: VerifyingKey = VerifyingKey.from_string(ref_pk, curve=Ed25519)
-    assert pk.verify(signature, data, hashlib.sha512)
+    assert signature == REFERENCE_SIGNER.sign(path, data)
+
+
+def verify_signed_tx(txBody: bytes, signedTx: bytes, signatures: List[Tuple[str, bytes]]) -> None:
+    """Check the signed transaction assembled from the witnesses
+
+    Args:
+        txBody (bytes): The tx body, kept as it is
+        signedTx (bytes): The signed transaction
+        signatures (List): The (path, signature) of the witnesses
+    """
+
+    assert signedTx[1:1 + len(txBody)] == txBody
+    _, witnessSet, isValid, _ = cbor.loads(signedTx)
+    assert isValid is True
+    witnesses = dict(signatures)
+    byronPaths = [path for path in witnesses if path.startswith("m/44'")]
+    # the witness arrays are tagged as sets (258) for the Conway set encoding
+    vkeys, bootstraps = [getattr(items, "value", items) for items in (witnessSet.get(0, []), witnessSet.get(2, []))]
+    assert len(vkeys) == len(witnesses) - len(byronPaths)
+    assert len(bootstraps) == len(byronPaths)
+    for witness in vkeys + bootstraps:
+        assert witness[1] in witnesses.values()
 
 
 def verify_version(version: str) -> None:
@@ -0,0 +1,69 @@
+#include <stdio.h>
+#include <string.h>
+
+#include "common.h"
+#include "os_io.h"
+#include "runTests.h"
+#include "testUtils.h"
+
+// Runs one suite of src/test, given by its name, in this process (see unit_tests/README.md).
+// Exits with 0 if the suite passed, 1 if a check failed and 2 for an unknown suite.
+
+uint8_t G_io_apdu_buffer[IO_APDU_BUFFER_SIZE];
+
+typedef struct {
+    const char* name;
+    void (*run)();
+} test_suite_t;
+
+static const test_suite_t SUITES[] = {
+    {"hex", run_hex_test},
+    {"base58", run_base58_test},
+    {"bech32", run_bech32_test},
+    {"crc32", run_crc32_test},
+    {"endian", run_endian_test},
+    {"textUtils", run_textUtils_test},
+    {"tokens", run_tokens_test},
+    {"ipUtils", run_ipUtils_test},
+    {"hash", run_hash_test},
+    {"cbor", run_cbor_test},
+    {"bip44", run_bip44_test},
+    {"keyDerivation", run_key_derivation_test},
+    {"addressUtilsByron", run_addressUtilsByron_test},
+    {"addressUtilsShelley", run_addressUtilsShelley_test},
+    {"auxDataHashBuilder", run_auxDataHashBuilder_test},
+    {"nativeScriptHashBuilder", run_nativeScriptHashBuilder_test},
+};
+
+static int runSuite(const test_suite_t* suite) {
+    volatile int status = 0;
+    BEGIN_TRY {
+        TRY {
+            suite->run();
+        }
+        CATCH_OTHER(e) {
+            fprintf(stderr, "%s: failed with 0x%x\n", suite->name, e);
+            status = 1;
+        }
+        FINALLY {
+        }
+    }
+    END_TRY;
+    return status;
+}
+
+int main(int argc, char* argv[]) {
+    if (argc == 2) {
+        for (size_t i = 0; i < ARRAY_LEN(SUITES); i++) {
+            if (strcmp(argv[1], SUITES[i].name) == 0) {
+                return runSuite(&SUITES[i]);
+            }
+        }
+    }
+
+    fprintf(stderr, "usage: %s <suite>, the suites being:\n", argv[0]);
+    for (size_t i = 0; i < ARRAY_LEN(SUITES); i++) {
+        fprintf(stderr, "  %s\n", SUITES[i].name);
+    }
+    return 2;
+}